@@ -0,0 +1,18 @@
+"""
+Нагрузочный генератор и бенчмарки симулятора.
+
+Запуск:
+    python -m src.benchmarks --mode all --output bench.json --baseline baseline.json
+"""
+from .stats import FlowResult, summarize, compare, failures
+from .in_process import run_in_process
+from .http import run_http
+
+__all__ = [
+    "FlowResult",
+    "summarize",
+    "compare",
+    "failures",
+    "run_in_process",
+    "run_http",
+]
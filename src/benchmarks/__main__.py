@@ -0,0 +1,83 @@
+"""
+CLI бенчмарков.
+
+Примеры:
+    python -m src.benchmarks --mode in-process --count 50000
+    python -m src.benchmarks --mode http --concurrency 64 --output bench.json
+    python -m src.benchmarks --baseline baseline.json --tolerance 0.15
+
+Код возврата 1 означает регрессию относительно базовой линии
+или неуспешные ответы сервера в HTTP-сценариях.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from .stats import compare, failures
+from .in_process import FLOWS as IN_PROCESS_FLOWS, run_in_process
+from .http import run_http
+
+
+def _print_table(results) -> None:
+    header = f"{'mode':<11} {'flow':<7} {'payments':>9} {'pay/s':>10} {'p50 ms':>8} {'p95 ms':>8} " \
+             f"{'p99 ms':>8} {'p999 ms':>8} {'B/op':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        alloc = f"{r.alloc_bytes_per_op:.0f}" if r.alloc_bytes_per_op is not None else "-"
+        print(f"{r.mode:<11} {r.flow:<7} {r.payments:>9} {r.throughput:>10.0f} {r.p50_ms:>8.3f} "
+              f"{r.p95_ms:>8.3f} {r.p99_ms:>8.3f} {r.p999_ms:>8.3f} {alloc:>8}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Payment Gateway Simulator benchmarks")
+    parser.add_argument("--mode", choices=["in-process", "http", "all"], default="all")
+    parser.add_argument("--flows", default=",".join(IN_PROCESS_FLOWS),
+                        help="Сценарии через запятую: create,lookup,refund,batch")
+    parser.add_argument("--count", type=int, default=10_000, help="Платежей на сценарий")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32, help="Параллельных HTTP-запросов")
+    parser.add_argument("--url", default=None, help="Адрес запущенного сервера вместо локального uvicorn")
+    parser.add_argument("--no-alloc", action="store_true", help="Не замерять аллокации")
+    parser.add_argument("--output", default=None, help="Куда сохранить JSON-отчёт")
+    parser.add_argument("--baseline", default=None, help="JSON-отчёт для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Допустимое ухудшение, доля")
+    args = parser.parse_args()
+
+    flows = [flow.strip() for flow in args.flows.split(",") if flow.strip()]
+    results = []
+    if args.mode in ("in-process", "all"):
+        results += run_in_process(args.count, args.batch_size, flows, None if args.no_alloc else 2_000)
+    if args.mode in ("http", "all"):
+        results += run_http(args.count, args.batch_size, args.concurrency, flows, url=args.url)
+
+    _print_table(results)
+
+    if args.output:
+        report = {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "count": args.count,
+            "results": [r.to_dict() for r in results],
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    failed = failures(results)
+    for line in failed:
+        print(f"FAILED {line}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = compare(json.load(file), results, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions or failed else 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Бенчмарк сценариев через HTTP: локальный uvicorn и асинхронный httpx-клиент.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+
+import httpx
+
+from .stats import FlowResult, summarize
+
+MODE = "http"
+
+# Корень репозитория: отсюда uvicorn импортирует src.payment_gateway_simulator
+_ROOT = Path(__file__).resolve().parents[2]
+_APP = "src.payment_gateway_simulator.api.main:app"
+
+# Сценарии, доступные через API
+FLOWS = ("create", "lookup", "refund", "batch")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def local_server(env: Optional[dict] = None, startup_timeout: float = 15.0) -> Iterator[str]:
+    """
+    Поднять uvicorn в отдельном процессе на свободном порту.
+
+    Вывод сервера (в том числе лог транзакций) отбрасывается.
+
+    :param env: Дополнительные переменные окружения (например, PGS_STORAGE)
+    :return: Базовый URL сервера
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", _APP, "--port", str(port), "--log-level", "warning"],
+        cwd=_ROOT,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                if httpx.get(f"{url}/health", timeout=0.5).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not start in time")
+            time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _payload(payment_id: str) -> dict:
+    return {
+        "payment_id": payment_id,
+        "amount": "100.50",
+        "currency": "USD",
+        "description": "Benchmark payment",
+        "customer_email": "bench@example.com",
+    }
+
+
+async def _drive(client: httpx.AsyncClient, requests: Sequence[tuple], concurrency: int):
+    """
+    Выполнить запросы из concurrency параллельных воркеров.
+
+    :param requests: Кортежи (method, path, json)
+    :return: (замеры в секундах, общее время, число ответов не из 2xx)
+    """
+    samples: List[float] = []
+    errors = 0
+    pending = iter(requests)
+    clock = time.perf_counter
+
+    async def worker():
+        nonlocal errors
+        for method, path, body in pending:
+            started = clock()
+            response = await client.request(method, path, json=body)
+            samples.append(clock() - started)
+            if not response.is_success:
+                errors += 1
+
+    started = clock()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return samples, clock() - started, errors
+
+
+async def _run(url: str, count: int, batch_size: int, concurrency: int, flows: Sequence[str]) -> List[FlowResult]:
+    # Уникальный префикс: сервер может быть общим для нескольких прогонов
+    prefix = f"bench_{os.getpid()}_{time.time_ns()}"
+    ids = [f"{prefix}_c_{i}" for i in range(count)]
+    plans = {
+        "create": [("POST", "/api/pay", _payload(payment_id)) for payment_id in ids],
+        "lookup": [("GET", f"/api/pay/{payment_id}", None) for payment_id in ids],
+        "refund": [
+            ("POST", f"/api/pay/{payment_id}/refund", {"amount": "10.00", "currency": "USD", "reason": "benchmark"})
+            for payment_id in ids
+        ],
+        "batch": [
+            ("POST", "/api/pay/batch", {
+                "payments": [_payload(f"{prefix}_b_{i}") for i in range(start, min(start + batch_size, count))]
+            })
+            for start in range(0, count, batch_size)
+        ],
+    }
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = []
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        for flow in FLOWS:
+            # lookup и refund работают по платежам, созданным сценарием create
+            if flow not in flows and not (flow == "create" and {"lookup", "refund"} & set(flows)):
+                continue
+            samples, elapsed, errors = await _drive(client, plans[flow], concurrency)
+            if flow not in flows:
+                continue
+            result = summarize(flow, MODE, samples, elapsed, payments=count)
+            result.extra["errors"] = errors
+            result.extra["error_rate"] = errors / len(samples) if samples else 0.0
+            result.extra["concurrency"] = concurrency
+            results.append(result)
+    return results
+
+
+def run_http(
+        count: int = 5_000,
+        batch_size: int = 100,
+        concurrency: int = 32,
+        flows: Sequence[str] = FLOWS,
+        url: Optional[str] = None,
+        env: Optional[dict] = None,
+) -> List[FlowResult]:
+    """
+    Прогнать сценарии через HTTP.
+
+    Аллокации здесь не меряются: они происходят в процессе сервера.
+
+    :param count: Число платежей в каждом сценарии
+    :param concurrency: Число одновременных запросов
+    :param url: Адрес уже запущенного сервера; если не задан — поднимаем свой uvicorn
+    :param env: Переменные окружения для локального сервера
+    """
+    flows = [flow for flow in flows if flow in FLOWS]
+    if url is not None:
+        return asyncio.run(_run(url, count, batch_size, concurrency, flows))
+    with local_server(env) as local_url:
+        return asyncio.run(_run(local_url, count, batch_size, concurrency, flows))
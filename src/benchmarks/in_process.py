@@ -0,0 +1,222 @@
+"""
+Бенчмарк сценариев внутри процесса: use case и адаптер без HTTP.
+"""
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List, Optional, Sequence
+
+from ..payment_gateway_simulator.adapters.payment import InMemoryPaymentAdapter
+from ..payment_gateway_simulator.adapters.risk import RiskEngine, RiskRule
+from ..payment_gateway_simulator.adapters.fx import FxRateMatrix, LocalFxRateProvider
+from ..payment_gateway_simulator.domain import (
+    Amount, Payment, PaymentCommand, PaymentId, PaymentQuery, TransactionLoggerPort,
+)
+from ..payment_gateway_simulator.domain.ports.payment_processor import cursor_of
+from ..payment_gateway_simulator.use_cases import ProcessPaymentInput, ProcessPaymentUseCase
+from .stats import FlowResult, summarize
+
+MODE = "in-process"
+
+
+class _NullTransactionLogger(TransactionLoggerPort):
+    """
+    Логгер без вывода: в бенчмарке меряем обработку, а не stdout.
+    """
+
+    def log_transaction(self, payment: Payment) -> None:
+        pass
+
+    def log_transactions(self, payments: List[Payment]) -> None:
+        pass
+
+    def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return []
+
+
+def _inputs(prefix: str, count: int) -> List[ProcessPaymentInput]:
+    return [
+        ProcessPaymentInput(
+            payment_id=f"{prefix}_{i}",
+            amount=Decimal("100.50"),
+            currency="USD",
+            description="Benchmark payment",
+            customer_email="bench@example.com",
+        )
+        for i in range(count)
+    ]
+
+
+# Типичный набор правил риска: по одному условию каждого вида и два окна скорости
+_RISK_RULES = (
+    {"name": "large_amount", "min_amount": "10000", "currency": ["USD", "EUR"]},
+    {"name": "disposable_email", "email_domain": ["mailinator.com", "tempmail.com"]},
+    {"name": "sanctioned_country", "meta": {"country": ["KP", "IR"]}},
+    {"name": "velocity_minute", "velocity": {"max": 5, "window": 60}},
+    {"name": "velocity_hour", "velocity": {"max": 20, "window": 3600}},
+)
+
+# Мультивалютный сценарий: платежи в разных валютах с пересчётом в USD
+_FX_RATES = {"base": "USD", "rates": {"EUR": "0.92", "GBP": "0.79", "JPY": "151.30", "KWD": "0.3075", "CHF": "0.88"}}
+_FX_CURRENCIES = ("EUR", "GBP", "JPY", "KWD", "CHF", "USD")
+
+
+def _timed(operations: Sequence[Callable[[], object]]):
+    """
+    Выполнить операции по очереди и замерить каждую.
+
+    :return: (замеры в секундах, общее время)
+    """
+    samples = []
+    clock = time.perf_counter
+    started = clock()
+    for operation in operations:
+        op_started = clock()
+        operation()
+        samples.append(clock() - op_started)
+    return samples, clock() - started
+
+
+def _allocations(operations: Sequence[Callable[[], object]]):
+    """
+    Прирост памяти на операцию по данным tracemalloc.
+
+    Выполняется отдельным прогоном: трассировка сильно искажает задержки.
+
+    :return: (байт на операцию, блоков на операцию)
+    """
+    if not operations:
+        return None, None
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for operation in operations:
+            operation()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in diff)
+    blocks = sum(stat.count_diff for stat in diff)
+    return size / len(operations), blocks / len(operations)
+
+
+class _Flows:
+    """
+    Набор сценариев поверх одного свежего адаптера.
+
+    Каждый сценарий возвращает список операций без аргументов —
+    один и тот же список можно прогнать с замером времени или памяти.
+    """
+
+    def __init__(self, prefix: str, count: int, batch_size: int):
+        self.adapter = InMemoryPaymentAdapter()
+        self.use_case = ProcessPaymentUseCase(self.adapter, _NullTransactionLogger())
+        self.prefix = prefix
+        self.count = count
+        self.batch_size = batch_size
+
+    def create(self):
+        execute = self.use_case.execute
+        return [lambda item=item: execute(item) for item in _inputs(f"{self.prefix}_c", self.count)]
+
+    def lookup(self):
+        get_payment = self.adapter.get_payment
+        ids = [PaymentId(f"{self.prefix}_c_{i}") for i in range(self.count)]
+        return [lambda payment_id=payment_id: get_payment(payment_id) for payment_id in ids]
+
+    def refund(self):
+        refund_payment = self.adapter.refund_payment
+        amount = Amount(Decimal("10.00"), "USD")
+        ids = [PaymentId(f"{self.prefix}_c_{i}") for i in range(self.count)]
+        return [lambda payment_id=payment_id: refund_payment(payment_id, amount, "benchmark") for payment_id in ids]
+
+    def batch(self):
+        execute_batch = self.use_case.execute_batch
+        items = _inputs(f"{self.prefix}_b", self.count)
+        chunks = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+        return [lambda chunk=chunk: execute_batch(chunk) for chunk in chunks]
+
+    def risk(self):
+        assess = RiskEngine([RiskRule.from_dict(rule) for rule in _RISK_RULES]).assess
+        amount = Amount(Decimal("100.50"), "USD")
+        commands = [
+            PaymentCommand(
+                PaymentId(f"{self.prefix}_r_{i}"), amount,
+                customer_email=f"customer{i % 1000}@example.com", meta={"country": "US"}
+            )
+            for i in range(self.count)
+        ]
+        return [lambda command=command: assess(command) for command in commands]
+
+    def fx(self):
+        use_case = ProcessPaymentUseCase(
+            self.adapter,
+            _NullTransactionLogger(),
+            fx_rates=LocalFxRateProvider(FxRateMatrix.from_dict(_FX_RATES)),
+            settlement_currency="USD"
+        )
+        execute = use_case.execute
+        items = [
+            replace(item, currency=_FX_CURRENCIES[i % len(_FX_CURRENCIES)])
+            for i, item in enumerate(_inputs(f"{self.prefix}_x", self.count))
+        ]
+        return [lambda item=item: execute(item) for item in items]
+
+    def capture(self):
+        # Авторизации создаются заранее, замеряется только перенос в индекс SUCCEEDED
+        authorize_payment = self.adapter.authorize_payment
+        amount = Amount(Decimal("100.50"), "USD")
+        expires_at = datetime.now() + timedelta(days=7)
+        ids = [PaymentId(f"{self.prefix}_a_{i}") for i in range(self.count)]
+        for payment_id in ids:
+            authorize_payment(payment_id, amount, expires_at, customer_email="bench@example.com")
+        capture_payment = self.adapter.capture_payment
+        return [lambda payment_id=payment_id: capture_payment(payment_id) for payment_id in ids]
+
+    def list(self):
+        # Страница выборки по статусу от курсора каждого платежа из create
+        list_payments = self.adapter.list_payments
+        payments = [self.adapter.get_payment(PaymentId(f"{self.prefix}_c_{i}")) for i in range(self.count)]
+        queries = [
+            PaymentQuery(status=payment.status, currency="USD", after=cursor_of(payment), limit=50)
+            for payment in payments
+        ]
+        return [lambda query=query: list_payments(query) for query in queries]
+
+
+# Порядок важен: lookup, refund и list работают по платежам из create
+FLOWS = ("create", "lookup", "refund", "batch", "risk", "fx", "capture", "list")
+
+
+def run_in_process(
+        count: int = 10_000,
+        batch_size: int = 100,
+        flows: Sequence[str] = FLOWS,
+        alloc_sample: Optional[int] = 2_000,
+) -> List[FlowResult]:
+    """
+    Прогнать сценарии внутри процесса.
+
+    :param count: Число платежей в каждом сценарии
+    :param batch_size: Размер пакета для сценария batch
+    :param flows: Какие сценарии запускать
+    :param alloc_sample: Сколько платежей прогнать под tracemalloc (None — не мерить)
+    """
+    timed = _Flows("bench", count, batch_size)
+    traced = _Flows("alloc", min(count, alloc_sample or 0), batch_size)
+    results = []
+    for flow in FLOWS:
+        if flow not in flows and not (flow == "create" and {"lookup", "refund", "list"} & set(flows)):
+            continue
+        samples, elapsed = _timed(getattr(timed, flow)())
+        bytes_per_op, blocks_per_op = _allocations(getattr(traced, flow)()) if alloc_sample else (None, None)
+        if flow not in flows:
+            continue
+        result = summarize(flow, MODE, samples, elapsed, payments=count)
+        result.alloc_bytes_per_op = bytes_per_op
+        result.alloc_blocks_per_op = blocks_per_op
+        results.append(result)
+    return results
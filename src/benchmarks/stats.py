@@ -0,0 +1,132 @@
+"""
+Сбор статистики бенчмарков и сравнение с базовой линией.
+"""
+import math
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List, Optional, Sequence
+
+# Перцентили задержки, которые попадают в отчёт
+PERCENTILES = (50, 95, 99, 99.9)
+
+# Метрики, по которым ищем регрессии: имя -> True, если «больше — лучше»
+_TRACKED = {
+    "throughput": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "alloc_bytes_per_op": False,
+}
+
+
+@dataclass
+class FlowResult:
+    """
+    Результат прогона одного сценария.
+
+    Задержки — в миллисекундах на операцию, throughput — платежей в секунду.
+    Для пакетного сценария одна операция — один пакет, а throughput
+    считается по платежам.
+    """
+    flow: str
+    mode: str
+    operations: int
+    payments: int
+    elapsed: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    p999_ms: float
+    alloc_bytes_per_op: Optional[float] = None
+    alloc_blocks_per_op: Optional[float] = None
+    extra: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.mode}:{self.flow}"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def percentile(sorted_samples: Sequence[float], pct: float) -> float:
+    """
+    Перцентиль по методу ближайшего ранга.
+
+    :param sorted_samples: Отсортированные по возрастанию значения
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = min(len(sorted_samples), max(1, math.ceil(pct / 100 * len(sorted_samples)))) - 1
+    return sorted_samples[rank]
+
+
+def summarize(
+        flow: str,
+        mode: str,
+        samples: Sequence[float],
+        elapsed: float,
+        payments: Optional[int] = None,
+) -> FlowResult:
+    """
+    Собрать результат сценария из замеров задержки.
+
+    :param samples: Длительность каждой операции в секундах
+    :param elapsed: Общее время прогона в секундах
+    :param payments: Сколько платежей обработано (по умолчанию — по одному на операцию)
+    """
+    ordered = sorted(samples)
+    p50, p95, p99, p999 = (percentile(ordered, p) * 1000 for p in PERCENTILES)
+    if payments is None:
+        payments = len(ordered)
+    return FlowResult(
+        flow=flow,
+        mode=mode,
+        operations=len(ordered),
+        payments=payments,
+        elapsed=elapsed,
+        throughput=payments / elapsed if elapsed > 0 else 0.0,
+        p50_ms=p50,
+        p95_ms=p95,
+        p99_ms=p99,
+        p999_ms=p999,
+    )
+
+
+def failures(results: Sequence[FlowResult]) -> List[str]:
+    """
+    Сценарии с неуспешными ответами (extra["errors"]).
+
+    Замеры такого прогона ничего не говорят о скорости: отказ 429/503
+    быстрее настоящей обработки.
+
+    :return: Описание неуспешных сценариев (пустой список — ошибок нет)
+    """
+    return [
+        f"{result.key}: {result.extra['errors']:.0f} of {result.operations} responses failed"
+        for result in results
+        if result.extra.get("errors")
+    ]
+
+
+def compare(baseline: dict, results: Sequence[FlowResult], tolerance: float = 0.2) -> List[str]:
+    """
+    Сравнить результаты с сохранённой базовой линией.
+
+    :param baseline: Содержимое JSON-отчёта предыдущего прогона
+    :param tolerance: Допустимое ухудшение (0.2 — на 20%)
+    :return: Описание найденных регрессий (пустой список — регрессий нет)
+    """
+    previous = {f"{r['mode']}:{r['flow']}": r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result.key)
+        if before is None:
+            continue
+        for metric, higher_is_better in _TRACKED.items():
+            old, new = before.get(metric), getattr(result, metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{result.key} {metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
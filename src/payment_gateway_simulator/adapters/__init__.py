@@ -1,7 +1,79 @@
-from .payment import InMemoryPaymentAdapter
-from .logging import ConsoleLoggerAdapter
+from .payment import (
+    InMemoryPaymentAdapter,
+    AsyncInMemoryPaymentAdapter,
+    SqlitePaymentAdapter,
+    AsyncSqlitePaymentAdapter,
+    SharedPaymentAdapter,
+    AsyncSharedPaymentAdapter,
+)
+from .logging import (
+    ConsoleLoggerAdapter,
+    AsyncConsoleLoggerAdapter,
+    BufferedLoggerAdapter,
+    FileTransactionLoggerAdapter,
+)
+from .metrics import (
+    MetricsRegistry,
+    PaymentMetrics,
+    InstrumentedPaymentProcessor,
+    AsyncInstrumentedPaymentProcessor,
+    InstrumentedTransactionLogger,
+    AsyncInstrumentedTransactionLogger,
+)
+from .reporting import (
+    VolumeAggregator,
+    AggregatingTransactionLogger,
+    AsyncAggregatingTransactionLogger,
+)
+from .expiry import (
+    ExpiryWheel,
+    AuthorizationExpiryScheduler,
+    AsyncExpiryTrackingTransactionLogger,
+)
+from .risk import (
+    RiskEngine,
+    RiskRule,
+    VelocityCounter,
+)
+from .fx import (
+    FxRateMatrix,
+    LocalFxRateProvider,
+)
+from .webhooks import (
+    WebhookDispatcher,
+    WebhookEndpoint,
+    AsyncWebhookTransactionLogger,
+)
 
 __all__ = [
     "InMemoryPaymentAdapter",
+    "AsyncInMemoryPaymentAdapter",
+    "SqlitePaymentAdapter",
+    "AsyncSqlitePaymentAdapter",
+    "SharedPaymentAdapter",
+    "AsyncSharedPaymentAdapter",
     "ConsoleLoggerAdapter",
-]
\ No newline at end of file
+    "AsyncConsoleLoggerAdapter",
+    "BufferedLoggerAdapter",
+    "FileTransactionLoggerAdapter",
+    "MetricsRegistry",
+    "PaymentMetrics",
+    "InstrumentedPaymentProcessor",
+    "AsyncInstrumentedPaymentProcessor",
+    "InstrumentedTransactionLogger",
+    "AsyncInstrumentedTransactionLogger",
+    "VolumeAggregator",
+    "AggregatingTransactionLogger",
+    "AsyncAggregatingTransactionLogger",
+    "ExpiryWheel",
+    "AuthorizationExpiryScheduler",
+    "AsyncExpiryTrackingTransactionLogger",
+    "RiskEngine",
+    "RiskRule",
+    "VelocityCounter",
+    "FxRateMatrix",
+    "LocalFxRateProvider",
+    "WebhookDispatcher",
+    "WebhookEndpoint",
+    "AsyncWebhookTransactionLogger",
+]
@@ -0,0 +1,9 @@
+from .wheel import ExpiryWheel
+from .scheduler import AuthorizationExpiryScheduler
+from .tracking import AsyncExpiryTrackingTransactionLogger
+
+__all__ = [
+    "ExpiryWheel",
+    "AuthorizationExpiryScheduler",
+    "AsyncExpiryTrackingTransactionLogger",
+]
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+
+from ...domain.payment import Payment
+from ...domain.payment_status import PaymentStatus
+from ...domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ...domain.ports.payment_processor import PaymentQuery
+from .wheel import ExpiryWheel
+
+logger = logging.getLogger("payment_gateway_simulator.adapters.expiry")
+
+# Обработчик истёкших авторизаций: получает их payment_id пачкой
+ExpireCallback = Callable[[List[str]], Awaitable[None]]
+
+
+class AuthorizationExpiryScheduler:
+    """
+    Автоматическая отмена авторизаций (PENDING), у которых истёк срок.
+
+    Сроки хранятся в ExpiryWheel: постановка и снятие таймера — O(1),
+    раз в тик фоновая задача забирает истёкшие и передаёт их в expire
+    пачками не больше batch_size. Хранилище при этом не сканируется.
+
+    Таймеры живут в памяти процесса. При старте они восстанавливаются
+    из хранилища (load) — по индексу статуса PENDING, один раз.
+
+    Пачка, на которой expire упал, возвращается в колесо и повторяется
+    в следующем тике: её таймеры уже сняты, и без этого авторизации
+    остались бы PENDING до перезапуска.
+    """
+
+    def __init__(
+            self,
+            expire: ExpireCallback,
+            tick: float = 1.0,
+            batch_size: int = 1000
+    ):
+        """
+        :param expire: Корутина, отменяющая авторизации по списку payment_id
+        :param tick: Период разбора таймеров, секунды
+        :param batch_size: Максимум авторизаций в одном вызове expire
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self._expire = expire
+        self._tick = tick
+        self._batch_size = batch_size
+        self._wheel = ExpiryWheel(tick)
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._wheel)
+
+    def track(self, payment: Payment) -> None:
+        """
+        Учесть изменение платежа: авторизация ставит таймер, любой другой статус снимает.
+        """
+        if payment.status is PaymentStatus.PENDING and payment.expires_at is not None:
+            self._wheel.add(payment.id.value, payment.expires_at)
+        else:
+            self._wheel.discard(payment.id.value)
+
+    async def load(self, processor: AsyncPaymentProcessorPort, page_size: int = 1000) -> int:
+        """
+        Поставить таймеры всех авторизаций, уже лежащих в хранилище.
+
+        :return: Количество найденных авторизаций
+        """
+        query = PaymentQuery(status=PaymentStatus.PENDING, limit=page_size)
+        loaded = 0
+        while True:
+            page = await processor.list_payments(query)
+            for payment in page.items:
+                self.track(payment)
+            loaded += len(page.items)
+            if page.next_cursor is None:
+                return loaded
+            query = PaymentQuery(status=PaymentStatus.PENDING, after=page.next_cursor, limit=page_size)
+
+    async def start(self) -> None:
+        """
+        Запустить фоновый разбор таймеров (повторный вызов ничего не делает).
+        """
+        if self._task is None and not self._closed:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def aclose(self) -> None:
+        """
+        Остановить фоновый разбор.
+        """
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self, now: Optional[float] = None) -> int:
+        """
+        Отменить авторизации, истёкшие к моменту now.
+
+        :param now: Время Unix (по умолчанию time.time())
+        :return: Количество переданных в expire авторизаций
+        """
+        if now is None:
+            now = time.time()
+        expired = self._wheel.pop_expired(now)
+        for start in range(0, len(expired), self._batch_size):
+            batch = expired[start:start + self._batch_size]
+            try:
+                await self._expire(batch)
+            except Exception:
+                # Ошибка одной пачки не должна останавливать планировщик
+                logger.exception("Failed to expire batch of %d authorizations, retrying next tick", len(batch))
+                self._retry(batch, now)
+        return len(expired)
+
+    def _retry(self, batch: List[str], now: float) -> None:
+        """
+        Вернуть пачку в колесо на текущий тик (сработает при следующем разборе).
+
+        Таймер, заново поставленный за время вызова expire, не перезаписывается.
+        """
+        due = datetime.fromtimestamp(now)
+        wheel = self._wheel
+        for payment_id in batch:
+            if payment_id not in wheel:
+                wheel.add(payment_id, due)
+
+    async def _run(self) -> None:
+        tick = self._tick
+        while True:
+            # Просыпаемся сразу после границы тика — ячейка к этому моменту закрыта
+            await asyncio.sleep(tick - time.time() % tick + 0.001)
+            await self.run_once()
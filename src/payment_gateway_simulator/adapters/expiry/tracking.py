@@ -0,0 +1,34 @@
+from typing import List
+
+from ...domain import (
+    Payment,
+    PaymentId,
+    AsyncTransactionLoggerPort,
+)
+from .scheduler import AuthorizationExpiryScheduler
+
+
+class AsyncExpiryTrackingTransactionLogger(AsyncTransactionLoggerPort):
+    """
+    Декоратор AsyncTransactionLoggerPort, ведущий таймеры авторизаций.
+
+    Записанная авторизация ставит таймер истечения, списание или
+    отмена — снимают его.
+    """
+
+    def __init__(self, inner: AsyncTransactionLoggerPort, scheduler: AuthorizationExpiryScheduler):
+        self._inner = inner
+        self._scheduler = scheduler
+
+    async def log_transaction(self, payment: Payment) -> None:
+        await self._inner.log_transaction(payment)
+        self._scheduler.track(payment)
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        await self._inner.log_transactions(payments)
+        track = self._scheduler.track
+        for payment in payments:
+            track(payment)
+
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._inner.get_transactions_by_payment_id(payment_id)
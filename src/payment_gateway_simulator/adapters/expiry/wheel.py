@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class ExpiryWheel:
+    """
+    Таймеры истечения по идентификатору: колесо с ячейкой на каждый тик.
+
+    Ячейка — номер тика (время Unix // tick) → множество идентификаторов,
+    которые истекают в этом тике. add и discard — O(1) операции над
+    словарями, pop_expired забирает только ячейки прошедших тиков:
+    каждый таймер трогается один раз, сколько бы их ни было и как бы
+    далеко в будущем они ни истекали. Полного перебора нет.
+
+    Таймер срабатывает не раньше срока и не позже чем через один тик после.
+    Не потокобезопасно: используется из одного event loop.
+    """
+
+    def __init__(self, tick: float = 1.0):
+        """
+        :param tick: Ширина ячейки, секунды (точность срабатывания)
+        """
+        if tick <= 0:
+            raise ValueError("tick must be positive")
+        self._tick = tick
+        self._slots: Dict[int, Dict[str, None]] = {}
+        self._slot_of: Dict[str, int] = {}
+        self._cursor: Optional[int] = None  # Первый ещё не разобранный тик
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def add(self, key: str, expires_at: datetime) -> None:
+        """
+        Поставить (или переставить) таймер ключа на expires_at.
+        """
+        self.discard(key)
+        slot = int(expires_at.timestamp() // self._tick)
+        if self._cursor is not None and slot < self._cursor:
+            # Срок уже прошёл — сработает при следующем разборе
+            slot = self._cursor
+        keys = self._slots.get(slot)
+        if keys is None:
+            keys = self._slots[slot] = {}
+        keys[key] = None
+        self._slot_of[key] = slot
+
+    def discard(self, key: str) -> None:
+        """
+        Снять таймер ключа (если он есть).
+        """
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            keys = self._slots[slot]
+            del keys[key]
+            if not keys:
+                del self._slots[slot]
+
+    def pop_expired(self, now: float) -> List[str]:
+        """
+        Забрать ключи, чей тик целиком прошёл к моменту now.
+
+        :param now: Текущее время Unix, секунды
+        :return: Истёкшие ключи (их таймеры сняты)
+        """
+        current = int(now // self._tick)
+        cursor = self._cursor
+        if cursor is None:
+            cursor = min(min(self._slots, default=current), current)
+        if current - cursor > len(self._slots):
+            # После долгого простоя дешевле пройти по занятым ячейкам, чем по тикам
+            due = sorted(slot for slot in self._slots if slot < current)
+        else:
+            due = range(cursor, current)
+        self._cursor = max(cursor, current)
+
+        expired: List[str] = []
+        slots, slot_of = self._slots, self._slot_of
+        for slot in due:
+            keys = slots.pop(slot, None)
+            if keys:
+                for key in keys:
+                    del slot_of[key]
+                expired.extend(keys)
+        return expired
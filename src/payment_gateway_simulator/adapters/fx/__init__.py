@@ -0,0 +1,7 @@
+from .matrix import FxRateMatrix
+from .provider import LocalFxRateProvider
+
+__all__ = [
+    "FxRateMatrix",
+    "LocalFxRateProvider",
+]
@@ -0,0 +1,118 @@
+import json
+from decimal import Decimal, InvalidOperation
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+from ...domain.currency import exponent
+
+
+class FxRateMatrix:
+    """
+    Неизменяемая таблица курсов: плотная матрица всех пар валют.
+
+    Курсы задаются к одной базовой валюте (сколько единиц валюты дают
+    за единицу base). Кросс-курсы всех пар выводятся один раз при
+    загрузке — точными дробями, уже с учётом экспонент валют: ячейка
+    (source, target) — пара целых (числитель, знаменатель), переводящая
+    минорные единицы source в минорные единицы target.
+
+    Конвертация — два поиска в словаре кодов, индекс в кортеже и одно
+    целочисленное деление с банковским округлением: без Decimal,
+    контекстов округления и накопления ошибки через базовую валюту.
+    """
+
+    __slots__ = ("base", "rates", "_index", "_size", "_ratios")
+
+    def __init__(self, base: str, rates: Mapping[str, Decimal]):
+        """
+        :param base: Код базовой валюты
+        :param rates: Валюта → сколько её за одну единицу base (курс base к себе можно не указывать)
+        :raises ValueError: Невалидный код валюты или неположительный курс
+        """
+        base = _currency(base)
+        normalized: Dict[str, Decimal] = {base: Decimal(1)}
+        for currency, rate in rates.items():
+            currency = _currency(currency)
+            if not rate.is_finite() or rate <= 0:
+                raise ValueError(f"FX rate for {currency} must be positive")
+            if currency == base and rate != 1:
+                raise ValueError(f"FX rate of base currency {base} must be 1")
+            normalized[currency] = rate
+
+        self.base = base
+        self.rates: Dict[str, Decimal] = normalized
+        self._index: Dict[str, int] = {currency: position for position, currency in enumerate(normalized)}
+        self._size = len(normalized)
+
+        # Дробь минорных единиц: 1 minor(source) = rate(target) / rate(source) * 10^(exp(target) - exp(source))
+        scaled = [
+            (Fraction(rate), exponent(currency)) for currency, rate in normalized.items()
+        ]
+        ratios = []
+        for source_rate, source_exp in scaled:
+            for target_rate, target_exp in scaled:
+                ratio = target_rate / source_rate * Fraction(10) ** (target_exp - source_exp)
+                ratios.append((ratio.numerator, ratio.denominator))
+        self._ratios: Tuple[Tuple[int, int], ...] = tuple(ratios)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FxRateMatrix":
+        """
+        Собрать таблицу из словаря (формат JSON-файла курсов).
+
+        Пример:
+            {"base": "USD", "rates": {"EUR": "0.92", "JPY": "151.30", "KWD": "0.3075"}}
+
+        Курсы лучше задавать строками — числа JSON переводятся в Decimal через str.
+
+        :raises ValueError: Нет base/rates, невалидный код или курс
+        """
+        if "base" not in data or not isinstance(data.get("rates"), dict):
+            raise ValueError("FX rates must have 'base' and 'rates' fields")
+        rates = {}
+        for currency, rate in data["rates"].items():
+            try:
+                rates[currency] = Decimal(str(rate))
+            except InvalidOperation:
+                raise ValueError(f"Invalid FX rate for {currency}: {rate!r}") from None
+        return cls(data["base"], rates)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "FxRateMatrix":
+        """
+        Загрузить таблицу из JSON-файла (см. from_dict).
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self._index
+
+    def convert_minor(self, minor: int, source: str, target: str) -> Optional[int]:
+        """
+        Перевести минорные единицы source в минорные единицы target.
+
+        :return: Сумма с банковским округлением или None, если валюты нет в таблице
+        """
+        index = self._index
+        row = index.get(source)
+        column = index.get(target)
+        if row is None or column is None:
+            return None
+        numerator, denominator = self._ratios[row * self._size + column]
+        quotient, remainder = divmod(minor * numerator, denominator)
+        # Банковское округление: ровно половина — к чётному
+        remainder *= 2
+        if remainder > denominator or remainder == denominator and quotient & 1:
+            quotient += 1
+        return quotient
+
+
+def _currency(code: str) -> str:
+    if not isinstance(code, str) or len(code) != 3 or not code.isalpha():
+        raise ValueError(f"Invalid currency code: {code!r}")
+    return code.upper()
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from ...domain.ports.fx_rates import FxRateProviderPort
+from .matrix import FxRateMatrix
+
+logger = logging.getLogger("payment_gateway_simulator.adapters.fx")
+
+
+class LocalFxRateProvider(FxRateProviderPort):
+    """
+    Курсы валют из локального JSON-файла (см. FxRateMatrix.from_dict).
+
+    Таблица подменяется целиком: новая FxRateMatrix строится в стороне
+    и заменяет текущую одним присваиванием ссылки. Конвертация берёт
+    ссылку один раз за вызов, поэтому видит либо старые, либо новые
+    курсы — без блокировок и без смеси курсов разных версий.
+
+    С reload_interval фоновая задача проверяет время изменения файла
+    и перечитывает его; файл с ошибкой не применяется, остаются
+    прежние курсы.
+    """
+
+    def __init__(
+            self,
+            matrix: FxRateMatrix,
+            path: Optional[Union[str, Path]] = None,
+            reload_interval: float = 0.0
+    ):
+        """
+        :param matrix: Начальная таблица курсов
+        :param path: Файл курсов для reload()
+        :param reload_interval: Период проверки файла, секунды (0 — не перечитывать)
+        """
+        self._matrix = matrix
+        self._path = path
+        self._reload_interval = reload_interval
+        self._mtime = os.stat(path).st_mtime_ns if path is not None else None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], reload_interval: float = 0.0) -> "LocalFxRateProvider":
+        """
+        Загрузить курсы из файла.
+
+        :raises ValueError: Невалидный файл курсов
+        """
+        return cls(FxRateMatrix.from_file(path), path, reload_interval)
+
+    @property
+    def matrix(self) -> FxRateMatrix:
+        """
+        Текущая таблица курсов
+        """
+        return self._matrix
+
+    def swap(self, matrix: FxRateMatrix) -> None:
+        """
+        Атомарно заменить таблицу курсов.
+        """
+        self._matrix = matrix
+
+    def reload(self) -> bool:
+        """
+        Перечитать файл курсов, если он изменился.
+
+        :return: True, если таблица заменена
+        :raises ValueError: Невалидный файл курсов (таблица не меняется)
+        :raises OSError: Файл недоступен
+        """
+        if self._path is None:
+            return False
+        mtime = os.stat(self._path).st_mtime_ns
+        if mtime == self._mtime:
+            return False
+        matrix = FxRateMatrix.from_file(self._path)
+        self._mtime = mtime
+        self.swap(matrix)
+        return True
+
+    def convert_minor(self, minor: int, source: str, target: str) -> Optional[int]:
+        return self._matrix.convert_minor(minor, source, target)
+
+    async def start(self) -> None:
+        """
+        Запустить периодическую проверку файла (если задан reload_interval).
+        """
+        if self._path is not None and self._reload_interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self._reload_interval)
+            try:
+                if self.reload():
+                    logger.info("FX rates reloaded from %s (%d currencies)", self._path, len(self._matrix))
+            except (OSError, ValueError) as e:
+                logger.warning("FX rates not reloaded from %s: %s", self._path, e)
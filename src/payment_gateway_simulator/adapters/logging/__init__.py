@@ -1,5 +1,11 @@
 from .console import ConsoleLoggerAdapter
+from .async_console import AsyncConsoleLoggerAdapter
+from .buffered import BufferedLoggerAdapter
+from .file import FileTransactionLoggerAdapter
 
 __all__ = [
     "ConsoleLoggerAdapter",
-]
\ No newline at end of file
+    "AsyncConsoleLoggerAdapter",
+    "BufferedLoggerAdapter",
+    "FileTransactionLoggerAdapter",
+]
@@ -0,0 +1,88 @@
+import asyncio
+import sys
+from typing import List, Optional
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+from .formatting import format_log_line
+
+
+def _write_lines(lines: List[str]) -> None:
+    """
+    Записать строки в stdout одним вызовом (выполняется вне event loop).
+    """
+    stream = sys.stdout
+    stream.write("\n".join(lines) + "\n")
+    stream.flush()
+
+
+class AsyncConsoleLoggerAdapter(AsyncTransactionLoggerPort):
+    """
+    Асинхронный адаптер для логирования транзакций в консоль (stdout).
+
+    log_transaction только форматирует строку и ставит её в очередь —
+    запись в stdout выполняется в пуле потоков. Пока идёт одна запись,
+    новые строки копятся и уходят следующей порцией, поэтому переход
+    в другой поток происходит один раз на пачку, а не на каждый платёж.
+    """
+
+    def __init__(self, pretty: bool = False):
+        """
+        :param pretty: Если True — красивый многострочный JSON, иначе одна строка
+        """
+        self._pretty = pretty
+        self._pending: List[str] = []
+        self._flush_future: Optional[asyncio.Future] = None
+
+    async def log_transaction(self, payment: Payment) -> None:
+        """
+        Поставить транзакцию в очередь на запись в консоль.
+        """
+        self._pending.append(format_log_line(payment, self._pretty))
+        self._schedule_flush()
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        """
+        Поставить пакет транзакций в очередь на запись в консоль.
+        """
+        if payments:
+            self._pending.extend(format_log_line(payment, self._pretty) for payment in payments)
+            self._schedule_flush()
+
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Консоль не хранит историю — возвращаем пустой список.
+        """
+        return []
+
+    async def flush(self) -> None:
+        """
+        Дождаться, пока все накопленные строки будут записаны.
+        """
+        while self._flush_future is not None or self._pending:
+            if self._flush_future is None:
+                self._schedule_flush()
+            await asyncio.wait({self._flush_future})
+
+    async def aclose(self) -> None:
+        """
+        Завершить работу адаптера, дописав очередь.
+        """
+        await self.flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_future is not None or not self._pending:
+            return
+
+        lines, self._pending = self._pending, []
+        loop = asyncio.get_running_loop()
+        self._flush_future = loop.run_in_executor(None, _write_lines, lines)
+        self._flush_future.add_done_callback(self._on_flushed)
+
+    def _on_flushed(self, future: asyncio.Future) -> None:
+        self._flush_future = None
+        if not future.cancelled():
+            # Ошибка записи в stdout не должна ронять обработку платежей
+            future.exception()
+        self._schedule_flush()
@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import sys
+from typing import List, Optional, TextIO
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+from ...domain.ports.transaction_logger import TransactionLoggerPort
+from .formatting import format_log_line
+
+logger = logging.getLogger("payment_gateway_simulator.adapters.logging")
+
+# Маркер остановки фонового писателя
+_STOP = object()
+
+
+class BufferedLoggerAdapter(AsyncTransactionLoggerPort):
+    """
+    Буферизованный адаптер логирования транзакций.
+
+    log_transaction только кладёт платёж в ограниченную очередь.
+    Фоновая задача забирает платежи пачками (не больше flush_size или
+    не дольше flush_interval), сериализует их и пишет в поток одним
+    вызовом в пуле потоков.
+
+    Если очередь заполнена, log_transaction ждёт освобождения места —
+    так медленный потребитель stdout замедляет запросы, а не съедает память.
+
+    С sink пачки пишутся не в поток, а в синхронный логгер транзакций
+    (например, FileTransactionLoggerAdapter) одним вызовом log_transactions;
+    история платежа тогда читается из него.
+    """
+
+    def __init__(
+            self,
+            stream: Optional[TextIO] = None,
+            flush_size: int = 500,
+            flush_interval: float = 0.05,
+            max_queue_size: int = 10_000,
+            pretty: bool = False,
+            sink: Optional[TransactionLoggerPort] = None
+    ):
+        """
+        :param stream: Поток для записи (если None — текущий sys.stdout)
+        :param flush_size: Максимальный размер пачки за одну запись
+        :param flush_interval: Максимальное время ожидания пачки, секунды
+        :param max_queue_size: Ёмкость очереди (0 — без ограничения)
+        :param pretty: Если True — многострочный JSON
+        :param sink: Логгер, в который пишутся пачки вместо потока
+        """
+        if flush_size <= 0:
+            raise ValueError("flush_size must be positive")
+        if flush_interval < 0:
+            raise ValueError("flush_interval must be non-negative")
+
+        self._stream = stream
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._max_queue_size = max_queue_size
+        self._pretty = pretty
+        self._sink = sink
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def log_transaction(self, payment: Payment) -> None:
+        """
+        Поставить транзакцию в очередь (ждёт, если очередь заполнена).
+        """
+        queue = self._ensure_started()
+        try:
+            queue.put_nowait(payment)
+        except asyncio.QueueFull:
+            await queue.put(payment)
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        """
+        Поставить пакет транзакций в очередь (с учётом backpressure).
+        """
+        queue = self._ensure_started()
+        for payment in payments:
+            try:
+                queue.put_nowait(payment)
+            except asyncio.QueueFull:
+                await queue.put(payment)
+
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        История из sink (без платежей, ещё ждущих в очереди); поток историю не хранит.
+        """
+        if self._sink is None:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._sink.get_transactions_by_payment_id, payment_id)
+
+    async def start(self) -> None:
+        """
+        Запустить фоновую запись (иначе стартует при первом логировании).
+        """
+        self._ensure_started()
+
+    async def aclose(self) -> None:
+        """
+        Остановить фоновую запись, предварительно дописав всю очередь.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._writer is None:
+            return
+        await self._queue.put(_STOP)
+        await self._writer
+
+    @property
+    def pending(self) -> int:
+        """
+        Количество платежей, ожидающих записи.
+        """
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._closed:
+            raise RuntimeError("BufferedLoggerAdapter is closed")
+
+        if self._writer is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+            self._writer = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        stopping = False
+
+        while not stopping:
+            item = await queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self._flush_interval
+
+            while len(batch) < self._flush_size:
+                # Сначала забираем всё, что уже лежит в очереди
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await loop.run_in_executor(None, self._write_batch, batch)
+            except Exception:
+                # Ошибка записи не должна останавливать фоновую задачу
+                logger.exception("Failed to write batch of %d transactions", len(batch))
+
+    def _write_batch(self, batch: List[Payment]) -> None:
+        """
+        Сериализовать пачку и записать её одним вызовом (вне event loop).
+        """
+        if self._sink is not None:
+            self._sink.log_transactions(batch)
+            return
+        pretty = self._pretty
+        data = "\n".join(format_log_line(payment, pretty) for payment in batch) + "\n"
+        stream = self._stream if self._stream is not None else sys.stdout
+        stream.write(data)
+        stream.flush()
@@ -1,10 +1,9 @@
 from typing import List
-import json
-from datetime import datetime
 
 from ...domain.payment import Payment
 from ...domain.payment_id import PaymentId
 from ...domain.ports.transaction_logger import TransactionLoggerPort
+from .formatting import format_log_line
 
 
 class ConsoleLoggerAdapter(TransactionLoggerPort):
@@ -24,21 +23,14 @@ class ConsoleLoggerAdapter(TransactionLoggerPort):
         """
         Залогировать транзакцию в консоль.
         """
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "payment_id": payment.id.value,
-            "amount": str(payment.amount.value),
-            "currency": payment.amount.currency,
-            "status": payment.status.value,
-            "description": payment.description,
-            "customer_email": payment.customer_email,
-            "error_message": payment.error_message
-        }
-
-        if self._pretty:
-            print(json.dumps(log_entry, indent=2, ensure_ascii=False))
-        else:
-            print(json.dumps(log_entry, ensure_ascii=False))
+        print(format_log_line(payment, self._pretty))
+
+    def log_transactions(self, payments: List[Payment]) -> None:
+        """
+        Залогировать пакет транзакций одной записью в консоль.
+        """
+        if payments:
+            print("\n".join(format_log_line(payment, self._pretty) for payment in payments))
 
     def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
         """
@@ -0,0 +1,324 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.amount import Amount
+from ...domain.payment_status import PaymentStatus
+from ...domain.ports.transaction_logger import TransactionLoggerPort
+from ..serialization import dumps, loads
+
+# Упаковка адреса записи в одно целое: [сегмент | смещение (40 бит) | длина (24 бита)]
+_LENGTH_BITS = 24
+_OFFSET_BITS = 40
+_LENGTH_MASK = (1 << _LENGTH_BITS) - 1
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+_STATUSES = {status.value: status for status in PaymentStatus}
+
+
+def _pack(segment: int, offset: int, length: int) -> int:
+    return (segment << (_OFFSET_BITS + _LENGTH_BITS)) | (offset << _LENGTH_BITS) | length
+
+
+def _unpack(location: int):
+    return (
+        location >> (_OFFSET_BITS + _LENGTH_BITS),
+        (location >> _LENGTH_BITS) & _OFFSET_MASK,
+        location & _LENGTH_MASK,
+    )
+
+
+def _encode(payment: Payment) -> bytes:
+    """
+    Компактная запись платежа: JSON-строка с короткими ключами.
+
+    Суммы пишутся целыми числами минорных единиц: "n" — сумма платежа,
+    "r" — сумма возвратов (в валюте платежа), "sn"/"sc" — сумма и валюта
+    расчётов. Необязательные поля пишутся, только если заданы.
+    """
+    record = {
+        "i": payment.id.value,
+        "n": payment.amount.minor,
+        "c": payment.amount.currency,
+        "s": payment.status.value,
+        "t": payment.created_at.isoformat(),
+    }
+    if payment.description is not None:
+        record["d"] = payment.description
+    if payment.customer_email is not None:
+        record["e"] = payment.customer_email
+    if payment.error_message is not None:
+        record["m"] = payment.error_message
+    if payment.refunded_amount is not None:
+        record["r"] = payment.refunded_amount.minor
+    if payment.expires_at is not None:
+        record["x"] = payment.expires_at.isoformat()
+    if payment.settlement_amount is not None:
+        record["sn"] = payment.settlement_amount.minor
+        record["sc"] = payment.settlement_amount.currency
+    return dumps(record) + b"\n"
+
+
+def _decode(line: bytes) -> Payment:
+    # Данные провалидированы при записи — создаём объекты без повторных проверок
+    record = loads(line)
+    refunded = record.get("r")
+    expires_at = record.get("x")
+    settlement = record.get("sn")
+    return Payment(
+        id=PaymentId.trusted(record["i"]),
+        amount=Amount.trusted_minor(record["n"], record["c"]),
+        status=_STATUSES[record["s"]],
+        created_at=datetime.fromisoformat(record["t"]),
+        description=record.get("d"),
+        customer_email=record.get("e"),
+        error_message=record.get("m"),
+        refunded_amount=Amount.trusted_minor(refunded, record["c"]) if refunded is not None else None,
+        expires_at=datetime.fromisoformat(expires_at) if expires_at is not None else None,
+        settlement_amount=Amount.trusted_minor(settlement, record["sc"]) if settlement is not None else None,
+    )
+
+
+class FileTransactionLoggerAdapter(TransactionLoggerPort):
+    """
+    Адаптер, сохраняющий транзакции в append-only файлы на диске.
+
+    Записи дописываются в сегменты segment-NNNNNNNN.log, рядом ведётся
+    индекс segment-NNNNNNNN.idx (смещение, длина, payment_id).
+    В памяти хранится словарь payment_id → адреса записей, поэтому
+    история платежа читается точечными чтениями без сканирования файлов.
+
+    При старте индекс загружается из .idx; хвост последнего сегмента,
+    не попавший в индекс (например, после аварийной остановки), доиндексируется.
+    """
+
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            max_segment_bytes: int = 64 * 1024 * 1024,
+            fsync: bool = False
+    ):
+        """
+        :param directory: Каталог для сегментов и индексов
+        :param max_segment_bytes: Размер сегмента, после которого начинается новый
+        :param fsync: Если True — fsync после каждой записи (надёжнее, но медленнее)
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_segment_bytes = max_segment_bytes
+        self._fsync = fsync
+        self._lock = threading.Lock()
+
+        # payment_id → адрес записи (int) или список адресов, если записей несколько
+        self._index: Dict[str, Union[int, List[int]]] = {}
+        self._readers: Dict[int, BinaryIO] = {}
+
+        self._segment = 0
+        self._offset = 0
+        self._log_file: Optional[BinaryIO] = None
+        self._idx_file: Optional[BinaryIO] = None
+        self._dirty = False
+
+        self._load()
+
+    def log_transaction(self, payment: Payment) -> None:
+        """
+        Дописать транзакцию в текущий сегмент и обновить индекс.
+        """
+        with self._lock:
+            self._append(payment)
+            self._commit()
+
+    def log_transactions(self, payments: List[Payment]) -> None:
+        """
+        Дописать пакет транзакций одной серией записей.
+        """
+        with self._lock:
+            for payment in payments:
+                self._append(payment)
+            self._commit()
+
+    def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Получить историю транзакций по ID точечными чтениями по индексу.
+        """
+        locations = self._index.get(payment_id.value)
+        if locations is None:
+            return []
+        if isinstance(locations, int):
+            locations = [locations]
+
+        with self._lock:
+            if self._dirty:
+                self._log_file.flush()
+                self._dirty = False
+            return [_decode(self._read(location)) for location in locations]
+
+    def __len__(self) -> int:
+        """
+        Количество проиндексированных платежей.
+        """
+        return len(self._index)
+
+    def close(self) -> None:
+        """
+        Сбросить буферы и закрыть файлы.
+        """
+        with self._lock:
+            for file in (self._log_file, self._idx_file, *self._readers.values()):
+                if file is not None:
+                    file.close()
+            self._log_file = self._idx_file = None
+            self._readers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # === Запись ===
+
+    def _append(self, payment: Payment) -> None:
+        if self._offset >= self._max_segment_bytes:
+            self._open_segment(self._segment + 1)
+
+        data = _encode(payment)
+        key = payment.id.value
+        location = _pack(self._segment, self._offset, len(data))
+
+        self._log_file.write(data)
+        self._idx_file.write(f"{self._offset} {len(data)} {json.dumps(key)}\n".encode("utf-8"))
+        self._offset += len(data)
+        self._add_to_index(key, location)
+
+    def _commit(self) -> None:
+        # Индекс сбрасываем после лога: запись в индексе всегда указывает на данные
+        if self._fsync:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+            self._idx_file.flush()
+            os.fsync(self._idx_file.fileno())
+        else:
+            self._dirty = True
+
+    def _add_to_index(self, key: str, location: int) -> None:
+        existing = self._index.get(key)
+        if existing is None:
+            self._index[key] = location
+        elif isinstance(existing, int):
+            self._index[key] = [existing, location]
+        else:
+            existing.append(location)
+
+    def _open_segment(self, segment: int) -> None:
+        for file in (self._log_file, self._idx_file):
+            if file is not None:
+                file.close()
+        self._segment = segment
+        self._log_file = open(self._log_path(segment), "ab")
+        self._idx_file = open(self._idx_path(segment), "ab")
+        self._offset = self._log_file.tell()
+
+    # === Чтение ===
+
+    def _read(self, location: int) -> bytes:
+        segment, offset, length = _unpack(location)
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = open(self._log_path(segment), "rb")
+            self._readers[segment] = reader
+        reader.seek(offset)
+        return reader.read(length)
+
+    # === Восстановление при старте ===
+
+    def _load(self) -> None:
+        segments = sorted(
+            int(path.stem.split("-")[1]) for path in self._directory.glob("segment-*.log")
+        )
+        for segment in segments[:-1]:
+            self._load_index(segment)
+        if segments:
+            self._recover_last_segment(segments[-1])
+
+        self._open_segment(segments[-1] if segments else 1)
+
+    def _load_index(self, segment: int, log_size: Optional[int] = None):
+        """
+        Загрузить индекс сегмента.
+
+        :param log_size: Если задан — записи за пределами лога игнорируются
+        :return: (конец последней проиндексированной записи, индекс цел и полон)
+        """
+        indexed_end = 0
+        path = self._idx_path(segment)
+        if not path.exists():
+            return indexed_end, False
+
+        with open(path, "rb") as idx:
+            for line in idx:
+                if not line.endswith(b"\n"):
+                    return indexed_end, False  # Недописанная строка индекса
+                offset, length, key = line.decode("utf-8").split(" ", 2)
+                offset, length = int(offset), int(length)
+                if log_size is not None and offset + length > log_size:
+                    return indexed_end, False  # Индекс опередил лог
+                self._add_to_index(json.loads(key), _pack(segment, offset, length))
+                indexed_end = offset + length
+        return indexed_end, True
+
+    def _recover_last_segment(self, segment: int) -> None:
+        """
+        Загрузить индекс последнего сегмента, доиндексировать записи,
+        отсутствующие в .idx, и обрезать недописанную последнюю запись.
+        """
+        log_path = self._log_path(segment)
+        log_size = log_path.stat().st_size
+        indexed_end, clean = self._load_index(segment, log_size)
+
+        idx_lines = []
+        offset = indexed_end
+        with open(log_path, "rb") as log:
+            log.seek(offset)
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break
+                key = json.loads(line)["i"]
+                self._add_to_index(key, _pack(segment, offset, len(line)))
+                idx_lines.append(f"{offset} {len(line)} {json.dumps(key)}\n")
+                offset += len(line)
+
+        if offset < log_size:
+            os.truncate(log_path, offset)
+
+        if idx_lines or not clean:
+            self._rewrite_index(segment)
+
+    def _rewrite_index(self, segment: int) -> None:
+        """
+        Переписать индекс сегмента по текущему состоянию индекса в памяти.
+        """
+        entries = []
+        for key, locations in self._index.items():
+            for location in (locations if isinstance(locations, list) else [locations]):
+                loc_segment, offset, length = _unpack(location)
+                if loc_segment == segment:
+                    entries.append((offset, length, key))
+        entries.sort()
+
+        with open(self._idx_path(segment), "wb") as idx:
+            idx.write("".join(
+                f"{offset} {length} {json.dumps(key)}\n" for offset, length, key in entries
+            ).encode("utf-8"))
+
+    def _log_path(self, segment: int) -> Path:
+        return self._directory / f"segment-{segment:08d}.log"
+
+    def _idx_path(self, segment: int) -> Path:
+        return self._directory / f"segment-{segment:08d}.idx"
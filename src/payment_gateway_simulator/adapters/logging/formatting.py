@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from ...domain.payment import Payment
+from ..serialization import dumps
+
+
+def format_log_line(payment: Payment, pretty: bool = False) -> str:
+    """
+    Сформировать JSON-строку лога для платежа.
+
+    Общий формат для всех логгеров, пишущих в поток; кодирование —
+    общим кодировщиком (orjson, если установлен).
+
+    :param payment: Платёж для логирования
+    :param pretty: Если True — многострочный JSON с отступами
+    """
+    log_entry = {
+        "timestamp": datetime.now().isoformat(),
+        "payment_id": payment.id.value,
+        "amount": str(payment.amount.value),
+        "amount_minor": payment.amount.minor,
+        "currency": payment.amount.currency,
+        "status": payment.status.value,
+        "description": payment.description,
+        "customer_email": payment.customer_email,
+        "error_message": payment.error_message
+    }
+
+    return dumps(log_entry, pretty).decode("utf-8")
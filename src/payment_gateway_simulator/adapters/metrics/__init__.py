@@ -0,0 +1,20 @@
+from .registry import MetricsRegistry, Counter, Histogram, DEFAULT_BUCKETS
+from .instrumented import (
+    PaymentMetrics,
+    InstrumentedPaymentProcessor,
+    AsyncInstrumentedPaymentProcessor,
+    InstrumentedTransactionLogger,
+    AsyncInstrumentedTransactionLogger,
+)
+
+__all__ = [
+    "MetricsRegistry",
+    "Counter",
+    "Histogram",
+    "DEFAULT_BUCKETS",
+    "PaymentMetrics",
+    "InstrumentedPaymentProcessor",
+    "AsyncInstrumentedPaymentProcessor",
+    "InstrumentedTransactionLogger",
+    "AsyncInstrumentedTransactionLogger",
+]
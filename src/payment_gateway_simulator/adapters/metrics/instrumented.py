@@ -0,0 +1,418 @@
+"""
+Декораторы портов, снимающие метрики вызовов.
+
+Оборачивают любой адаптер платежей или логгера: считают вызовы по статусу
+и валюте, ошибки — по классу исключения, и пишут задержку в гистограмму.
+"""
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from ...domain import (
+    Amount,
+    Payment,
+    PaymentId,
+    PaymentCommand,
+    BatchItemOutcome,
+    PaymentQuery,
+    PaymentPage,
+    PaymentProcessorPort,
+    TransactionLoggerPort,
+    AsyncPaymentProcessorPort,
+    AsyncTransactionLoggerPort,
+)
+from .registry import MetricsRegistry
+
+_clock = time.perf_counter
+
+# Статус для get_payment, когда платёж не найден
+NOT_FOUND = "NOT_FOUND"
+
+
+class PaymentMetrics:
+    """
+    Метрики платёжных операций.
+
+    - pgs_operations_total{operation,status,currency} — платежи по результату
+    - pgs_operation_errors_total{operation,exception} — исключения
+    - pgs_operation_duration_seconds{operation} — длительность вызова
+    - pgs_validation_errors_total{field,type} — ошибки валидации запросов
+    - pgs_use_case_seconds{use_case,clock} — время сценариев (TimingInterceptor)
+    - pgs_rejected_requests_total{reason} — запросы, отклонённые до обработки
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.operations = registry.counter(
+            "pgs_operations_total",
+            "Payments handled by operation, status and currency",
+            ("operation", "status", "currency")
+        )
+        self.errors = registry.counter(
+            "pgs_operation_errors_total",
+            "Operations that raised, by exception class",
+            ("operation", "exception")
+        )
+        self.duration = registry.histogram(
+            "pgs_operation_duration_seconds",
+            "Operation latency in seconds",
+            ("operation",)
+        )
+        self.validation_errors = registry.counter(
+            "pgs_validation_errors_total",
+            "Request validation errors by field and error type",
+            ("field", "type")
+        )
+        self.use_case_duration = registry.histogram(
+            "pgs_use_case_seconds",
+            "Use case execute time, wall and thread CPU",
+            ("use_case", "clock")
+        )
+        self.rejected_requests = registry.counter(
+            "pgs_rejected_requests_total",
+            "Requests shed before processing, by reason",
+            ("reason",)
+        )
+
+    def record_payment(self, operation: str, payment: Optional[Payment], started: float) -> None:
+        """
+        Учесть успешный вызов, вернувший платёж (или None)
+
+        :param started: Значение _clock() перед вызовом
+        """
+        self.duration.observe((operation,), _clock() - started)
+        if payment is None:
+            self.operations.inc((operation, NOT_FOUND, ""))
+        else:
+            # _value_ вместо value: свойство Enum.value заметно дороже на горячем пути
+            self.operations.inc((operation, payment.status._value_, payment.amount.currency))
+
+    def record_payments(self, operation: str, outcomes: List[BatchItemOutcome], started: float) -> None:
+        """
+        Учесть пакетный вызов: платежи по статусу, отказы по классу ошибки
+        """
+        self.duration.observe((operation,), _clock() - started)
+        inc_operation, inc_error = self.operations.inc, self.errors.inc
+        for outcome in outcomes:
+            if isinstance(outcome, Payment):
+                inc_operation((operation, outcome.status._value_, outcome.amount.currency))
+            else:
+                inc_error((operation, type(outcome).__name__))
+
+    def record_error(self, operation: str, error: BaseException, started: float) -> None:
+        """
+        Учесть вызов, завершившийся исключением
+        """
+        self.duration.observe((operation,), _clock() - started)
+        self.errors.inc((operation, type(error).__name__))
+
+    def record_use_case(self, use_case: str, wall: float, cpu: float) -> None:
+        """
+        Учесть замер сценария (совместимо с sink у TimingInterceptor)
+        """
+        self.use_case_duration.observe((use_case, "wall"), wall)
+        self.use_case_duration.observe((use_case, "cpu"), cpu)
+
+    def record_validation_errors(self, errors: List[dict]) -> None:
+        """
+        Учесть ошибки валидации Pydantic (формат RequestValidationError.errors())
+        """
+        for error in errors:
+            location = error.get("loc") or ("",)
+            self.validation_errors.inc((str(location[-1]), error.get("type", "")))
+
+    def record_rejection(self, reason: str) -> None:
+        """
+        Учесть запрос, отклонённый лимитом или контролем допуска
+        """
+        self.rejected_requests.inc((reason,))
+
+
+class InstrumentedPaymentProcessor(PaymentProcessorPort):
+    """
+    Декоратор PaymentProcessorPort с метриками
+    """
+
+    def __init__(self, inner: PaymentProcessorPort, metrics: PaymentMetrics):
+        self._inner = inner
+        self._metrics = metrics
+
+    def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        started = _clock()
+        try:
+            payment = self._inner.process_payment(
+                payment_id, amount, description, customer_email, meta, decline_reason, settlement_amount
+            )
+        except Exception as e:
+            self._metrics.record_error("process_payment", e, started)
+            raise
+        self._metrics.record_payment("process_payment", payment, started)
+        return payment
+
+    def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        started = _clock()
+        try:
+            payment = self._inner.refund_payment(payment_id, amount, reason)
+        except Exception as e:
+            self._metrics.record_error("refund_payment", e, started)
+            raise
+        self._metrics.record_payment("refund_payment", payment, started)
+        return payment
+
+    def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        started = _clock()
+        try:
+            payment = self._inner.authorize_payment(
+                payment_id, amount, expires_at, description, customer_email, meta, decline_reason, settlement_amount
+            )
+        except Exception as e:
+            self._metrics.record_error("authorize_payment", e, started)
+            raise
+        self._metrics.record_payment("authorize_payment", payment, started)
+        return payment
+
+    def capture_payment(self, payment_id: PaymentId) -> Payment:
+        started = _clock()
+        try:
+            payment = self._inner.capture_payment(payment_id)
+        except Exception as e:
+            self._metrics.record_error("capture_payment", e, started)
+            raise
+        self._metrics.record_payment("capture_payment", payment, started)
+        return payment
+
+    def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        started = _clock()
+        try:
+            payment = self._inner.void_payment(payment_id, reason)
+        except Exception as e:
+            self._metrics.record_error("void_payment", e, started)
+            raise
+        self._metrics.record_payment("void_payment", payment, started)
+        return payment
+
+    def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        started = _clock()
+        try:
+            payment = self._inner.get_payment(payment_id)
+        except Exception as e:
+            self._metrics.record_error("get_payment", e, started)
+            raise
+        self._metrics.record_payment("get_payment", payment, started)
+        return payment
+
+    def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return self._inner.get_refunds(payment_id)
+
+    def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        return self._inner.list_payments(query)
+
+    def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        started = _clock()
+        try:
+            outcomes = self._inner.process_payments(commands)
+        except Exception as e:
+            self._metrics.record_error("process_payments", e, started)
+            raise
+        self._metrics.record_payments("process_payments", outcomes, started)
+        return outcomes
+
+
+class AsyncInstrumentedPaymentProcessor(AsyncPaymentProcessorPort):
+    """
+    Декоратор AsyncPaymentProcessorPort с метриками
+    """
+
+    def __init__(self, inner: AsyncPaymentProcessorPort, metrics: PaymentMetrics):
+        self._inner = inner
+        self._metrics = metrics
+
+    async def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        started = _clock()
+        try:
+            payment = await self._inner.process_payment(
+                payment_id, amount, description, customer_email, meta, decline_reason, settlement_amount
+            )
+        except Exception as e:
+            self._metrics.record_error("process_payment", e, started)
+            raise
+        self._metrics.record_payment("process_payment", payment, started)
+        return payment
+
+    async def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        started = _clock()
+        try:
+            payment = await self._inner.refund_payment(payment_id, amount, reason)
+        except Exception as e:
+            self._metrics.record_error("refund_payment", e, started)
+            raise
+        self._metrics.record_payment("refund_payment", payment, started)
+        return payment
+
+    async def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        started = _clock()
+        try:
+            payment = await self._inner.authorize_payment(
+                payment_id, amount, expires_at, description, customer_email, meta, decline_reason, settlement_amount
+            )
+        except Exception as e:
+            self._metrics.record_error("authorize_payment", e, started)
+            raise
+        self._metrics.record_payment("authorize_payment", payment, started)
+        return payment
+
+    async def capture_payment(self, payment_id: PaymentId) -> Payment:
+        started = _clock()
+        try:
+            payment = await self._inner.capture_payment(payment_id)
+        except Exception as e:
+            self._metrics.record_error("capture_payment", e, started)
+            raise
+        self._metrics.record_payment("capture_payment", payment, started)
+        return payment
+
+    async def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        started = _clock()
+        try:
+            payment = await self._inner.void_payment(payment_id, reason)
+        except Exception as e:
+            self._metrics.record_error("void_payment", e, started)
+            raise
+        self._metrics.record_payment("void_payment", payment, started)
+        return payment
+
+    async def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        started = _clock()
+        try:
+            payment = await self._inner.get_payment(payment_id)
+        except Exception as e:
+            self._metrics.record_error("get_payment", e, started)
+            raise
+        self._metrics.record_payment("get_payment", payment, started)
+        return payment
+
+    async def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._inner.get_refunds(payment_id)
+
+    async def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        return await self._inner.list_payments(query)
+
+    async def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        started = _clock()
+        try:
+            outcomes = await self._inner.process_payments(commands)
+        except Exception as e:
+            self._metrics.record_error("process_payments", e, started)
+            raise
+        self._metrics.record_payments("process_payments", outcomes, started)
+        return outcomes
+
+
+class InstrumentedTransactionLogger(TransactionLoggerPort):
+    """
+    Декоратор TransactionLoggerPort с метриками
+    """
+
+    def __init__(self, inner: TransactionLoggerPort, metrics: PaymentMetrics):
+        self._inner = inner
+        self._metrics = metrics
+
+    def log_transaction(self, payment: Payment) -> None:
+        started = _clock()
+        try:
+            self._inner.log_transaction(payment)
+        except Exception as e:
+            self._metrics.record_error("log_transaction", e, started)
+            raise
+        self._metrics.record_payment("log_transaction", payment, started)
+
+    def log_transactions(self, payments: List[Payment]) -> None:
+        started = _clock()
+        try:
+            self._inner.log_transactions(payments)
+        except Exception as e:
+            self._metrics.record_error("log_transactions", e, started)
+            raise
+        self._metrics.record_payments("log_transactions", payments, started)
+
+    def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return self._inner.get_transactions_by_payment_id(payment_id)
+
+
+class AsyncInstrumentedTransactionLogger(AsyncTransactionLoggerPort):
+    """
+    Декоратор AsyncTransactionLoggerPort с метриками
+    """
+
+    def __init__(self, inner: AsyncTransactionLoggerPort, metrics: PaymentMetrics):
+        self._inner = inner
+        self._metrics = metrics
+
+    async def log_transaction(self, payment: Payment) -> None:
+        started = _clock()
+        try:
+            await self._inner.log_transaction(payment)
+        except Exception as e:
+            self._metrics.record_error("log_transaction", e, started)
+            raise
+        self._metrics.record_payment("log_transaction", payment, started)
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        started = _clock()
+        try:
+            await self._inner.log_transactions(payments)
+        except Exception as e:
+            self._metrics.record_error("log_transactions", e, started)
+            raise
+        self._metrics.record_payments("log_transactions", payments, started)
+
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._inner.get_transactions_by_payment_id(payment_id)
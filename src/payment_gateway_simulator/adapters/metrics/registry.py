@@ -0,0 +1,209 @@
+"""
+Метрики в формате Prometheus с агрегацией по потокам.
+
+Каждый поток пишет в собственный словарь ячеек, поэтому на горячем пути
+нет блокировок: блокировка берётся один раз при первом обращении потока
+и при сборе метрик (/metrics), который суммирует ячейки всех потоков.
+Под GIL запись в словарь одного потока не конфликтует с чтением при сборе.
+"""
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+# Границы корзин гистограммы задержек по умолчанию, в секундах
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _PerThreadMetric:
+    """
+    Общая часть метрик: ячейки по потокам и их регистрация.
+    """
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread_cells: List[dict] = []
+
+    def _cells(self) -> dict:
+        """
+        Словарь ячеек текущего потока (создаётся при первом обращении)
+        """
+        try:
+            return self._local.cells
+        except AttributeError:
+            cells: dict = {}
+            with self._lock:
+                self._thread_cells.append(cells)
+            self._local.cells = cells
+            return cells
+
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            return [dict(cells) for cells in self._thread_cells]
+
+
+class Counter(_PerThreadMetric):
+    """
+    Монотонный счётчик с метками
+    """
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """
+        Увеличить счётчик.
+
+        :param labels: Значения меток в порядке labelnames
+        """
+        try:
+            cells = self._local.cells
+        except AttributeError:
+            cells = self._cells()
+        cells[labels] = cells.get(labels, 0) + amount
+
+    def collect(self) -> Dict[Labels, float]:
+        """
+        Суммарные значения по всем потокам
+        """
+        totals: Dict[Labels, float] = {}
+        for cells in self._snapshot():
+            for labels, value in cells.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram(_PerThreadMetric):
+    """
+    Гистограмма с фиксированными корзинами.
+
+    Ячейка потока — список [счётчики корзин..., счётчик +Inf, сумма];
+    кумулятивные значения считаются только при сборе.
+    """
+    kind = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            help: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._width = len(self.buckets) + 2
+
+    def observe(self, labels: Labels, value: float) -> None:
+        """
+        Записать наблюдение.
+
+        :param labels: Значения меток в порядке labelnames
+        """
+        try:
+            cell = self._local.cells[labels]
+        except (AttributeError, KeyError):
+            cell = self._cells().setdefault(labels, [0] * self._width)
+        # bisect_left: значение на границе попадает в корзину le=границе
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            return [{labels: list(cell) for labels, cell in cells.items()} for cells in self._thread_cells]
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        """
+        Суммарные (некумулятивные) значения ячеек по всем потокам
+        """
+        totals: Dict[Labels, List[float]] = {}
+        for cells in self._snapshot():
+            for labels, cell in cells.items():
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = cell
+                else:
+                    for i, value in enumerate(cell):
+                        total[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = []
+        bounds = self.buckets + (float("inf"),)
+        for labels, cell in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(bounds, cell):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(float(cell[-1]))}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Набор метрик процесса и их вывод в текстовом формате Prometheus
+    """
+
+    def __init__(self):
+        self._metrics: List[_PerThreadMetric] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+            self,
+            name: str,
+            help: str,
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        if any(existing.name == metric.name for existing in self._metrics):
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Текст для эндпоинта /metrics (text/plain; version=0.0.4)
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -1,5 +1,36 @@
+from .sharded_store import ShardedPaymentStore
+from .simulation import (
+    PaymentSimulator,
+    SimulationConfig,
+    DeclineRule,
+    LatencyModel,
+    OutageWindow,
+)
 from .in_memory import InMemoryPaymentAdapter
+from .async_in_memory import AsyncInMemoryPaymentAdapter
+from .simulated import AsyncSimulatedPaymentAdapter
+from .sqlite import SqlitePaymentAdapter, AsyncSqlitePaymentAdapter
+from .shared import (
+    SharedPaymentAdapter,
+    AsyncSharedPaymentAdapter,
+    serve_store,
+    start_store_server,
+)
 
 __all__ = [
-    "InMemoryPaymentAdapter"
+    "ShardedPaymentStore",
+    "PaymentSimulator",
+    "SimulationConfig",
+    "DeclineRule",
+    "LatencyModel",
+    "OutageWindow",
+    "InMemoryPaymentAdapter",
+    "AsyncInMemoryPaymentAdapter",
+    "AsyncSimulatedPaymentAdapter",
+    "SqlitePaymentAdapter",
+    "AsyncSqlitePaymentAdapter",
+    "SharedPaymentAdapter",
+    "AsyncSharedPaymentAdapter",
+    "serve_store",
+    "start_store_server",
 ]
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import List, Optional
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.amount import Amount
+from ...domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ...domain.ports.payment_processor import PaymentCommand, BatchItemOutcome, PaymentQuery, PaymentPage
+from .in_memory import InMemoryPaymentAdapter
+
+
+class AsyncInMemoryPaymentAdapter(AsyncPaymentProcessorPort):
+    """
+    Асинхронный адаптер для обработки платежей в памяти.
+
+    Операции над словарём не блокируют, поэтому вызовы идут напрямую
+    в InMemoryPaymentAdapter — без пула потоков. Задержки шлюза
+    добавляет AsyncSimulatedPaymentAdapter поверх любого хранилища.
+    """
+
+    def __init__(self, store: Optional[InMemoryPaymentAdapter] = None):
+        """
+        :param store: Синхронное хранилище (если None — создаётся новое)
+        """
+        self._store = store if store is not None else InMemoryPaymentAdapter()
+
+    async def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return self._store.process_payment(
+            payment_id=payment_id,
+            amount=amount,
+            description=description,
+            customer_email=customer_email,
+            meta=meta,
+            decline_reason=decline_reason,
+            settlement_amount=settlement_amount
+        )
+
+    async def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        return self._store.process_payments(commands)
+
+    async def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return self._store.authorize_payment(
+            payment_id=payment_id,
+            amount=amount,
+            expires_at=expires_at,
+            description=description,
+            customer_email=customer_email,
+            meta=meta,
+            decline_reason=decline_reason,
+            settlement_amount=settlement_amount
+        )
+
+    async def capture_payment(self, payment_id: PaymentId) -> Payment:
+        return self._store.capture_payment(payment_id)
+
+    async def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        return self._store.void_payment(payment_id, reason)
+
+    async def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        return self._store.get_payment(payment_id)
+
+    async def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        return self._store.refund_payment(payment_id=payment_id, amount=amount, reason=reason)
+
+    async def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return self._store.get_refunds(payment_id)
+
+    async def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        return self._store.list_payments(query)
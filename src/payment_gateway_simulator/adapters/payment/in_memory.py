@@ -1,25 +1,60 @@
-from typing import Optional, Dict
+from typing import Dict, Optional, List
 from datetime import datetime
 
 from ...domain.payment import Payment
 from ...domain.payment_id import PaymentId
 from ...domain.amount import Amount
 from ...domain.payment_status import PaymentStatus
-from ...domain.ports.payment_processor import PaymentProcessorPort
-from ...domain.exceptions import PaymentProcessingError
+from ...domain.ports.payment_processor import (
+    PaymentProcessorPort,
+    PaymentCommand,
+    BatchItemOutcome,
+    PaymentQuery,
+    PaymentPage,
+)
+from ...domain.exceptions import PaymentAlreadyExistsError, PaymentNotFoundError
+from .sharded_store import ShardedPaymentStore
+from .payment_index import PaymentIndex
+from .simulation import PaymentSimulator
 
 
 class InMemoryPaymentAdapter(PaymentProcessorPort):
     """
     Простой адаптер для обработки платежей в памяти.
 
-    Хранит все платежи в словаре Python.
+    Хранит все платежи в шардированном потокобезопасном хранилище:
+    проверка дубликата и вставка — одна атомарная операция.
     Не сохраняет данные между перезапусками.
+
+    С симулятором часть платежей отклоняется (статус FAILED и error_message)
+    по правилам отказов и окнам недоступности.
+
+    Выборки (list_payments) идут по вторичным индексам PaymentIndex,
+    которые обновляются при каждой записи.
     """
 
-    def __init__(self):
+    def __init__(
+            self,
+            store: Optional[ShardedPaymentStore] = None,
+            simulator: Optional[PaymentSimulator] = None
+    ):
+        """
+        :param store: Хранилище платежей (если None — создаётся новое)
+        :param simulator: Симулятор отказов (если None — все платежи успешны)
+        """
         # Внутреннее хранилище платежей: {payment_id.value: Payment}
-        self._payments: Dict[str, Payment] = {}
+        self._payments = store if store is not None else ShardedPaymentStore()
+        self._simulator = simulator
+        # Журнал возвратов: {payment_id.value: [записи о возвратах по порядку]}
+        self._refunds: Dict[str, List[Payment]] = {}
+        # Индексы по статусу, валюте, email и времени; платежи переданного
+        # хранилища индексируются сразу
+        self._index = PaymentIndex()
+        self._index.add_many(list(self._payments.values()))
+
+    @property
+    def simulator(self) -> Optional[PaymentSimulator]:
+        return self._simulator
 
     def process_payment(
             self,
@@ -27,38 +62,175 @@ class InMemoryPaymentAdapter(PaymentProcessorPort):
             amount: Amount,
             description: Optional[str] = None,
             customer_email: Optional[str] = None,
-            meta: Optional[dict] = None
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
     ) -> Payment:
         """
         Обработать платёж в памяти.
 
-        Всегда успешен (для демо). В реальных адаптерах здесь будет:
+        Без симулятора всегда успешен. В реальных адаптерах здесь будет:
         - Вызов внешнего API (Stripe, PayPal)
         - Обработка ошибок сети
-        - Симуляция отказов (через параметр fail_rate)
+        Отказы симулируются через PaymentSimulator (правила и fail_rate).
+        С decline_reason платёж сохраняется отклонённым без симулятора.
         """
-        # Проверка: платёж с таким ID уже существует?
-        if payment_id.value in self._payments:
-            raise PaymentProcessingError(
+        payment = self._new_payment(
+            payment_id, amount, description, customer_email, datetime.now(),
+            decline_reason=decline_reason, settlement_amount=settlement_amount
+        )
+
+        # Сохраняем, если платежа с таким ID ещё нет (атомарно)
+        if not self._payments.insert_if_absent(payment_id.value, payment):
+            raise PaymentAlreadyExistsError(
                 f"Payment with id={payment_id.value} already exists",
                 payment_id=payment_id.value
             )
 
-        # Создаём успешный платёж
-        payment = Payment(
-            id=payment_id,
-            amount=amount,
-            status=PaymentStatus.SUCCEEDED,
-            created_at=datetime.now(),
-            description=description,
-            customer_email=customer_email
+        self._index.add(payment)
+        return payment
+
+    def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Авторизовать платёж в памяти: PENDING до expires_at
+        (или FAILED, если отклонён до шлюза или симулятором).
+        """
+        payment = self._new_payment(
+            payment_id, amount, description, customer_email, datetime.now(), expires_at,
+            decline_reason=decline_reason, settlement_amount=settlement_amount
         )
 
-        # Сохраняем в "хранилище"
-        self._payments[payment_id.value] = payment
+        if not self._payments.insert_if_absent(payment_id.value, payment):
+            raise PaymentAlreadyExistsError(
+                f"Payment with id={payment_id.value} already exists",
+                payment_id=payment_id.value
+            )
 
+        self._index.add(payment)
         return payment
 
+    def capture_payment(self, payment_id: PaymentId) -> Payment:
+        """
+        Списать авторизацию (проверка статуса и срока — под блокировкой шарда).
+        """
+        return self._transition(payment_id, lambda payment: payment.capture(), "capture")
+
+    def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        """
+        Отменить авторизацию (под блокировкой шарда).
+        """
+        return self._transition(payment_id, lambda payment: payment.void(reason), "void")
+
+    def _transition(self, payment_id: PaymentId, apply, action: str) -> Payment:
+        """
+        Атомарно перевести платёж в новый статус через доменный метод apply.
+        """
+        def update(payment: Payment) -> Payment:
+            updated = apply(payment)
+            self._index.update_status(payment, updated)
+            return updated
+
+        updated = self._payments.update(payment_id.value, update)
+        if updated is None:
+            raise PaymentNotFoundError(
+                f"Payment with id={payment_id.value} not found for {action}",
+                payment_id=payment_id.value
+            )
+        return updated
+
+    def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        """
+        Получить платёж из памяти.
+
+        Одно чтение словаря без блокировок.
+        """
+        return self._payments.get(payment_id.value)
+
+    def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        """
+        Обработать пакет платежей в памяти.
+
+        Одна метка времени на весь пакет, блокировка каждого шарда
+        берётся один раз. Дубликаты (в том числе внутри самого пакета)
+        возвращаются как ошибки.
+        """
+        created_at = datetime.now()
+        payments = [
+            self._new_payment(
+                command.payment_id,
+                command.amount,
+                command.description,
+                command.customer_email,
+                created_at,
+                decline_reason=command.decline_reason,
+                settlement_amount=command.settlement_amount
+            )
+            for command in commands
+        ]
+
+        inserted = self._payments.insert_many_if_absent(
+            [(payment.id.value, payment) for payment in payments]
+        )
+
+        outcomes: List[BatchItemOutcome] = []
+        for payment, ok in zip(payments, inserted):
+            if ok:
+                outcomes.append(payment)
+            else:
+                outcomes.append(PaymentAlreadyExistsError(
+                    f"Payment with id={payment.id.value} already exists",
+                    payment_id=payment.id.value
+                ))
+
+        self._index.add_many([payment for payment, ok in zip(payments, inserted) if ok])
+        return outcomes
+
+    def _new_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str],
+            customer_email: Optional[str],
+            created_at: datetime,
+            expires_at: Optional[datetime] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Создать платёж: успешный (или авторизованный до expires_at)
+        либо отклонённый до шлюза (decline_reason) или симулятором.
+        """
+        error_message = decline_reason
+        if error_message is None and self._simulator is not None:
+            error_message = self._simulator.decide(payment_id.value, amount)
+
+        if error_message:
+            status, expires_at = PaymentStatus.FAILED, None
+        else:
+            status = PaymentStatus.PENDING if expires_at is not None else PaymentStatus.SUCCEEDED
+
+        return Payment(
+            id=payment_id,
+            amount=amount,
+            status=status,
+            created_at=created_at,
+            description=description,
+            customer_email=customer_email,
+            error_message=error_message,
+            expires_at=expires_at,
+            settlement_amount=settlement_amount
+        )
+
     def refund_payment(
             self,
             payment_id: PaymentId,
@@ -66,31 +238,42 @@ class InMemoryPaymentAdapter(PaymentProcessorPort):
             reason: Optional[str] = None
     ) -> Payment:
         """
-        Вернуть платёж в памяти.
+        Вернуть платёж в памяти (полностью или частично).
 
-        Для демо: всегда успешен, если платёж существует.
+        Проверка остатка и обновление платежа выполняются атомарно под
+        блокировкой шарда: одновременные возвраты не превысят сумму платежа.
+        Хранимый платёж сохраняет исходную сумму, а сумма возвратов
+        накапливается в refunded_amount.
+
+        :return: Запись о возврате (сумма возврата, статус REFUNDED)
         """
+        refunds: List[Payment] = []
+
+        def refund(original_payment: Payment) -> Payment:
+            updated, record = original_payment.refund(amount, reason)
+            # Журнал пополняется под той же блокировкой — порядок записей совпадает с порядком возвратов
+            self._refunds.setdefault(payment_id.value, []).append(record)
+            self._index.update_status(original_payment, updated)
+            refunds.append(record)
+            return updated
+
         # Проверка: платёж существует?
-        if payment_id.value not in self._payments:
-            raise PaymentProcessingError(
+        if self._payments.update(payment_id.value, refund) is None:
+            raise PaymentNotFoundError(
                 f"Payment with id={payment_id.value} not found for refund",
                 payment_id=payment_id.value
             )
 
-        original_payment = self._payments[payment_id.value]
-
-        # Создаём платёж со статусом возврата
-        refunded_payment = Payment(
-            id=original_payment.id,
-            amount=amount or original_payment.amount,  # Полный или частичный возврат
-            status=PaymentStatus.REFUNDED,
-            created_at=datetime.now(),
-            description=f"Refund: {reason or 'No reason provided'}",
-            customer_email=original_payment.customer_email,
-            error_message=None
-        )
+        return refunds[0]
 
-        # Обновляем хранилище
-        self._payments[payment_id.value] = refunded_payment
+    def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Записи о возвратах платежа в порядке проведения.
+        """
+        return list(self._refunds.get(payment_id.value, ()))
 
-        return refunded_payment
\ No newline at end of file
+    def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        """
+        Выборка по вторичным индексам (см. PaymentIndex).
+        """
+        return self._index.query(query, self._payments.get)
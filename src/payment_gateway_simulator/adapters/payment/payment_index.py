@@ -0,0 +1,289 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from ...domain.payment import Payment
+from ...domain.payment_status import PaymentStatus
+from ...domain.ports.payment_processor import PaymentCursor, PaymentPage, PaymentQuery, cursor_of
+
+# Ключ индекса — позиция платежа в порядке выборки: (created_at, payment_id)
+_Key = PaymentCursor
+
+
+class PaymentIndex:
+    """
+    Вторичные индексы платежей для выборок по фильтрам.
+
+    Для каждого значения статуса, валюты и email хранится отсортированный
+    по (created_at, payment_id) набор ключей, плюс общий набор по времени.
+    Индексы обновляются при записи: новый платёж — вставка во все наборы
+    (обычно в конец, платежи приходят по времени), смена статуса — перенос
+    ключа между наборами статусов. Набор разбит на блоки (_SortedKeys),
+    поэтому вставка и удаление в середине не сдвигают весь список.
+
+    Индекс разбит на шарды по хэшу payment_id, как ShardedPaymentStore:
+    у каждого шарда свои наборы и своя блокировка, записи в разные шарды
+    не конкурируют.
+
+    Выборка берёт в каждом шарде самый короткий из подходящих наборов,
+    находит начало диапазона бинарным поиском, сливает куски шардов по
+    порядку и проверяет остальные фильтры по самому платежу — без
+    перебора всего хранилища.
+    """
+
+    def __init__(self, shards: int = 8):
+        """
+        :param shards: Количество шардов (округляется вверх до степени двойки)
+        """
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+
+        size = 1
+        while size < shards:
+            size <<= 1
+
+        self._mask = size - 1
+        self._shards: List[_IndexShard] = [_IndexShard() for _ in range(size)]
+
+    def __len__(self) -> int:
+        return sum(len(shard.by_time) for shard in self._shards)
+
+    def add(self, payment: Payment) -> None:
+        """
+        Добавить новый платёж во все индексы.
+        """
+        shard = self._shards[hash(payment.id.value) & self._mask]
+        with shard.lock:
+            shard.add(payment)
+
+    def add_many(self, payments: List[Payment]) -> None:
+        """
+        Добавить пачку новых платежей, захватывая блокировку каждого шарда один раз.
+        """
+        mask = self._mask
+        by_shard: Dict[int, List[Payment]] = {}
+        for payment in payments:
+            by_shard.setdefault(hash(payment.id.value) & mask, []).append(payment)
+
+        for index, items in by_shard.items():
+            shard = self._shards[index]
+            with shard.lock:
+                for payment in items:
+                    shard.add(payment)
+
+    def update_status(self, before: Payment, after: Payment) -> None:
+        """
+        Перенести платёж в индекс нового статуса (остальные поля не меняются).
+        """
+        if before.status is after.status:
+            return
+        key = cursor_of(before)
+        shard = self._shards[hash(key[1]) & self._mask]
+        with shard.lock:
+            keys = shard.by_status.get(before.status)
+            if keys is not None:
+                keys.discard(key)
+            shard.by_status.setdefault(after.status, _SortedKeys()).add(key)
+
+    def query(self, query: PaymentQuery, load: Callable[[str], Optional[Payment]]) -> PaymentPage:
+        """
+        Выполнить выборку.
+
+        :param query: Фильтры, курсор и размер страницы
+        :param load: Чтение платежа по payment_id из хранилища
+        :return: Страница платежей по возрастанию (created_at, payment_id)
+        """
+        items: List[Payment] = []
+        limit = query.limit
+        # Ключи равномерно распределены по шардам: из каждого нужна лишь доля страницы
+        per_shard = max(2 * (limit + 1) // len(self._shards) + 1, _MIN_CHUNK)
+        high = (query.created_to,) if query.created_to is not None else None
+        after = query.after
+        while True:
+            # Куски ключей копируются под блокировкой своего шарда, платежи
+            # проверяются без неё. Начало каждого куска ищется заново от
+            # последнего ключа — вставки между кусками не дают пропусков и повторов.
+            low, inclusive = _lower_bound(query.created_from, after)
+            chunks = []
+            bound: Optional[_Key] = None
+            for shard in self._shards:
+                with shard.lock:
+                    chunk = shard.candidates(query).slice(low, inclusive, high, per_shard)
+                if chunk:
+                    chunks.append(chunk)
+                    # Из обрезанного куска ключи за его последним не видны —
+                    # слитый порядок верен только до самого раннего такого конца
+                    if len(chunk) == per_shard and (bound is None or chunk[-1] < bound):
+                        bound = chunk[-1]
+            if not chunks:
+                return PaymentPage(items, None)
+
+            for key in heapq.merge(*chunks) if len(chunks) > 1 else chunks[0]:
+                if bound is not None and key > bound:
+                    break
+                after = key
+                payment = load(key[1])
+                if payment is None or not _matches(payment, query):
+                    continue
+                if len(items) == limit:
+                    return PaymentPage(items, cursor_of(items[-1]))
+                items.append(payment)
+
+
+class _IndexShard:
+    """
+    Наборы ключей одного шарда индекса и его блокировка
+    """
+
+    __slots__ = ("lock", "by_time", "by_status", "by_currency", "by_email")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_time = _SortedKeys()
+        self.by_status: Dict[PaymentStatus, _SortedKeys] = {}
+        self.by_currency: Dict[str, _SortedKeys] = {}
+        self.by_email: Dict[str, _SortedKeys] = {}
+
+    def add(self, payment: Payment) -> None:
+        key = cursor_of(payment)
+        self.by_time.add(key)
+        self.by_status.setdefault(payment.status, _SortedKeys()).add(key)
+        self.by_currency.setdefault(payment.amount.currency, _SortedKeys()).add(key)
+        if payment.customer_email is not None:
+            self.by_email.setdefault(payment.customer_email, _SortedKeys()).add(key)
+
+    def candidates(self, query: PaymentQuery) -> "_SortedKeys":
+        """
+        Самый короткий набор ключей среди заданных фильтров-равенств
+        """
+        sets = [self.by_time]
+        for index, value in (
+                (self.by_status, query.status),
+                (self.by_currency, query.currency),
+                (self.by_email, query.customer_email),
+        ):
+            if value is not None:
+                sets.append(_lookup(index, value))
+        return min(sets, key=len)
+
+
+class _SortedKeys:
+    """
+    Отсортированный набор ключей, разбитый на блоки ограниченного размера.
+
+    Поиск — бинарный по максимумам блоков и внутри блока; вставка и
+    удаление сдвигают только один блок, а не весь набор. Переполненный
+    блок делится пополам, пустой удаляется.
+    """
+
+    __slots__ = ("_blocks", "_maxes", "_len")
+
+    def __init__(self):
+        self._blocks: List[List[_Key]] = []
+        self._maxes: List[_Key] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def add(self, key: _Key) -> None:
+        blocks, maxes = self._blocks, self._maxes
+        self._len += 1
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            return
+
+        position = bisect_left(maxes, key)
+        if position == len(maxes):
+            # Платежи обычно приходят по времени — вставка в конец без поиска в блоке
+            position -= 1
+            keys = blocks[position]
+            keys.append(key)
+            maxes[position] = key
+        else:
+            keys = blocks[position]
+            insort(keys, key)
+
+        if len(keys) > 2 * _BLOCK_SIZE:
+            blocks[position:position + 1] = [keys[:_BLOCK_SIZE], keys[_BLOCK_SIZE:]]
+            maxes[position:position + 1] = [keys[_BLOCK_SIZE - 1], keys[-1]]
+
+    def discard(self, key: _Key) -> None:
+        blocks, maxes = self._blocks, self._maxes
+        position = bisect_left(maxes, key)
+        if position == len(maxes):
+            return
+        keys = blocks[position]
+        offset = bisect_left(keys, key)
+        if offset == len(keys) or keys[offset] != key:
+            return
+
+        del keys[offset]
+        self._len -= 1
+        if not keys:
+            del blocks[position]
+            del maxes[position]
+        elif offset == len(keys):
+            maxes[position] = keys[-1]
+
+    def slice(self, low: Optional[tuple], inclusive: bool, high: Optional[tuple], count: int) -> List[_Key]:
+        """
+        До count ключей по возрастанию, начиная с low (включительно или нет) и до high (не включая).
+        """
+        blocks, maxes = self._blocks, self._maxes
+        position, offset = 0, 0
+        if low is not None:
+            search = bisect_left if inclusive else bisect_right
+            position = search(maxes, low)
+            if position == len(maxes):
+                return []
+            offset = search(blocks[position], low)
+
+        result: List[_Key] = []
+        while position < len(blocks) and len(result) < count:
+            keys = blocks[position][offset:offset + count - len(result)]
+            if high is not None and keys and keys[-1] >= high:
+                result.extend(keys[:bisect_left(keys, high)])
+                break
+            result.extend(keys)
+            position += 1
+            offset = 0
+        return result
+
+
+_EMPTY = _SortedKeys()
+
+# Размер блока набора ключей: блок делится, когда вырастает вдвое
+_BLOCK_SIZE = 512
+
+# Минимум ключей, копируемых из шарда за один захват блокировки при выборке
+_MIN_CHUNK = 16
+
+
+def _lookup(index: Dict[Hashable, _SortedKeys], value: Hashable) -> _SortedKeys:
+    return index.get(value, _EMPTY)
+
+
+def _lower_bound(created_from: Optional[datetime], after: Optional[_Key]) -> Tuple[Optional[tuple], bool]:
+    """
+    Нижняя граница выборки: (ключ, включительно ли)
+    """
+    low = (created_from,) if created_from is not None else None
+    if after is not None and (low is None or after >= low):
+        return after, False
+    return low, True
+
+
+def _matches(payment: Payment, query: PaymentQuery) -> bool:
+    # Индекс мог устареть между записью в хранилище и его обновлением —
+    # фильтры проверяются по текущему состоянию платежа
+    if query.status is not None and payment.status is not query.status:
+        return False
+    if query.currency is not None and payment.amount.currency != query.currency:
+        return False
+    if query.customer_email is not None and payment.customer_email != query.customer_email:
+        return False
+    return True
@@ -0,0 +1,112 @@
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ...domain.payment import Payment
+
+
+class ShardedPaymentStore:
+    """
+    Потокобезопасное хранилище платежей, разбитое на шарды.
+
+    N словарей и N блокировок; шард выбирается по хэшу payment_id.
+    Записи в разные шарды не конкурируют за одну блокировку,
+    а чтение одного ключа — атомарная операция словаря и идёт без блокировки.
+    """
+
+    def __init__(self, shards: int = 64):
+        """
+        :param shards: Количество шардов (округляется вверх до степени двойки)
+        """
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+
+        size = 1
+        while size < shards:
+            size <<= 1
+
+        self._mask = size - 1
+        self._shards: List[Dict[str, Payment]] = [{} for _ in range(size)]
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(size)]
+
+    @property
+    def shard_count(self) -> int:
+        return self._mask + 1
+
+    def get(self, key: str) -> Optional[Payment]:
+        """
+        Прочитать платёж без блокировки.
+        """
+        return self._shards[hash(key) & self._mask].get(key)
+
+    def insert_if_absent(self, key: str, payment: Payment) -> bool:
+        """
+        Атомарно добавить платёж, если ключа ещё нет.
+
+        :return: True — платёж добавлен, False — ключ уже существует
+        """
+        index = hash(key) & self._mask
+        shard = self._shards[index]
+        with self._locks[index]:
+            if key in shard:
+                return False
+            shard[key] = payment
+            return True
+
+    def insert_many_if_absent(self, items: List[Tuple[str, Payment]]) -> List[bool]:
+        """
+        Добавить пачку платежей, захватывая блокировку каждого шарда один раз.
+
+        Порядок внутри шарда сохраняется, поэтому из повторов одного ключа
+        в пачке успешен только первый.
+
+        :return: Для каждого элемента — добавлен ли он
+        """
+        mask = self._mask
+        by_shard: Dict[int, List[int]] = {}
+        for position, (key, _) in enumerate(items):
+            by_shard.setdefault(hash(key) & mask, []).append(position)
+
+        inserted = [False] * len(items)
+        for index, positions in by_shard.items():
+            shard = self._shards[index]
+            with self._locks[index]:
+                for position in positions:
+                    key, payment = items[position]
+                    if key not in shard:
+                        shard[key] = payment
+                        inserted[position] = True
+        return inserted
+
+    def update(self, key: str, fn: Callable[[Payment], Payment]) -> Optional[Payment]:
+        """
+        Атомарно заменить платёж результатом fn(текущий платёж).
+
+        fn вызывается под блокировкой шарда и может бросить исключение —
+        тогда хранилище не меняется.
+
+        :return: Новый платёж или None, если ключа нет
+        """
+        index = hash(key) & self._mask
+        shard = self._shards[index]
+        with self._locks[index]:
+            current = shard.get(key)
+            if current is None:
+                return None
+            updated = fn(current)
+            shard[key] = updated
+            return updated
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._shards[hash(key) & self._mask]
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def values(self) -> Iterator[Payment]:
+        """
+        Итерация по снимку каждого шарда (без глобальной блокировки).
+        """
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                snapshot = list(shard.values())
+            yield from snapshot
@@ -0,0 +1,279 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from multiprocessing.managers import BaseManager
+from typing import List, Optional, Tuple, Union
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.amount import Amount
+from ...domain.ports.payment_processor import (
+    PaymentProcessorPort,
+    PaymentCommand,
+    BatchItemOutcome,
+    PaymentQuery,
+    PaymentPage,
+)
+from ...domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from .in_memory import InMemoryPaymentAdapter
+from .sharded_store import ShardedPaymentStore
+from .simulation import PaymentSimulator, SimulationConfig
+
+Address = Union[Tuple[str, int], str]
+
+# Методы процессора, доступные клиентам общего хранилища
+_EXPOSED = (
+    "process_payment", "process_payments", "refund_payment", "authorize_payment", "capture_payment",
+    "void_payment", "get_payment", "get_refunds", "list_payments",
+)
+
+# Процессор на стороне сервера хранилища (один на процесс сервера)
+_server_processor: Optional[InMemoryPaymentAdapter] = None
+
+
+def _get_processor() -> InMemoryPaymentAdapter:
+    return _server_processor
+
+
+class StoreManager(BaseManager):
+    """
+    Менеджер общего хранилища платежей (локальный сокет + pickle).
+    """
+
+
+StoreManager.register("processor", callable=_get_processor, exposed=_EXPOSED)
+
+
+def parse_address(address: str) -> Address:
+    """
+    Разобрать адрес сервера хранилища.
+
+    "host:port" — TCP, иначе — путь к Unix-сокету.
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def serve_store(
+        address: Address,
+        authkey: bytes,
+        shards: int = 64,
+        simulation: Optional[SimulationConfig] = None
+) -> None:
+    """
+    Запустить сервер общего хранилища (блокирует текущий процесс).
+
+    Сервер обслуживает каждое соединение в своём потоке, а
+    InMemoryPaymentAdapter поверх ShardedPaymentStore потокобезопасен —
+    поэтому проверка дубликатов и возвраты атомарны для всех воркеров.
+    Симуляция отказов тоже выполняется здесь, одна на все воркеры.
+    """
+    global _server_processor
+    simulator = PaymentSimulator(simulation) if simulation is not None else None
+    _server_processor = InMemoryPaymentAdapter(ShardedPaymentStore(shards), simulator)
+    server = StoreManager(address=address, authkey=authkey).get_server()
+    server.serve_forever()
+
+
+def start_store_server(
+        address: Address,
+        authkey: bytes,
+        shards: int = 64,
+        timeout: float = 10.0,
+        simulation: Optional[SimulationConfig] = None
+) -> multiprocessing.Process:
+    """
+    Запустить сервер хранилища в отдельном процессе и дождаться готовности.
+
+    :param simulation: Симуляция отказов и задержек (если None — все платежи успешны)
+    :return: Процесс сервера (daemon — завершится вместе с родителем)
+    """
+    process = multiprocessing.Process(
+        target=serve_store, args=(address, authkey, shards, simulation), name="payment-store", daemon=True
+    )
+    process.start()
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            StoreManager(address=address, authkey=authkey).connect()
+            return process
+        except OSError:
+            if time.monotonic() > deadline or not process.is_alive():
+                process.terminate()
+                raise RuntimeError(f"Payment store server did not start on {address}")
+            time.sleep(0.05)
+
+
+class SharedPaymentAdapter(PaymentProcessorPort):
+    """
+    Адаптер, работающий с общим хранилищем платежей другого процесса.
+
+    Все воркеры uvicorn подключаются к одному серверу хранилища,
+    поэтому дубликат или возврат, пришедший в любой воркер,
+    обрабатывается по единому состоянию.
+    Прокси потокобезопасен: у каждого потока своё соединение.
+    """
+
+    def __init__(self, address: Address, authkey: bytes):
+        """
+        :param address: Адрес сервера хранилища (host, port) или путь к сокету
+        :param authkey: Ключ аутентификации соединения
+        """
+        manager = StoreManager(address=address, authkey=authkey)
+        manager.connect()
+        self._processor = manager.processor()
+
+    def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return self._processor.process_payment(
+            payment_id=payment_id,
+            amount=amount,
+            description=description,
+            customer_email=customer_email,
+            meta=meta,
+            decline_reason=decline_reason,
+            settlement_amount=settlement_amount
+        )
+
+    def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        # Пакет уходит на сервер одним сообщением
+        return self._processor.process_payments(commands)
+
+    def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        return self._processor.refund_payment(payment_id=payment_id, amount=amount, reason=reason)
+
+    def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return self._processor.authorize_payment(
+            payment_id=payment_id,
+            amount=amount,
+            expires_at=expires_at,
+            description=description,
+            customer_email=customer_email,
+            meta=meta,
+            decline_reason=decline_reason,
+            settlement_amount=settlement_amount
+        )
+
+    def capture_payment(self, payment_id: PaymentId) -> Payment:
+        return self._processor.capture_payment(payment_id)
+
+    def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        return self._processor.void_payment(payment_id, reason)
+
+    def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        return self._processor.get_payment(payment_id)
+
+    def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return self._processor.get_refunds(payment_id)
+
+    def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        # Выборка выполняется по индексам на сервере, клиенту уходит только страница
+        return self._processor.list_payments(query)
+
+
+class AsyncSharedPaymentAdapter(AsyncPaymentProcessorPort):
+    """
+    Асинхронный адаптер общего хранилища.
+
+    Вызов сервера — блокирующий обмен по сокету, поэтому он выполняется
+    в выделенном пуле потоков, а корутина ждёт результат.
+    """
+
+    def __init__(self, store: SharedPaymentAdapter, max_workers: int = 32):
+        """
+        :param store: Синхронный клиент общего хранилища
+        :param max_workers: Максимум одновременных запросов к серверу
+        """
+        self._store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="payment-store")
+
+    async def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return await self._call(
+            self._store.process_payment,
+            payment_id, amount, description, customer_email, meta, decline_reason, settlement_amount
+        )
+
+    async def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        return await self._call(self._store.process_payments, commands)
+
+    async def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        return await self._call(self._store.refund_payment, payment_id, amount, reason)
+
+    async def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return await self._call(
+            self._store.authorize_payment,
+            payment_id, amount, expires_at, description, customer_email, meta, decline_reason, settlement_amount
+        )
+
+    async def capture_payment(self, payment_id: PaymentId) -> Payment:
+        return await self._call(self._store.capture_payment, payment_id)
+
+    async def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        return await self._call(self._store.void_payment, payment_id, reason)
+
+    async def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        return await self._call(self._store.get_payment, payment_id)
+
+    async def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._call(self._store.get_refunds, payment_id)
+
+    async def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        return await self._call(self._store.list_payments, query)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _call(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
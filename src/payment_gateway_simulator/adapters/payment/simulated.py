@@ -0,0 +1,140 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+from typing import List, Optional
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.amount import Amount
+from ...domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ...domain.ports.payment_processor import PaymentCommand, BatchItemOutcome, PaymentQuery, PaymentPage
+from .simulation import PaymentSimulator
+
+
+class AsyncSimulatedPaymentAdapter(AsyncPaymentProcessorPort):
+    """
+    Симуляция внешнего шлюза поверх любого асинхронного хранилища.
+
+    Задержка ответа шлюза выдерживается через asyncio.sleep: тысячи
+    «медленных» платежей ждут одновременно, не занимая потоков.
+    Решение об отказе передаётся в хранилище как decline_reason —
+    тем же путём, что и отказ по правилу риска, поэтому отклонённый
+    платёж сохраняется со статусом FAILED в памяти, SQLite и общем
+    хранилище одинаково.
+
+    Если хранилище принимает решения само (сервер общего хранилища
+    со своим симулятором), decide=False оставляет здесь только задержку.
+    """
+
+    def __init__(self, inner: AsyncPaymentProcessorPort, simulator: PaymentSimulator, decide: bool = True):
+        """
+        :param inner: Хранилище платежей
+        :param simulator: Симулятор отказов и задержек
+        :param decide: Если False — только задержка, отказы решает хранилище
+        """
+        self._inner = inner
+        self._simulator = simulator
+        self._decide = decide
+
+    async def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return await self._inner.process_payment(
+            payment_id=payment_id,
+            amount=amount,
+            description=description,
+            customer_email=customer_email,
+            meta=meta,
+            decline_reason=await self._respond(payment_id, amount, decline_reason),
+            settlement_amount=settlement_amount
+        )
+
+    async def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        simulator = self._simulator
+        # Пакет уходит в шлюз одним вызовом — ждём самую долгую задержку
+        await _sleep(max((
+            simulator.latency(command.payment_id.value)
+            for command in commands if command.decline_reason is None
+        ), default=0.0))
+        if self._decide:
+            commands = [
+                command if command.decline_reason is not None
+                else replace(command, decline_reason=simulator.decide(command.payment_id.value, command.amount))
+                for command in commands
+            ]
+        return await self._inner.process_payments(commands)
+
+    async def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return await self._inner.authorize_payment(
+            payment_id=payment_id,
+            amount=amount,
+            expires_at=expires_at,
+            description=description,
+            customer_email=customer_email,
+            meta=meta,
+            decline_reason=await self._respond(payment_id, amount, decline_reason),
+            settlement_amount=settlement_amount
+        )
+
+    async def capture_payment(self, payment_id: PaymentId) -> Payment:
+        return await self._inner.capture_payment(payment_id)
+
+    async def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        return await self._inner.void_payment(payment_id, reason)
+
+    async def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        return await self._inner.get_payment(payment_id)
+
+    async def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        return await self._inner.refund_payment(payment_id=payment_id, amount=amount, reason=reason)
+
+    async def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._inner.get_refunds(payment_id)
+
+    async def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        return await self._inner.list_payments(query)
+
+    def close(self) -> None:
+        """
+        Закрыть хранилище, если оно держит ресурсы (SQLite, соединения с сервером).
+        """
+        if hasattr(self._inner, "close"):
+            self._inner.close()
+
+    async def _respond(self, payment_id: PaymentId, amount: Amount, decline_reason: Optional[str]) -> Optional[str]:
+        """
+        Дождаться ответа шлюза и вернуть причину отказа.
+
+        Отклонённый до шлюза платёж (decline_reason задан) не ждёт его ответа.
+        """
+        if decline_reason is not None:
+            return decline_reason
+        await _sleep(self._simulator.latency(payment_id.value))
+        return self._simulator.decide(payment_id.value, amount) if self._decide else None
+
+
+async def _sleep(latency: float) -> None:
+    if latency > 0:
+        await asyncio.sleep(latency)
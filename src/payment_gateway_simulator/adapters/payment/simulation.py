@@ -0,0 +1,204 @@
+import json
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from hashlib import blake2b
+from pathlib import Path
+from statistics import NormalDist
+from typing import Callable, Optional, Tuple, Union
+
+from ...domain.amount import Amount
+
+_LATENCY_DISTRIBUTIONS = ("none", "fixed", "normal", "pareto")
+_STANDARD_NORMAL = NormalDist()
+_UNIT = float(1 << 64)
+
+
+@dataclass(frozen=True)
+class DeclineRule:
+    """
+    Правило отказа: доля отклоняемых платежей для валюты и диапазона сумм.
+    """
+    rate: float  # Доля отказов, 0..1
+    currency: Optional[str] = None  # Если None — любая валюта
+    min_amount: Optional[Decimal] = None  # Нижняя граница (включительно)
+    max_amount: Optional[Decimal] = None  # Верхняя граница (не включительно)
+    message: str = "Card declined"
+
+    def matches(self, amount: Amount) -> bool:
+        if self.currency is not None and self.currency != amount.currency:
+            return False
+        if self.min_amount is not None and amount.value < self.min_amount:
+            return False
+        if self.max_amount is not None and amount.value >= self.max_amount:
+            return False
+        return True
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """
+    Распределение задержки ответа шлюза, секунды.
+
+    - fixed: всегда value
+    - normal: нормальное со средним value и отклонением stddev (не меньше 0)
+    - pareto: длинный хвост, минимум value и параметр формы alpha
+    """
+    distribution: str = "none"
+    value: float = 0.0
+    stddev: float = 0.0
+    alpha: float = 1.5
+    max_latency: Optional[float] = None  # Ограничение сверху (для pareto)
+
+    def __post_init__(self):
+        if self.distribution not in _LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.distribution}")
+
+    def sample(self, u: float) -> float:
+        """
+        Значение задержки по квантилю u ∈ (0, 1).
+        """
+        if self.distribution == "fixed":
+            latency = self.value
+        elif self.distribution == "normal":
+            latency = max(0.0, self.value + self.stddev * _STANDARD_NORMAL.inv_cdf(u))
+        elif self.distribution == "pareto":
+            latency = self.value / (1.0 - u) ** (1.0 / self.alpha)
+        else:
+            return 0.0
+
+        if self.max_latency is not None:
+            latency = min(latency, self.max_latency)
+        return latency
+
+
+@dataclass(frozen=True)
+class OutageWindow:
+    """
+    Сценарий недоступности шлюза: интервал от старта симулятора, секунды.
+
+    Если задан period — окно повторяется с этим периодом.
+    """
+    start: float
+    end: float
+    message: str = "Gateway unavailable (simulated outage)"
+    period: Optional[float] = None
+
+    def active(self, elapsed: float) -> bool:
+        if self.period:
+            elapsed %= self.period
+        return self.start <= elapsed < self.end
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """
+    Настройки симуляции отказов и задержек.
+    """
+    seed: int = 0
+    decline_rules: Tuple[DeclineRule, ...] = ()
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    outages: Tuple[OutageWindow, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SimulationConfig":
+        """
+        Собрать настройки из словаря (формат JSON-файла симуляции).
+
+        Пример:
+            {"seed": 42,
+             "fail_rate": 0.05,
+             "decline_rules": [{"currency": "EUR", "min_amount": "1000", "rate": 0.3}],
+             "latency": {"distribution": "pareto", "value": 0.05, "alpha": 1.2, "max_latency": 30},
+             "outages": [{"start": 60, "end": 90, "period": 600}]}
+
+        Правила проверяются по порядку, применяется первое подходящее.
+        fail_rate — короткая запись правила для любых платежей
+        (срабатывает, если не подошло ни одно другое правило).
+        """
+        rules = [
+            DeclineRule(
+                rate=float(rule["rate"]),
+                currency=rule.get("currency"),
+                min_amount=Decimal(str(rule["min_amount"])) if rule.get("min_amount") is not None else None,
+                max_amount=Decimal(str(rule["max_amount"])) if rule.get("max_amount") is not None else None,
+                message=rule.get("message", "Card declined"),
+            )
+            for rule in data.get("decline_rules", ())
+        ]
+        if data.get("fail_rate"):
+            rules.append(DeclineRule(rate=float(data["fail_rate"])))
+
+        return cls(
+            seed=int(data.get("seed", 0)),
+            decline_rules=tuple(rules),
+            latency=LatencyModel(**data.get("latency", {})),
+            outages=tuple(OutageWindow(**outage) for outage in data.get("outages", ())),
+        )
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "SimulationConfig":
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+class PaymentSimulator:
+    """
+    Движок симуляции поведения внешнего шлюза.
+
+    Решение об отказе и задержка детерминированы парой (seed, payment_id):
+    один и тот же прогон даёт те же результаты независимо от порядка
+    и параллельности запросов. Окна недоступности отсчитываются от
+    момента создания симулятора.
+    """
+
+    def __init__(self, config: SimulationConfig, clock: Callable[[], float] = time.monotonic):
+        """
+        :param config: Настройки симуляции
+        :param clock: Источник времени для окон недоступности (для тестов)
+        """
+        self._config = config
+        self._clock = clock
+        self._started = clock()
+        self._seed = str(config.seed).encode("utf-8") + b":"
+
+    @property
+    def config(self) -> SimulationConfig:
+        return self._config
+
+    def decide(self, payment_id: str, amount: Amount) -> Optional[str]:
+        """
+        Решить судьбу платежа.
+
+        :return: Текст ошибки, если платёж должен быть отклонён, иначе None
+        """
+        config = self._config
+        if config.outages:
+            elapsed = self._clock() - self._started
+            for outage in config.outages:
+                if outage.active(elapsed):
+                    return outage.message
+
+        for rule in config.decline_rules:
+            if rule.matches(amount):
+                if self._uniform(payment_id, 0) < rule.rate:
+                    return rule.message
+                return None
+        return None
+
+    def latency(self, payment_id: str) -> float:
+        """
+        Задержка ответа шлюза для платежа, секунды.
+        """
+        latency = self._config.latency
+        if latency.distribution == "none":
+            return 0.0
+        return latency.sample(self._uniform(payment_id, 1))
+
+    def _uniform(self, payment_id: str, stream: int) -> float:
+        """
+        Псевдослучайное число в (0, 1), зависящее только от seed, payment_id и номера потока.
+        """
+        digest = blake2b(self._seed + payment_id.encode("utf-8"), digest_size=16).digest()
+        chunk = digest[stream * 8:(stream + 1) * 8]
+        return (int.from_bytes(chunk, "little") + 0.5) / _UNIT
@@ -0,0 +1,688 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+from ...domain.payment import Payment
+from ...domain.payment_id import PaymentId
+from ...domain.amount import Amount
+from ...domain.payment_status import PaymentStatus
+from ...domain.ports.payment_processor import (
+    PaymentProcessorPort,
+    PaymentCommand,
+    BatchItemOutcome,
+    PaymentQuery,
+    PaymentPage,
+    cursor_of,
+)
+from ...domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ...domain.exceptions import PaymentNotFoundError, PaymentAlreadyExistsError
+
+# SQL-тексты — константы: sqlite3 кэширует подготовленные выражения
+# на соединении по тексту запроса, поэтому они компилируются один раз.
+# Суммы хранятся целыми числами в минорных единицах валюты.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    id TEXT PRIMARY KEY,
+    amount_minor INTEGER NOT NULL,
+    currency TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    description TEXT,
+    customer_email TEXT,
+    error_message TEXT,
+    refunded_minor INTEGER,
+    expires_at TEXT,
+    settlement_minor INTEGER,
+    settlement_currency TEXT
+) WITHOUT ROWID
+"""
+# Журнал возвратов: одна строка на возврат, валюта — как у платежа
+_REFUNDS_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS refunds ("
+    "payment_id TEXT NOT NULL, seq INTEGER NOT NULL, amount_minor INTEGER NOT NULL, created_at TEXT NOT NULL, "
+    "description TEXT, PRIMARY KEY (payment_id, seq)) WITHOUT ROWID"
+)
+_INSERT = (
+    "INSERT INTO payments (id, amount_minor, currency, status, created_at, description, customer_email, "
+    "error_message, refunded_minor, expires_at, settlement_minor, settlement_currency) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO NOTHING"
+)
+_COLUMNS = (
+    "id, amount_minor, currency, status, created_at, description, customer_email, error_message, refunded_minor, "
+    "expires_at, settlement_minor, settlement_currency"
+)
+_SELECT = f"SELECT {_COLUMNS} FROM payments WHERE id = ?"
+# Вторичные индексы для выборок (list_payments): фильтр-равенство + порядок выдачи.
+# created_at хранится в ISO 8601 — строковый порядок совпадает с временным
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS payments_by_time ON payments (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS payments_by_status ON payments (status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS payments_by_currency ON payments (currency, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS payments_by_email ON payments (customer_email, created_at, id)",
+)
+_UPDATE_REFUNDED = "UPDATE payments SET status = ?, refunded_minor = ? WHERE id = ?"
+_UPDATE_TRANSITION = "UPDATE payments SET status = ?, expires_at = ?, error_message = ? WHERE id = ?"
+_INSERT_REFUND = (
+    "INSERT INTO refunds (payment_id, seq, amount_minor, created_at, description) "
+    "VALUES (?, (SELECT COALESCE(MAX(seq) + 1, 0) FROM refunds WHERE payment_id = ?), ?, ?, ?)"
+)
+_SELECT_REFUNDS = (
+    "SELECT amount_minor, created_at, description FROM refunds WHERE payment_id = ? ORDER BY seq"
+)
+
+_STATUSES = {status.value: status for status in PaymentStatus}
+
+# Маркер остановки потока-писателя
+_STOP = object()
+
+
+def _to_row(payment: Payment) -> tuple:
+    return (
+        payment.id.value,
+        payment.amount.minor,
+        payment.amount.currency,
+        payment.status.value,
+        payment.created_at.isoformat(),
+        payment.description,
+        payment.customer_email,
+        payment.error_message,
+        payment.refunded_amount.minor if payment.refunded_amount is not None else None,
+        payment.expires_at.isoformat() if payment.expires_at is not None else None,
+        payment.settlement_amount.minor if payment.settlement_amount is not None else None,
+        payment.settlement_amount.currency if payment.settlement_amount is not None else None,
+    )
+
+
+def _from_row(row: tuple) -> Payment:
+    # Данные провалидированы при записи — создаём объекты без повторных проверок
+    return Payment(
+        id=PaymentId.trusted(row[0]),
+        amount=Amount.trusted_minor(row[1], row[2]),
+        status=_STATUSES[row[3]],
+        created_at=datetime.fromisoformat(row[4]),
+        description=row[5],
+        customer_email=row[6],
+        error_message=row[7],
+        refunded_amount=Amount.trusted_minor(row[8], row[2]) if row[8] is not None else None,
+        expires_at=datetime.fromisoformat(row[9]) if row[9] is not None else None,
+        settlement_amount=Amount.trusted_minor(row[10], row[11]) if row[10] is not None else None,
+    )
+
+
+def _refunds_from_rows(payment: Payment, rows: List[tuple]) -> List[Payment]:
+    return [
+        Payment(
+            id=payment.id,
+            amount=Amount.trusted_minor(row[0], payment.amount.currency),
+            status=PaymentStatus.REFUNDED,
+            created_at=datetime.fromisoformat(row[1]),
+            description=row[2],
+            customer_email=payment.customer_email,
+        )
+        for row in rows
+    ]
+
+
+def _list_query(query: PaymentQuery) -> Tuple[str, list]:
+    """
+    SQL выборки по фильтрам: равенства и диапазон попадают в один из индексов,
+    курсор — сравнение пар (created_at, id), страница — LIMIT на одну строку больше.
+    """
+    clauses = []
+    params: list = []
+    if query.status is not None:
+        clauses.append("status = ?")
+        params.append(query.status.value)
+    if query.currency is not None:
+        clauses.append("currency = ?")
+        params.append(query.currency)
+    if query.customer_email is not None:
+        clauses.append("customer_email = ?")
+        params.append(query.customer_email)
+    if query.created_from is not None:
+        clauses.append("created_at >= ?")
+        params.append(query.created_from.isoformat())
+    if query.created_to is not None:
+        clauses.append("created_at < ?")
+        params.append(query.created_to.isoformat())
+    if query.after is not None:
+        clauses.append("(created_at, id) > (?, ?)")
+        params.extend((query.after[0].isoformat(), query.after[1]))
+
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    params.append(query.limit + 1)
+    return f"SELECT {_COLUMNS} FROM payments{where} ORDER BY created_at, id LIMIT ?", params
+
+
+def _already_exists(payment_id: PaymentId) -> PaymentAlreadyExistsError:
+    return PaymentAlreadyExistsError(
+        f"Payment with id={payment_id.value} already exists",
+        payment_id=payment_id.value
+    )
+
+
+class SqlitePaymentAdapter(PaymentProcessorPort):
+    """
+    Адаптер для обработки платежей с хранением в SQLite.
+
+    Данные переживают перезапуск процесса. Особенности:
+    - WAL: читатели не блокируют писателя и друг друга
+    - Все записи выполняет один поток-писатель: операции, пришедшие
+      одновременно из разных запросов, объединяются в одну транзакцию
+      (group commit) — один fsync на пачку вместо одного на платёж
+    - Чтения идут через отдельные соединения (по одному на поток)
+
+    Если поток-писатель сам не смог выполнить пачку (например, упал
+    BEGIN или ROLLBACK), адаптер считается сломанным: ожидающие операции
+    завершаются ошибкой, новые отклоняются сразу — вызовы не зависают.
+    """
+
+    def __init__(
+            self,
+            path: Union[str, Path] = "payments.db",
+            max_batch: int = 1000,
+            synchronous: str = "NORMAL"
+    ):
+        """
+        :param path: Путь к файлу базы (":memory:" не поддерживается — нужен общий файл)
+        :param max_batch: Максимум операций в одной транзакции
+        :param synchronous: Режим PRAGMA synchronous (NORMAL достаточно для WAL)
+        """
+        self._path = str(path)
+        self._max_batch = max_batch
+        self._synchronous = synchronous
+        self._queue: "queue.Queue" = queue.Queue()
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+        self._failure: Optional[BaseException] = None
+
+        writer = self._connect()
+        writer.execute(_SCHEMA)
+        writer.execute(_REFUNDS_SCHEMA)
+        for index in _INDEXES:
+            writer.execute(index)
+
+        self._writer = threading.Thread(
+            target=self._run_writer, args=(writer,), name="sqlite-payment-writer", daemon=True
+        )
+        self._writer.start()
+
+    # === Порт ===
+
+    def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Сохранить успешный (или отклонённый с decline_reason) платёж
+        (ошибка, если ID уже существует).
+        """
+        return self.submit_process(
+            payment_id, amount, description, customer_email, decline_reason, settlement_amount
+        ).result()
+
+    def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        """
+        Сохранить пакет платежей одной транзакцией.
+        """
+        return self.submit_batch(commands).result()
+
+    def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        """
+        Вернуть платёж (полностью или частично, см. PaymentProcessorPort.refund_payment).
+        """
+        return self.submit_refund(payment_id, amount, reason).result()
+
+    def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Сохранить авторизацию со статусом PENDING (или FAILED с decline_reason;
+        ошибка, если ID уже существует).
+        """
+        return self.submit_authorize(
+            payment_id, amount, expires_at, description, customer_email, decline_reason, settlement_amount
+        ).result()
+
+    def capture_payment(self, payment_id: PaymentId) -> Payment:
+        """
+        Списать авторизацию (см. PaymentProcessorPort.capture_payment).
+        """
+        return self.submit_capture(payment_id).result()
+
+    def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        """
+        Отменить авторизацию (см. PaymentProcessorPort.void_payment).
+        """
+        return self.submit_void(payment_id, reason).result()
+
+    def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Прочитать журнал возвратов платежа.
+        """
+        connection = self._reader()
+        row = connection.execute(_SELECT, (payment_id.value,)).fetchone()
+        if row is None:
+            return []
+        return _refunds_from_rows(
+            _from_row(row), connection.execute(_SELECT_REFUNDS, (payment_id.value,)).fetchall()
+        )
+
+    def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        """
+        Прочитать платёж по первичному ключу через соединение текущего потока.
+        """
+        row = self._reader().execute(_SELECT, (payment_id.value,)).fetchone()
+        return _from_row(row) if row is not None else None
+
+    def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        """
+        Выборка по вторичным индексам через соединение текущего потока.
+        """
+        sql, params = _list_query(query)
+        items = [_from_row(row) for row in self._reader().execute(sql, params)]
+        if len(items) > query.limit:
+            del items[query.limit:]
+            return PaymentPage(items, cursor_of(items[-1]))
+        return PaymentPage(items, None)
+
+    def close(self) -> None:
+        """
+        Дождаться записи очереди и закрыть соединения.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        with self._readers_lock:
+            for connection in self._readers:
+                connection.close()
+            self._readers.clear()
+
+    # === Постановка операций писателю ===
+    #
+    # submit_* ставят операцию в очередь потока-писателя и сразу возвращают
+    # Future с результатом (или исключением) — методы порта ждут его через
+    # result(), AsyncSqlitePaymentAdapter — через asyncio.wrap_future.
+
+    def submit_process(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Future:
+        """
+        Поставить в очередь сохранение платежа (см. process_payment).
+        """
+        payment = Payment(
+            id=payment_id,
+            amount=amount,
+            status=PaymentStatus.SUCCEEDED if decline_reason is None else PaymentStatus.FAILED,
+            created_at=datetime.now(),
+            description=description,
+            customer_email=customer_email,
+            error_message=decline_reason,
+            settlement_amount=settlement_amount
+        )
+
+        def op(connection: sqlite3.Connection) -> Payment:
+            if connection.execute(_INSERT, _to_row(payment)).rowcount == 0:
+                raise _already_exists(payment_id)
+            return payment
+
+        return self._submit(op)
+
+    def submit_authorize(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Future:
+        """
+        Поставить в очередь сохранение авторизации (см. authorize_payment).
+        """
+        payment = Payment(
+            id=payment_id,
+            amount=amount,
+            status=PaymentStatus.PENDING if decline_reason is None else PaymentStatus.FAILED,
+            created_at=datetime.now(),
+            description=description,
+            customer_email=customer_email,
+            error_message=decline_reason,
+            expires_at=expires_at if decline_reason is None else None,
+            settlement_amount=settlement_amount
+        )
+
+        def op(connection: sqlite3.Connection) -> Payment:
+            if connection.execute(_INSERT, _to_row(payment)).rowcount == 0:
+                raise _already_exists(payment_id)
+            return payment
+
+        return self._submit(op)
+
+    def submit_capture(self, payment_id: PaymentId) -> Future:
+        """
+        Поставить в очередь списание авторизации (см. capture_payment).
+        """
+        return self._submit_transition(payment_id, lambda payment: payment.capture(), "capture")
+
+    def submit_void(self, payment_id: PaymentId, reason: Optional[str] = None) -> Future:
+        """
+        Поставить в очередь отмену авторизации (см. void_payment).
+        """
+        return self._submit_transition(payment_id, lambda payment: payment.void(reason), "void")
+
+    def _submit_transition(
+            self,
+            payment_id: PaymentId,
+            apply: Callable[[Payment], Payment],
+            action: str
+    ) -> Future:
+        def op(connection: sqlite3.Connection) -> Payment:
+            row = connection.execute(_SELECT, (payment_id.value,)).fetchone()
+            if row is None:
+                raise PaymentNotFoundError(
+                    f"Payment with id={payment_id.value} not found for {action}",
+                    payment_id=payment_id.value
+                )
+
+            # Чтение и обновление в потоке-писателе — переход атомарен
+            updated = apply(_from_row(row))
+            connection.execute(_UPDATE_TRANSITION, (
+                updated.status.value,
+                updated.expires_at.isoformat() if updated.expires_at is not None else None,
+                updated.error_message,
+                payment_id.value
+            ))
+            return updated
+
+        return self._submit(op)
+
+    def submit_batch(self, commands: List[PaymentCommand]) -> Future:
+        """
+        Поставить в очередь сохранение пакета платежей (см. process_payments).
+        """
+        created_at = datetime.now()
+        payments = [
+            Payment(
+                id=command.payment_id,
+                amount=command.amount,
+                status=PaymentStatus.SUCCEEDED if command.decline_reason is None else PaymentStatus.FAILED,
+                created_at=created_at,
+                description=command.description,
+                customer_email=command.customer_email,
+                error_message=command.decline_reason,
+                settlement_amount=command.settlement_amount
+            )
+            for command in commands
+        ]
+
+        def op(connection: sqlite3.Connection) -> List[BatchItemOutcome]:
+            outcomes: List[BatchItemOutcome] = []
+            for payment in payments:
+                if connection.execute(_INSERT, _to_row(payment)).rowcount == 0:
+                    outcomes.append(_already_exists(payment.id))
+                else:
+                    outcomes.append(payment)
+            return outcomes
+
+        return self._submit(op)
+
+    def submit_refund(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Future:
+        """
+        Поставить в очередь возврат платежа (см. refund_payment).
+        """
+        def op(connection: sqlite3.Connection) -> Payment:
+            row = connection.execute(_SELECT, (payment_id.value,)).fetchone()
+            if row is None:
+                raise PaymentNotFoundError(
+                    f"Payment with id={payment_id.value} not found for refund",
+                    payment_id=payment_id.value
+                )
+
+            # Все записи идут через один поток-писатель, поэтому чтение остатка
+            # и обновление не пересекаются с другими возвратами этого платежа
+            updated, record = _from_row(row).refund(amount, reason)
+            connection.execute(_UPDATE_REFUNDED, (
+                updated.status.value, updated.refunded_amount.minor, payment_id.value
+            ))
+            connection.execute(_INSERT_REFUND, (
+                payment_id.value, payment_id.value, record.amount.minor,
+                record.created_at.isoformat(), record.description
+            ))
+            return record
+
+        return self._submit(op)
+
+    def _submit(self, op: Callable[[sqlite3.Connection], object]) -> Future:
+        if self._closed:
+            raise RuntimeError("SqlitePaymentAdapter is closed")
+        if self._failure is not None:
+            raise self._writer_failed()
+        future: Future = Future()
+        self._queue.put((op, future))
+        return future
+
+    # === Поток-писатель ===
+
+    def _run_writer(self, connection: sqlite3.Connection) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            group = [item]
+            while len(group) < self._max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                group.append(item)
+
+            if self._failure is None:
+                try:
+                    self._execute_group(connection, group)
+                except BaseException as e:
+                    self._failure = e
+                    self._fail(group)
+            else:
+                # Операции, поставленные до того, как _submit увидел сбой
+                self._fail(group)
+
+        connection.close()
+
+    def _fail(self, group: list) -> None:
+        for _, future in group:
+            if not future.done():
+                future.set_exception(self._writer_failed())
+
+    def _writer_failed(self) -> RuntimeError:
+        error = RuntimeError("SqlitePaymentAdapter writer failed")
+        error.__cause__ = self._failure
+        return error
+
+    @staticmethod
+    def _execute_group(connection: sqlite3.Connection, group: list) -> None:
+        """
+        Выполнить пачку операций одной транзакцией.
+
+        Каждая операция идёт в своей точке сохранения: ошибка (например,
+        дубликат или сбой на середине возврата) откатывает только её
+        собственные изменения и не затрагивает остальные операции пачки.
+        """
+        results = []
+        connection.execute("BEGIN")
+        for op, future in group:
+            connection.execute("SAVEPOINT op")
+            try:
+                result = op(connection)
+            except Exception as e:
+                connection.execute("ROLLBACK TO op")
+                connection.execute("RELEASE op")
+                results.append((future, None, e))
+            else:
+                connection.execute("RELEASE op")
+                results.append((future, result, None))
+
+        try:
+            connection.execute("COMMIT")
+        except Exception as e:
+            connection.rollback()
+            for future, _, _ in results:
+                future.set_exception(e)
+            return
+
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    # === Соединения ===
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None — транзакциями управляем явно (BEGIN/COMMIT)
+        connection = sqlite3.connect(
+            self._path, isolation_level=None, check_same_thread=False, cached_statements=64
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(f"PRAGMA synchronous={self._synchronous}")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            connection.execute("PRAGMA query_only=ON")
+            self._local.connection = connection
+            with self._readers_lock:
+                self._readers.append(connection)
+        return connection
+
+
+class AsyncSqlitePaymentAdapter(AsyncPaymentProcessorPort):
+    """
+    Асинхронный адаптер поверх SqlitePaymentAdapter.
+
+    Записи передаются потоку-писателю, корутина ждёт результат через
+    asyncio.wrap_future — event loop не блокируется на транзакции.
+    Чтение по первичному ключу выполняется прямо в loop: это точечный
+    запрос к локальному файлу, обычно из кэша страниц.
+    """
+
+    def __init__(self, store: SqlitePaymentAdapter):
+        """
+        :param store: Синхронный SQLite-адаптер (владеет потоком-писателем)
+        """
+        self._store = store
+
+    async def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return await asyncio.wrap_future(
+            self._store.submit_process(
+                payment_id, amount, description, customer_email, decline_reason, settlement_amount
+            )
+        )
+
+    async def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        return await asyncio.wrap_future(self._store.submit_batch(commands))
+
+    async def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        return await asyncio.wrap_future(self._store.submit_refund(payment_id, amount, reason))
+
+    async def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        return await asyncio.wrap_future(
+            self._store.submit_authorize(
+                payment_id, amount, expires_at, description, customer_email, decline_reason, settlement_amount
+            )
+        )
+
+    async def capture_payment(self, payment_id: PaymentId) -> Payment:
+        return await asyncio.wrap_future(
+            self._store.submit_capture(payment_id)
+        )
+
+    async def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        return await asyncio.wrap_future(
+            self._store.submit_void(payment_id, reason)
+        )
+
+    async def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        return self._store.get_refunds(payment_id)
+
+    async def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        return self._store.get_payment(payment_id)
+
+    async def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        # Страница может быть большой — читаем в пуле потоков, не занимая loop
+        return await asyncio.to_thread(self._store.list_payments, query)
+
+    def close(self) -> None:
+        self._store.close()
@@ -0,0 +1,8 @@
+from .volume import VolumeAggregator
+from .aggregating import AggregatingTransactionLogger, AsyncAggregatingTransactionLogger
+
+__all__ = [
+    "VolumeAggregator",
+    "AggregatingTransactionLogger",
+    "AsyncAggregatingTransactionLogger",
+]
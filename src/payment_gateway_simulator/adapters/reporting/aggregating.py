@@ -0,0 +1,53 @@
+from typing import List
+
+from ...domain import (
+    Payment,
+    PaymentId,
+    TransactionLoggerPort,
+    AsyncTransactionLoggerPort,
+)
+from .volume import VolumeAggregator
+
+
+class AggregatingTransactionLogger(TransactionLoggerPort):
+    """
+    Декоратор TransactionLoggerPort, пополняющий агрегаты отчётов.
+
+    Транзакция учитывается после успешной записи во внутренний логгер.
+    """
+
+    def __init__(self, inner: TransactionLoggerPort, aggregator: VolumeAggregator):
+        self._inner = inner
+        self._aggregator = aggregator
+
+    def log_transaction(self, payment: Payment) -> None:
+        self._inner.log_transaction(payment)
+        self._aggregator.record(payment)
+
+    def log_transactions(self, payments: List[Payment]) -> None:
+        self._inner.log_transactions(payments)
+        self._aggregator.record_many(payments)
+
+    def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return self._inner.get_transactions_by_payment_id(payment_id)
+
+
+class AsyncAggregatingTransactionLogger(AsyncTransactionLoggerPort):
+    """
+    Декоратор AsyncTransactionLoggerPort, пополняющий агрегаты отчётов
+    """
+
+    def __init__(self, inner: AsyncTransactionLoggerPort, aggregator: VolumeAggregator):
+        self._inner = inner
+        self._aggregator = aggregator
+
+    async def log_transaction(self, payment: Payment) -> None:
+        await self._inner.log_transaction(payment)
+        self._aggregator.record(payment)
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        await self._inner.log_transactions(payments)
+        self._aggregator.record_many(payments)
+
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._inner.get_transactions_by_payment_id(payment_id)
@@ -0,0 +1,148 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ...domain.payment import Payment
+from ...domain.payment_status import PaymentStatus
+from ...domain.ports.volume_report import ReportGranularity, VolumeBucket, VolumeReportPort
+
+# Окна считаются по локальному времени created_at: секунды от этой точки
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+_WIDTHS = {
+    ReportGranularity.MINUTE: 60,
+    ReportGranularity.HOUR: 3600,
+    ReportGranularity.DAY: 86400,
+}
+
+# Ячейка агрегата: [число транзакций, сумма в минорных единицах]
+_Cell = List[int]
+_Key = Tuple[str, PaymentStatus]
+
+
+class _Window:
+    """
+    Скользящее окно одной ширины: номер окна → {(валюта, статус): ячейка}.
+
+    Хранится не больше retention последних окон; окна старше вытесняются
+    при появлении нового, опоздавшие транзакции для вытесненных окон
+    отбрасываются.
+    """
+
+    __slots__ = ("width", "span", "retention", "buckets", "heap", "newest")
+
+    def __init__(self, width: int, retention: int):
+        self.width = width
+        self.span = timedelta(seconds=width)
+        self.retention = retention
+        self.buckets: Dict[int, Dict[_Key, _Cell]] = {}
+        self.heap: List[int] = []  # Номера хранимых окон (минимум — самое старое)
+        self.newest = -1
+
+    def add(self, second: int, key: _Key, minor: int) -> None:
+        index = second // self.width
+        bucket = self.buckets.get(index)
+        if bucket is None:
+            if index <= self.newest - self.retention:
+                return
+            bucket = self.buckets[index] = {}
+            heapq.heappush(self.heap, index)
+            if index > self.newest:
+                self.newest = index
+                oldest = index - self.retention
+                while self.heap[0] <= oldest:
+                    del self.buckets[heapq.heappop(self.heap)]
+
+        cell = bucket.get(key)
+        if cell is None:
+            bucket[key] = [1, minor]
+        else:
+            cell[0] += 1
+            cell[1] += minor
+
+    def snapshot(self, first: int, last: int) -> List[Tuple[int, List[Tuple[_Key, Tuple[int, int]]]]]:
+        """
+        Копия окон с номерами в [first, last)
+        """
+        return [
+            (index, [(key, (cell[0], cell[1])) for key, cell in self.buckets[index].items()])
+            for index in sorted(self.buckets)
+            if first <= index < last
+        ]
+
+
+class VolumeAggregator(VolumeReportPort):
+    """
+    Инкрементальные агрегаты объёма транзакций по минутам, часам и дням.
+
+    Каждая транзакция добавляется в три окна (O(1) целочисленных операций),
+    отчёт читает только хранимые окна — O(окон × валют × статусов),
+    независимо от числа платежей. Суммы копятся в минорных единицах.
+
+    Агрегаты живут в памяти процесса: при нескольких воркерах у каждого свои.
+    """
+
+    def __init__(self, minute_buckets: int = 1440, hour_buckets: int = 744, day_buckets: int = 366):
+        """
+        :param minute_buckets: Сколько последних минутных окон хранить
+        :param hour_buckets: Сколько последних часовых окон хранить
+        :param day_buckets: Сколько последних дневных окон хранить
+        """
+        retention = {
+            ReportGranularity.MINUTE: minute_buckets,
+            ReportGranularity.HOUR: hour_buckets,
+            ReportGranularity.DAY: day_buckets,
+        }
+        self._windows = {
+            granularity: _Window(width, retention[granularity]) for granularity, width in _WIDTHS.items()
+        }
+        self._all = tuple(self._windows.values())
+        self._lock = threading.Lock()
+
+    def record(self, payment: Payment) -> None:
+        """
+        Учесть одну транзакцию.
+        """
+        second = (payment.created_at - _EPOCH) // _SECOND
+        key = (payment.amount.currency, payment.status)
+        minor = payment.amount.minor
+        with self._lock:
+            for window in self._all:
+                window.add(second, key, minor)
+
+    def record_many(self, payments: List[Payment]) -> None:
+        """
+        Учесть пакет транзакций за один захват блокировки.
+        """
+        entries = [
+            ((payment.created_at - _EPOCH) // _SECOND, (payment.amount.currency, payment.status), payment.amount.minor)
+            for payment in payments
+        ]
+        with self._lock:
+            for window in self._all:
+                for second, key, minor in entries:
+                    window.add(second, key, minor)
+
+    def volume(
+            self,
+            granularity: ReportGranularity,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None
+    ) -> List[VolumeBucket]:
+        window = self._windows[granularity]
+        width = window.width
+        # Берутся окна, пересекающие [start, end): номер первого — вниз, конца — вверх
+        first = (start - _EPOCH) // window.span if start is not None else 0
+        last = -((_EPOCH - end) // window.span) if end is not None else window.newest + 1
+        with self._lock:
+            snapshot = window.snapshot(first, last)
+
+        buckets: List[VolumeBucket] = []
+        for index, cells in snapshot:
+            bucket_start = _EPOCH + timedelta(seconds=index * width)
+            cells.sort(key=lambda item: (item[0][0], item[0][1].value))
+            for (currency, status), (count, minor) in cells:
+                buckets.append(VolumeBucket(bucket_start, currency, status, count, minor))
+        return buckets
@@ -0,0 +1,9 @@
+from .velocity import VelocityCounter
+from .engine import RiskEngine, RiskRule, VelocityLimit
+
+__all__ = [
+    "VelocityCounter",
+    "RiskEngine",
+    "RiskRule",
+    "VelocityLimit",
+]
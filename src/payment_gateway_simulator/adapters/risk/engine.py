@@ -0,0 +1,229 @@
+import json
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+from ...domain.ports.payment_processor import PaymentCommand
+from ...domain.ports.risk_assessor import RiskAssessorPort
+from .velocity import VelocityCounter
+
+_RULE_KEYS = frozenset({
+    "name", "message", "currency", "min_amount", "max_amount", "email_domain", "meta", "velocity",
+})
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class VelocityLimit:
+    """
+    Ограничение скорости: не больше max_count платежей с одним email за window секунд.
+    """
+    max_count: int
+    window: float
+
+
+@dataclass(frozen=True)
+class RiskRule:
+    """
+    Правило риска: платёж отклоняется, если выполнены все заданные условия.
+    """
+    name: str
+    message: Optional[str] = None  # Текст ошибки; по умолчанию — с именем правила
+    currencies: FrozenSet[str] = frozenset()  # Пусто — любая валюта
+    min_amount: Optional[Decimal] = None  # Нижняя граница (включительно)
+    max_amount: Optional[Decimal] = None  # Верхняя граница (не включительно)
+    email_domains: FrozenSet[str] = frozenset()  # Домены email (в нижнем регистре)
+    meta: Tuple[Tuple[str, FrozenSet[object]], ...] = ()  # Поле meta → допустимые значения
+    velocity: Optional[VelocityLimit] = None
+
+    def __post_init__(self):
+        if not (self.currencies or self.min_amount is not None or self.max_amount is not None
+                or self.email_domains or self.meta or self.velocity is not None):
+            raise ValueError(f"Risk rule {self.name} has no conditions")
+
+    @property
+    def decline_message(self) -> str:
+        return self.message or f"Declined by risk rule {self.name}"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RiskRule":
+        """
+        Собрать правило из словаря (формат JSON-файла правил).
+
+        Пример:
+            {"name": "disposable_email", "email_domain": ["mailinator.com"],
+             "min_amount": "100", "currency": ["USD", "EUR"],
+             "meta": {"country": ["KP", "IR"]},
+             "velocity": {"max": 5, "window": 3600},
+             "message": "Suspicious payment"}
+
+        Строковое значение currency, email_domain и полей meta равносильно
+        списку из одного элемента.
+
+        :raises ValueError: Неизвестное поле или правило без условий
+        """
+        unknown = set(data) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown risk rule fields: {', '.join(sorted(unknown))}")
+        velocity = data.get("velocity")
+        return cls(
+            name=str(data["name"]),
+            message=data.get("message"),
+            currencies=frozenset(value.upper() for value in _as_list(data.get("currency"))),
+            min_amount=Decimal(str(data["min_amount"])) if data.get("min_amount") is not None else None,
+            max_amount=Decimal(str(data["max_amount"])) if data.get("max_amount") is not None else None,
+            email_domains=frozenset(value.lower() for value in _as_list(data.get("email_domain"))),
+            meta=tuple(
+                (field, frozenset(_as_list(values)))
+                for field, values in (data.get("meta") or {}).items()
+            ),
+            velocity=VelocityLimit(
+                max_count=int(velocity["max"]), window=float(velocity["window"])
+            ) if velocity is not None else None,
+        )
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+# Предикат условия: (команда, домен email, счётчики скорости) → условие выполнено
+_Predicate = Callable[[PaymentCommand, Optional[str], Sequence[int]], bool]
+
+
+class RiskEngine(RiskAssessorPort):
+    """
+    Движок правил риска, скомпилированных в цепочку предикатов.
+
+    Правила разбираются один раз при создании: каждое условие становится
+    замыканием над заранее подготовленными значениями (Decimal-границы,
+    frozenset валют, доменов и значений meta), правило — кортежем таких
+    замыканий, от дешёвых условий к дорогим. На запрос остаётся пройти
+    по кортежам: без разбора конфигурации, словарей условий и ветвления
+    по их типам. Правила проверяются по порядку, отклоняет первое
+    сработавшее.
+
+    Скорость считается по email (без учёта регистра): на каждое окно
+    правил — один VelocityCounter, в который попадает каждый платёж
+    с email, в том числе отклонённый — попытки тоже считаются.
+    Дубликаты уже существующих платежей из счёта убираются (discard).
+    """
+
+    def __init__(
+            self,
+            rules: Sequence[RiskRule],
+            velocity_buckets: int = 10,
+            velocity_max_keys: int = 100_000,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        :param rules: Правила в порядке проверки
+        :param velocity_buckets: Число ячеек в окне счётчиков скорости
+        :param velocity_max_keys: Максимум email в одной ячейке счётчика
+        :param clock: Источник времени для окон скорости (для тестов)
+        """
+        self._clock = clock
+        self._counters: List[VelocityCounter] = []
+        counter_of: Dict[float, int] = {}
+        compiled = []
+        for rule in rules:
+            if rule.velocity is not None and rule.velocity.window not in counter_of:
+                counter_of[rule.velocity.window] = len(self._counters)
+                self._counters.append(VelocityCounter(rule.velocity.window, velocity_buckets, velocity_max_keys))
+            compiled.append((_compile(rule, counter_of), rule.decline_message))
+        self._rules = tuple(compiled)
+        self._needs_domain = any(rule.email_domains for rule in rules)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> "RiskEngine":
+        """
+        Собрать движок из JSON-файла вида {"rules": [...]} (см. RiskRule.from_dict).
+
+        :param kwargs: Остальные параметры конструктора
+        """
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        return cls([RiskRule.from_dict(rule) for rule in data.get("rules", ())], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def assess(self, command: PaymentCommand) -> Optional[str]:
+        email = command.customer_email
+        domain = None
+        counts: Sequence[int] = ()
+        if email is not None:
+            email = email.lower()
+            if self._needs_domain:
+                domain = email.rpartition("@")[2]
+            if self._counters:
+                now = self._clock()
+                counts = [counter.hit(email, now) for counter in self._counters]
+
+        for predicates, message in self._rules:
+            for predicate in predicates:
+                if not predicate(command, domain, counts):
+                    break
+            else:
+                return message
+        return None
+
+    def discard(self, command: PaymentCommand) -> None:
+        email = command.customer_email
+        if email is None:
+            return
+        email = email.lower()
+        for counter in self._counters:
+            counter.discard(email)
+
+
+def _compile(rule: RiskRule, counter_of: Dict[float, int]) -> Tuple[_Predicate, ...]:
+    """
+    Собрать предикаты правила: сначала дешёвые сравнения, скорость — последней
+    """
+    predicates: List[_Predicate] = []
+
+    if rule.currencies:
+        currencies = rule.currencies
+        predicates.append(lambda command, domain, counts: command.amount.currency in currencies)
+
+    if rule.min_amount is not None:
+        min_amount = rule.min_amount
+        predicates.append(lambda command, domain, counts: command.amount.value >= min_amount)
+
+    if rule.max_amount is not None:
+        max_amount = rule.max_amount
+        predicates.append(lambda command, domain, counts: command.amount.value < max_amount)
+
+    if rule.email_domains:
+        domains = rule.email_domains
+        predicates.append(lambda command, domain, counts: domain in domains)
+
+    for field, values in rule.meta:
+        predicates.append(_meta_predicate(field, values))
+
+    if rule.velocity is not None:
+        position = counter_of[rule.velocity.window]
+        max_count = rule.velocity.max_count
+        predicates.append(lambda command, domain, counts: bool(counts) and counts[position] > max_count)
+
+    return tuple(predicates)
+
+
+def _meta_predicate(field: str, values: FrozenSet[object]) -> _Predicate:
+    def predicate(command: PaymentCommand, domain: Optional[str], counts: Sequence[int]) -> bool:
+        meta = command.meta
+        if not meta:
+            return False
+        try:
+            return meta.get(field, _MISSING) in values
+        except TypeError:
+            # Нехешируемое значение (список, объект) не совпадает ни с одним допустимым
+            return False
+    return predicate
@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+class VelocityCounter:
+    """
+    Число событий по ключу в скользящем окне, с ограниченной памятью.
+
+    Окно делится на buckets ячеек по времени, ячейка — словарь
+    ключ → число событий за её интервал. Счёт ключа — сумма по живым
+    ячейкам, то есть окно приближается с точностью до ширины ячейки
+    (учитывается от window - window/buckets до window секунд).
+    Вышедшая из окна ячейка удаляется целиком — поштучной очистки
+    ключей нет.
+
+    В одной ячейке не больше max_keys ключей: новые ключи сверх этого
+    в ячейке не учитываются (при переполнении правило скорости
+    пропускает, а не отклоняет). Память — не больше buckets * max_keys
+    записей при любом потоке платежей.
+
+    Не потокобезопасно: используется из одного event loop.
+    """
+
+    def __init__(self, window: float, buckets: int = 10, max_keys: int = 100_000):
+        """
+        :param window: Длина окна, секунды
+        :param buckets: Число ячеек в окне (точность окна)
+        :param max_keys: Максимум ключей в одной ячейке
+        """
+        if window <= 0 or buckets <= 0 or max_keys <= 0:
+            raise ValueError("window, buckets and max_keys must be positive")
+        self._width = window / buckets
+        self._buckets = buckets
+        self._max_keys = max_keys
+        # (номер интервала, ключ → число событий), от старых к новым
+        self._ring: Deque[Tuple[int, Dict[str, int]]] = deque()
+
+    def __len__(self) -> int:
+        """
+        Число записей во всех живых ячейках
+        """
+        return sum(len(counts) for _, counts in self._ring)
+
+    def hit(self, key: str, now: float) -> int:
+        """
+        Учесть событие ключа и вернуть число его событий в окне (включая это).
+
+        :param now: Текущее время (монотонные секунды)
+        """
+        ring = self._ring
+        index = int(now // self._width)
+        if not ring or ring[-1][0] < index:
+            ring.append((index, {}))
+            oldest = index - self._buckets
+            while ring[0][0] <= oldest:
+                ring.popleft()
+
+        current = ring[-1][1]
+        count = current.get(key)
+        if count is not None:
+            current[key] = count + 1
+        elif len(current) < self._max_keys:
+            current[key] = 1
+
+        total = 0
+        for _, counts in ring:
+            total += counts.get(key, 0)
+        return total
+
+    def discard(self, key: str) -> None:
+        """
+        Отменить последнее учтённое событие ключа (из самой новой ячейки, где он есть).
+        """
+        for _, counts in reversed(self._ring):
+            count = counts.get(key)
+            if count is not None:
+                if count > 1:
+                    counts[key] = count - 1
+                else:
+                    del counts[key]
+                return
@@ -0,0 +1,43 @@
+"""
+Общий JSON-кодировщик для ответов API и логов.
+
+Если установлен orjson, кодирование идёт через него (байты сразу,
+без промежуточной строки), иначе — через стандартный json с тем же
+результатом по содержимому. Выход всегда компактный и в UTF-8.
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+
+if orjson is not None:
+    _PRETTY = orjson.OPT_INDENT_2
+
+    def dumps(obj: Any, pretty: bool = False) -> bytes:
+        """
+        Закодировать объект в JSON (UTF-8)
+
+        :param pretty: Многострочный вывод с отступом 2
+        """
+        return orjson.dumps(obj, option=_PRETTY) if pretty else orjson.dumps(obj)
+
+    loads = orjson.loads
+
+else:
+    def dumps(obj: Any, pretty: bool = False) -> bytes:
+        """
+        Закодировать объект в JSON (UTF-8)
+
+        :param pretty: Многострочный вывод с отступом 2
+        """
+        if pretty:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
@@ -0,0 +1,15 @@
+from .dispatcher import WebhookDispatcher, WebhookEndpoint, EVENT_TYPES, REFUND_EVENT, event_type
+from .publishing import AsyncWebhookTransactionLogger
+from .signing import SIGNATURE_HEADER, sign, verify
+
+__all__ = [
+    "WebhookDispatcher",
+    "WebhookEndpoint",
+    "EVENT_TYPES",
+    "REFUND_EVENT",
+    "event_type",
+    "AsyncWebhookTransactionLogger",
+    "SIGNATURE_HEADER",
+    "sign",
+    "verify",
+]
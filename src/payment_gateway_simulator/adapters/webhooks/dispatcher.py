@@ -0,0 +1,446 @@
+import asyncio
+import heapq
+import logging
+import random
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import httpx
+
+from ...domain.payment import Payment
+from ...domain.payment_status import PaymentStatus
+from ..serialization import dumps
+from .signing import SIGNATURE_HEADER, sign
+
+logger = logging.getLogger("payment_gateway_simulator.adapters.webhooks")
+
+# Типы событий: платёж перешёл в статус; запись о возврате — отдельное событие
+REFUND_EVENT = "refund.created"
+EVENT_TYPES: FrozenSet[str] = frozenset(
+    [f"payment.{status.value}" for status in PaymentStatus if status is not PaymentStatus.REFUNDED] + [REFUND_EVENT]
+)
+
+
+def event_type(payment: Payment) -> str:
+    """
+    Тип события для записанной транзакции (запись со статусом REFUNDED — возврат)
+    """
+    if payment.status is PaymentStatus.REFUNDED:
+        return REFUND_EVENT
+    return f"payment.{payment.status._value_}"
+
+
+@dataclass(frozen=True)
+class WebhookEndpoint:
+    """
+    Зарегистрированный получатель вебхуков
+    """
+    id: str
+    url: str
+    secret: str
+    events: Optional[FrozenSet[str]]  # None — все типы событий
+    max_concurrency: int  # Максимум одновременных запросов к эндпоинту
+
+
+class _Delivery:
+    """
+    Доставка одного события одному эндпоинту; тело общее для всех эндпоинтов
+    """
+
+    __slots__ = ("event_id", "body", "attempt")
+
+    def __init__(self, event_id: str, body: bytes):
+        self.event_id = event_id
+        self.body = body
+        self.attempt = 0
+
+
+class _EndpointState:
+    """
+    Очередь готовых к отправке доставок и счётчик запросов в полёте
+    """
+
+    __slots__ = ("endpoint", "ready", "in_flight")
+
+    def __init__(self, endpoint: WebhookEndpoint):
+        self.endpoint = endpoint
+        self.ready: Deque[_Delivery] = deque()
+        self.in_flight = 0
+
+
+class WebhookDispatcher:
+    """
+    Асинхронная доставка вебхуков о транзакциях.
+
+    publish() только раскладывает события по очередям эндпоинтов.
+    Задача создаётся на каждый запрос в полёте, а их число ограничено
+    max_concurrency эндпоинта, поэтому ожидающие доставки — просто
+    объекты в очередях: десятки тысяч не стоят десятков тысяч задач.
+
+    Неуспешная доставка (сетевая ошибка или не 2xx) повторяется с
+    экспоненциальной задержкой и случайным разбросом. Повторы ждут в
+    одной куче таймеров, которую разбирает одна фоновая задача.
+    После max_attempts попыток доставка отбрасывается.
+
+    Все запросы идут через один httpx.AsyncClient с пулом соединений.
+    Очереди живут в памяти процесса и теряются при остановке.
+    Должен использоваться из одного event loop.
+    """
+
+    def __init__(
+            self,
+            max_pending: int = 100_000,
+            max_attempts: int = 8,
+            backoff_base: float = 1.0,
+            backoff_max: float = 600.0,
+            timeout: float = 10.0,
+            max_connections: int = 200,
+            default_concurrency: int = 10,
+            transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        :param max_pending: Максимум недоставленных доставок; сверх — новые отбрасываются
+        :param max_attempts: Максимум попыток одной доставки
+        :param backoff_base: Задержка перед первым повтором, секунды (далее удваивается)
+        :param backoff_max: Максимальная задержка между попытками, секунды
+        :param timeout: Таймаут одного запроса, секунды
+        :param max_connections: Размер пула соединений клиента
+        :param default_concurrency: max_concurrency для эндпоинтов, где он не задан
+        :param transport: Транспорт httpx (для тестов — httpx.MockTransport)
+        """
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+        if default_concurrency <= 0:
+            raise ValueError("default_concurrency must be positive")
+
+        self._max_pending = max_pending
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._default_concurrency = default_concurrency
+        self._transport = transport
+
+        self._endpoints: Dict[str, _EndpointState] = {}
+        # Повторы: (время попытки по loop.time(), порядковый номер, эндпоинт, доставка)
+        self._timers: List[Tuple[float, int, _EndpointState, _Delivery]] = []
+        self._timer_seq = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._scheduler: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._closed = False
+
+        self._pending = 0
+        self._delivered = 0
+        self._retried = 0
+        self._failed = 0
+        self._dropped = 0
+
+    # === Эндпоинты ===
+
+    def register(
+            self,
+            url: str,
+            secret: Optional[str] = None,
+            events: Optional[Iterable[str]] = None,
+            max_concurrency: Optional[int] = None
+    ) -> WebhookEndpoint:
+        """
+        Зарегистрировать эндпоинт.
+
+        :param url: Адрес, на который отправляются POST-запросы
+        :param secret: Секрет подписи (если None — генерируется)
+        :param events: Типы событий из EVENT_TYPES (если None — все)
+        :param max_concurrency: Максимум одновременных запросов
+        :raises ValueError: При неизвестном типе события или неположительном max_concurrency
+        """
+        if events is not None:
+            events = frozenset(events)
+            unknown = events - EVENT_TYPES
+            if unknown:
+                raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+        if max_concurrency is None:
+            max_concurrency = self._default_concurrency
+        elif max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        endpoint = WebhookEndpoint(
+            id=f"we_{secrets.token_hex(8)}",
+            url=url,
+            secret=secret if secret is not None else f"whsec_{secrets.token_urlsafe(24)}",
+            events=events,
+            max_concurrency=max_concurrency
+        )
+        self._endpoints[endpoint.id] = _EndpointState(endpoint)
+        return endpoint
+
+    def remove(self, endpoint_id: str) -> bool:
+        """
+        Удалить эндпоинт вместе с его недоставленными событиями.
+
+        :return: True, если эндпоинт был зарегистрирован
+        """
+        state = self._endpoints.pop(endpoint_id, None)
+        if state is None:
+            return False
+        # Ожидающие повтора отбрасываются при срабатывании таймера,
+        # запросы в полёте — по завершении
+        self._pending -= len(state.ready)
+        state.ready.clear()
+        return True
+
+    def endpoints(self) -> List[WebhookEndpoint]:
+        """
+        Зарегистрированные эндпоинты в порядке регистрации.
+        """
+        return [state.endpoint for state in self._endpoints.values()]
+
+    def get(self, endpoint_id: str) -> Optional[WebhookEndpoint]:
+        """
+        Эндпоинт по id (или None).
+        """
+        state = self._endpoints.get(endpoint_id)
+        return state.endpoint if state is not None else None
+
+    # === Публикация ===
+
+    def publish(self, payments: List[Payment]) -> None:
+        """
+        Поставить события о транзакциях в очереди подписанных эндпоинтов.
+
+        Не ждёт отправки. Тело события сериализуется один раз для всех
+        эндпоинтов. Если недоставленных больше max_pending, новые
+        доставки отбрасываются (счётчик dropped).
+        """
+        if not self._endpoints:
+            return
+        if self._closed:
+            raise RuntimeError("WebhookDispatcher is closed")
+        self._ensure_started()
+
+        states = list(self._endpoints.values())
+        touched = []
+        for payment in payments:
+            kind = event_type(payment)
+            event_id = f"evt_{secrets.token_hex(12)}"
+            delivery_body = None
+            for state in states:
+                events = state.endpoint.events
+                if events is not None and kind not in events:
+                    continue
+                if self._pending >= self._max_pending:
+                    self._dropped += 1
+                    continue
+                if delivery_body is None:
+                    delivery_body = _event_body(event_id, kind, payment)
+                state.ready.append(_Delivery(event_id, delivery_body))
+                self._pending += 1
+                if len(state.ready) == 1:
+                    touched.append(state)
+
+        for state in touched:
+            self._pump(state)
+
+    # === Жизненный цикл ===
+
+    async def aclose(self) -> None:
+        """
+        Остановить доставку: прервать запросы в полёте и закрыть клиент.
+
+        Недоставленные события теряются.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        tasks = list(self._tasks)
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Счётчики доставки.
+
+        pending — недоставленные (в очередях, ждут повтора или в полёте),
+        in_flight — запросы в полёте, scheduled — ждут повтора,
+        delivered / failed — завершены успешно / после всех попыток,
+        retried — назначенные повторы, dropped — отброшены из-за max_pending.
+        """
+        return {
+            "endpoints": len(self._endpoints),
+            "pending": self._pending,
+            "in_flight": len(self._tasks),
+            "scheduled": len(self._timers),
+            "delivered": self._delivered,
+            "retried": self._retried,
+            "failed": self._failed,
+            "dropped": self._dropped,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._scheduler is None:
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections
+                )
+            )
+            self._wakeup = asyncio.Event()
+            self._scheduler = asyncio.get_running_loop().create_task(self._run_timers())
+
+    # === Отправка ===
+
+    def _pump(self, state: _EndpointState) -> None:
+        """
+        Запустить отправку готовых доставок в пределах max_concurrency эндпоинта
+        """
+        ready, limit = state.ready, state.endpoint.max_concurrency
+        while ready and state.in_flight < limit:
+            delivery = ready.popleft()
+            state.in_flight += 1
+            task = asyncio.get_running_loop().create_task(self._send(state, delivery))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, state: _EndpointState, delivery: _Delivery) -> None:
+        endpoint = state.endpoint
+        delivery.attempt += 1
+        timestamp = int(time.time())
+        retry_after = None
+        try:
+            response = await self._client.post(
+                endpoint.url,
+                content=delivery.body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Webhook-Id": delivery.event_id,
+                    "Webhook-Attempt": str(delivery.attempt),
+                    SIGNATURE_HEADER: sign(endpoint.secret, timestamp, delivery.body),
+                }
+            )
+            succeeded = response.is_success
+            if not succeeded:
+                retry_after = _retry_after(response)
+        except httpx.HTTPError:
+            succeeded = False
+        except Exception:
+            # Ошибка одной доставки не должна останавливать остальные
+            logger.exception("Webhook delivery to %s failed", endpoint.url)
+            succeeded = False
+        finally:
+            state.in_flight -= 1
+
+        active = self._endpoints.get(endpoint.id) is state
+        if succeeded:
+            self._delivered += 1
+            self._pending -= 1
+        elif not active:
+            self._pending -= 1
+        elif delivery.attempt >= self._max_attempts:
+            self._failed += 1
+            self._pending -= 1
+        else:
+            self._retried += 1
+            self._schedule(state, delivery, self._backoff(delivery.attempt, retry_after))
+
+        if active:
+            self._pump(state)
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """
+        Задержка перед следующей попыткой: base·2^(attempt−1) со случайным
+        разбросом в пределах половины, не больше backoff_max; Retry-After
+        получателя, если он больше
+        """
+        delay = min(self._backoff_base * 2 ** (attempt - 1), self._backoff_max)
+        delay *= 0.5 + random.random() / 2
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self._backoff_max))
+        return delay
+
+    def _schedule(self, state: _EndpointState, delivery: _Delivery, delay: float) -> None:
+        due = asyncio.get_running_loop().time() + delay
+        self._timer_seq += 1
+        heapq.heappush(self._timers, (due, self._timer_seq, state, delivery))
+        if self._timers[0][3] is delivery:
+            # Новый ближайший таймер — будим планировщик пересчитать ожидание
+            self._wakeup.set()
+
+    async def _run_timers(self) -> None:
+        """
+        Переносить доставки, чья задержка истекла, в очереди эндпоинтов
+        """
+        loop = asyncio.get_running_loop()
+        timers, wakeup = self._timers, self._wakeup
+        while True:
+            wakeup.clear()
+            if not timers:
+                await wakeup.wait()
+                continue
+            delay = timers[0][0] - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = loop.time()
+            touched = []
+            while timers and timers[0][0] <= now:
+                _, _, state, delivery = heapq.heappop(timers)
+                if self._endpoints.get(state.endpoint.id) is not state:
+                    self._pending -= 1
+                    continue
+                state.ready.append(delivery)
+                touched.append(state)
+            for state in touched:
+                self._pump(state)
+
+
+def _event_body(event_id: str, kind: str, payment: Payment) -> bytes:
+    """
+    Тело события: поля платежа как в ответах API, сумма — строкой
+    """
+    return dumps({
+        "id": event_id,
+        "type": kind,
+        "created": datetime.now().isoformat(),
+        "data": {
+            "payment_id": payment.id.value,
+            "amount": str(payment.amount.value),
+            "amount_minor": payment.amount.minor,
+            "currency": payment.amount.currency,
+            "status": payment.status._value_,
+            "created_at": payment.created_at.isoformat(),
+            "description": payment.description,
+            "customer_email": payment.customer_email,
+            "error_message": payment.error_message,
+        },
+    })
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Retry-After в секундах (формат даты не поддерживается)
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
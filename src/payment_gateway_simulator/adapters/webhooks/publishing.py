@@ -0,0 +1,32 @@
+from typing import List
+
+from ...domain import (
+    Payment,
+    PaymentId,
+    AsyncTransactionLoggerPort,
+)
+from .dispatcher import WebhookDispatcher
+
+
+class AsyncWebhookTransactionLogger(AsyncTransactionLoggerPort):
+    """
+    Декоратор AsyncTransactionLoggerPort, публикующий вебхуки о транзакциях.
+
+    Событие ставится в очередь после успешной записи во внутренний логгер;
+    отправка идёт в фоне и запрос не задерживает.
+    """
+
+    def __init__(self, inner: AsyncTransactionLoggerPort, dispatcher: WebhookDispatcher):
+        self._inner = inner
+        self._dispatcher = dispatcher
+
+    async def log_transaction(self, payment: Payment) -> None:
+        await self._inner.log_transaction(payment)
+        self._dispatcher.publish([payment])
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        await self._inner.log_transactions(payments)
+        self._dispatcher.publish(payments)
+
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        return await self._inner.get_transactions_by_payment_id(payment_id)
@@ -0,0 +1,44 @@
+"""
+Подпись тел вебхуков HMAC-SHA256 (схема как у Stripe).
+
+Подписывается строка "<timestamp>.<тело>", заголовок — "t=<timestamp>,v1=<hex>".
+Метка времени в подписи не даёт переиграть старый запрос.
+"""
+import hashlib
+import hmac
+import time
+from typing import Optional
+
+SIGNATURE_HEADER = "Webhook-Signature"
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """
+    Значение заголовка подписи для тела запроса.
+
+    :param secret: Секрет эндпоинта
+    :param timestamp: Время отправки, секунды Unix
+    :param body: Тело запроса как есть
+    """
+    digest = hmac.new(secret.encode("utf-8"), b"%d." % timestamp + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify(secret: str, header: str, body: bytes, tolerance: float = 300.0, now: Optional[float] = None) -> bool:
+    """
+    Проверить подпись на стороне получателя.
+
+    :param header: Значение заголовка Webhook-Signature
+    :param tolerance: Допустимый возраст подписи, секунды
+    :param now: Текущее время (по умолчанию time.time())
+    :return: True, если подпись верна и не устарела
+    """
+    fields = dict(part.split("=", 1) for part in header.split(",") if "=" in part)
+    try:
+        timestamp = int(fields["t"])
+        signature = fields["v1"]
+    except (KeyError, ValueError):
+        return False
+    if abs((time.time() if now is None else now) - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), f"t={timestamp},v1={signature}")
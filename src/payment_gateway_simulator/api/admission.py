@@ -0,0 +1,282 @@
+import asyncio
+import math
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Причины отказа (метка reason в метриках)
+RATE_LIMITED = "rate_limited"
+TOO_MANY_IN_FLIGHT = "in_flight"
+LOOP_LAG = "loop_lag"
+
+
+class TokenBucketTable:
+    """
+    Token bucket на каждый ключ (API-ключ, мерчант, адрес клиента).
+
+    Состояние ведра — два числа (токены и момент последнего обращения)
+    в общих массивах array('d'); словарь хранит только ключ → номер ячейки.
+    Пополнение ленивое: токены досчитываются при обращении к ключу,
+    фоновых задач и таймеров нет.
+
+    Таблица ограничена max_keys. При заполнении сначала удаляются ключи,
+    чьё ведро уже полное (для них отсутствие записи ничего не меняет),
+    затем — самые старые по первому обращению, с запасом, чтобы
+    следующие вставки не запускали очистку снова.
+
+    Не потокобезопасно: используется из одного event loop.
+    """
+
+    def __init__(
+            self,
+            rate: float,
+            burst: float,
+            max_keys: int = 100_000,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        :param rate: Пополнение, токенов в секунду
+        :param burst: Ёмкость ведра (допустимый всплеск)
+        :param max_keys: Максимум ключей в таблице
+        :param clock: Источник времени (для тестов)
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        if max_keys <= 0:
+            raise ValueError("max_keys must be positive")
+        self._rate = rate
+        self._burst = float(burst)
+        self._max_keys = max_keys
+        self._clock = clock
+        self._slots: Dict[str, int] = {}
+        self._tokens = array("d")
+        self._stamps = array("d")
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """
+        Списать cost токенов из ведра ключа.
+
+        :return: 0.0, если запрос разрешён, иначе через сколько секунд токенов хватит
+        """
+        now = self._clock()
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._allocate(key)
+            tokens = self._burst
+        else:
+            tokens = self._tokens[slot] + (now - self._stamps[slot]) * self._rate
+            if tokens > self._burst:
+                tokens = self._burst
+        self._stamps[slot] = now
+        if tokens >= cost:
+            self._tokens[slot] = tokens - cost
+            return 0.0
+        self._tokens[slot] = tokens
+        return (cost - tokens) / self._rate
+
+    def _allocate(self, key: str) -> int:
+        if len(self._slots) >= self._max_keys:
+            self._evict()
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._tokens)
+            self._tokens.append(0.0)
+            self._stamps.append(0.0)
+        self._slots[key] = slot
+        return slot
+
+    def _evict(self) -> None:
+        now = self._clock()
+        rate, burst = self._rate, self._burst
+        tokens, stamps = self._tokens, self._stamps
+        idle = [
+            key for key, slot in self._slots.items()
+            if tokens[slot] + (now - stamps[slot]) * rate >= burst
+        ]
+        for key in idle:
+            self._free.append(self._slots.pop(key))
+
+        # Запас в 1/16 таблицы: очистка (полный проход) случается не чаще раза на max_keys/16 вставок
+        target = self._max_keys - max(1, self._max_keys // 16)
+        if len(self._slots) > target:
+            oldest = list(self._slots)[:len(self._slots) - target]
+            for key in oldest:
+                self._free.append(self._slots.pop(key))
+
+
+class AdmissionController:
+    """
+    Глобальный контроль допуска: сброс нагрузки до начала обработки.
+
+    Запрос отклоняется, если одновременно обрабатывается max_in_flight
+    запросов или задержка event loop превысила max_loop_lag. Задержку
+    меряет фоновая задача: насколько позже заказанного она просыпается
+    из asyncio.sleep(lag_interval). Без новых пиков оценка уменьшается
+    вдвое за каждое измерение — одиночная пауза не держит сброс нагрузки
+    дольше нескольких интервалов. Дешёвый отказ сразу лучше для хвоста
+    задержек, чем очередь внутри обработчиков.
+    """
+
+    def __init__(
+            self,
+            max_in_flight: int = 0,
+            max_loop_lag: float = 0.0,
+            lag_interval: float = 0.05
+    ):
+        """
+        :param max_in_flight: Максимум одновременных запросов (0 — без ограничения)
+        :param max_loop_lag: Порог задержки event loop, секунды (0 — не измерять)
+        :param lag_interval: Период измерения задержки, секунды
+        """
+        if lag_interval <= 0:
+            raise ValueError("lag_interval must be positive")
+        self._max_in_flight = max_in_flight
+        self._max_loop_lag = max_loop_lag
+        self._lag_interval = lag_interval
+        self._in_flight = 0
+        self._loop_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def loop_lag(self) -> float:
+        """
+        Текущая оценка задержки event loop, секунды
+        """
+        return self._loop_lag
+
+    def check(self) -> Optional[Tuple[str, float]]:
+        """
+        Проверить, можно ли принять запрос.
+
+        :return: None или (причина отказа, рекомендуемая пауза перед повтором в секундах)
+        """
+        if self._max_loop_lag and self._loop_lag > self._max_loop_lag:
+            return LOOP_LAG, self._loop_lag
+        if self._max_in_flight and self._in_flight >= self._max_in_flight:
+            return TOO_MANY_IN_FLIGHT, 1.0
+        return None
+
+    def enter(self) -> None:
+        self._in_flight += 1
+
+    def leave(self) -> None:
+        self._in_flight -= 1
+
+    async def start(self) -> None:
+        """
+        Запустить измерение задержки event loop (если задан порог).
+        """
+        if self._max_loop_lag and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._monitor())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self._lag_interval
+        while True:
+            started = loop.time()
+            await asyncio.sleep(interval)
+            self._loop_lag = max(loop.time() - started - interval, self._loop_lag * 0.5)
+
+
+_REJECTIONS = {
+    RATE_LIMITED: (429, b'{"detail":"Rate limit exceeded"}'),
+    TOO_MANY_IN_FLIGHT: (503, b'{"detail":"Too many requests in flight"}'),
+    LOOP_LAG: (503, b'{"detail":"Service overloaded"}'),
+}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI-middleware: лимит запросов по ключу и глобальный контроль допуска.
+
+    Применяется к путям из paths (сам путь и всё под ним). Сначала
+    проверяется глобальная перегрузка (503), затем ведро ключа (429) —
+    отклонённый глобально запрос не тратит токены клиента. Ключ — значение
+    заголовка key_header, без него — адрес клиента. Отказ отдаётся сразу,
+    без чтения тела и маршрутизации, с заголовком Retry-After.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            controller: AdmissionController,
+            limiter: Optional[TokenBucketTable] = None,
+            paths: Sequence[str] = ("/api/pay",),
+            key_header: str = "X-API-Key",
+            on_reject: Optional[Callable[[str], None]] = None
+    ):
+        """
+        :param on_reject: Вызывается с причиной каждого отказа (для метрик)
+        """
+        self.app = app
+        self._controller = controller
+        self._limiter = limiter
+        self._paths = tuple(paths)
+        self._key_header = key_header.lower().encode("latin-1")
+        self._on_reject = on_reject
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._applies(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        controller = self._controller
+        rejection = controller.check()
+        if rejection is None and self._limiter is not None:
+            wait = self._limiter.acquire(self._key(scope))
+            if wait:
+                rejection = RATE_LIMITED, wait
+        if rejection is not None:
+            await self._reject(send, *rejection)
+            return
+
+        controller.enter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.leave()
+
+    def _applies(self, path: str) -> bool:
+        for prefix in self._paths:
+            if path == prefix or path.startswith(prefix) and path[len(prefix)] == "/":
+                return True
+        return False
+
+    def _key(self, scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == self._key_header:
+                return value.decode("latin-1")
+        client = scope.get("client")
+        return f"ip:{client[0]}" if client else "ip:"
+
+    async def _reject(self, send: Send, reason: str, retry_after: float) -> None:
+        if self._on_reject is not None:
+            self._on_reject(reason)
+        status, body = _REJECTIONS[reason]
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """
+    Сериализованный ответ, сохранённый для повтора по Idempotency-Key.
+    """
+    status_code: int
+    body: bytes
+    fingerprint: str  # Отпечаток тела запроса, на который был дан ответ
+
+
+class IdempotencyKeyConflict(Exception):
+    """Ключ уже использован с другим телом запроса"""
+
+
+class IdempotencyCache:
+    """
+    Ограниченный кэш ответов по Idempotency-Key (TTL + вытеснение LRU).
+
+    Повторный запрос с тем же ключом получает сохранённый ответ без
+    повторного выполнения сценария. Одновременные запросы с одним ключом
+    объединяются: выполняется только первый, остальные ждут его результат.
+    Выполнение идёт отдельной задачей: отмена первого запроса (например,
+    клиент отключился) не прерывает его, и ответ всё равно попадает в кэш.
+
+    Кэш живёт в памяти процесса: при нескольких воркерах каждый
+    воркер хранит свои ключи.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = 100_000,
+            ttl: float = 24 * 3600,
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        :param max_entries: Максимум ключей; при превышении вытесняется самый старый по использованию
+        :param ttl: Время жизни ответа, секунды
+        :param clock: Источник времени (для тестов)
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._clock = clock
+        # key → (ответ, момент истечения); порядок — от давно использованных к недавним
+        self._entries: "OrderedDict[str, Tuple[CachedResponse, float]]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Получить сохранённый ответ (None, если ключа нет или он истёк).
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        response, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        """
+        Сохранить ответ, вытеснив самые давно использованные ключи при переполнении.
+        """
+        self._entries[key] = (response, self._clock() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def run(
+            self,
+            key: str,
+            fingerprint: str,
+            execute: Callable[[], Awaitable[CachedResponse]]
+    ) -> Tuple[CachedResponse, bool]:
+        """
+        Вернуть ответ для ключа, выполнив execute не более одного раза.
+
+        :param key: Значение заголовка Idempotency-Key
+        :param fingerprint: Отпечаток тела запроса
+        :param execute: Выполнение запроса; ответы со статусом < 500 кэшируются
+        :return: (ответ, True — если это повтор сохранённого ответа)
+        :raises IdempotencyKeyConflict: Ключ уже использован с другим телом
+        """
+        while True:
+            cached = self.get(key)
+            if cached is not None:
+                if cached.fingerprint != fingerprint:
+                    raise IdempotencyKeyConflict(key)
+                return cached, True
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+
+            inflight_fingerprint, task = inflight
+            if inflight_fingerprint != fingerprint:
+                raise IdempotencyKeyConflict(key)
+            try:
+                return await asyncio.shield(task), True
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+            except Exception:
+                pass
+            # Первый запрос завершился ошибкой без ответа — пробуем сами
+
+        task = asyncio.get_running_loop().create_task(self._execute(key, execute))
+        # Исключение задачи, которую никто не ждёт (все запросы отменены), не попадает в лог asyncio
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = (fingerprint, task)
+        return await asyncio.shield(task), False
+
+    async def _execute(self, key: str, execute: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        try:
+            response = await execute()
+        finally:
+            del self._inflight[key]
+        if response.status_code < 500:
+            self.put(key, response)
+        return response
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
@@ -1,7 +1,47 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from ..config import settings
+from .admission import AdmissionController, AdmissionMiddleware, TokenBucketTable
 from .routes.payments import router as payments_router
+from .routes.payments import startup as startup_payments
+from .routes.payments import shutdown as shutdown_payments
+from .routes.payments import metrics_registry, payment_metrics
+from .routes.reports import router as reports_router
+from .routes.webhooks import router as webhooks_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Жизненный цикл приложения: при старте восстанавливаем таймеры
+    авторизаций и запускаем измерение задержки event loop,
+    при остановке дописываем логи
+    """
+    await startup_payments()
+    await admission_controller.start()
+    yield
+    await admission_controller.aclose()
+    await shutdown_payments()
+
+
+# Контроль допуска и лимит запросов — общие для всех запросов процесса
+admission_controller = AdmissionController(
+    max_in_flight=settings.admission_max_in_flight,
+    max_loop_lag=settings.admission_max_loop_lag,
+    lag_interval=settings.admission_lag_interval
+)
+rate_limiter = TokenBucketTable(
+    rate=settings.rate_limit_per_second,
+    burst=settings.rate_limit_burst,
+    max_keys=settings.rate_limit_max_keys
+) if settings.rate_limit_per_second > 0 else None
+
 
 # Создаём приложение
 app = FastAPI(
@@ -10,6 +50,18 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan,
+)
+
+# Лимиты проверяются до разбора запроса; middleware добавлен раньше CORS,
+# поэтому ответы 429/503 тоже получают CORS-заголовки
+app.add_middleware(
+    AdmissionMiddleware,
+    controller=admission_controller,
+    limiter=rate_limiter,
+    paths=("/api/pay",),
+    key_header=settings.rate_limit_key_header,
+    on_reject=payment_metrics.record_rejection,
 )
 
 # Разрешаем CORS (чтобы тесты из браузера/других сервисов могли вызывать API)
@@ -21,8 +73,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    Считаем ошибки валидации Pydantic и отвечаем стандартным 422
+    """
+    payment_metrics.record_validation_errors(exc.errors())
+    return await request_validation_exception_handler(request, exc)
+
+
 # Подключаем роуты
 app.include_router(payments_router, prefix="/api")
+app.include_router(reports_router, prefix="/api")
+app.include_router(webhooks_router, prefix="/api")
 
 
 @app.get("/health")
@@ -30,4 +93,14 @@ async def health_check():
     """
     Проверка работоспособности сервиса
     """
-    return {"status": "ok", "service": "payment-gateway-simulator"}
\ No newline at end of file
+    return {"status": "ok", "service": "payment-gateway-simulator"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """
+    Метрики процесса в текстовом формате Prometheus
+    """
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
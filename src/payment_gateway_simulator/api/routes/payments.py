@@ -1,12 +1,70 @@
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
+import csv
+from dataclasses import replace
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from hashlib import blake2b
+import io
+import time
+from typing import AsyncIterator, List, Literal, Optional, Union
 
-from ...use_cases import ProcessPaymentUseCase, ProcessPaymentInput
-from ...adapters.payment import InMemoryPaymentAdapter
-from ...adapters.logging import ConsoleLoggerAdapter
-from ...domain import Payment, PaymentStatus
+from ...use_cases import (
+    AsyncProcessPaymentUseCase,
+    AsyncRefundPaymentUseCase,
+    AsyncAuthorizePaymentUseCase,
+    AsyncCapturePaymentUseCase,
+    AsyncVoidPaymentUseCase,
+    ProcessPaymentInput,
+    RefundPaymentInput,
+    AuthorizePaymentInput,
+    CapturePaymentInput,
+    VoidPaymentInput,
+)
+from ...use_cases.core import build_interceptors, configure_interceptors
+from ...adapters.payment import (
+    AsyncInMemoryPaymentAdapter,
+    AsyncSimulatedPaymentAdapter,
+    InMemoryPaymentAdapter,
+    PaymentSimulator,
+    SimulationConfig,
+    AsyncSqlitePaymentAdapter,
+    AsyncSharedPaymentAdapter,
+    SharedPaymentAdapter,
+    SqlitePaymentAdapter,
+)
+from ...adapters.payment.shared import parse_address
+from ...adapters.logging import BufferedLoggerAdapter, FileTransactionLoggerAdapter
+from ...adapters.reporting import AsyncAggregatingTransactionLogger, VolumeAggregator
+from ...adapters.webhooks import AsyncWebhookTransactionLogger, WebhookDispatcher
+from ...adapters.expiry import AsyncExpiryTrackingTransactionLogger, AuthorizationExpiryScheduler
+from ...adapters.risk import RiskEngine
+from ...adapters.fx import LocalFxRateProvider
+from ...adapters.serialization import dumps
+from ...adapters.metrics import (
+    MetricsRegistry,
+    PaymentMetrics,
+    AsyncInstrumentedPaymentProcessor,
+    AsyncInstrumentedTransactionLogger,
+)
+from ...config import settings
+from ..idempotency import CachedResponse, IdempotencyCache, IdempotencyKeyConflict
+from ..streaming import NdjsonStreamingResponse, ndjson_batches
+from ...domain.currency import MAX_MINOR, from_minor
+from ...domain import (
+    Payment,
+    PaymentId,
+    PaymentStatus,
+    PaymentQuery,
+    PaymentCursor,
+    AsyncPaymentProcessorPort,
+    PaymentProcessingError,
+    PaymentNotFoundError,
+    PaymentAlreadyExistsError,
+)
 
 # Создаём роутер
 router = APIRouter(tags=["payments"])
@@ -14,101 +72,966 @@ router = APIRouter(tags=["payments"])
 
 # === DTO для запросов/ответов ===
 
+def _one_amount(model: BaseModel, required: bool) -> BaseModel:
+    """
+    Проверить, что сумма задана не более чем одним способом (и задана, если required)
+    """
+    if model.amount is not None and model.amount_minor is not None:
+        raise ValueError("Specify either amount or amount_minor, not both")
+    if required and model.amount is None and model.amount_minor is None:
+        raise ValueError("Either amount or amount_minor is required")
+    return model
+
+
 class PaymentRequest(BaseModel):
     """
     Запрос на создание платежа
+
+    Сумма — точным десятичным числом (amount, лучше строкой: "100.50")
+    или целым числом минорных единиц валюты (amount_minor: 10050).
     """
     payment_id: str = Field(..., min_length=1, max_length=100)
-    amount: float = Field(..., gt=0)
+    amount: Optional[Decimal] = Field(None, gt=0)
+    amount_minor: Optional[int] = Field(None, gt=0, le=MAX_MINOR)
     currency: str = Field(..., min_length=3, max_length=3, pattern="^[A-Z]{3}$")
     description: Optional[str] = Field(None, max_length=500)
     customer_email: Optional[str] = Field(None, pattern=r"^[^@]+@[^@]+\.[^@]+$")
     meta: Optional[dict] = None
 
+    @model_validator(mode="after")
+    def _check_amount(self) -> "PaymentRequest":
+        return _one_amount(self, required=True)
+
 
 class PaymentResponse(BaseModel):
     """
     Ответ с информацией о платеже
+
+    amount — точная десятичная строка в экспоненте валюты ("100.50", "500" для JPY),
+    amount_minor — та же сумма в минорных единицах.
     """
     payment_id: str
-    amount: float
+    amount: Decimal
+    amount_minor: int
     currency: str
     status: str
     description: Optional[str] = None
     customer_email: Optional[str] = None
     created_at: str
+    error_message: Optional[str] = None
+    refunded_amount: Optional[Decimal] = None
+    refunded_minor: Optional[int] = None
+    expires_at: Optional[str] = None  # Срок авторизации (только для статуса pending)
+    # Сумма в валюте расчётов по курсу на момент обработки (если настроены курсы и валюта расчётов)
+    settlement_amount: Optional[Decimal] = None
+    settlement_minor: Optional[int] = None
+    settlement_currency: Optional[str] = None
+
+
+# Максимальный срок авторизации, секунды
+MAX_HOLD_SECONDS = 31 * 24 * 3600
+
+
+class AuthorizeRequest(PaymentRequest):
+    """
+    Запрос на авторизацию: поля платежа и срок блокировки средств
+
+    Без hold_seconds действует срок по умолчанию (PGS_AUTHORIZATION_HOLD_SECONDS).
+    """
+    hold_seconds: Optional[float] = Field(None, gt=0, le=MAX_HOLD_SECONDS)
+
+
+class VoidRequest(BaseModel):
+    """
+    Запрос на отмену авторизации
+    """
+    reason: Optional[str] = Field(None, max_length=500)
+
+
+class RefundRequest(BaseModel):
+    """
+    Запрос на возврат (без amount и amount_minor — возврат всего остатка)
+    """
+    amount: Optional[Decimal] = Field(None, gt=0)
+    amount_minor: Optional[int] = Field(None, gt=0, le=MAX_MINOR)
+    currency: Optional[str] = Field(None, min_length=3, max_length=3, pattern="^[A-Z]{3}$")
+    reason: Optional[str] = Field(None, max_length=500)
+
+    @model_validator(mode="after")
+    def _check_amount(self) -> "RefundRequest":
+        return _one_amount(self, required=False)
+
+
+class RefundResponse(BaseModel):
+    """
+    Ответ на возврат: запись о возврате и состояние платежа после него
+    """
+    payment_id: str
+    amount: Decimal
+    amount_minor: int
+    currency: str
+    created_at: str
+    description: Optional[str] = None
+    payment: Optional[PaymentResponse] = None
+
+
+# Максимальное число платежей в одном пакетном запросе
+MAX_BATCH_SIZE = 100_000
+
+
+class BatchPaymentRequest(BaseModel):
+    """
+    Пакетный запрос на создание платежей
+    """
+    payments: List[PaymentRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchPaymentItemResponse(BaseModel):
+    """
+    Результат обработки одного платежа из пакета
+    """
+    payment_id: str
+    success: bool
+    payment: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+
+
+class BatchPaymentResponse(BaseModel):
+    """
+    Ответ на пакетный запрос
+    """
+    total: int
+    succeeded: int
+    failed: int
+    results: List[BatchPaymentItemResponse]
+
+
+class PaymentListResponse(BaseModel):
+    """
+    Страница выборки платежей; next_cursor передаётся в cursor за следующей страницей
+    """
+    items: List[PaymentResponse]
+    next_cursor: Optional[str] = None
+
+
+# Максимальный размер страницы выборки
+MAX_PAGE_SIZE = 1000
+
+
+class StreamPaymentItemResponse(BaseModel):
+    """
+    Строка ответа потокового импорта: результат платежа из строки line тела запроса
+    """
+    line: int
+    payment_id: Optional[str] = None
+    success: bool
+    payment: Optional[PaymentResponse] = None
+    error: Optional[str] = None
+
+
+def _to_response(payment: Payment) -> dict:
+    """
+    Преобразовать доменный объект в тело ответа по схеме PaymentResponse.
+
+    Словарь кодируется напрямую (_json_response), без построения модели
+    и jsonable_encoder; модели остаются только для OpenAPI-схемы.
+    Порядок и типы полей совпадают с PaymentResponse; суммы — точные
+    десятичные строки, как их сериализует Pydantic для Decimal.
+    """
+    amount = payment.amount
+    refunded_amount = payment.refunded_amount
+    settlement_amount = payment.settlement_amount
+    return {
+        "payment_id": payment.id.value,
+        "amount": str(amount.value),
+        "amount_minor": amount.minor,
+        "currency": amount.currency,
+        "status": payment.status.value,
+        "description": payment.description,
+        "customer_email": payment.customer_email,
+        "created_at": payment.created_at.isoformat(),
+        "error_message": payment.error_message,
+        "refunded_amount": str(refunded_amount.value) if refunded_amount is not None else None,
+        "refunded_minor": refunded_amount.minor if refunded_amount is not None else None,
+        "expires_at": payment.expires_at.isoformat() if payment.expires_at is not None else None,
+        "settlement_amount": str(settlement_amount.value) if settlement_amount is not None else None,
+        "settlement_minor": settlement_amount.minor if settlement_amount is not None else None,
+        "settlement_currency": settlement_amount.currency if settlement_amount is not None else None,
+    }
+
+
+def _json_response(content: dict, status_code: int = status.HTTP_200_OK, headers: Optional[dict] = None) -> Response:
+    """
+    Готовый JSON-ответ из байтов общего кодировщика (orjson, если установлен)
+    """
+    return Response(dumps(content), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def _etag(payment: Payment) -> str:
+    """
+    Сильный ETag по полям, которые меняются вместе с состоянием платежа
+    """
+    digest = blake2b(
+        f"{payment.id.value}|{payment.status.value}|{payment.amount.value}|"
+        f"{payment.amount.currency}|{payment.created_at.isoformat()}|"
+        f"{payment.refunded_amount.value if payment.refunded_amount is not None else ''}".encode("utf-8"),
+        digest_size=12
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Проверка заголовка If-None-Match (слабое сравнение, поддержка списка и *)
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _request_amount(request: Union[PaymentRequest, RefundRequest], currency: str) -> Optional[Decimal]:
+    """
+    Точная сумма запроса: amount как есть или amount_minor в экспоненте валюты
+    """
+    if request.amount_minor is not None:
+        return from_minor(request.amount_minor, currency)
+    return request.amount
+
+
+def _to_input(request: PaymentRequest) -> ProcessPaymentInput:
+    """
+    Преобразовать DTO запроса во входные данные сценария
+    """
+    return ProcessPaymentInput(
+        payment_id=request.payment_id,
+        amount=_request_amount(request, request.currency),
+        currency=request.currency,
+        description=request.description,
+        customer_email=request.customer_email,
+        meta=request.meta
+    )
 
 
 # === Инициализация зависимостей ===
 
-# Создаём адаптеры (реализации портов)
-_payment_adapter = InMemoryPaymentAdapter()
-_logger_adapter = ConsoleLoggerAdapter(pretty=False)
+def _build_payment_adapter() -> AsyncPaymentProcessorPort:
+    """
+    Выбрать хранилище платежей по настройке PGS_STORAGE и, если задан
+    PGS_SIMULATION_FILE, обернуть его симуляцией шлюза
+    """
+    store = _build_store()
+    if not settings.simulation_file:
+        return store
+    simulator = PaymentSimulator(SimulationConfig.from_file(settings.simulation_file))
+    # В режиме shared отказы решает сервер хранилища (один отсчёт окон недоступности
+    # на все воркеры), здесь — только задержка ответа
+    return AsyncSimulatedPaymentAdapter(store, simulator, decide=settings.storage != "shared")
+
+
+def _build_store() -> AsyncPaymentProcessorPort:
+    if settings.storage == "memory":
+        return AsyncInMemoryPaymentAdapter(InMemoryPaymentAdapter())
+    if settings.storage == "sqlite":
+        return AsyncSqlitePaymentAdapter(SqlitePaymentAdapter(settings.sqlite_path))
+    if settings.storage == "shared":
+        # Ключ и симуляцию отказов задаёт процесс, запустивший сервер хранилища (serve)
+        if not settings.shared_store_authkey:
+            raise ValueError("PGS_SHARED_STORE_AUTHKEY is required for shared storage")
+        return AsyncSharedPaymentAdapter(SharedPaymentAdapter(
+            parse_address(settings.shared_store_address),
+            settings.shared_store_authkey.encode("utf-8")
+        ))
+    raise ValueError(f"Unknown storage: {settings.storage}")
+
+
+def _build_transaction_sink() -> Optional[FileTransactionLoggerAdapter]:
+    """
+    Выбрать назначение логов транзакций по настройке PGS_TRANSACTION_LOG
+    (None — JSON-строки в stdout)
+    """
+    if settings.transaction_log == "stdout":
+        return None
+    if settings.transaction_log == "file":
+        return FileTransactionLoggerAdapter(settings.transaction_log_dir, fsync=settings.transaction_log_fsync)
+    raise ValueError(f"Unknown transaction log: {settings.transaction_log}")
+
+
+# Создаём асинхронные адаптеры (реализации портов) — обработчики
+# ожидают их напрямую и не блокируют event loop.
+# Логи пишутся пачками из фоновой задачи в stdout или в файлы (PGS_TRANSACTION_LOG).
+_payment_adapter = _build_payment_adapter()
+_transaction_sink = _build_transaction_sink()
+_logger_adapter = BufferedLoggerAdapter(
+    flush_size=settings.log_flush_size,
+    flush_interval=settings.log_flush_interval,
+    max_queue_size=settings.log_queue_size,
+    sink=_transaction_sink
+)
+
+# Метрики процесса (/metrics); порты оборачиваются декораторами с замерами
+metrics_registry = MetricsRegistry()
+payment_metrics = PaymentMetrics(metrics_registry)
+_payment_processor = AsyncInstrumentedPaymentProcessor(_payment_adapter, payment_metrics)
+
+# Агрегаты отчётов (/api/reports/volume) пополняются при записи каждой транзакции
+volume_aggregator = VolumeAggregator(
+    minute_buckets=settings.report_minute_buckets,
+    hour_buckets=settings.report_hour_buckets,
+    day_buckets=settings.report_day_buckets
+)
+
+# Вебхуки о транзакциях (/api/webhooks/endpoints) отправляются в фоне
+webhook_dispatcher = WebhookDispatcher(
+    max_pending=settings.webhook_max_pending,
+    max_attempts=settings.webhook_max_attempts,
+    backoff_base=settings.webhook_backoff_base,
+    backoff_max=settings.webhook_backoff_max,
+    timeout=settings.webhook_timeout,
+    max_connections=settings.webhook_max_connections,
+    default_concurrency=settings.webhook_max_concurrency
+)
+
+
+async def _expire_authorizations(payment_ids: List[str]) -> None:
+    """
+    Отменить истёкшие авторизации через сценарий (с логом и вебхуками)
+    """
+    for payment_id in payment_ids:
+        try:
+            await _void_use_case.execute(VoidPaymentInput(payment_id, reason="Authorization expired"))
+        except PaymentProcessingError:
+            # Авторизацию уже списали или отменили (например, в другом воркере)
+            pass
+
+
+# Таймеры авторизаций ставятся и снимаются при записи транзакций
+_expiry_scheduler = AuthorizationExpiryScheduler(
+    _expire_authorizations,
+    tick=settings.authorization_expiry_tick
+)
+_transaction_logger = AsyncExpiryTrackingTransactionLogger(
+    AsyncWebhookTransactionLogger(
+        AsyncAggregatingTransactionLogger(
+            AsyncInstrumentedTransactionLogger(_logger_adapter, payment_metrics),
+            volume_aggregator
+        ),
+        webhook_dispatcher
+    ),
+    _expiry_scheduler
+)
+
+# Правила риска компилируются один раз при старте
+_risk_engine = RiskEngine.from_file(
+    settings.risk_rules_file,
+    velocity_buckets=settings.risk_velocity_buckets,
+    velocity_max_keys=settings.risk_velocity_max_keys
+) if settings.risk_rules_file else None
+
+# Курсы валют: кросс-курсы считаются при загрузке, файл перечитывается в фоне
+fx_rates = LocalFxRateProvider.from_file(
+    settings.fx_rates_file,
+    reload_interval=settings.fx_reload_interval
+) if settings.fx_rates_file else None
 
 # Создаём Use Case с внедрёнными адаптерами
-_payment_use_case = ProcessPaymentUseCase(
-    payment_processor=_payment_adapter,
-    transaction_logger=_logger_adapter
+_payment_use_case = AsyncProcessPaymentUseCase(
+    payment_processor=_payment_processor,
+    transaction_logger=_transaction_logger,
+    risk_assessor=_risk_engine,
+    fx_rates=fx_rates,
+    settlement_currency=settings.settlement_currency
+)
+
+_refund_use_case = AsyncRefundPaymentUseCase(
+    payment_processor=_payment_processor,
+    transaction_logger=_transaction_logger,
+    fx_rates=fx_rates
+)
+
+_authorize_use_case = AsyncAuthorizePaymentUseCase(
+    payment_processor=_payment_processor,
+    transaction_logger=_transaction_logger,
+    risk_assessor=_risk_engine,
+    fx_rates=fx_rates,
+    settlement_currency=settings.settlement_currency
+)
+
+_capture_use_case = AsyncCapturePaymentUseCase(
+    payment_processor=_payment_processor,
+    transaction_logger=_transaction_logger
+)
+
+_void_use_case = AsyncVoidPaymentUseCase(
+    payment_processor=_payment_processor,
+    transaction_logger=_transaction_logger
 )
 
+# Перехватчики сценариев из настроек (замеры, медленные вызовы, профили)
+configure_interceptors({
+    name: build_interceptors(
+        names,
+        slow_call_threshold=settings.slow_call_threshold,
+        profile_every=settings.profile_every,
+        profile_mode=settings.profile_mode,
+        profile_dir=settings.profile_dir,
+        timing_sink=payment_metrics.record_use_case
+    )
+    for name, names in settings.use_case_interceptors.items()
+})
+
+# Кэш ответов для повторов с Idempotency-Key
+_idempotency_cache = IdempotencyCache(
+    max_entries=settings.idempotency_max_entries,
+    ttl=settings.idempotency_ttl
+)
+
+
+async def startup() -> None:
+    """
+    Восстановить таймеры авторизаций из хранилища и запустить их разбор,
+    начать следить за файлом курсов
+    """
+    await _expiry_scheduler.load(_payment_adapter)
+    await _expiry_scheduler.start()
+    if fx_rates is not None:
+        await fx_rates.start()
+
+
+async def shutdown() -> None:
+    """
+    Корректно завершить адаптеры (дописать буферизованные логи, остановить вебхуки)
+    """
+    await _expiry_scheduler.aclose()
+    if fx_rates is not None:
+        await fx_rates.aclose()
+    await _logger_adapter.aclose()
+    if _transaction_sink is not None:
+        _transaction_sink.close()
+    await webhook_dispatcher.aclose()
+    if hasattr(_payment_adapter, "close"):
+        _payment_adapter.close()
+
 
 # === Эндпоинты ===
 
-@router.post("/pay", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
-async def create_payment(request: PaymentRequest):
+async def _execute_payment(request: PaymentRequest) -> Payment:
     """
-    Создать платёж
+    Выполнить сценарий создания платежа, переведя ошибки в HTTP-коды
     """
+    started = time.perf_counter()
     try:
         # Выполняем сценарий с реальными адаптерами (как в рабочем проекте!)
-        payment: Payment = _payment_use_case.execute(
-            ProcessPaymentInput(
-                payment_id=request.payment_id,
-                amount=Decimal(str(request.amount)),
-                currency=request.currency,
-                description=request.description,
-                customer_email=request.customer_email,
-                meta=request.meta
-            )
-        )
-
-        # Преобразуем доменный объект в DTO для ответа
-        return PaymentResponse(
-            payment_id=payment.id.value,
-            amount=float(payment.amount.value),
-            currency=payment.amount.currency,
-            status=payment.status.value,
-            description=payment.description,
-            customer_email=payment.customer_email,
-            created_at=payment.created_at.isoformat()
-        )
+        payment = await _payment_use_case.execute(_to_input(request))
+        payment_metrics.record_payment("create_payment", payment, started)
+        return payment
 
     except ValueError as e:
+        payment_metrics.record_error("create_payment", e, started)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Validation error: {str(e)}"
         )
+    except PaymentAlreadyExistsError as e:
+        payment_metrics.record_error("create_payment", e, started)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
     except Exception as e:
+        payment_metrics.record_error("create_payment", e, started)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Payment processing failed: {str(e)}"
         )
 
 
-@router.get("/pay/{payment_id}", response_model=PaymentResponse)
-async def get_payment(payment_id: str):
+def _caller(http_request: Request) -> str:
+    """
+    Кто вызывает API: заголовок X-API-Key, без него — адрес клиента (как у лимита запросов)
+    """
+    api_key = http_request.headers.get(settings.rate_limit_key_header)
+    if api_key:
+        return f"key:{api_key}"
+    client = http_request.client
+    return f"ip:{client.host}" if client else "ip:"
+
+
+@router.post(
+    "/pay",
+    response_model=PaymentResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_409_CONFLICT: {"description": "Платёж с таким ID уже существует"},
+    },
+)
+async def create_payment(
+        request: PaymentRequest,
+        http_request: Request,
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
+    """
+    Создать платёж
+
+    С заголовком Idempotency-Key повтор запроса возвращает сохранённый
+    ответ (с заголовком Idempotent-Replayed: true) без повторной обработки.
+    Ключи разных вызывающих (X-API-Key или адрес клиента) не пересекаются.
+    """
+    if idempotency_key is None:
+        # Преобразуем доменный объект в тело ответа
+        return _json_response(_to_response(await _execute_payment(request)), status.HTTP_201_CREATED)
+
+    fingerprint = blake2b(request.model_dump_json().encode("utf-8"), digest_size=16).hexdigest()
+
+    async def execute() -> CachedResponse:
+        try:
+            payment = await _execute_payment(request)
+        except HTTPException as e:
+            # Ошибки сервера не кэшируем — повтор должен выполниться заново
+            if e.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                raise
+            return CachedResponse(e.status_code, dumps({"detail": e.detail}), fingerprint)
+
+        return CachedResponse(status.HTTP_201_CREATED, dumps(_to_response(payment)), fingerprint)
+
+    try:
+        cached, replayed = await _idempotency_cache.run(
+            f"{_caller(http_request)}\n{idempotency_key}", fingerprint, execute
+        )
+    except IdempotencyKeyConflict:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request body"
+        )
+
+    return Response(
+        content=cached.body,
+        status_code=cached.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if replayed else None
+    )
+
+
+@router.post("/pay/batch", response_model=BatchPaymentResponse)
+async def create_payments_batch(request: BatchPaymentRequest):
+    """
+    Создать пакет платежей за один запрос
+
+    Ошибка отдельного платежа не прерывает пакет — результат
+    возвращается для каждого элемента в исходном порядке.
+    """
+    try:
+        results = await _payment_use_case.execute_batch(
+            [_to_input(item) for item in request.payments]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Batch processing failed: {str(e)}"
+        )
+
+    # Поля BatchPaymentItemResponse / BatchPaymentResponse
+    items = [
+        {
+            "payment_id": result.payment_id,
+            "success": result.succeeded,
+            "payment": _to_response(result.payment) if result.payment else None,
+            "error": result.error,
+        }
+        for result in results
+    ]
+    succeeded = sum(1 for result in results if result.succeeded)
+
+    return _json_response({
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "results": items,
+    })
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'body'}: {item['msg']}" for item in error.errors()
+    )
+
+
+async def _stream_results(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Обработать NDJSON-поток микропакетами и выдать результаты строками NDJSON
+
+    Каждый микропакет — один вызов execute_batch и один фрагмент ответа;
+    строки с ошибкой разбора или валидации получают результат с ошибкой
+    и не прерывают поток. Результаты идут в порядке строк запроса.
+    """
+    async for batch in ndjson_batches(
+            chunks,
+            batch_size=settings.stream_batch_size,
+            flush_interval=settings.stream_flush_interval,
+            max_line_bytes=settings.stream_max_line_bytes
+    ):
+        # Поля StreamPaymentItemResponse; ошибки разбора заполняются сразу
+        items = []
+        inputs = []
+        pending = []
+        for line_no, line in batch:
+            if line is None:
+                items.append({"line": line_no, "payment_id": None, "success": False, "payment": None,
+                              "error": f"Line exceeds {settings.stream_max_line_bytes} bytes"})
+                continue
+            try:
+                request = PaymentRequest.model_validate_json(line)
+            except ValidationError as e:
+                payment_metrics.record_validation_errors(e.errors())
+                items.append({"line": line_no, "payment_id": None, "success": False, "payment": None,
+                              "error": f"Validation error: {_format_validation_error(e)}"})
+                continue
+            item = {"line": line_no, "payment_id": request.payment_id, "success": False, "payment": None,
+                    "error": None}
+            items.append(item)
+            inputs.append(_to_input(request))
+            pending.append(item)
+
+        if inputs:
+            try:
+                results = await _payment_use_case.execute_batch(inputs)
+            except Exception as e:
+                # Ответ уже отправляется — сбой пакета сообщается в строках, поток продолжается
+                for item in pending:
+                    item["error"] = f"Batch processing failed: {str(e)}"
+            else:
+                for item, result in zip(pending, results):
+                    item["success"] = result.succeeded
+                    item["payment"] = _to_response(result.payment) if result.payment else None
+                    item["error"] = result.error
+
+        yield b"".join([dumps(item) + b"\n" for item in items])
+
+
+@router.post(
+    "/pay/stream",
+    response_class=NdjsonStreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "model": StreamPaymentItemResponse,
+            "description": "Результаты по строкам NDJSON, по мере обработки",
+        },
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"$ref": "#/components/schemas/PaymentRequest"}}},
+        },
+    },
+)
+async def create_payments_stream(request: Request):
+    """
+    Потоковый импорт платежей из NDJSON (по одному PaymentRequest в строке)
+
+    Тело читается по мере поступления (chunked), платежи проходят через
+    сценарий микропакетами, результаты возвращаются NDJSON-потоком
+    в порядке строк. Тело целиком в памяти не держится, поэтому размер
+    потока не ограничен. Клиент должен читать ответ параллельно с отправкой.
+    """
+    return NdjsonStreamingResponse(_stream_results(request.stream()))
+
+
+@router.get(
+    "/pay/{payment_id}",
+    response_model=PaymentResponse,
+    responses={
+        status.HTTP_304_NOT_MODIFIED: {"description": "Платёж не изменился (If-None-Match)"},
+        status.HTTP_404_NOT_FOUND: {"description": "Платёж не найден"},
+    },
+)
+async def get_payment(
+        payment_id: str,
+        if_none_match: Optional[str] = Header(None)
+):
     """
     Получить информацию о платеже по ID
 
-    Пока возвращает заглушку — в будущем можно добавить хранилище
-    """
-    # Для демо: возвращаем фиктивный платёж
-    return PaymentResponse(
-        payment_id=payment_id,
-        amount=100.0,
-        currency="USD",
-        status=PaymentStatus.SUCCEEDED.value,
-        description="Demo payment",
-        customer_email="demo@example.com",
-        created_at="2026-02-04T12:00:00"
-    )
\ No newline at end of file
+    Читает хранилище процессора напрямую, минуя сценарий обработки.
+    Ответ содержит ETag; при совпадении If-None-Match возвращается 304.
+    """
+    try:
+        key = PaymentId(payment_id)
+    except ValueError:
+        key = None
+
+    payment = await _payment_processor.get_payment(key) if key is not None else None
+    if payment is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Payment {payment_id} not found"
+        )
+
+    etag = _etag(payment)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if if_none_match and _etag_matches(etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return _json_response(_to_response(payment), headers=headers)
+
+
+def _encode_cursor(cursor: PaymentCursor) -> str:
+    """
+    Непрозрачный курсор для клиента: base64url от "created_at|payment_id"
+    """
+    created_at, payment_id = cursor
+    return urlsafe_b64encode(f"{created_at.isoformat()}|{payment_id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> PaymentCursor:
+    try:
+        created_at, payment_id = urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(created_at), payment_id
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _local_time(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Платежи хранят локальное время без зоны — время с зоной приводим к нему
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+# Колонки CSV-выгрузки — поля PaymentResponse в том же порядке
+_CSV_COLUMNS = list(PaymentResponse.model_fields)
+
+
+async def _export_pages(query: PaymentQuery) -> AsyncIterator[List[Payment]]:
+    """
+    Все платежи выборки страницами по settings.export_page_size, начиная с курсора запроса
+    """
+    query = replace(query, limit=settings.export_page_size)
+    while True:
+        page = await _payment_processor.list_payments(query)
+        if page.items:
+            yield page.items
+        if page.next_cursor is None:
+            return
+        query = replace(query, after=page.next_cursor)
+
+
+async def _export_ndjson(query: PaymentQuery) -> AsyncIterator[bytes]:
+    async for payments in _export_pages(query):
+        yield b"".join([dumps(_to_response(payment)) + b"\n" for payment in payments])
+
+
+async def _export_csv(query: PaymentQuery) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_CSV_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    async for payments in _export_pages(query):
+        writer.writerows(_to_response(payment) for payment in payments)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get(
+    "/payments",
+    response_model=PaymentListResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Страница (json) или потоковая выгрузка всей выборки (ndjson, csv)",
+        },
+        status.HTTP_400_BAD_REQUEST: {"description": "Неверный курсор"},
+    },
+)
+async def list_payments(
+        payment_status: Optional[PaymentStatus] = Query(None, alias="status"),
+        currency: Optional[str] = Query(None, min_length=3, max_length=3, pattern="^[A-Z]{3}$"),
+        customer_email: Optional[str] = None,
+        created_from: Optional[datetime] = Query(None, description="Начало диапазона created_at (включительно)"),
+        created_to: Optional[datetime] = Query(None, description="Конец диапазона created_at (не включительно)"),
+        cursor: Optional[str] = Query(None, description="next_cursor предыдущей страницы"),
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+        export_format: Literal["json", "ndjson", "csv"] = Query("json", alias="format")
+):
+    """
+    Выборка платежей по фильтрам в порядке (created_at, payment_id)
+
+    format=json — одна страница размером limit и next_cursor для следующей.
+    format=ndjson / csv — потоковая выгрузка всех подходящих платежей
+    (от cursor, если задан) за один запрос: страницы читаются по мере
+    отправки, выборка целиком в памяти не собирается.
+    Фильтры отвечаются по вторичным индексам хранилища.
+    """
+    query = PaymentQuery(
+        status=payment_status,
+        currency=currency,
+        customer_email=customer_email,
+        created_from=_local_time(created_from),
+        created_to=_local_time(created_to),
+        after=_decode_cursor(cursor) if cursor is not None else None,
+        limit=limit
+    )
+
+    if export_format == "ndjson":
+        return StreamingResponse(_export_ndjson(query), media_type="application/x-ndjson")
+    if export_format == "csv":
+        return StreamingResponse(
+            _export_csv(query),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="payments.csv"'}
+        )
+
+    page = await _payment_processor.list_payments(query)
+    # Поля PaymentListResponse
+    return _json_response({
+        "items": [_to_response(payment) for payment in page.items],
+        "next_cursor": _encode_cursor(page.next_cursor) if page.next_cursor is not None else None,
+    })
+
+
+@router.post(
+    "/pay/authorize",
+    response_model=PaymentResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_409_CONFLICT: {"description": "Платёж с таким ID уже существует"},
+    },
+)
+async def authorize_payment(request: AuthorizeRequest):
+    """
+    Авторизовать платёж: заблокировать средства без списания
+
+    Платёж получает статус pending и срок expires_at. До срока его можно
+    списать (capture) или отменить (void); по истечении авторизация
+    отменяется автоматически (статус voided).
+    """
+    try:
+        payment = await _authorize_use_case.execute(AuthorizePaymentInput(
+            payment_id=request.payment_id,
+            amount=_request_amount(request, request.currency),
+            currency=request.currency,
+            description=request.description,
+            customer_email=request.customer_email,
+            meta=request.meta,
+            hold_seconds=request.hold_seconds or settings.authorization_hold_seconds
+        ))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Validation error: {str(e)}"
+        )
+    except PaymentProcessingError as e:
+        # В том числе PaymentAlreadyExistsError — как у POST /pay
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
+
+    return _json_response(_to_response(payment), status.HTTP_201_CREATED)
+
+
+async def _execute_transition(payment_id: str, execute) -> Response:
+    """
+    Выполнить переход статуса (capture / void), переведя ошибки в HTTP-коды
+    """
+    try:
+        payment = await execute()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Validation error: {str(e)}"
+        )
+    except PaymentNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Payment {payment_id} not found"
+        )
+    except PaymentProcessingError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
+
+    return _json_response(_to_response(payment))
+
+
+@router.post(
+    "/pay/{payment_id}/capture",
+    response_model=PaymentResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Платёж не найден"},
+        status.HTTP_409_CONFLICT: {"description": "Платёж не авторизован или авторизация истекла"},
+    },
+)
+async def capture_payment(payment_id: str):
+    """
+    Списать авторизованные средства (pending → succeeded)
+    """
+    return await _execute_transition(
+        payment_id, lambda: _capture_use_case.execute(CapturePaymentInput(payment_id))
+    )
+
+
+@router.post(
+    "/pay/{payment_id}/void",
+    response_model=PaymentResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Платёж не найден"},
+        status.HTTP_409_CONFLICT: {"description": "Платёж не авторизован"},
+    },
+)
+async def void_payment(payment_id: str, request: Optional[VoidRequest] = None):
+    """
+    Отменить авторизацию и освободить средства (pending → voided)
+    """
+    reason = request.reason if request is not None else None
+    return await _execute_transition(
+        payment_id, lambda: _void_use_case.execute(VoidPaymentInput(payment_id, reason))
+    )
+
+
+@router.post(
+    "/pay/{payment_id}/refund",
+    response_model=RefundResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Платёж не найден"},
+        status.HTTP_409_CONFLICT: {"description": "Возврат превышает остаток, валюта без курса или статус"},
+    },
+)
+async def refund_payment(payment_id: str, request: Optional[RefundRequest] = None):
+    """
+    Вернуть платёж полностью или частично
+
+    Сумма всех возвратов не может превысить сумму платежа: одновременные
+    возвраты сверх остатка отклоняются с 409. Сумма в другой валюте
+    пересчитывается в валюту платежа по текущему курсу (если настроены курсы).
+    """
+    request = request or RefundRequest()
+    try:
+        refund = await _refund_use_case.execute(RefundPaymentInput(
+            payment_id=payment_id,
+            amount=_request_amount(request, request.currency or ""),
+            currency=request.currency,
+            reason=request.reason
+        ))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Validation error: {str(e)}"
+        )
+    except PaymentNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Payment {payment_id} not found"
+        )
+    except PaymentProcessingError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
+
+    payment = await _payment_processor.get_payment(refund.id)
+    # Поля RefundResponse
+    return _json_response({
+        "payment_id": refund.id.value,
+        "amount": str(refund.amount.value),
+        "amount_minor": refund.amount.minor,
+        "currency": refund.amount.currency,
+        "created_at": refund.created_at.isoformat(),
+        "description": refund.description,
+        "payment": _to_response(payment) if payment is not None else None,
+    }, status.HTTP_201_CREATED)
@@ -0,0 +1,117 @@
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Literal, Optional
+
+from ...use_cases import VolumeReportUseCase, VolumeReportInput
+from ...adapters.serialization import dumps
+from ...config import settings
+from ...domain.currency import from_minor
+from ...domain import PaymentStatus, VolumeBucket
+from .payments import volume_aggregator, fx_rates, _local_time
+
+# Создаём роутер
+router = APIRouter(tags=["reports"])
+
+
+# === DTO для ответов ===
+
+class VolumeBucketResponse(BaseModel):
+    """
+    Одно окно отчёта: транзакции одной валюты и статуса
+    """
+    start: datetime
+    currency: str
+    status: str
+    count: int
+    amount: Decimal  # Сумма с экспонентой валюты, в JSON — строка
+    amount_minor: int
+    # Сумма в валюте расчётов по текущему курсу (None — без пересчёта или курса нет)
+    settlement_currency: Optional[str] = None
+    settlement_amount: Optional[Decimal] = None
+    settlement_minor: Optional[int] = None
+
+
+class VolumeReportResponse(BaseModel):
+    """
+    Отчёт по объёму транзакций
+    """
+    granularity: str
+    buckets: List[VolumeBucketResponse]
+
+
+# === Адаптеры ===
+
+# Отчёт читает агрегаты, которые пополняет логгер транзакций сценариев платежей
+_volume_report_use_case = VolumeReportUseCase(volume_aggregator, fx_rates)
+
+
+def _to_response(bucket: VolumeBucket) -> dict:
+    """
+    Поля VolumeBucketResponse; сумма — строкой, как в ответах платежей
+    """
+    return {
+        "start": bucket.start.isoformat(),
+        "currency": bucket.currency,
+        "status": bucket.status.value,
+        "count": bucket.count,
+        "amount": str(from_minor(bucket.amount_minor, bucket.currency)),
+        "amount_minor": bucket.amount_minor,
+        "settlement_currency": bucket.settlement_currency,
+        "settlement_amount": (
+            str(from_minor(bucket.settlement_minor, bucket.settlement_currency))
+            if bucket.settlement_minor is not None else None
+        ),
+        "settlement_minor": bucket.settlement_minor,
+    }
+
+
+# === Эндпоинты ===
+
+@router.get(
+    "/reports/volume",
+    response_model=VolumeReportResponse,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Начало диапазона не раньше конца или курсы не настроены"},
+    },
+)
+async def volume_report(
+        granularity: Literal["minute", "hour", "day"] = "minute",
+        start: Optional[datetime] = Query(None, description="Начало диапазона (включительно)"),
+        end: Optional[datetime] = Query(None, description="Конец диапазона (не включительно)"),
+        currency: Optional[str] = Query(None, min_length=3, max_length=3, pattern="^[A-Z]{3}$"),
+        payment_status: Optional[PaymentStatus] = Query(None, alias="status"),
+        settlement_currency: Optional[str] = Query(
+            None, min_length=3, max_length=3, pattern="^[A-Z]{3}$",
+            description="Пересчитать суммы в эту валюту (по умолчанию — валюта расчётов из настроек)"
+        )
+):
+    """
+    Число и сумма транзакций по валюте, статусу и окну времени
+
+    Окна считаются по локальному времени created_at. Агрегаты пополняются
+    при записи каждой транзакции, поэтому отчёт не перебирает платежи.
+    Хранится ограниченное число последних окон каждой ширины
+    (настройки report_*_buckets), агрегаты — свои у каждого процесса.
+    Суммы окон пересчитываются в валюту расчётов по текущим курсам.
+    """
+    if settlement_currency is None and fx_rates is not None:
+        settlement_currency = settings.settlement_currency
+    try:
+        buckets = _volume_report_use_case.execute(VolumeReportInput(
+            granularity=granularity,
+            start=_local_time(start),
+            end=_local_time(end),
+            currency=currency,
+            status=payment_status.value if payment_status is not None else None,
+            settlement_currency=settlement_currency
+        ))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Поля VolumeReportResponse
+    return Response(
+        dumps({"granularity": granularity, "buckets": [_to_response(bucket) for bucket in buckets]}),
+        media_type="application/json"
+    )
@@ -0,0 +1,105 @@
+from fastapi import APIRouter, HTTPException, Response, status
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from ...adapters.webhooks import EVENT_TYPES, WebhookEndpoint
+from .payments import webhook_dispatcher
+
+# Создаём роутер
+router = APIRouter(tags=["webhooks"])
+
+
+# === DTO для запросов/ответов ===
+
+class WebhookEndpointRequest(BaseModel):
+    """
+    Регистрация получателя вебхуков
+    """
+    url: str = Field(..., pattern="^https?://", max_length=2048)
+    secret: Optional[str] = Field(None, min_length=16, max_length=256, description="Если не задан — генерируется")
+    events: Optional[List[str]] = Field(None, description=f"Типы событий (по умолчанию все): {', '.join(sorted(EVENT_TYPES))}")
+    max_concurrency: Optional[int] = Field(None, gt=0, le=1000, description="Максимум одновременных запросов")
+
+
+class WebhookEndpointResponse(BaseModel):
+    """
+    Зарегистрированный получатель; secret проверяет подпись Webhook-Signature
+    """
+    id: str
+    url: str
+    secret: str
+    events: Optional[List[str]] = None
+    max_concurrency: int
+
+
+def _to_response(endpoint: WebhookEndpoint) -> WebhookEndpointResponse:
+    return WebhookEndpointResponse(
+        id=endpoint.id,
+        url=endpoint.url,
+        secret=endpoint.secret,
+        events=sorted(endpoint.events) if endpoint.events is not None else None,
+        max_concurrency=endpoint.max_concurrency
+    )
+
+
+# === Эндпоинты ===
+
+@router.post(
+    "/webhooks/endpoints",
+    response_model=WebhookEndpointResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Неизвестный тип события"},
+    },
+)
+async def register_webhook_endpoint(request: WebhookEndpointRequest):
+    """
+    Зарегистрировать получателя вебхуков
+
+    На каждую записанную транзакцию (платёж, возврат) подписанным
+    эндпоинтам отправляется POST с JSON-событием и заголовком
+    Webhook-Signature: t=<время>,v1=<HMAC-SHA256 от "<время>.<тело>">.
+    Неуспешные доставки повторяются с экспоненциальной задержкой.
+    """
+    try:
+        endpoint = webhook_dispatcher.register(
+            url=request.url,
+            secret=request.secret,
+            events=request.events,
+            max_concurrency=request.max_concurrency
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _to_response(endpoint)
+
+
+@router.get("/webhooks/endpoints", response_model=List[WebhookEndpointResponse])
+async def list_webhook_endpoints():
+    """
+    Зарегистрированные получатели вебхуков
+    """
+    return [_to_response(endpoint) for endpoint in webhook_dispatcher.endpoints()]
+
+
+@router.delete(
+    "/webhooks/endpoints/{endpoint_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Эндпоинт не найден"},
+    },
+)
+async def remove_webhook_endpoint(endpoint_id: str):
+    """
+    Удалить получателя вместе с его недоставленными событиями
+    """
+    if not webhook_dispatcher.remove(endpoint_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Webhook endpoint {endpoint_id} not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/webhooks/stats", response_model=Dict[str, int])
+async def webhook_stats():
+    """
+    Счётчики доставки вебхуков в этом процессе
+    """
+    return webhook_dispatcher.stats()
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+# Строка NDJSON: (номер строки с 1, байты строки без перевода строки).
+# Вместо слишком длинной строки приходит None — её содержимое отброшено.
+NdjsonLine = Tuple[int, Optional[bytes]]
+
+
+async def ndjson_batches(
+        chunks: AsyncIterator[bytes],
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_line_bytes: int = 64 * 1024
+) -> AsyncIterator[List[NdjsonLine]]:
+    """
+    Разбить поток байтов на строки NDJSON и выдавать их пачками.
+
+    В памяти держится только недочитанный хвост (не длиннее max_line_bytes)
+    и текущая пачка, поэтому тело любого размера читается по мере прихода.
+    Пачка отдаётся, когда набрано batch_size строк, или когда первая
+    строка пачки ждёт дольше flush_interval, а новых данных нет —
+    медленный поток не копит задержку. Пустые строки пропускаются.
+
+    Следующий фрагмент читается, пока обрабатывается выданная пачка,
+    но не более одного фрагмента вперёд.
+
+    :param chunks: Фрагменты тела запроса (например, Request.stream())
+    :param batch_size: Максимум строк в пачке
+    :param flush_interval: Максимальное ожидание неполной пачки, секунды
+    :param max_line_bytes: Максимальная длина строки; длинная строка отдаётся как None
+    """
+    iterator = chunks.__aiter__()
+    batch: List[NdjsonLine] = []
+    batch_started = 0.0
+    tail = b""
+    line_no = 0
+    skipping = False  # Отбрасываем остаток слишком длинной строки до перевода строки
+
+    pending = asyncio.ensure_future(iterator.__anext__())
+    try:
+        while True:
+            if batch:
+                timeout = batch_started + flush_interval - time.monotonic()
+                done, _ = await asyncio.wait((pending,), timeout=max(timeout, 0.0))
+                if not done:
+                    yield batch
+                    batch = []
+                    continue
+            try:
+                chunk = await pending
+            except StopAsyncIteration:
+                break
+            pending = asyncio.ensure_future(iterator.__anext__())
+
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if skipping:
+                    skipping = False
+                    continue
+                line_no += 1
+                line = line.strip()
+                if not line:
+                    continue
+                if len(line) > max_line_bytes:
+                    line = None
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append((line_no, line))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+            if len(tail) > max_line_bytes and not skipping:
+                line_no += 1
+                if not batch:
+                    batch_started = time.monotonic()
+                batch.append((line_no, None))
+                skipping = True
+            if skipping:
+                tail = b""
+    finally:
+        if not pending.done():
+            pending.cancel()
+
+    tail = tail.strip()
+    if tail and not skipping:
+        line_no += 1
+        batch.append((line_no, tail if len(tail) <= max_line_bytes else None))
+    if batch:
+        yield batch
+
+
+class NdjsonStreamingResponse(StreamingResponse):
+    """
+    Потоковый NDJSON-ответ, который отправляется, пока тело запроса ещё читается.
+
+    StreamingResponse параллельно слушает receive() в ожидании отключения
+    клиента и перехватывает фрагменты тела запроса. Здесь receive читает
+    только обработчик (через Request.stream()), а отключение клиента
+    обнаруживается им же (ClientDisconnect).
+
+    Клиент должен читать ответ, не дожидаясь конца отправки запроса:
+    иначе при заполнении буферов сокета обе стороны ждут друг друга.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Настройки симулятора.
+
+    Читаются из переменных окружения с префиксом PGS_
+    (например: PGS_LOG_FLUSH_SIZE=1000).
+    """
+    model_config = SettingsConfigDict(env_prefix="PGS_")
+
+    # Хранилище платежей: "memory", "sqlite" или "shared" (общее для всех воркеров)
+    storage: str = "memory"
+    sqlite_path: str = "payments.db"
+    shared_store_address: str = "127.0.0.1:50055"  # "host:port" или путь к Unix-сокету
+    # Ключ соединений с сервером хранилища; serve генерирует его на каждый запуск, если не задан
+    shared_store_authkey: Optional[str] = None
+
+    # JSON-файл симуляции отказов и задержок (см. SimulationConfig.from_dict)
+    simulation_file: Optional[str] = None
+
+    # JSON-файл правил риска (см. RiskRule.from_dict); None — без оценки риска
+    risk_rules_file: Optional[str] = None
+    risk_velocity_buckets: int = 10  # Точность окон скорости: ячеек на окно
+    risk_velocity_max_keys: int = 100_000  # Максимум email в одной ячейке окна
+
+    # JSON-файл курсов валют (см. FxRateMatrix.from_dict); None — без конвертации
+    fx_rates_file: Optional[str] = None
+    fx_reload_interval: float = 5.0  # Проверка изменений файла курсов, секунды (0 — не перечитывать)
+    settlement_currency: Optional[str] = None  # Валюта расчётов: сумма в ней сохраняется с платежом
+
+    # Буферизованный логгер транзакций: "stdout" (JSON-строки) или "file"
+    # (append-only сегменты в transaction_log_dir с историей по payment_id)
+    transaction_log: str = "stdout"
+    transaction_log_dir: str = "transactions"
+    transaction_log_fsync: bool = False  # fsync после каждой пачки (надёжнее, но медленнее)
+    log_flush_size: int = 500  # Максимальный размер пачки за одну запись
+    log_flush_interval: float = 0.05  # Максимальное ожидание пачки, секунды
+    log_queue_size: int = 10_000  # Ёмкость очереди (backpressure при заполнении)
+
+    # Кэш ответов по Idempotency-Key
+    idempotency_ttl: float = 24 * 3600  # Время жизни ответа, секунды
+    idempotency_max_entries: int = 100_000  # Максимум ключей (LRU)
+
+    # Лимит запросов к /api/pay по ключу (заголовок X-API-Key, без него — адрес клиента).
+    # Выключен по умолчанию: без X-API-Key все запросы нагрузочного теста с одного адреса делят одно ведро
+    rate_limit_per_second: float = 0.0  # Пополнение ведра, запросов в секунду (0 — без лимита)
+    rate_limit_burst: int = 2000  # Допустимый всплеск
+    rate_limit_max_keys: int = 100_000  # Максимум ключей в таблице вёдер
+    rate_limit_key_header: str = "X-API-Key"
+
+    # Сброс нагрузки (503) до начала обработки. Выключен по умолчанию, как и лимит запросов:
+    # под /api/pay попадают и опрос GET /api/pay/{id}, и долгие медленные платежи симуляции
+    admission_max_in_flight: int = 0  # Одновременных запросов к /api/pay (0 — без ограничения)
+    admission_max_loop_lag: float = 0.0  # Порог задержки event loop, секунды (0 — не измерять)
+    admission_lag_interval: float = 0.05  # Период измерения задержки, секунды
+
+    # Потоковый импорт NDJSON (POST /api/pay/stream)
+    stream_batch_size: int = 500  # Максимум платежей в микропакете
+    stream_flush_interval: float = 0.05  # Максимальное ожидание неполного микропакета, секунды
+    stream_max_line_bytes: int = 64 * 1024  # Максимальная длина строки NDJSON
+
+    # Выгрузка платежей (GET /api/payments?format=csv|ndjson)
+    export_page_size: int = 1000  # Платежей, читаемых из хранилища за один раз
+
+    # Отчёт по объёму (GET /api/reports/volume): сколько последних окон хранить
+    report_minute_buckets: int = 1440  # Сутки по минутам
+    report_hour_buckets: int = 744  # 31 день по часам
+    report_day_buckets: int = 366  # Год по дням
+
+    # Двухфазные платежи (/api/pay/authorize, capture, void)
+    authorization_hold_seconds: float = 7 * 24 * 3600  # Срок авторизации по умолчанию
+    authorization_expiry_tick: float = 1.0  # Точность автоматической отмены истёкших авторизаций, секунды
+
+    # Вебхуки (/api/webhooks/endpoints)
+    webhook_max_pending: int = 100_000  # Максимум недоставленных событий в процессе
+    webhook_max_attempts: int = 8  # Попыток доставки одного события
+    webhook_backoff_base: float = 1.0  # Задержка перед первым повтором, секунды (далее удваивается)
+    webhook_backoff_max: float = 600.0  # Максимальная задержка между попытками, секунды
+    webhook_timeout: float = 10.0  # Таймаут запроса к получателю, секунды
+    webhook_max_connections: int = 200  # Размер пула соединений
+    webhook_max_concurrency: int = 10  # Одновременных запросов к эндпоинту по умолчанию
+
+    # Перехватчики сценариев по имени класса, например
+    # PGS_USE_CASE_INTERCEPTORS='{"AsyncProcessPaymentUseCase": ["timing", "slow_calls", "profile"]}'
+    use_case_interceptors: Dict[str, List[str]] = {}
+    slow_call_threshold: float = 0.1  # Порог медленного вызова, секунды
+    profile_every: int = 1000  # Профилировать каждый N-й вызов
+    profile_mode: str = "cprofile"  # "cprofile" или "tracemalloc"
+    profile_dir: Optional[str] = None  # Каталог для профилей; None — в лог
+
+
+settings = Settings()
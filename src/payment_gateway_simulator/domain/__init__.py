@@ -7,10 +7,24 @@ from .exceptions import (
     InvalidPaymentIdError,
     InvalidAmountError,
     PaymentProcessingError,
+    PaymentNotFoundError,
+    PaymentAlreadyExistsError,
 )
 from .ports import (
     PaymentProcessorPort,
+    PaymentCommand,
+    BatchItemOutcome,
+    PaymentQuery,
+    PaymentPage,
+    PaymentCursor,
     TransactionLoggerPort,
+    AsyncPaymentProcessorPort,
+    AsyncTransactionLoggerPort,
+    VolumeReportPort,
+    VolumeBucket,
+    ReportGranularity,
+    RiskAssessorPort,
+    FxRateProviderPort,
 )
 
 __all__ = [
@@ -22,6 +36,20 @@ __all__ = [
     "InvalidPaymentIdError",
     "InvalidAmountError",
     "PaymentProcessingError",
+    "PaymentNotFoundError",
+    "PaymentAlreadyExistsError",
     "PaymentProcessorPort",
+    "PaymentCommand",
+    "BatchItemOutcome",
+    "PaymentQuery",
+    "PaymentPage",
+    "PaymentCursor",
     "TransactionLoggerPort",
+    "AsyncPaymentProcessorPort",
+    "AsyncTransactionLoggerPort",
+    "VolumeReportPort",
+    "VolumeBucket",
+    "ReportGranularity",
+    "RiskAssessorPort",
+    "FxRateProviderPort",
 ]
\ No newline at end of file
@@ -1,27 +1,88 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from decimal import Decimal
+from typing import Dict, Self
 
+from .currency import MAX_MINOR, exponent, from_minor as _from_minor, quantum
 
-@dataclass(frozen=True)
+# Константы, которые раньше создавались при каждой проверке
+_ZERO = Decimal("0")
+
+# Кэш нормализованных кодов валют: исходная строка → интернированный код в верхнем регистре.
+# Все суммы в одной валюте ссылаются на одну и ту же строку.
+_CURRENCIES: Dict[str, str] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class Amount:
     value: Decimal  # Сумма (например: Decimal("100.50"))
     currency: str  # Валюта (например: "USD", "EUR", "RUB")
+    # Сумма в минорных единицах валюты (центы, иены, филсы) — для точной целочисленной арифметики
+    minor: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.value <= Decimal("0"):
+        if self.value <= _ZERO:
             raise ValueError("Amount must be positive")
 
-        # Проверка 2: валюта должна быть 3-буквенным кодом (стандарт ISO 4217)
-        if not self.currency or len(self.currency) != 3:
+        currency = _CURRENCIES.get(self.currency)
+        if currency is None:
+            # Проверка 2: валюта должна быть 3-буквенным кодом (стандарт ISO 4217)
+            if not self.currency or len(self.currency) != 3:
+                raise ValueError("Currency must be a 3-letter ISO code (e.g., USD, EUR, RUB)")
+
+            # Нормализация: приводим валюту к верхнему регистру (USD, а не usd)
+            currency = sys.intern(self.currency.upper())
+            _CURRENCIES[self.currency] = currency
+
+        if currency is not self.currency:
+            object.__setattr__(self, 'currency', currency)
+
+        # Округление до минорной единицы валюты (банковское, как у round):
+        # 99.999 USD → 100.00, 100.5 JPY → 100, 1.2345 KWD → 1.234.
+        # Значение всегда приводится к экспоненте валюты: 100 USD → 100.00
+        exp = exponent(currency)
+        if self.value.adjusted() + exp > 18:
+            raise ValueError(f"Amount must not exceed {MAX_MINOR} minor units")
+        rounded_value = self.value.quantize(quantum(currency))
+        object.__setattr__(self, 'value', rounded_value)
+
+        minor = int(rounded_value.scaleb(exp))
+        if minor <= 0:
+            raise ValueError(f"Amount must be positive (at least one minor unit of {currency})")
+        if minor > MAX_MINOR:
+            raise ValueError(f"Amount must not exceed {MAX_MINOR} minor units")
+        object.__setattr__(self, 'minor', minor)
+
+    @classmethod
+    def from_minor(cls, minor: int, currency: str) -> Self:
+        """
+        Создать сумму из минорных единиц с проверками (1050, "USD" → 10.50 USD).
+        """
+        if not isinstance(currency, str) or len(currency) != 3:
             raise ValueError("Currency must be a 3-letter ISO code (e.g., USD, EUR, RUB)")
+        return cls(_from_minor(minor, currency.upper()), currency)
+
+    @classmethod
+    def trusted(cls, value: Decimal, currency: str) -> Self:
+        """
+        Создать сумму без проверок и нормализации.
 
-        # Нормализация: приводим валюту к верхнему регистру (USD, а не usd)
-        normalized_currency = self.currency.upper()
-        if normalized_currency != self.currency:
-            object.__setattr__(self, 'currency', normalized_currency)
+        Только для уже провалидированных данных (например, загрузка из хранилища):
+        value должно быть положительным и округлённым, currency — кодом в верхнем регистре.
+        """
+        amount = object.__new__(cls)
+        object.__setattr__(amount, 'value', value)
+        object.__setattr__(amount, 'currency', _CURRENCIES.get(currency) or sys.intern(currency))
+        object.__setattr__(amount, 'minor', int(value.scaleb(exponent(currency))))
+        return amount
 
-        # Округление до 2 знаков после запятой (как деньги)
-        # Например: 99.999 → 100.00
-        rounded_value = round(self.value, 2)
-        if rounded_value != self.value:
-            object.__setattr__(self, 'value', rounded_value)
\ No newline at end of file
+    @classmethod
+    def trusted_minor(cls, minor: int, currency: str) -> Self:
+        """
+        Создать сумму из минорных единиц без проверок (загрузка из хранилища, результат арифметики).
+        """
+        amount = object.__new__(cls)
+        object.__setattr__(amount, 'value', _from_minor(minor, currency))
+        object.__setattr__(amount, 'currency', _CURRENCIES.get(currency) or sys.intern(currency))
+        object.__setattr__(amount, 'minor', minor)
+        return amount
@@ -0,0 +1,58 @@
+from decimal import Decimal
+from typing import Dict
+
+# Число знаков после запятой (экспонента ISO 4217) для валют,
+# у которых она отличается от двух. Остальные коды — 2 знака.
+_EXPONENTS: Dict[str, int] = {
+    # Без дробной части
+    "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "ISK": 0, "JPY": 0, "KMF": 0, "KRW": 0,
+    "PYG": 0, "RWF": 0, "UGX": 0, "UYI": 0, "VND": 0, "VUV": 0, "XAF": 0, "XOF": 0, "XPF": 0,
+    # Три знака
+    "BHD": 3, "IQD": 3, "JOD": 3, "KWD": 3, "LYD": 3, "OMR": 3, "TND": 3,
+    # Четыре знака (расчётные единицы)
+    "CLF": 4, "UYW": 4,
+}
+
+DEFAULT_EXPONENT = 2
+
+# Предел суммы в минорных единицах: знаковое 64-битное целое
+# (SQLite INTEGER, целые без потерь в JSON-кодировщиках)
+MAX_MINOR = 2 ** 63 - 1
+
+# Шаг округления для каждой экспоненты: 0 → 1, 2 → 0.01, 3 → 0.001
+_QUANTS: Dict[int, Decimal] = {
+    exponent: Decimal(1).scaleb(-exponent) for exponent in {DEFAULT_EXPONENT, *_EXPONENTS.values()}
+}
+
+
+def exponent(currency: str) -> int:
+    """
+    Число знаков после запятой в валюте (код в верхнем регистре).
+
+    :param currency: Код валюты ISO 4217
+    :return: Экспонента минорной единицы (USD → 2, JPY → 0, KWD → 3)
+    """
+    return _EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def quantum(currency: str) -> Decimal:
+    """
+    Наименьшая единица валюты как Decimal (USD → 0.01, JPY → 1).
+    """
+    return _QUANTS[_EXPONENTS.get(currency, DEFAULT_EXPONENT)]
+
+
+def to_minor(value: Decimal, currency: str) -> int:
+    """
+    Перевести точную сумму в целое число минорных единиц.
+
+    Сумма должна быть уже округлена до экспоненты валюты.
+    """
+    return int(value.scaleb(_EXPONENTS.get(currency, DEFAULT_EXPONENT)))
+
+
+def from_minor(minor: int, currency: str) -> Decimal:
+    """
+    Перевести минорные единицы в Decimal с экспонентой валюты (1050, USD → 10.50).
+    """
+    return Decimal(minor).scaleb(-_EXPONENTS.get(currency, DEFAULT_EXPONENT))
@@ -6,18 +6,42 @@ class DomainError(Exception):
 class InvalidPaymentIdError(DomainError, ValueError):
     """Исключение для невалидного идентификатора платежа"""
     def __init__(self, message: str):
+        self.message = message
         super().__init__(f"InvalidPaymentIdError: {message}")
 
+    def __reduce__(self):
+        # Сериализация (pickle) с исходными аргументами, а не с готовым текстом
+        return self.__class__, (self.message,)
+
 
 class InvalidAmountError(DomainError, ValueError):
     """Исключение для невалидной суммы"""
     def __init__(self, message: str):
+        self.message = message
         super().__init__(f"InvalidAmountError: {message}")
 
+    def __reduce__(self):
+        return self.__class__, (self.message,)
+
 
 class PaymentProcessingError(DomainError):
     """Исключение при обработке платежа (например, отказ карты)"""
     def __init__(self, message: str, payment_id: str = None):
+        self.message = message
         self.payment_id = payment_id
         detail = f" (payment_id={payment_id})" if payment_id else ""
-        super().__init__(f"PaymentProcessingError: {message}{detail}")
\ No newline at end of file
+        super().__init__(f"PaymentProcessingError: {message}{detail}")
+
+    def __reduce__(self):
+        # Ошибка передаётся между процессами (общее хранилище) без потери payment_id
+        return self.__class__, (self.message, self.payment_id)
+
+
+class PaymentNotFoundError(PaymentProcessingError):
+    """Исключение, если платёж с таким идентификатором не найден"""
+    pass
+
+
+class PaymentAlreadyExistsError(PaymentProcessingError):
+    """Исключение, если платёж с таким идентификатором уже существует"""
+    pass
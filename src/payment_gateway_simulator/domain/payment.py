@@ -1,14 +1,30 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Tuple
 
 # Относительные импорты из того же пакета `domain`
 from .payment_id import PaymentId
 from .amount import Amount
+from .currency import from_minor
 from .payment_status import PaymentStatus
+from .exceptions import PaymentProcessingError
 
+# Допустимые переходы статусов; переходов, которых нет в таблице, не бывает:
+# авторизация (PENDING) списывается (capture) или отменяется (void),
+# возвраты возможны только после списания
+_TRANSITIONS = {
+    PaymentStatus.PENDING: frozenset({PaymentStatus.SUCCEEDED, PaymentStatus.VOIDED}),
+    PaymentStatus.SUCCEEDED: frozenset({PaymentStatus.PARTIALLY_REFUNDED, PaymentStatus.REFUNDED}),
+    PaymentStatus.PARTIALLY_REFUNDED: frozenset({PaymentStatus.PARTIALLY_REFUNDED, PaymentStatus.REFUNDED}),
+}
+_FINAL: frozenset = frozenset()
 
-@dataclass(frozen=True)
+# Статусы, из которых возможен возврат
+_REFUNDABLE = frozenset(status for status, targets in _TRANSITIONS.items() if PaymentStatus.REFUNDED in targets)
+
+
+@dataclass(frozen=True, slots=True)
 class Payment:
     id: PaymentId  # Уникальный идентификатор платежа
     amount: Amount  # Сумма платежа
@@ -17,6 +33,9 @@ class Payment:
     description: Optional[str] = None  # Описание платежа
     customer_email: Optional[str] = None  # Email клиента
     error_message: Optional[str] = None  # Сообщение об ошибке (если статус FAILED)
+    refunded_amount: Optional[Amount] = None  # Сумма всех возвратов (None — возвратов не было)
+    expires_at: Optional[datetime] = None  # Срок авторизации (только для PENDING)
+    settlement_amount: Optional[Amount] = None  # Сумма в валюте расчётов по курсу на момент обработки
 
     """
     Проверка, успешен ли платёж.
@@ -30,6 +49,113 @@ class Payment:
     def is_failed(self) -> bool:
         return self.status == PaymentStatus.FAILED
 
+    """
+    Разрешён ли переход в статус status.
+    """
+    def can_transition_to(self, status: PaymentStatus) -> bool:
+        return status in _TRANSITIONS.get(self.status, _FINAL)
+
+    """
+    Списать авторизованные средства: PENDING → SUCCEEDED.
+
+    Истёкшую авторизацию списать нельзя, даже если её ещё не отменил
+    планировщик.
+    """
+    def capture(self, captured_at: Optional[datetime] = None) -> "Payment":
+        self._check_transition(PaymentStatus.SUCCEEDED, "captured")
+        if self.expires_at is not None and (captured_at or datetime.now()) >= self.expires_at:
+            raise PaymentProcessingError(
+                f"Authorization expired at {self.expires_at.isoformat()}", payment_id=self.id.value
+            )
+        return replace(self, status=PaymentStatus.SUCCEEDED, expires_at=None)
+
+    """
+    Отменить авторизацию: PENDING → VOIDED, причина — в error_message.
+    """
+    def void(self, reason: Optional[str] = None) -> "Payment":
+        self._check_transition(PaymentStatus.VOIDED, "voided")
+        return replace(
+            self, status=PaymentStatus.VOIDED, expires_at=None, error_message=reason or "Authorization voided"
+        )
+
+    def _check_transition(self, status: PaymentStatus, action: str) -> None:
+        if not self.can_transition_to(status):
+            raise PaymentProcessingError(
+                f"Payment in status {self.status.value} cannot be {action}", payment_id=self.id.value
+            )
+
+    """
+    Сколько ещё можно вернуть (в минорных единицах валюты).
+    """
+    def refundable_minor(self) -> int:
+        if self.status not in _REFUNDABLE:
+            return 0
+        refunded = self.refunded_amount.minor if self.refunded_amount is not None else 0
+        return self.amount.minor - refunded
+
+    """
+    Сколько ещё можно вернуть.
+    """
+    def refundable_value(self) -> Decimal:
+        return from_minor(self.refundable_minor(), self.amount.currency)
+
+    """
+    Применить возврат: новое состояние платежа и запись о возврате.
+
+    Сумма возвратов хранится нарастающим итогом в минорных единицах,
+    поэтому проверка на превышение — O(1) целочисленная операция
+    независимо от числа предыдущих возвратов.
+    """
+    def refund(
+            self,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None,
+            refunded_at: Optional[datetime] = None
+    ) -> Tuple["Payment", "Payment"]:
+        """
+        :param amount: Сумма возврата (если None — возврат всего остатка)
+        :param reason: Причина возврата
+        :param refunded_at: Время возврата (по умолчанию — сейчас)
+        :return: (обновлённый платёж, запись о возврате со статусом REFUNDED)
+        :raises PaymentProcessingError: Если возврат невозможен или превышает остаток
+        """
+        payment_id = self.id.value
+        if self.status not in _REFUNDABLE:
+            raise PaymentProcessingError(
+                f"Payment in status {self.status.value} cannot be refunded", payment_id=payment_id
+            )
+
+        currency = self.amount.currency
+        remaining = self.refundable_minor()
+        if amount is None:
+            amount = Amount.trusted_minor(remaining, currency)
+        elif amount.currency != currency:
+            raise PaymentProcessingError(
+                f"Refund currency {amount.currency} does not match payment currency {currency}",
+                payment_id=payment_id
+            )
+        elif amount.minor > remaining:
+            raise PaymentProcessingError(
+                f"Refund of {amount.value} exceeds refundable amount {from_minor(remaining, currency)}",
+                payment_id=payment_id
+            )
+
+        refunded_minor = self.amount.minor - remaining + amount.minor
+        updated = replace(
+            self,
+            status=PaymentStatus.REFUNDED if refunded_minor == self.amount.minor else PaymentStatus.PARTIALLY_REFUNDED,
+            refunded_amount=Amount.trusted_minor(refunded_minor, currency)
+        )
+        refund = Payment(
+            id=self.id,
+            amount=amount,
+            status=PaymentStatus.REFUNDED,
+            created_at=refunded_at or datetime.now(),
+            description=f"Refund: {reason or 'No reason provided'}",
+            customer_email=self.customer_email
+        )
+        return updated, refund
+
     """
     Строковое представление объекта (аналог toString() в Java).
     """
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Self
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PaymentId:
     value: str
 
@@ -16,4 +16,15 @@ class PaymentId:
 
         # Проверка 3: длина не должна превышать 100 символов
         if len(self.value) > 100:
-            raise ValueError("PaymentId cannot be longer than 100 characters")
\ No newline at end of file
+            raise ValueError("PaymentId cannot be longer than 100 characters")
+
+    @classmethod
+    def trusted(cls, value: str) -> Self:
+        """
+        Создать идентификатор без проверок.
+
+        Только для уже провалидированных данных (например, загрузка из хранилища).
+        """
+        payment_id = object.__new__(cls)
+        object.__setattr__(payment_id, 'value', value)
+        return payment_id
@@ -4,7 +4,9 @@ class PaymentStatus(Enum):
     """
     Статус платежа — перечисление возможных состояний
     """
-    PENDING = "pending"      # Платёж в обработке
+    PENDING = "pending"      # Средства заблокированы (авторизация), ждёт capture или void
     SUCCEEDED = "succeeded"  # Платёж успешен
     FAILED = "failed"        # Платёж провален
-    REFUNDED = "refunded"    # Платёж возвращён
\ No newline at end of file
+    REFUNDED = "refunded"    # Платёж возвращён
+    PARTIALLY_REFUNDED = "partially_refunded"  # Возвращена часть суммы
+    VOIDED = "voided"        # Авторизация отменена, средства освобождены
\ No newline at end of file
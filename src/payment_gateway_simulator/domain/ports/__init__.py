@@ -1,7 +1,31 @@
-from .payment_processor import PaymentProcessorPort
+from .payment_processor import (
+    PaymentProcessorPort,
+    PaymentCommand,
+    BatchItemOutcome,
+    PaymentQuery,
+    PaymentPage,
+    PaymentCursor,
+)
 from .transaction_logger import TransactionLoggerPort
+from .async_payment_processor import AsyncPaymentProcessorPort
+from .async_transaction_logger import AsyncTransactionLoggerPort
+from .volume_report import VolumeReportPort, VolumeBucket, ReportGranularity
+from .risk_assessor import RiskAssessorPort
+from .fx_rates import FxRateProviderPort
 
 __all__ = [
     "PaymentProcessorPort",
+    "PaymentCommand",
+    "BatchItemOutcome",
+    "PaymentQuery",
+    "PaymentPage",
+    "PaymentCursor",
     "TransactionLoggerPort",
-]
\ No newline at end of file
+    "AsyncPaymentProcessorPort",
+    "AsyncTransactionLoggerPort",
+    "VolumeReportPort",
+    "VolumeBucket",
+    "ReportGranularity",
+    "RiskAssessorPort",
+    "FxRateProviderPort",
+]
@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from ..payment import Payment
+from ..payment_id import PaymentId
+from ..amount import Amount
+from ..exceptions import PaymentProcessingError
+from .payment_processor import PaymentCommand, BatchItemOutcome, PaymentQuery, PaymentPage
+
+
+class AsyncPaymentProcessorPort(ABC):
+    """
+    Асинхронный порт для обработки платежей.
+
+    Повторяет контракт PaymentProcessorPort, но методы — корутины:
+    адаптер сам решает, как не блокировать event loop.
+    """
+
+    @abstractmethod
+    async def process_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Обработать платёж через внешний шлюз.
+
+        :param payment_id: Уникальный идентификатор платежа
+        :param amount: Сумма и валюта
+        :param description: Описание платежа (опционально)
+        :param customer_email: Email клиента (опционально)
+        :param meta: Дополнительные данные для шлюза (опционально)
+        :param decline_reason: Если задан — платёж сохраняется со статусом FAILED
+            и этим сообщением, без обращения к шлюзу
+        :param settlement_amount: Сумма в валюте расчётов (сохраняется с платежом)
+        :return: Созданный платёж со статусом
+        :raises PaymentProcessingError: Если платёж отклонён или произошла ошибка
+        """
+        pass
+
+    @abstractmethod
+    async def refund_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Optional[Amount] = None,
+            reason: Optional[str] = None
+    ) -> Payment:
+        """
+        Вернуть платёж (полностью или частично).
+
+        Хранимый платёж сохраняет исходную сумму и получает статус
+        PARTIALLY_REFUNDED или REFUNDED; сумма возвратов накапливается
+        в refunded_amount. Возвраты сверх остатка отклоняются атомарно.
+
+        :param payment_id: Идентификатор платежа для возврата
+        :param amount: Сумма возврата (если None — возврат всего остатка)
+        :param reason: Причина возврата (опционально)
+        :return: Запись о возврате (сумма возврата, статус REFUNDED)
+        :raises PaymentProcessingError: Если платёж не найден, валюта не совпадает
+            или сумма превышает остаток
+        """
+        pass
+
+    @abstractmethod
+    async def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Авторизовать платёж (см. PaymentProcessorPort.authorize_payment).
+        """
+        pass
+
+    @abstractmethod
+    async def capture_payment(self, payment_id: PaymentId) -> Payment:
+        """
+        Списать авторизованные средства (см. PaymentProcessorPort.capture_payment).
+        """
+        pass
+
+    @abstractmethod
+    async def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        """
+        Отменить авторизацию (см. PaymentProcessorPort.void_payment).
+        """
+        pass
+
+    @abstractmethod
+    async def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        """
+        Получить текущее состояние платежа.
+
+        :param payment_id: Идентификатор платежа
+        :return: Платёж или None, если платёж не найден
+        """
+        pass
+
+    @abstractmethod
+    async def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Получить журнал возвратов платежа.
+
+        :param payment_id: Идентификатор платежа
+        :return: Записи о возвратах в порядке проведения (пустой список, если возвратов нет)
+        """
+        pass
+
+    @abstractmethod
+    async def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        """
+        Выбрать платежи по фильтрам с курсорной пагинацией (см. PaymentProcessorPort.list_payments).
+
+        :param query: Фильтры, курсор и размер страницы
+        :return: Страница платежей по возрастанию (created_at, payment_id)
+        """
+        pass
+
+    async def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        """
+        Обработать пакет платежей за один вызов.
+
+        Реализация по умолчанию последовательно ожидает process_payment.
+
+        :param commands: Команды на обработку (порядок сохраняется)
+        :return: Для каждой команды — созданный платёж или ошибка отказа
+        """
+        outcomes: List[BatchItemOutcome] = []
+        for command in commands:
+            try:
+                outcomes.append(await self.process_payment(
+                    payment_id=command.payment_id,
+                    amount=command.amount,
+                    description=command.description,
+                    customer_email=command.customer_email,
+                    meta=command.meta,
+                    decline_reason=command.decline_reason,
+                    settlement_amount=command.settlement_amount
+                ))
+            except PaymentProcessingError as e:
+                outcomes.append(e)
+        return outcomes
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..payment import Payment
+from ..payment_id import PaymentId
+
+
+class AsyncTransactionLoggerPort(ABC):
+    """
+    Асинхронный порт для логирования транзакций.
+    """
+
+    @abstractmethod
+    async def log_transaction(self, payment: Payment) -> None:
+        """
+        Залогировать транзакцию.
+
+        :param payment: Платёж для логирования
+        """
+        pass
+
+    async def log_transactions(self, payments: List[Payment]) -> None:
+        """
+        Залогировать пакет транзакций за один вызов.
+
+        Реализация по умолчанию вызывает log_transaction для каждого платежа.
+
+        :param payments: Платежи для логирования
+        """
+        for payment in payments:
+            await self.log_transaction(payment)
+
+    @abstractmethod
+    async def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Получить историю транзакций по идентификатору платежа.
+
+        :param payment_id: Идентификатор платежа
+        :return: Список транзакций (обычно 1 основная + 0..N возвратов)
+        """
+        pass
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..amount import Amount
+
+
+class FxRateProviderPort(ABC):
+    """
+    Абстрактный порт курсов валют.
+
+    Конвертация вызывается для каждого платежа в мультивалютных
+    сценариях, поэтому контракт синхронный и без ввода-вывода:
+    реализация отвечает из заранее загруженной таблицы.
+    """
+
+    @abstractmethod
+    def convert_minor(self, minor: int, source: str, target: str) -> Optional[int]:
+        """
+        Перевести сумму в минорных единицах из одной валюты в другую.
+
+        Результат округляется до минорной единицы целевой валюты
+        (банковское округление, как у Amount).
+
+        :param minor: Сумма в минорных единицах source
+        :param source: Код исходной валюты (в верхнем регистре)
+        :param target: Код целевой валюты (в верхнем регистре)
+        :return: Сумма в минорных единицах target или None, если курса нет
+        """
+        pass
+
+    def convert(self, amount: Amount, currency: str) -> Optional[Amount]:
+        """
+        Перевести сумму в валюту currency.
+
+        :return: Сумма в currency или None, если курса нет или сумма
+            меньше минорной единицы currency
+        """
+        minor = self.convert_minor(amount.minor, amount.currency, currency)
+        if not minor:
+            return None
+        return Amount.trusted_minor(minor, currency)
@@ -1,10 +1,70 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
 
 from ..payment import Payment
 from ..payment_id import PaymentId
 from ..amount import Amount
-from ..exceptions import DomainError
+from ..payment_status import PaymentStatus
+from ..exceptions import DomainError, PaymentProcessingError
+
+
+@dataclass(frozen=True)
+class PaymentCommand:
+    """
+    Команда на обработку одного платежа в пакете.
+    """
+    payment_id: PaymentId
+    amount: Amount
+    description: Optional[str] = None
+    customer_email: Optional[str] = None
+    meta: Optional[dict] = None
+    decline_reason: Optional[str] = None  # Отказ до обращения к шлюзу (например, правило риска)
+    settlement_amount: Optional[Amount] = None  # Сумма в валюте расчётов
+
+
+# Результат обработки элемента пакета: платёж или ошибка отказа
+BatchItemOutcome = Union[Payment, PaymentProcessingError]
+
+# Позиция в выборке платежей: (created_at, payment_id) последнего отданного платежа.
+# Платежи упорядочены по этой паре, поэтому курсор устойчив к новым записям.
+PaymentCursor = Tuple[datetime, str]
+
+
+@dataclass(frozen=True)
+class PaymentQuery:
+    """
+    Фильтры и страница для выборки платежей.
+
+    Все фильтры необязательны и объединяются через И;
+    диапазон created_at — [created_from, created_to).
+    """
+    status: Optional[PaymentStatus] = None
+    currency: Optional[str] = None
+    customer_email: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    after: Optional[PaymentCursor] = None  # Курсор: отдавать платежи строго после этой позиции
+    limit: int = 100
+
+
+@dataclass(frozen=True)
+class PaymentPage:
+    """
+    Страница выборки: платежи по возрастанию (created_at, payment_id).
+
+    next_cursor — позиция для следующей страницы (None, если страница последняя).
+    """
+    items: List[Payment]
+    next_cursor: Optional[PaymentCursor] = None
+
+
+def cursor_of(payment: Payment) -> PaymentCursor:
+    """
+    Позиция платежа в порядке выборки
+    """
+    return payment.created_at, payment.id.value
 
 
 class PaymentProcessorPort(ABC):
@@ -19,7 +79,9 @@ class PaymentProcessorPort(ABC):
             amount: Amount,
             description: Optional[str] = None,
             customer_email: Optional[str] = None,
-            metadata: Optional[dict] = None
+            metadata: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
     ) -> Payment:
         """
         Обработать платёж через внешний шлюз.
@@ -29,6 +91,9 @@ class PaymentProcessorPort(ABC):
         :param description: Описание платежа (опционально)
         :param customer_email: Email клиента (опционально)
         :param metadata: Дополнительные данные для шлюза (опционально)
+        :param decline_reason: Если задан — платёж сохраняется со статусом FAILED
+            и этим сообщением, без обращения к шлюзу
+        :param settlement_amount: Сумма в валюте расчётов (сохраняется с платежом)
         :return: Созданный платёж со статусом
         :raises PaymentProcessingError: Если платёж отклонён или произошла ошибка
         """
@@ -44,10 +109,134 @@ class PaymentProcessorPort(ABC):
         """
         Вернуть платёж (полностью или частично).
 
+        Хранимый платёж сохраняет исходную сумму и получает статус
+        PARTIALLY_REFUNDED или REFUNDED; сумма возвратов накапливается
+        в refunded_amount. Возвраты сверх остатка отклоняются атомарно.
+
         :param payment_id: Идентификатор платежа для возврата
-        :param amount: Сумма возврата (если None — полный возврат)
+        :param amount: Сумма возврата (если None — возврат всего остатка)
         :param reason: Причина возврата (опционально)
-        :return: Обновлённый платёж со статусом REFUNDED
-        :raises PaymentProcessingError: Если возврат невозможен
+        :return: Запись о возврате (сумма возврата, статус REFUNDED)
+        :raises PaymentProcessingError: Если платёж не найден, валюта не совпадает
+            или сумма превышает остаток
+        """
+        pass
+
+    @abstractmethod
+    def authorize_payment(
+            self,
+            payment_id: PaymentId,
+            amount: Amount,
+            expires_at: datetime,
+            description: Optional[str] = None,
+            customer_email: Optional[str] = None,
+            meta: Optional[dict] = None,
+            decline_reason: Optional[str] = None,
+            settlement_amount: Optional[Amount] = None
+    ) -> Payment:
+        """
+        Авторизовать платёж: заблокировать средства без списания.
+
+        Одобренная авторизация сохраняется со статусом PENDING и сроком
+        expires_at; отказ шлюза — со статусом FAILED, как в process_payment.
+
+        :param payment_id: Уникальный идентификатор платежа
+        :param amount: Сумма и валюта
+        :param expires_at: Срок, после которого авторизация отменяется
+        :param decline_reason: Если задан — авторизация сохраняется со статусом FAILED
+            и этим error_message, без обращения к шлюзу (см. process_payment)
+        :param settlement_amount: Сумма в валюте расчётов (сохраняется с платежом)
+        :return: Платёж со статусом PENDING (или FAILED)
+        :raises PaymentProcessingError: Если платёж с таким ID уже существует
+        """
+        pass
+
+    @abstractmethod
+    def capture_payment(self, payment_id: PaymentId) -> Payment:
+        """
+        Списать авторизованные средства (PENDING → SUCCEEDED).
+
+        Проверка статуса и срока авторизации выполняется атомарно
+        вместе с обновлением.
+
+        :param payment_id: Идентификатор авторизованного платежа
+        :return: Обновлённый платёж
+        :raises PaymentNotFoundError: Если платёж не найден
+        :raises PaymentProcessingError: Если платёж не в статусе PENDING или авторизация истекла
+        """
+        pass
+
+    @abstractmethod
+    def void_payment(self, payment_id: PaymentId, reason: Optional[str] = None) -> Payment:
+        """
+        Отменить авторизацию (PENDING → VOIDED).
+
+        :param payment_id: Идентификатор авторизованного платежа
+        :param reason: Причина отмены (опционально)
+        :return: Обновлённый платёж
+        :raises PaymentNotFoundError: Если платёж не найден
+        :raises PaymentProcessingError: Если платёж не в статусе PENDING
+        """
+        pass
+
+    @abstractmethod
+    def get_payment(self, payment_id: PaymentId) -> Optional[Payment]:
+        """
+        Получить текущее состояние платежа.
+
+        Чтение без валидации и побочных эффектов — вызывается напрямую,
+        минуя сценарии использования.
+
+        :param payment_id: Идентификатор платежа
+        :return: Платёж или None, если платёж не найден
+        """
+        pass
+
+    @abstractmethod
+    def get_refunds(self, payment_id: PaymentId) -> List[Payment]:
+        """
+        Получить журнал возвратов платежа.
+
+        :param payment_id: Идентификатор платежа
+        :return: Записи о возвратах в порядке проведения (пустой список, если возвратов нет)
+        """
+        pass
+
+    @abstractmethod
+    def list_payments(self, query: PaymentQuery) -> PaymentPage:
+        """
+        Выбрать платежи по фильтрам с курсорной пагинацией.
+
+        Адаптер отвечает на запрос по вторичным индексам (статус, валюта,
+        email, created_at), а не полным перебором хранилища.
+
+        :param query: Фильтры, курсор и размер страницы
+        :return: Страница платежей по возрастанию (created_at, payment_id)
+        """
+        pass
+
+    def process_payments(self, commands: List[PaymentCommand]) -> List[BatchItemOutcome]:
+        """
+        Обработать пакет платежей за один вызов.
+
+        Реализация по умолчанию вызывает process_payment для каждой команды.
+        Адаптеры переопределяют метод, если умеют обрабатывать пакет дешевле.
+
+        :param commands: Команды на обработку (порядок сохраняется)
+        :return: Для каждой команды — созданный платёж или ошибка отказа
         """
-        pass
\ No newline at end of file
+        outcomes: List[BatchItemOutcome] = []
+        for command in commands:
+            try:
+                outcomes.append(self.process_payment(
+                    payment_id=command.payment_id,
+                    amount=command.amount,
+                    description=command.description,
+                    customer_email=command.customer_email,
+                    meta=command.meta,
+                    decline_reason=command.decline_reason,
+                    settlement_amount=command.settlement_amount
+                ))
+            except PaymentProcessingError as e:
+                outcomes.append(e)
+        return outcomes
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from .payment_processor import PaymentCommand
+
+
+class RiskAssessorPort(ABC):
+    """
+    Абстрактный порт оценки риска платежа до обращения к шлюзу.
+
+    Вызывается для каждого платежа на горячем пути, поэтому контракт
+    синхронный и без ввода-вывода: один порт обслуживает и синхронные,
+    и асинхронные сценарии.
+    """
+
+    @abstractmethod
+    def assess(self, command: PaymentCommand) -> Optional[str]:
+        """
+        Оценить платёж.
+
+        :param command: Провалидированная команда на платёж
+        :return: Причина отказа, если сработало правило, иначе None
+        """
+        pass
+
+    def discard(self, command: PaymentCommand) -> None:
+        """
+        Отменить учёт оценённой команды, которую хранилище не приняло
+        (платёж с таким ID уже существует): повтор не является новой попыткой.
+
+        Реализация по умолчанию ничего не делает.
+
+        :param command: Команда, ранее переданная в assess
+        """
+        pass
@@ -19,6 +19,17 @@ class TransactionLoggerPort(ABC):
         """
         pass
 
+    def log_transactions(self, payments: List[Payment]) -> None:
+        """
+        Залогировать пакет транзакций за один вызов.
+
+        Реализация по умолчанию вызывает log_transaction для каждого платежа.
+
+        :param payments: Платежи для логирования
+        """
+        for payment in payments:
+            self.log_transaction(payment)
+
     @abstractmethod
     def get_transactions_by_payment_id(self, payment_id: PaymentId) -> List[Payment]:
         """
@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from ..payment_status import PaymentStatus
+
+
+class ReportGranularity(Enum):
+    """
+    Ширина временного окна отчёта
+    """
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
+@dataclass(frozen=True)
+class VolumeBucket:
+    """
+    Агрегат одного окна: число транзакций и их сумма по валюте и статусу.
+    """
+    start: datetime  # Начало окна (локальное время, как у created_at)
+    currency: str
+    status: PaymentStatus
+    count: int
+    amount_minor: int  # Сумма в минорных единицах валюты
+    settlement_currency: Optional[str] = None  # Валюта расчётов (если отчёт пересчитан)
+    settlement_minor: Optional[int] = None  # Сумма в минорных единицах валюты расчётов (None — курса нет)
+
+
+class VolumeReportPort(ABC):
+    """
+    Абстрактный порт для отчётов по объёму транзакций.
+
+    Реализация поддерживает агрегаты инкрементально, поэтому отчёт
+    стоит O(окон), а не O(платежей).
+    """
+
+    @abstractmethod
+    def volume(
+            self,
+            granularity: ReportGranularity,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None
+    ) -> List[VolumeBucket]:
+        """
+        Получить агрегаты окон в диапазоне [start, end).
+
+        :param granularity: Ширина окна
+        :param start: Начало диапазона (None — самое старое хранимое окно)
+        :param end: Конец диапазона (None — до последнего окна включительно)
+        :return: Непустые окна по возрастанию start, затем валюты и статуса
+        """
+        pass
@@ -0,0 +1,58 @@
+"""
+Запуск симулятора в нескольких процессах с общим хранилищем платежей.
+
+Пример:
+    python -m src.payment_gateway_simulator.serve --workers 8 --port 8000
+
+Сначала поднимается процесс-сервер хранилища, затем uvicorn с N воркерами;
+каждый воркер подключается к хранилищу (PGS_STORAGE=shared). Ключ
+соединений без PGS_SHARED_STORE_AUTHKEY генерируется на каждый запуск
+и передаётся воркерам через окружение. Симуляция отказов
+(PGS_SIMULATION_FILE) выполняется на сервере хранилища.
+"""
+import argparse
+import os
+import secrets
+
+import uvicorn
+
+from .adapters.payment.shared import parse_address, start_store_server
+from .adapters.payment.simulation import SimulationConfig
+from .config import settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Payment Gateway Simulator (multi-process)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--store-address", default=settings.shared_store_address)
+    parser.add_argument("--store-shards", type=int, default=64)
+    args = parser.parse_args()
+
+    authkey = settings.shared_store_authkey or secrets.token_hex(32)
+    simulation = SimulationConfig.from_file(settings.simulation_file) if settings.simulation_file else None
+    store = start_store_server(
+        parse_address(args.store_address), authkey.encode("utf-8"), shards=args.store_shards,
+        simulation=simulation
+    )
+
+    # Воркеры читают настройки из окружения при импорте приложения
+    os.environ["PGS_STORAGE"] = "shared"
+    os.environ["PGS_SHARED_STORE_ADDRESS"] = args.store_address
+    os.environ["PGS_SHARED_STORE_AUTHKEY"] = authkey
+
+    try:
+        uvicorn.run(
+            f"{__package__}.api.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+        )
+    finally:
+        store.terminate()
+        store.join()
+
+
+if __name__ == "__main__":
+    main()
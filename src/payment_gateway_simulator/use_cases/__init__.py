@@ -1,6 +1,48 @@
-from .process_payment import ProcessPaymentUseCase, ProcessPaymentInput
+from .process_payment import (
+    ProcessPaymentUseCase,
+    AsyncProcessPaymentUseCase,
+    ProcessPaymentInput,
+    ProcessPaymentResult,
+)
+from .refund_payment import (
+    RefundPaymentUseCase,
+    AsyncRefundPaymentUseCase,
+    RefundPaymentInput,
+)
+from .authorize_payment import (
+    AuthorizePaymentUseCase,
+    AsyncAuthorizePaymentUseCase,
+    AuthorizePaymentInput,
+)
+from .capture_payment import (
+    CapturePaymentUseCase,
+    AsyncCapturePaymentUseCase,
+    CapturePaymentInput,
+)
+from .void_payment import (
+    VoidPaymentUseCase,
+    AsyncVoidPaymentUseCase,
+    VoidPaymentInput,
+)
+from .volume_report import VolumeReportUseCase, VolumeReportInput
 
 __all__ = [
     "ProcessPaymentUseCase",
+    "AsyncProcessPaymentUseCase",
     "ProcessPaymentInput",
-]
\ No newline at end of file
+    "ProcessPaymentResult",
+    "RefundPaymentUseCase",
+    "AsyncRefundPaymentUseCase",
+    "RefundPaymentInput",
+    "AuthorizePaymentUseCase",
+    "AsyncAuthorizePaymentUseCase",
+    "AuthorizePaymentInput",
+    "CapturePaymentUseCase",
+    "AsyncCapturePaymentUseCase",
+    "CapturePaymentInput",
+    "VoidPaymentUseCase",
+    "AsyncVoidPaymentUseCase",
+    "VoidPaymentInput",
+    "VolumeReportUseCase",
+    "VolumeReportInput",
+]
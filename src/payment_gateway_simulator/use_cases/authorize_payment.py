@@ -0,0 +1,151 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime, timedelta
+
+from .core.base_use_case import BaseUseCase
+from .core.async_base_use_case import AsyncBaseUseCase
+from .process_payment import ProcessPaymentInput, _Settlement, _assess, _discard, _to_command
+from ..domain.payment import Payment
+from ..domain.exceptions import PaymentAlreadyExistsError
+from ..domain.ports.payment_processor import PaymentProcessorPort
+from ..domain.ports.transaction_logger import TransactionLoggerPort
+from ..domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ..domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+from ..domain.ports.risk_assessor import RiskAssessorPort
+from ..domain.ports.fx_rates import FxRateProviderPort
+
+# Срок авторизации по умолчанию — как у карточных холдов (7 дней)
+DEFAULT_HOLD_SECONDS = 7 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class AuthorizePaymentInput(ProcessPaymentInput):
+    """
+    Входные данные для авторизации: поля платежа и срок блокировки средств.
+    """
+    hold_seconds: float = DEFAULT_HOLD_SECONDS
+
+
+def _expires_at(input: AuthorizePaymentInput) -> datetime:
+    """
+    :raises ValueError: Если срок авторизации не положительный
+    """
+    if input.hold_seconds <= 0:
+        raise ValueError("hold_seconds must be positive")
+    return datetime.now() + timedelta(seconds=input.hold_seconds)
+
+
+class AuthorizePaymentUseCase(BaseUseCase[AuthorizePaymentInput, Payment]):
+    """
+    Сценарий авторизации (первая фаза двухфазного платежа).
+
+    1. Валидация входных данных (правила — как у ProcessPaymentUseCase)
+    2. Оценка риска и пересчёт в валюту расчётов — как у ProcessPaymentUseCase,
+       поэтому авторизация со списанием не обходит правила риска
+    3. Блокировка средств в процессоре: PENDING до expires_at
+       (сработавшее правило риска сохраняет авторизацию отклонённой)
+    4. Логирование авторизации
+    """
+
+    def __init__(
+            self,
+            payment_processor: PaymentProcessorPort,
+            transaction_logger: TransactionLoggerPort,
+            risk_assessor: Optional[RiskAssessorPort] = None,
+            fx_rates: Optional[FxRateProviderPort] = None,
+            settlement_currency: Optional[str] = None
+    ):
+        """
+        Внедрение зависимостей через конструктор
+
+        :param settlement_currency: Валюта расчётов; сумма в ней сохраняется
+            с авторизацией и остаётся у платежа после списания
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+        self._risk_assessor = risk_assessor
+        self._settlement = _Settlement(fx_rates, settlement_currency)
+
+    def execute(self, input: AuthorizePaymentInput) -> Payment:
+        """
+        Выполнить авторизацию.
+
+        :param input: Входные данные платежа и срок авторизации
+        :return: Платёж со статусом PENDING (или FAILED при отказе шлюза)
+        :raises ValueError: При невалидных входных данных
+        :raises PaymentProcessingError: Если платёж с таким ID уже существует
+        """
+        command = _to_command(input)
+        expires_at = _expires_at(input)
+        command = self._settlement.apply(_assess(self._risk_assessor, command))
+
+        try:
+            payment = self._payment_processor.authorize_payment(
+                payment_id=command.payment_id,
+                amount=command.amount,
+                expires_at=expires_at,
+                description=command.description,
+                customer_email=command.customer_email,
+                meta=command.meta,
+                decline_reason=command.decline_reason,
+                settlement_amount=command.settlement_amount
+            )
+        except PaymentAlreadyExistsError:
+            _discard(self._risk_assessor, command)
+            raise
+
+        self._transaction_logger.log_transaction(payment)
+
+        return payment
+
+
+class AsyncAuthorizePaymentUseCase(AsyncBaseUseCase[AuthorizePaymentInput, Payment]):
+    """
+    Асинхронный сценарий авторизации (те же правила, что и в AuthorizePaymentUseCase)
+    """
+
+    def __init__(
+            self,
+            payment_processor: AsyncPaymentProcessorPort,
+            transaction_logger: AsyncTransactionLoggerPort,
+            risk_assessor: Optional[RiskAssessorPort] = None,
+            fx_rates: Optional[FxRateProviderPort] = None,
+            settlement_currency: Optional[str] = None
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+        self._risk_assessor = risk_assessor
+        self._settlement = _Settlement(fx_rates, settlement_currency)
+
+    async def execute(self, input: AuthorizePaymentInput) -> Payment:
+        """
+        Выполнить авторизацию.
+
+        :param input: Входные данные платежа и срок авторизации
+        :return: Платёж со статусом PENDING (или FAILED при отказе шлюза)
+        """
+        command = _to_command(input)
+        expires_at = _expires_at(input)
+        command = self._settlement.apply(_assess(self._risk_assessor, command))
+
+        try:
+            payment = await self._payment_processor.authorize_payment(
+                payment_id=command.payment_id,
+                amount=command.amount,
+                expires_at=expires_at,
+                description=command.description,
+                customer_email=command.customer_email,
+                meta=command.meta,
+                decline_reason=command.decline_reason,
+                settlement_amount=command.settlement_amount
+            )
+        except PaymentAlreadyExistsError:
+            _discard(self._risk_assessor, command)
+            raise
+
+        await self._transaction_logger.log_transaction(payment)
+
+        return payment
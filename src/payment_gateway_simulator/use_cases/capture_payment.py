@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+
+from .core.base_use_case import BaseUseCase
+from .core.async_base_use_case import AsyncBaseUseCase
+from ..domain.payment import Payment
+from ..domain.payment_id import PaymentId
+from ..domain.ports.payment_processor import PaymentProcessorPort
+from ..domain.ports.transaction_logger import TransactionLoggerPort
+from ..domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ..domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+
+
+@dataclass(frozen=True)
+class CapturePaymentInput:
+    """
+    Входные данные для списания авторизованного платежа.
+    """
+    payment_id: str
+
+
+def _payment_id(payment_id: str) -> PaymentId:
+    """
+    :raises ValueError: При пустом идентификаторе
+    """
+    if not payment_id or not payment_id.strip():
+        raise ValueError("payment_id must be non-empty")
+    return PaymentId(payment_id)
+
+
+class CapturePaymentUseCase(BaseUseCase[CapturePaymentInput, Payment]):
+    """
+    Сценарий списания (вторая фаза двухфазного платежа).
+
+    1. Валидация входных данных
+    2. Атомарный переход PENDING → SUCCEEDED в процессоре (проверка статуса и срока)
+    3. Логирование списания
+    """
+
+    def __init__(
+            self,
+            payment_processor: PaymentProcessorPort,
+            transaction_logger: TransactionLoggerPort
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+
+    def execute(self, input: CapturePaymentInput) -> Payment:
+        """
+        Списать авторизованные средства.
+
+        :param input: Идентификатор авторизованного платежа
+        :return: Платёж со статусом SUCCEEDED
+        :raises ValueError: При невалидных входных данных
+        :raises PaymentNotFoundError: Если платёж не найден
+        :raises PaymentProcessingError: Если платёж не в статусе PENDING или авторизация истекла
+        """
+        payment = self._payment_processor.capture_payment(_payment_id(input.payment_id))
+
+        self._transaction_logger.log_transaction(payment)
+
+        return payment
+
+
+class AsyncCapturePaymentUseCase(AsyncBaseUseCase[CapturePaymentInput, Payment]):
+    """
+    Асинхронный сценарий списания (те же правила, что и в CapturePaymentUseCase)
+    """
+
+    def __init__(
+            self,
+            payment_processor: AsyncPaymentProcessorPort,
+            transaction_logger: AsyncTransactionLoggerPort
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+
+    async def execute(self, input: CapturePaymentInput) -> Payment:
+        """
+        Списать авторизованные средства.
+
+        :param input: Идентификатор авторизованного платежа
+        :return: Платёж со статусом SUCCEEDED
+        """
+        payment = await self._payment_processor.capture_payment(_payment_id(input.payment_id))
+
+        await self._transaction_logger.log_transaction(payment)
+
+        return payment
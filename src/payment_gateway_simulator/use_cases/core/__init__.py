@@ -1,3 +1,23 @@
 from .base_use_case import BaseUseCase
+from .async_base_use_case import AsyncBaseUseCase
+from .interceptors import (
+    CallContext,
+    UseCaseInterceptor,
+    TimingInterceptor,
+    SlowCallInterceptor,
+    SamplingProfilerInterceptor,
+    build_interceptors,
+    configure_interceptors,
+)
 
-__all__ = ['BaseUseCase']
\ No newline at end of file
+__all__ = [
+    'BaseUseCase',
+    'AsyncBaseUseCase',
+    'CallContext',
+    'UseCaseInterceptor',
+    'TimingInterceptor',
+    'SlowCallInterceptor',
+    'SamplingProfilerInterceptor',
+    'build_interceptors',
+    'configure_interceptors',
+]
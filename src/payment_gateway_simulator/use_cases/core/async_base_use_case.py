@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from typing import Generic, Sequence
+
+from .base_use_case import I, O
+from .interceptors import UseCaseInterceptor, intercept_methods, async_intercepted, register_use_case
+
+
+class AsyncBaseUseCase(ABC, Generic[I, O]):
+    """
+    Абстрактный базовый класс для асинхронных сценариев использования.
+
+    Используется там, где порты асинхронные и сценарий выполняется
+    прямо в event loop (например, из обработчиков FastAPI).
+    execute и execute_batch подклассов оборачиваются цепочкой перехватчиков, как в BaseUseCase.
+    """
+    interceptors: Sequence[UseCaseInterceptor] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        register_use_case(cls)
+        intercept_methods(cls, async_intercepted)
+
+    @abstractmethod
+    async def execute(self, input: I) -> O:
+        """
+        Выполнить бизнес-сценарий.
+
+        :param input: Входные данные сценария
+        :return: Результат выполнения
+        :raises DomainError: При ошибках валидации или бизнес-логики
+        """
+        pass
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from typing import Generic, Sequence, TypeVar
+
+from .interceptors import UseCaseInterceptor, intercept_methods, intercepted, register_use_case
 
 I = TypeVar('I')  # Тип входного параметра
 O = TypeVar('O')  # Тип выходного результата
@@ -8,7 +10,16 @@ O = TypeVar('O')  # Тип выходного результата
 class BaseUseCase(ABC, Generic[I, O]):
     """
     Абстрактный базовый класс для всех сценариев использования (Use Cases).
+
+    execute и execute_batch подклассов автоматически оборачиваются цепочкой перехватчиков
+    (см. interceptors.py); по умолчанию цепочка пустая.
     """
+    interceptors: Sequence[UseCaseInterceptor] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        register_use_case(cls)
+        intercept_methods(cls, intercepted)
 
     @abstractmethod
     def execute(self, input: I) -> O:
@@ -0,0 +1,344 @@
+"""
+Перехватчики вызовов execute у сценариев использования.
+
+Цепочка перехватчиков вызывается вокруг каждого execute и execute_batch:
+before — в прямом порядке, after / on_error — в обратном (как middleware).
+Вызов execute_batch виден перехватчикам как «<Сценарий>.execute_batch»,
+вместо списка входных данных в контексте — его краткое описание.
+Цепочка задаётся на уровне класса сценария (configure_interceptors) или
+экземпляра (атрибут interceptors); пустая цепочка почти ничего не стоит.
+"""
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence
+
+logger = logging.getLogger("payment_gateway_simulator.use_cases")
+
+# Все классы сценариев по имени — для настройки из конфигурации
+_USE_CASES: Dict[str, type] = {}
+
+
+@dataclass(slots=True)
+class CallContext:
+    """
+    Контекст одного вызова execute (или execute_batch).
+
+    Перехватчики могут класть свои данные в attrs.
+    """
+    use_case: str
+    input: Any
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class UseCaseInterceptor:
+    """
+    Базовый перехватчик: все хуки по умолчанию ничего не делают.
+
+    Хуки синхронные и должны быть дешёвыми — они выполняются
+    в том же потоке (или event loop), что и сценарий.
+    """
+
+    def before(self, ctx: CallContext) -> None:
+        pass
+
+    def after(self, ctx: CallContext, result: Any) -> None:
+        pass
+
+    def on_error(self, ctx: CallContext, error: BaseException) -> None:
+        pass
+
+
+def _before(chain: Sequence[UseCaseInterceptor], ctx: CallContext) -> None:
+    for interceptor in chain:
+        interceptor.before(ctx)
+
+
+def _after(chain: Sequence[UseCaseInterceptor], ctx: CallContext, result: Any) -> None:
+    for interceptor in reversed(chain):
+        interceptor.after(ctx, result)
+
+
+def _on_error(chain: Sequence[UseCaseInterceptor], ctx: CallContext, error: BaseException) -> None:
+    for interceptor in reversed(chain):
+        interceptor.on_error(ctx, error)
+
+
+def _batch_summary(inputs: Sequence[Any]) -> str:
+    return f"<batch of {len(inputs)}>"
+
+
+# Перехватываемые методы сценариев: имя -> описание входных данных для контекста (None — как есть)
+_INTERCEPTED_METHODS: Dict[str, Optional[Callable[[Any], Any]]] = {
+    "execute": None,
+    "execute_batch": _batch_summary,
+}
+
+
+def _context(self, method: str, input: Any) -> CallContext:
+    name = type(self).__name__
+    if method == "execute":
+        return CallContext(name, input)
+    summarize = _INTERCEPTED_METHODS[method]
+    return CallContext(f"{name}.{method}", summarize(input) if summarize is not None else input)
+
+
+def intercept_methods(cls: type, wrap: Callable[[Callable, str], Callable]) -> None:
+    """
+    Обернуть перехватываемые методы, определённые в самом классе
+    (вызывается из __init_subclass__ базовых классов)
+    """
+    for method in _INTERCEPTED_METHODS:
+        function = cls.__dict__.get(method)
+        if function is not None and not getattr(function, "__isabstractmethod__", False):
+            setattr(cls, method, wrap(function, method))
+
+
+def intercepted(execute: Callable, method: str = "execute") -> Callable:
+    """
+    Обернуть синхронный метод сценария цепочкой перехватчиков
+    """
+    @functools.wraps(execute)
+    def wrapper(self, input):
+        chain = self.interceptors
+        if not chain:
+            return execute(self, input)
+        ctx = _context(self, method, input)
+        _before(chain, ctx)
+        try:
+            result = execute(self, input)
+        except BaseException as e:
+            # BaseException: отмена задачи (CancelledError) тоже завершает замеры и профили
+            _on_error(chain, ctx, e)
+            raise
+        _after(chain, ctx, result)
+        return result
+
+    return wrapper
+
+
+def async_intercepted(execute: Callable, method: str = "execute") -> Callable:
+    """
+    Обернуть асинхронный метод сценария цепочкой перехватчиков
+    """
+    @functools.wraps(execute)
+    async def wrapper(self, input):
+        chain = self.interceptors
+        if not chain:
+            return await execute(self, input)
+        ctx = _context(self, method, input)
+        _before(chain, ctx)
+        try:
+            result = await execute(self, input)
+        except BaseException as e:
+            # BaseException: отмена задачи (CancelledError) тоже завершает замеры и профили
+            _on_error(chain, ctx, e)
+            raise
+        _after(chain, ctx, result)
+        return result
+
+    return wrapper
+
+
+def register_use_case(cls: type) -> None:
+    """
+    Запомнить класс сценария (вызывается из __init_subclass__ базовых классов)
+    """
+    _USE_CASES[cls.__name__] = cls
+
+
+def configure_interceptors(chains: Dict[str, Sequence[UseCaseInterceptor]]) -> None:
+    """
+    Назначить цепочки перехватчиков классам сценариев по имени.
+
+    :param chains: Имя класса сценария -> перехватчики
+    :raises ValueError: Если сценарий с таким именем не найден
+    """
+    for name, chain in chains.items():
+        cls = _USE_CASES.get(name)
+        if cls is None:
+            raise ValueError(f"Unknown use case: {name}")
+        cls.interceptors = tuple(chain)
+
+
+# === Встроенные перехватчики ===
+
+class TimingInterceptor(UseCaseInterceptor):
+    """
+    Замер времени вызова: настенное и процессорное время потока.
+
+    Для асинхронных сценариев процессорное время включает работу
+    других задач event loop, выполнявшихся, пока сценарий ожидал порты.
+
+    :param sink: Получатель замеров sink(use_case, wall, cpu); по умолчанию — лог DEBUG
+    """
+
+    def __init__(self, sink: Optional[Callable[[str, float, float], None]] = None):
+        self._sink = sink or self._log
+
+    @staticmethod
+    def _log(use_case: str, wall: float, cpu: float) -> None:
+        logger.debug("%s wall=%.6fs cpu=%.6fs", use_case, wall, cpu)
+
+    def before(self, ctx: CallContext) -> None:
+        ctx.attrs["timing"] = (time.perf_counter(), time.thread_time())
+
+    def _finish(self, ctx: CallContext) -> None:
+        wall_started, cpu_started = ctx.attrs["timing"]
+        self._sink(ctx.use_case, time.perf_counter() - wall_started, time.thread_time() - cpu_started)
+
+    def after(self, ctx: CallContext, result: Any) -> None:
+        self._finish(ctx)
+
+    def on_error(self, ctx: CallContext, error: BaseException) -> None:
+        self._finish(ctx)
+
+
+class SlowCallInterceptor(UseCaseInterceptor):
+    """
+    Логирование вызовов дольше порога (WARNING)
+
+    :param threshold: Порог в секундах
+    """
+
+    def __init__(self, threshold: float):
+        self._threshold = threshold
+
+    def before(self, ctx: CallContext) -> None:
+        ctx.attrs["slow_started"] = time.perf_counter()
+
+    def _check(self, ctx: CallContext, outcome: str) -> None:
+        elapsed = time.perf_counter() - ctx.attrs["slow_started"]
+        if elapsed >= self._threshold:
+            logger.warning("Slow call %s: %.3fs (%s) input=%r", ctx.use_case, elapsed, outcome, ctx.input)
+
+    def after(self, ctx: CallContext, result: Any) -> None:
+        self._check(ctx, "ok")
+
+    def on_error(self, ctx: CallContext, error: BaseException) -> None:
+        self._check(ctx, type(error).__name__)
+
+
+class SamplingProfilerInterceptor(UseCaseInterceptor):
+    """
+    Профилирование каждого N-го вызова через cProfile или tracemalloc.
+
+    Одновременно снимается не больше одного профиля на процесс: если
+    выбранный вызов пересёкся с уже идущим замером, он пропускается.
+    Профиль асинхронного сценария включает код других задач event loop.
+
+    :param every: Профилировать каждый every-й вызов
+    :param mode: "cprofile" (время по функциям) или "tracemalloc" (аллокации)
+    :param output_dir: Куда сохранять профили; если None — топ строк пишется в лог
+    :param top: Сколько строк статистики выводить в лог
+    """
+    MODES = ("cprofile", "tracemalloc")
+
+    def __init__(self, every: int, mode: str = "cprofile", output_dir: Optional[str] = None, top: int = 20):
+        if every < 1:
+            raise ValueError("every must be >= 1")
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._every = every
+        self._mode = mode
+        self._output_dir = output_dir
+        self._top = top
+        self._calls = 0
+        self._busy = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def before(self, ctx: CallContext) -> None:
+        self._calls += 1
+        if self._calls % self._every or not self._busy.acquire(blocking=False):
+            return
+        ctx.attrs["profile_call"] = self._calls
+        if self._mode == "cprofile":
+            profiler = cProfile.Profile()
+            ctx.attrs["profile"] = profiler
+            profiler.enable()
+        else:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            ctx.attrs["profile"] = (started, tracemalloc.take_snapshot())
+
+    def _finish(self, ctx: CallContext) -> None:
+        capture = ctx.attrs.pop("profile", None)
+        if capture is None:
+            return
+        try:
+            name = f"{ctx.use_case}-{ctx.attrs['profile_call']}"
+            if self._mode == "cprofile":
+                capture.disable()
+                self._emit_cprofile(name, capture)
+            else:
+                started, before = capture
+                after = tracemalloc.take_snapshot()
+                if started:
+                    tracemalloc.stop()
+                self._emit_tracemalloc(name, before, after)
+        finally:
+            self._busy.release()
+
+    def _emit_cprofile(self, name: str, profiler: cProfile.Profile) -> None:
+        if self._output_dir:
+            profiler.dump_stats(os.path.join(self._output_dir, f"{name}.prof"))
+            return
+        buffer = io.StringIO()
+        pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(self._top)
+        logger.info("Profile %s\n%s", name, buffer.getvalue())
+
+    def _emit_tracemalloc(self, name: str, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot) -> None:
+        stats = after.compare_to(before, "lineno")[:self._top]
+        text = "\n".join(str(stat) for stat in stats)
+        if self._output_dir:
+            with open(os.path.join(self._output_dir, f"{name}.alloc.txt"), "w", encoding="utf-8") as file:
+                file.write(text + "\n")
+            return
+        logger.info("Allocations %s\n%s", name, text)
+
+    def after(self, ctx: CallContext, result: Any) -> None:
+        self._finish(ctx)
+
+    def on_error(self, ctx: CallContext, error: BaseException) -> None:
+        self._finish(ctx)
+
+
+def build_interceptors(
+        names: Sequence[str],
+        slow_call_threshold: float = 0.1,
+        profile_every: int = 1000,
+        profile_mode: str = "cprofile",
+        profile_dir: Optional[str] = None,
+        timing_sink: Optional[Callable[[str, float, float], None]] = None,
+) -> list:
+    """
+    Собрать цепочку встроенных перехватчиков по именам.
+
+    Имена: "timing", "slow_calls", "profile".
+
+    :raises ValueError: При неизвестном имени перехватчика
+    """
+    factories = {
+        "timing": lambda: TimingInterceptor(timing_sink),
+        "slow_calls": lambda: SlowCallInterceptor(slow_call_threshold),
+        "profile": lambda: SamplingProfilerInterceptor(profile_every, profile_mode, profile_dir),
+    }
+    chain = []
+    for name in names:
+        if name not in factories:
+            raise ValueError(f"Unknown interceptor: {name}")
+        chain.append(factories[name]())
+    return chain
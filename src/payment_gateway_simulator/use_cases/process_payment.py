@@ -1,13 +1,19 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import List, Optional, Sequence
 from decimal import Decimal
 
 from .core.base_use_case import BaseUseCase
+from .core.async_base_use_case import AsyncBaseUseCase
 from ..domain.payment import Payment
 from ..domain.payment_id import PaymentId
 from ..domain.amount import Amount
-from ..domain.ports.payment_processor import PaymentProcessorPort
+from ..domain.exceptions import PaymentAlreadyExistsError
+from ..domain.ports.payment_processor import PaymentProcessorPort, PaymentCommand, BatchItemOutcome
 from ..domain.ports.transaction_logger import TransactionLoggerPort
+from ..domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ..domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+from ..domain.ports.risk_assessor import RiskAssessorPort
+from ..domain.ports.fx_rates import FxRateProviderPort
 
 
 @dataclass(frozen=True)
@@ -23,26 +29,84 @@ class ProcessPaymentInput:
     meta: Optional[dict] = None
 
 
+@dataclass(frozen=True)
+class ProcessPaymentResult:
+    """
+    Результат обработки одного элемента пакета.
+
+    Ровно одно из полей payment / error заполнено. Платёж, отклонённый
+    шлюзом или правилом риска, сохранён (payment заполнен), но успешным
+    не считается.
+    """
+    payment_id: str
+    payment: Optional[Payment] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.payment is not None and self.payment.is_successful()
+
+
+_ZERO = Decimal("0")
+
+
+def _to_command(input: ProcessPaymentInput) -> PaymentCommand:
+    """
+    Провалидировать входные данные и собрать команду для порта.
+
+    :raises ValueError: При невалидных входных данных
+    """
+    # Валидация входных данных (защита от некорректных вызовов)
+    if not input.payment_id or not input.payment_id.strip():
+        raise ValueError("payment_id must be non-empty")
+
+    if input.amount <= _ZERO:
+        raise ValueError("amount must be positive")
+
+    if not input.currency or len(input.currency) != 3:
+        raise ValueError("currency must be a 3-letter ISO code")
+
+    # Создаём доменные объекты из входных данных
+    return PaymentCommand(
+        payment_id=PaymentId(input.payment_id),
+        amount=Amount(input.amount, input.currency),
+        description=input.description,
+        customer_email=input.customer_email,
+        meta=input.meta
+    )
+
+
 class ProcessPaymentUseCase(BaseUseCase[ProcessPaymentInput, Payment]):
     """
     Сценарий обработки платежа.
 
     Оркестрирует взаимодействие с портами:
     1. Валидация входных данных
-    2. Вызов порта обработки платежа
-    3. Логирование результата
+    2. Оценка риска (если задан risk_assessor)
+    3. Пересчёт в валюту расчётов (если заданы fx_rates и settlement_currency)
+    4. Вызов порта обработки платежа: сработавшее правило риска
+       сохраняет платёж отклонённым (FAILED), не обращаясь к шлюзу
+    5. Логирование результата
     """
 
     def __init__(
             self,
             payment_processor: PaymentProcessorPort,
-            transaction_logger: TransactionLoggerPort
+            transaction_logger: TransactionLoggerPort,
+            risk_assessor: Optional[RiskAssessorPort] = None,
+            fx_rates: Optional[FxRateProviderPort] = None,
+            settlement_currency: Optional[str] = None
     ):
         """
         Внедрение зависимостей через конструктор
+
+        :param settlement_currency: Валюта расчётов; сумма в ней сохраняется
+            с платежом по курсу fx_rates на момент обработки
         """
         self._payment_processor = payment_processor
         self._transaction_logger = transaction_logger
+        self._risk_assessor = risk_assessor
+        self._settlement = _Settlement(fx_rates, settlement_currency)
 
     def execute(self, input: ProcessPaymentInput) -> Payment:
         """
@@ -58,30 +122,218 @@ class ProcessPaymentUseCase(BaseUseCase[ProcessPaymentInput, Payment]):
         :raises ValueError: При невалидных входных данных
         :raises PaymentProcessingError: При ошибке обработки платежа
         """
-        # Валидация входных данных (защита от некорректных вызовов)
-        if not input.payment_id or not input.payment_id.strip():
-            raise ValueError("payment_id must be non-empty")
-
-        if input.amount <= Decimal("0"):
-            raise ValueError("amount must be positive")
-
-        if not input.currency or len(input.currency) != 3:
-            raise ValueError("currency must be a 3-letter ISO code")
-
-        # Создаём доменные объекты из входных данных
-        payment_id = PaymentId(input.payment_id)
-        amount = Amount(input.amount, input.currency)
+        command = self._settlement.apply(_assess(self._risk_assessor, _to_command(input)))
 
         # Вызываем порт для обработки платежа
-        payment = self._payment_processor.process_payment(
-            payment_id=payment_id,
-            amount=amount,
-            description=input.description,
-            customer_email=input.customer_email,
-            meta=input.meta
-        )
+        try:
+            payment = self._payment_processor.process_payment(
+                payment_id=command.payment_id,
+                amount=command.amount,
+                description=command.description,
+                customer_email=command.customer_email,
+                meta=command.meta,
+                decline_reason=command.decline_reason,
+                settlement_amount=command.settlement_amount
+            )
+        except PaymentAlreadyExistsError:
+            _discard(self._risk_assessor, command)
+            raise
 
         # Логируем транзакцию через другой порт
         self._transaction_logger.log_transaction(payment)
 
-        return payment
\ No newline at end of file
+        return payment
+
+    def execute_batch(self, inputs: Sequence[ProcessPaymentInput]) -> List[ProcessPaymentResult]:
+        """
+        Выполнить обработку пакета платежей.
+
+        Невалидные элементы отсеиваются до вызова портов, остальные уходят
+        в процессор и в логгер одним вызовом. Ошибка одного элемента
+        не прерывает обработку пакета.
+
+        Риск оценивается для всего пакета до процессора, поэтому дубликат
+        учитывается в скорости для следующих элементов того же пакета;
+        после ответа процессора он из счёта убирается.
+
+        :param inputs: Входные данные платежей
+        :return: Результат для каждого элемента в исходном порядке
+        """
+        results, commands, positions = _prepare_batch(inputs, self._risk_assessor, self._settlement)
+
+        outcomes = self._payment_processor.process_payments(commands) if commands else []
+
+        payments = _collect_outcomes(results, commands, positions, outcomes, self._risk_assessor)
+        if payments:
+            self._transaction_logger.log_transactions(payments)
+
+        return results
+
+
+class AsyncProcessPaymentUseCase(AsyncBaseUseCase[ProcessPaymentInput, Payment]):
+    """
+    Асинхронный сценарий обработки платежа.
+
+    Те же бизнес-правила, что и в ProcessPaymentUseCase, но порты
+    ожидаются напрямую — обработчик не блокирует event loop.
+    Оценка риска синхронная: она не делает ввода-вывода.
+    """
+
+    def __init__(
+            self,
+            payment_processor: AsyncPaymentProcessorPort,
+            transaction_logger: AsyncTransactionLoggerPort,
+            risk_assessor: Optional[RiskAssessorPort] = None,
+            fx_rates: Optional[FxRateProviderPort] = None,
+            settlement_currency: Optional[str] = None
+    ):
+        """
+        Внедрение зависимостей через конструктор
+
+        :param settlement_currency: Валюта расчётов; сумма в ней сохраняется
+            с платежом по курсу fx_rates на момент обработки
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+        self._risk_assessor = risk_assessor
+        self._settlement = _Settlement(fx_rates, settlement_currency)
+
+    async def execute(self, input: ProcessPaymentInput) -> Payment:
+        """
+        Выполнить обработку платежа.
+
+        :param input: Входные данные платежа
+        :return: Созданный платёж
+        :raises ValueError: При невалидных входных данных
+        :raises PaymentProcessingError: При ошибке обработки платежа
+        """
+        command = self._settlement.apply(_assess(self._risk_assessor, _to_command(input)))
+
+        try:
+            payment = await self._payment_processor.process_payment(
+                payment_id=command.payment_id,
+                amount=command.amount,
+                description=command.description,
+                customer_email=command.customer_email,
+                meta=command.meta,
+                decline_reason=command.decline_reason,
+                settlement_amount=command.settlement_amount
+            )
+        except PaymentAlreadyExistsError:
+            _discard(self._risk_assessor, command)
+            raise
+
+        await self._transaction_logger.log_transaction(payment)
+
+        return payment
+
+    async def execute_batch(self, inputs: Sequence[ProcessPaymentInput]) -> List[ProcessPaymentResult]:
+        """
+        Выполнить обработку пакета платежей (см. ProcessPaymentUseCase.execute_batch).
+
+        :param inputs: Входные данные платежей
+        :return: Результат для каждого элемента в исходном порядке
+        """
+        results, commands, positions = _prepare_batch(inputs, self._risk_assessor, self._settlement)
+
+        outcomes = await self._payment_processor.process_payments(commands) if commands else []
+
+        payments = _collect_outcomes(results, commands, positions, outcomes, self._risk_assessor)
+        if payments:
+            await self._transaction_logger.log_transactions(payments)
+
+        return results
+
+
+def _assess(risk_assessor: Optional[RiskAssessorPort], command: PaymentCommand) -> PaymentCommand:
+    """
+    Оценить риск: сработавшее правило записывается в decline_reason команды
+    """
+    if risk_assessor is None:
+        return command
+    decline_reason = risk_assessor.assess(command)
+    if decline_reason is None:
+        return command
+    return replace(command, decline_reason=decline_reason)
+
+
+def _discard(risk_assessor: Optional[RiskAssessorPort], command: PaymentCommand) -> None:
+    """
+    Убрать из оценки риска команду-дубликат: хранилище её не приняло
+    """
+    if risk_assessor is not None:
+        risk_assessor.discard(command)
+
+
+class _Settlement:
+    """
+    Пересчёт суммы команды в валюту расчётов.
+
+    Без порта курсов или валюты расчётов команда не меняется; валюта без
+    курса в таблице оставляет settlement_amount пустым — платёж
+    обрабатывается как обычно.
+    """
+
+    __slots__ = ("_fx_rates", "_currency")
+
+    def __init__(self, fx_rates: Optional[FxRateProviderPort], currency: Optional[str]):
+        self._fx_rates = fx_rates if currency else None
+        self._currency = currency.upper() if currency else None
+
+    def apply(self, command: PaymentCommand) -> PaymentCommand:
+        if self._fx_rates is None:
+            return command
+        settlement_amount = self._fx_rates.convert(command.amount, self._currency)
+        if settlement_amount is None:
+            return command
+        return replace(command, settlement_amount=settlement_amount)
+
+
+def _prepare_batch(
+        inputs: Sequence[ProcessPaymentInput],
+        risk_assessor: Optional[RiskAssessorPort] = None,
+        settlement: Optional[_Settlement] = None
+):
+    """
+    Провалидировать элементы пакета, оценить их риск и пересчитать в валюту расчётов.
+
+    :return: (заготовка результатов, команды для порта, позиции команд в пакете)
+    """
+    results: List[Optional[ProcessPaymentResult]] = [None] * len(inputs)
+    commands: List[PaymentCommand] = []
+    positions: List[int] = []
+
+    for index, item in enumerate(inputs):
+        try:
+            command = _assess(risk_assessor, _to_command(item))
+            commands.append(settlement.apply(command) if settlement is not None else command)
+        except ValueError as e:
+            results[index] = ProcessPaymentResult(payment_id=item.payment_id, error=str(e))
+            continue
+        positions.append(index)
+
+    return results, commands, positions
+
+
+def _collect_outcomes(
+        results: List[Optional[ProcessPaymentResult]],
+        commands: List[PaymentCommand],
+        positions: List[int],
+        outcomes: List[BatchItemOutcome],
+        risk_assessor: Optional[RiskAssessorPort] = None
+) -> List[Payment]:
+    """
+    Разложить ответы процессора по позициям пакета; дубликаты убираются из оценки риска.
+
+    :return: Успешно созданные платежи (для логирования)
+    """
+    payments: List[Payment] = []
+    for index, command, outcome in zip(positions, commands, outcomes):
+        if isinstance(outcome, Payment):
+            payments.append(outcome)
+            results[index] = ProcessPaymentResult(payment_id=command.payment_id.value, payment=outcome)
+        else:
+            if isinstance(outcome, PaymentAlreadyExistsError):
+                _discard(risk_assessor, command)
+            results[index] = ProcessPaymentResult(payment_id=command.payment_id.value, error=str(outcome))
+    return payments
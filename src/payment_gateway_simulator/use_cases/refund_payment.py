@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional
+
+from .core.base_use_case import BaseUseCase
+from .core.async_base_use_case import AsyncBaseUseCase
+from ..domain.payment import Payment
+from ..domain.payment_id import PaymentId
+from ..domain.amount import Amount
+from ..domain.ports.payment_processor import PaymentProcessorPort
+from ..domain.ports.transaction_logger import TransactionLoggerPort
+from ..domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ..domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+from ..domain.ports.fx_rates import FxRateProviderPort
+from ..domain.exceptions import PaymentProcessingError
+
+
+@dataclass(frozen=True)
+class RefundPaymentInput:
+    """
+    Входные данные для сценария возврата.
+
+    Без amount возвращается весь остаток платежа. Сумма в другой валюте,
+    чем платёж, пересчитывается по курсу (если сценарию передан fx_rates).
+    """
+    payment_id: str
+    amount: Optional[Decimal] = None
+    currency: Optional[str] = None
+    reason: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class _RefundCommand:
+    payment_id: PaymentId
+    amount: Optional[Amount]
+    reason: Optional[str]
+
+
+_ZERO = Decimal("0")
+
+
+def _to_command(input: RefundPaymentInput) -> _RefundCommand:
+    """
+    Провалидировать входные данные возврата.
+
+    Проверки, зависящие от состояния платежа (валюта, остаток), выполняет
+    процессор атомарно вместе с возвратом.
+
+    :raises ValueError: При невалидных входных данных
+    """
+    if not input.payment_id or not input.payment_id.strip():
+        raise ValueError("payment_id must be non-empty")
+
+    amount = None
+    if input.amount is not None:
+        if input.amount <= _ZERO:
+            raise ValueError("amount must be positive")
+        if not input.currency or len(input.currency) != 3:
+            raise ValueError("currency must be a 3-letter ISO code when amount is given")
+        amount = Amount(input.amount, input.currency)
+
+    return _RefundCommand(PaymentId(input.payment_id), amount, input.reason)
+
+
+def _convert_refund(
+        fx_rates: FxRateProviderPort,
+        command: _RefundCommand,
+        payment: Optional[Payment]
+) -> _RefundCommand:
+    """
+    Пересчитать сумму возврата в валюту платежа.
+
+    Платежа нет или валюта совпадает — команда не меняется
+    (отсутствие платежа сообщит процессор).
+
+    :raises PaymentProcessingError: Если курса нет
+    """
+    if payment is None or payment.amount.currency == command.amount.currency:
+        return command
+    currency = payment.amount.currency
+    amount = fx_rates.convert(command.amount, currency)
+    if amount is None:
+        raise PaymentProcessingError(
+            f"No FX rate to convert refund from {command.amount.currency} to {currency}",
+            payment_id=command.payment_id.value
+        )
+    return _RefundCommand(command.payment_id, amount, command.reason)
+
+
+class RefundPaymentUseCase(BaseUseCase[RefundPaymentInput, Payment]):
+    """
+    Сценарий возврата платежа (полного или частичного).
+
+    1. Валидация входных данных
+    2. Пересчёт суммы в валюту платежа (если задан fx_rates и валюты различаются)
+    3. Атомарный возврат в процессоре (проверка валюты и остатка)
+    4. Логирование записи о возврате
+    """
+
+    def __init__(
+            self,
+            payment_processor: PaymentProcessorPort,
+            transaction_logger: TransactionLoggerPort,
+            fx_rates: Optional[FxRateProviderPort] = None
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+        self._fx_rates = fx_rates
+
+    def execute(self, input: RefundPaymentInput) -> Payment:
+        """
+        Выполнить возврат.
+
+        :param input: Входные данные возврата
+        :return: Запись о возврате (сумма возврата, статус REFUNDED)
+        :raises ValueError: При невалидных входных данных
+        :raises PaymentNotFoundError: Если платёж не найден
+        :raises PaymentProcessingError: Если возврат превышает остаток или курса валюты нет
+        """
+        command = _to_command(input)
+        if command.amount is not None and self._fx_rates is not None:
+            # Валюта платежа не меняется, поэтому её можно прочитать до атомарного возврата
+            command = _convert_refund(
+                self._fx_rates, command, self._payment_processor.get_payment(command.payment_id)
+            )
+
+        refund = self._payment_processor.refund_payment(
+            payment_id=command.payment_id,
+            amount=command.amount,
+            reason=command.reason
+        )
+
+        self._transaction_logger.log_transaction(refund)
+
+        return refund
+
+
+class AsyncRefundPaymentUseCase(AsyncBaseUseCase[RefundPaymentInput, Payment]):
+    """
+    Асинхронный сценарий возврата (те же правила, что и в RefundPaymentUseCase)
+    """
+
+    def __init__(
+            self,
+            payment_processor: AsyncPaymentProcessorPort,
+            transaction_logger: AsyncTransactionLoggerPort,
+            fx_rates: Optional[FxRateProviderPort] = None
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+        self._fx_rates = fx_rates
+
+    async def execute(self, input: RefundPaymentInput) -> Payment:
+        """
+        Выполнить возврат.
+
+        :param input: Входные данные возврата
+        :return: Запись о возврате (сумма возврата, статус REFUNDED)
+        """
+        command = _to_command(input)
+        if command.amount is not None and self._fx_rates is not None:
+            command = _convert_refund(
+                self._fx_rates, command, await self._payment_processor.get_payment(command.payment_id)
+            )
+
+        refund = await self._payment_processor.refund_payment(
+            payment_id=command.payment_id,
+            amount=command.amount,
+            reason=command.reason
+        )
+
+        await self._transaction_logger.log_transaction(refund)
+
+        return refund
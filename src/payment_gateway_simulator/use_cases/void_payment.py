@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .core.base_use_case import BaseUseCase
+from .core.async_base_use_case import AsyncBaseUseCase
+from .capture_payment import _payment_id
+from ..domain.payment import Payment
+from ..domain.ports.payment_processor import PaymentProcessorPort
+from ..domain.ports.transaction_logger import TransactionLoggerPort
+from ..domain.ports.async_payment_processor import AsyncPaymentProcessorPort
+from ..domain.ports.async_transaction_logger import AsyncTransactionLoggerPort
+
+
+@dataclass(frozen=True)
+class VoidPaymentInput:
+    """
+    Входные данные для отмены авторизации.
+    """
+    payment_id: str
+    reason: Optional[str] = None
+
+
+class VoidPaymentUseCase(BaseUseCase[VoidPaymentInput, Payment]):
+    """
+    Сценарий отмены авторизации (освобождение заблокированных средств).
+
+    1. Валидация входных данных
+    2. Атомарный переход PENDING → VOIDED в процессоре
+    3. Логирование отмены
+    """
+
+    def __init__(
+            self,
+            payment_processor: PaymentProcessorPort,
+            transaction_logger: TransactionLoggerPort
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+
+    def execute(self, input: VoidPaymentInput) -> Payment:
+        """
+        Отменить авторизацию.
+
+        :param input: Идентификатор авторизованного платежа и причина
+        :return: Платёж со статусом VOIDED
+        :raises ValueError: При невалидных входных данных
+        :raises PaymentNotFoundError: Если платёж не найден
+        :raises PaymentProcessingError: Если платёж не в статусе PENDING
+        """
+        payment = self._payment_processor.void_payment(_payment_id(input.payment_id), input.reason)
+
+        self._transaction_logger.log_transaction(payment)
+
+        return payment
+
+
+class AsyncVoidPaymentUseCase(AsyncBaseUseCase[VoidPaymentInput, Payment]):
+    """
+    Асинхронный сценарий отмены авторизации (те же правила, что и в VoidPaymentUseCase)
+    """
+
+    def __init__(
+            self,
+            payment_processor: AsyncPaymentProcessorPort,
+            transaction_logger: AsyncTransactionLoggerPort
+    ):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._payment_processor = payment_processor
+        self._transaction_logger = transaction_logger
+
+    async def execute(self, input: VoidPaymentInput) -> Payment:
+        """
+        Отменить авторизацию.
+
+        :param input: Идентификатор авторизованного платежа и причина
+        :return: Платёж со статусом VOIDED
+        """
+        payment = await self._payment_processor.void_payment(_payment_id(input.payment_id), input.reason)
+
+        await self._transaction_logger.log_transaction(payment)
+
+        return payment
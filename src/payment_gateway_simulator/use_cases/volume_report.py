@@ -0,0 +1,96 @@
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import List, Optional
+
+from .core.base_use_case import BaseUseCase
+from ..domain.payment_status import PaymentStatus
+from ..domain.ports.volume_report import ReportGranularity, VolumeBucket, VolumeReportPort
+from ..domain.ports.fx_rates import FxRateProviderPort
+
+_GRANULARITIES = {granularity.value: granularity for granularity in ReportGranularity}
+_STATUSES = {status.value: status for status in PaymentStatus}
+
+
+@dataclass(frozen=True)
+class VolumeReportInput:
+    """
+    Входные данные для отчёта по объёму транзакций.
+
+    Диапазон — [start, end); без границ — все хранимые окна.
+    С settlement_currency суммы окон дополнительно пересчитываются в эту валюту.
+    """
+    granularity: str = "minute"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    currency: Optional[str] = None
+    status: Optional[str] = None
+    settlement_currency: Optional[str] = None
+
+
+class VolumeReportUseCase(BaseUseCase[VolumeReportInput, List[VolumeBucket]]):
+    """
+    Сценарий отчёта: число и сумма транзакций по валюте, статусу и окну времени.
+
+    Читает готовые агрегаты из порта отчётов — стоимость не зависит
+    от числа платежей, поэтому отчёт можно запрашивать часто.
+    """
+
+    def __init__(self, volume_report: VolumeReportPort, fx_rates: Optional[FxRateProviderPort] = None):
+        """
+        Внедрение зависимостей через конструктор
+        """
+        self._volume_report = volume_report
+        self._fx_rates = fx_rates
+
+    def execute(self, input: VolumeReportInput) -> List[VolumeBucket]:
+        """
+        Построить отчёт.
+
+        :param input: Ширина окна, диапазон и фильтры
+        :return: Непустые окна по возрастанию времени, затем валюты и статуса
+        :raises ValueError: При неизвестной ширине окна, статусе, пустом диапазоне
+            или валюте расчётов без настроенных курсов
+        """
+        granularity = _GRANULARITIES.get(input.granularity)
+        if granularity is None:
+            raise ValueError(f"granularity must be one of: {', '.join(_GRANULARITIES)}")
+
+        status = None
+        if input.status is not None:
+            status = _STATUSES.get(input.status)
+            if status is None:
+                raise ValueError(f"status must be one of: {', '.join(_STATUSES)}")
+
+        if input.start is not None and input.end is not None and input.start >= input.end:
+            raise ValueError("start must be earlier than end")
+
+        if input.settlement_currency is not None and self._fx_rates is None:
+            raise ValueError("FX rates are not configured")
+
+        buckets = self._volume_report.volume(granularity, input.start, input.end)
+        if input.currency is not None:
+            currency = input.currency.upper()
+            buckets = [bucket for bucket in buckets if bucket.currency == currency]
+        if status is not None:
+            buckets = [bucket for bucket in buckets if bucket.status is status]
+        if input.settlement_currency is not None:
+            buckets = _settle(self._fx_rates, buckets, input.settlement_currency.upper())
+        return buckets
+
+
+def _settle(fx_rates: FxRateProviderPort, buckets: List[VolumeBucket], currency: str) -> List[VolumeBucket]:
+    """
+    Пересчитать суммы окон в валюту расчётов по текущим курсам.
+
+    Пересчитывается готовая сумма окна — одна конвертация на окно,
+    а не на платёж.
+    """
+    convert = fx_rates.convert_minor
+    return [
+        replace(
+            bucket,
+            settlement_currency=currency,
+            settlement_minor=convert(bucket.amount_minor, bucket.currency, currency)
+        )
+        for bucket in buckets
+    ]
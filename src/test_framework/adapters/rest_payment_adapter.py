@@ -34,7 +34,7 @@ class RestPaymentAdapter(PaymentApiPort):
         # Маппинг из доменных объектов в структуру запроса
         request_data = {
             "payment_id": payment_id,
-            "amount": float(amount),
+            "amount": str(amount),
             "currency": currency,
             "description": description,
             "customer_email": customer_email
@@ -62,7 +62,7 @@ class RestPaymentAdapter(PaymentApiPort):
         data = response.json()
         return PaymentResponse(
             payment_id=data["payment_id"],
-            amount=Decimal(str(data["amount"])),
+            amount=Decimal(data["amount"]),
             currency=data["currency"],
             status=data["status"],
             description=data.get("description"),
@@ -84,7 +84,7 @@ class RestPaymentAdapter(PaymentApiPort):
         data = response.json()
         return PaymentResponse(
             payment_id=data["payment_id"],
-            amount=Decimal(str(data["amount"])),
+            amount=Decimal(data["amount"]),
             currency=data["currency"],
             status=data["status"],
             description=data.get("description"),
@@ -1,6 +1,11 @@
+import json
 import pytest
 import httpx
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import queue
+import threading
+import time
 import uuid
 
 from src.test_framework import (
@@ -8,6 +13,7 @@ from src.test_framework import (
     GetPaymentUseCase,
     RestPaymentAdapter,
 )
+from src.payment_gateway_simulator.adapters.webhooks import SIGNATURE_HEADER, verify
 
 
 class TestPaymentApi:
@@ -96,9 +102,316 @@ class TestPaymentApi:
 
         assert "validation" in str(exc_info.value).lower()
 
-    def test_get_payment(self, get_payment_use_case, unique_payment_id):
-        """Получение информации о платеже по ID"""
+    def test_get_payment(self, payment_use_case, get_payment_use_case, unique_payment_id):
+        """Получение информации о созданном платеже по ID"""
+        payment_use_case.execute(
+            payment_id=unique_payment_id,
+            amount=Decimal("42.00"),
+            currency="USD"
+        )
+
         result = get_payment_use_case.execute(payment_id=unique_payment_id)
 
         assert result.payment_id == unique_payment_id
-        assert result.status == "succeeded"
\ No newline at end of file
+        assert result.amount == Decimal("42.00")
+        assert result.status == "succeeded"
+
+    def test_get_payment_not_found(self, get_payment_use_case, unique_payment_id):
+        """Несуществующий платёж возвращает 404"""
+        with pytest.raises(RuntimeError, match="not found"):
+            get_payment_use_case.execute(payment_id=unique_payment_id)
+
+    def test_get_payment_etag(self, payment_use_case, unique_payment_id):
+        """Повторный запрос с If-None-Match возвращает 304 без тела"""
+        payment_use_case.execute(
+            payment_id=unique_payment_id,
+            amount=Decimal("5.00"),
+            currency="EUR"
+        )
+        url = f"http://127.0.0.1:8000/api/pay/{unique_payment_id}"
+
+        first = httpx.get(url, timeout=5.0)
+        etag = first.headers["ETag"]
+        second = httpx.get(url, headers={"If-None-Match": etag}, timeout=5.0)
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+        assert second.content == b""
+
+    def test_create_payments_batch(self, unique_payment_id):
+        """Пакетное создание платежей возвращает результат по каждому элементу"""
+        payload = {
+            "payments": [
+                {"payment_id": f"{unique_payment_id}_1", "amount": 10.0, "currency": "USD"},
+                {"payment_id": f"{unique_payment_id}_2", "amount": 20.5, "currency": "EUR"},
+                {"payment_id": f"{unique_payment_id}_1", "amount": 30.0, "currency": "USD"},
+            ]
+        }
+        response = httpx.post("http://127.0.0.1:8000/api/pay/batch", json=payload, timeout=5.0)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 3
+        assert data["succeeded"] == 2
+        assert data["failed"] == 1
+        assert data["results"][1]["payment"]["amount"] == "20.50"
+        assert data["results"][2]["success"] is False
+        assert "already exists" in data["results"][2]["error"]
+
+    def test_create_payments_stream(self, unique_payment_id):
+        """NDJSON-поток обрабатывается построчно, ошибки строк не прерывают поток"""
+        def body():
+            yield f'{{"payment_id": "{unique_payment_id}_1", "amount": "10.00", "currency": "USD"}}\n'.encode()
+            yield b'not json\n'
+            yield f'{{"payment_id": "{unique_payment_id}_1", "amount": "5.00", '.encode()
+            yield b'"currency": "USD"}\n'
+            yield f'{{"payment_id": "{unique_payment_id}_2", "amount_minor": 500, "currency": "JPY"}}'.encode()
+
+        response = httpx.post(
+            "http://127.0.0.1:8000/api/pay/stream", content=body(),
+            headers={"Content-Type": "application/x-ndjson"}, timeout=5.0
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = [json.loads(line) for line in response.text.splitlines()]
+        assert [item["line"] for item in items] == [1, 2, 3, 4]
+        assert [item["success"] for item in items] == [True, False, False, True]
+        assert "Validation error" in items[1]["error"]
+        assert "already exists" in items[2]["error"]
+        assert items[3]["payment"]["amount"] == "500"
+
+    def test_list_and_export_payments(self, unique_payment_id):
+        """Выборка по фильтрам с курсором и потоковая выгрузка в CSV и NDJSON"""
+        base = "http://127.0.0.1:8000/api"
+        email = f"{unique_payment_id}@example.com"
+        for i in range(3):
+            httpx.post(f"{base}/pay", json={
+                "payment_id": f"{unique_payment_id}_{i}", "amount": "1.00", "currency": "USD", "customer_email": email
+            }, timeout=5.0)
+
+        first = httpx.get(f"{base}/payments", params={"customer_email": email, "limit": 2}, timeout=5.0).json()
+        second = httpx.get(f"{base}/payments", params={
+            "customer_email": email, "limit": 2, "cursor": first["next_cursor"]
+        }, timeout=5.0).json()
+        csv_export = httpx.get(f"{base}/payments", params={"customer_email": email, "format": "csv"}, timeout=5.0)
+        ndjson_export = httpx.get(f"{base}/payments", params={"customer_email": email, "format": "ndjson"},
+                                  timeout=5.0)
+
+        assert [p["payment_id"] for p in first["items"] + second["items"]] == [
+            f"{unique_payment_id}_{i}" for i in range(3)
+        ]
+        assert second["next_cursor"] is None
+        assert csv_export.headers["content-type"].startswith("text/csv")
+        assert csv_export.text.splitlines()[0].startswith("payment_id,amount,amount_minor,currency,status")
+        assert len(csv_export.text.splitlines()) == 4
+        assert [json.loads(line)["customer_email"] for line in ndjson_export.text.splitlines()] == [email] * 3
+        assert httpx.get(f"{base}/payments", params={"cursor": "!"}, timeout=5.0).status_code == 400
+
+    def test_volume_report(self, unique_payment_id):
+        """Отчёт по объёму учитывает новые транзакции в окне текущего дня"""
+        base = "http://127.0.0.1:8000/api"
+        params = {"granularity": "day", "currency": "XTS", "status": "succeeded"}
+
+        def totals():
+            buckets = httpx.get(f"{base}/reports/volume", params=params, timeout=5.0).json()["buckets"]
+            return sum(b["count"] for b in buckets), sum(b["amount_minor"] for b in buckets)
+
+        count, minor = totals()
+        for i, amount in enumerate(("1.25", "2.50")):
+            httpx.post(f"{base}/pay", json={
+                "payment_id": f"{unique_payment_id}_{i}", "amount": amount, "currency": "XTS"
+            }, timeout=5.0)
+
+        assert totals() == (count + 2, minor + 375)
+        assert httpx.get(f"{base}/reports/volume", params={
+            "start": "2026-01-02T00:00:00", "end": "2026-01-01T00:00:00"
+        }, timeout=5.0).status_code == 400
+
+    @pytest.fixture(scope="function")
+    def webhook_receiver(self):
+        """Фикстура: локальный получатель вебхуков; первый запрос отвечает 500"""
+        received = queue.Queue()
+        calls = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                calls.append(body)
+                self.send_response(500 if len(calls) == 1 else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                if len(calls) > 1:
+                    received.put((dict(self.headers), body))
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/hook", received
+        server.shutdown()
+        server.server_close()
+
+    def test_webhook_delivered_to_local_receiver(self, unique_payment_id, webhook_receiver):
+        """Платёж порождает подписанный вебхук, который доставляется после повтора"""
+        base = "http://127.0.0.1:8000/api"
+        url, received = webhook_receiver
+        endpoint = httpx.post(f"{base}/webhooks/endpoints", json={
+            "url": url, "events": ["payment.succeeded"]
+        }, timeout=5.0).json()
+        try:
+            httpx.post(f"{base}/pay", json={
+                "payment_id": unique_payment_id, "amount": "7.00", "currency": "USD"
+            }, timeout=5.0)
+            headers, body = received.get(timeout=10.0)
+        finally:
+            httpx.delete(f"{base}/webhooks/endpoints/{endpoint['id']}", timeout=5.0)
+
+        event = json.loads(body)
+        assert event["type"] == "payment.succeeded"
+        assert event["data"]["payment_id"] == unique_payment_id
+        assert headers["Webhook-Attempt"] == "2"
+        assert verify(endpoint["secret"], headers[SIGNATURE_HEADER], body)
+        assert httpx.post(f"{base}/webhooks/endpoints", json={
+            "url": url, "events": ["payment.unknown"]
+        }, timeout=5.0).status_code == 400
+
+    def test_idempotency_key_replays_response(self, unique_payment_id):
+        """Повтор с тем же Idempotency-Key возвращает исходный ответ вместо ошибки"""
+        url = "http://127.0.0.1:8000/api/pay"
+        payload = {"payment_id": unique_payment_id, "amount": 15.0, "currency": "USD"}
+        headers = {"Idempotency-Key": f"key-{unique_payment_id}"}
+
+        first = httpx.post(url, json=payload, headers=headers, timeout=5.0)
+        retry = httpx.post(url, json=payload, headers=headers, timeout=5.0)
+        conflict = httpx.post(url, json={**payload, "amount": 16.0}, headers=headers, timeout=5.0)
+
+        assert first.status_code == 201
+        assert retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert conflict.status_code == 422
+
+    def test_idempotency_key_scoped_by_caller(self, unique_payment_id):
+        """Один Idempotency-Key у разных X-API-Key не делит ответ; дубликат платежа — 409"""
+        url = "http://127.0.0.1:8000/api/pay"
+        payload = {"payment_id": unique_payment_id, "amount": 15.0, "currency": "USD"}
+        key = f"key-{unique_payment_id}"
+
+        first = httpx.post(url, json=payload, headers={"Idempotency-Key": key, "X-API-Key": "a"}, timeout=5.0)
+        other = httpx.post(url, json=payload, headers={"Idempotency-Key": key, "X-API-Key": "b"}, timeout=5.0)
+
+        assert first.status_code == 201
+        assert other.status_code == 409
+        assert "already exists" in other.json()["detail"]
+        assert "Idempotent-Replayed" not in other.headers
+
+    def test_metrics_endpoint(self, unique_payment_id):
+        """/metrics отдаёт счётчики операций и ошибок валидации"""
+        base = "http://127.0.0.1:8000"
+        httpx.post(f"{base}/api/pay", json={"payment_id": unique_payment_id, "amount": 5.0, "currency": "EUR"},
+                   timeout=5.0)
+        httpx.post(f"{base}/api/pay", json={"payment_id": unique_payment_id, "amount": -1, "currency": "EUR"},
+                   timeout=5.0)
+
+        response = httpx.get(f"{base}/metrics", timeout=5.0)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'pgs_operations_total{operation="create_payment",status="succeeded",currency="EUR"}' in response.text
+        assert 'pgs_operation_duration_seconds_count{operation="process_payment"}' in response.text
+        assert 'pgs_validation_errors_total{field="amount",type="greater_than"}' in response.text
+
+    def test_refund_lifecycle(self, unique_payment_id):
+        """Частичный возврат, возврат остатка, отказ при превышении и для чужой валюты"""
+        base = "http://127.0.0.1:8000/api/pay"
+        httpx.post(base, json={"payment_id": unique_payment_id, "amount": 100.0, "currency": "USD"}, timeout=5.0)
+        url = f"{base}/{unique_payment_id}/refund"
+
+        partial = httpx.post(url, json={"amount": 30.0, "currency": "USD", "reason": "Damaged"}, timeout=5.0)
+        too_much = httpx.post(url, json={"amount": 70.01, "currency": "USD"}, timeout=5.0)
+        wrong_currency = httpx.post(url, json={"amount": 1.0, "currency": "EUR"}, timeout=5.0)
+        rest = httpx.post(url, timeout=5.0)
+        missing = httpx.post(f"{base}/{unique_payment_id}_missing/refund", timeout=5.0)
+
+        assert partial.status_code == 201
+        assert partial.json()["amount"] == "30.00"
+        assert partial.json()["payment"]["status"] == "partially_refunded"
+        assert partial.json()["payment"]["amount"] == "100.00"
+        assert too_much.status_code == 409
+        assert wrong_currency.status_code == 409
+        assert rest.status_code == 201
+        assert rest.json()["amount"] == "70.00"
+        assert rest.json()["payment"]["status"] == "refunded"
+        assert rest.json()["payment"]["refunded_minor"] == 10000
+        assert missing.status_code == 404
+
+    def test_exact_minor_units(self, unique_payment_id):
+        """Суммы передаются без потерь: строкой или в минорных единицах, с экспонентой валюты"""
+        base = "http://127.0.0.1:8000/api/pay"
+
+        large = httpx.post(base, json={
+            "payment_id": f"{unique_payment_id}_usd", "amount": "12345678901234567.89", "currency": "USD"
+        }, timeout=5.0)
+        yen = httpx.post(base, json={
+            "payment_id": f"{unique_payment_id}_jpy", "amount_minor": 500, "currency": "JPY"
+        }, timeout=5.0)
+        dinar = httpx.post(base, json={
+            "payment_id": f"{unique_payment_id}_kwd", "amount": "1.005", "currency": "KWD"
+        }, timeout=5.0)
+        both = httpx.post(base, json={
+            "payment_id": f"{unique_payment_id}_both", "amount": "1.00", "amount_minor": 100, "currency": "USD"
+        }, timeout=5.0)
+
+        assert large.status_code == 201
+        assert large.json()["amount"] == "12345678901234567.89"
+        assert large.json()["amount_minor"] == 1234567890123456789
+        assert yen.json()["amount"] == "500"
+        assert dinar.json()["amount_minor"] == 1005
+        assert both.status_code == 422
+
+    def test_authorize_capture_void(self, unique_payment_id):
+        """Авторизация списывается или отменяется; после отмены списание отклоняется"""
+        base = "http://127.0.0.1:8000/api/pay"
+        for suffix in ("capture", "void"):
+            authorized = httpx.post(f"{base}/authorize", json={
+                "payment_id": f"{unique_payment_id}_{suffix}", "amount": "20.00", "currency": "USD"
+            }, timeout=5.0)
+            assert authorized.status_code == 201
+            assert authorized.json()["status"] == "pending"
+            assert authorized.json()["expires_at"] is not None
+
+        captured = httpx.post(f"{base}/{unique_payment_id}_capture/capture", timeout=5.0)
+        voided = httpx.post(f"{base}/{unique_payment_id}_void/void", json={"reason": "Cancelled"}, timeout=5.0)
+        late_capture = httpx.post(f"{base}/{unique_payment_id}_void/capture", timeout=5.0)
+        missing = httpx.post(f"{base}/{unique_payment_id}_missing/void", timeout=5.0)
+
+        assert captured.status_code == 200
+        assert captured.json()["status"] == "succeeded"
+        assert captured.json()["expires_at"] is None
+        assert voided.json()["status"] == "voided"
+        assert voided.json()["error_message"] == "Cancelled"
+        assert late_capture.status_code == 409
+        assert missing.status_code == 404
+        assert httpx.post(f"{base}/authorize", json={
+            "payment_id": f"{unique_payment_id}_bad", "amount": "1.00", "currency": "USD", "hold_seconds": 0
+        }, timeout=5.0).status_code == 422
+
+    def test_authorization_expires(self, unique_payment_id):
+        """Авторизация с истёкшим сроком отменяется планировщиком без запроса клиента"""
+        base = "http://127.0.0.1:8000/api/pay"
+        httpx.post(f"{base}/authorize", json={
+            "payment_id": unique_payment_id, "amount": "5.00", "currency": "USD", "hold_seconds": 1
+        }, timeout=5.0)
+
+        deadline = time.monotonic() + 5.0
+        status = "pending"
+        while status == "pending" and time.monotonic() < deadline:
+            time.sleep(0.2)
+            status = httpx.get(f"{base}/{unique_payment_id}", timeout=5.0).json()["status"]
+
+        assert status == "voided"
+        assert httpx.post(f"{base}/{unique_payment_id}/capture", timeout=5.0).status_code == 409
@@ -0,0 +1,189 @@
+"""
+Юнит-тесты для лимита запросов и контроля допуска
+
+Проверяем:
+- Всплеск до burst, ленивое пополнение и время до следующего токена
+- Ограничение таблицы вёдер и вытеснение простаивающих ключей
+- Отказ 429 по ключу и 503 при перегрузке, с Retry-After
+- Пути вне paths не ограничиваются
+- С настройками по умолчанию нагрузка не сбрасывается
+- Измерение задержки event loop
+"""
+import asyncio
+import time
+import pytest
+import httpx
+
+from src.payment_gateway_simulator.api.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    TokenBucketTable,
+    LOOP_LAG,
+    RATE_LIMITED,
+)
+from src.payment_gateway_simulator.config import Settings
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _client(middleware_kwargs: dict, release: asyncio.Event = None) -> httpx.AsyncClient:
+    async def app(scope, receive, send):
+        if release is not None:
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=AdmissionMiddleware(app, **middleware_kwargs)),
+        base_url="http://test"
+    )
+
+
+class TestTokenBucketTable:
+    """Тесты для таблицы token bucket"""
+
+    def test_burst_then_lazy_refill(self):
+        """Новый ключ получает полное ведро, дальше токены копятся со скоростью rate"""
+        clock = _Clock()
+        table = TokenBucketTable(rate=10, burst=3, clock=clock)
+
+        assert [table.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert table.acquire("a") == pytest.approx(0.1)
+        assert table.acquire("b") == 0.0
+
+        clock.now = 0.25
+        assert table.acquire("a") == 0.0
+        assert table.acquire("a") == 0.0
+        assert table.acquire("a") == pytest.approx(0.05)
+
+        clock.now = 100.0
+        assert [table.acquire("a") for _ in range(4)][-1] > 0
+
+    def test_table_bounded(self):
+        """Таблица не растёт сверх max_keys; ключи с полным ведром удаляются первыми"""
+        clock = _Clock()
+        table = TokenBucketTable(rate=1, burst=2, max_keys=32, clock=clock)
+        table.acquire("busy")
+        table.acquire("busy")
+        for i in range(31):
+            table.acquire(f"idle_{i}")
+
+        clock.now = 1.5  # Вёдра idle_* полные, у busy — 1.5 токена
+        for i in range(20):
+            table.acquire(f"new_{i}")
+
+        assert len(table) == 21
+        assert table.acquire("busy") == 0.0
+        assert table.acquire("busy") == pytest.approx(0.5)  # Ведро busy не сброшено вытеснением
+
+        for i in range(100):
+            table.acquire(f"more_{i}")
+            assert len(table) <= 32
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError):
+            TokenBucketTable(rate=0, burst=1)
+        with pytest.raises(ValueError):
+            TokenBucketTable(rate=1, burst=1, max_keys=0)
+
+
+class TestAdmissionMiddleware:
+    """Тесты для middleware контроля допуска"""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_per_key(self):
+        """Исчерпав ведро, ключ получает 429 с Retry-After; другой ключ и другие пути не затронуты"""
+        rejected = []
+        limiter = TokenBucketTable(rate=0.5, burst=2, clock=_Clock())
+        async with _client({
+            "controller": AdmissionController(), "limiter": limiter, "on_reject": rejected.append
+        }) as client:
+            statuses = [(await client.post("/api/pay", headers={"X-API-Key": "m1"})).status_code for _ in range(3)]
+            limited = await client.get("/api/pay/pay_1", headers={"X-API-Key": "m1"})
+            other_key = await client.post("/api/pay")
+            other_path = await client.get("/api/payments", headers={"X-API-Key": "m1"})
+
+        assert statuses == [200, 200, 429]
+        assert limited.status_code == 429
+        assert limited.headers["Retry-After"] == "2"
+        assert limited.json() == {"detail": "Rate limit exceeded"}
+        assert other_key.status_code == 200
+        assert other_path.status_code == 200
+        assert rejected == [RATE_LIMITED, RATE_LIMITED]
+
+    @pytest.mark.asyncio
+    async def test_sheds_beyond_max_in_flight(self):
+        """Сверх max_in_flight одновременных запросов — 503; после завершения счётчик освобождается"""
+        controller = AdmissionController(max_in_flight=2)
+        release = asyncio.Event()
+        async with _client({"controller": controller}, release) as client:
+            slow = [asyncio.create_task(client.post("/api/pay")) for _ in range(2)]
+            while controller.in_flight < 2:
+                await asyncio.sleep(0)
+            shed = await client.post("/api/pay/authorize")
+            release.set()
+            done = await asyncio.gather(*slow)
+
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "1"
+        assert [r.status_code for r in done] == [200, 200]
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_loop_lag_measured(self):
+        """Блокировка event loop дольше порога включает сброс нагрузки"""
+        controller = AdmissionController(max_loop_lag=0.03, lag_interval=0.01)
+        await controller.start()
+        try:
+            await asyncio.sleep(0.02)
+            assert controller.check() is None
+            time.sleep(0.1)  # Блокируем loop
+            await asyncio.sleep(0.001)
+            reason, retry_after = controller.check()
+            await asyncio.sleep(0.2)
+            recovered = controller.check()
+        finally:
+            await controller.aclose()
+
+        assert reason == LOOP_LAG
+        assert retry_after >= 0.03
+        assert recovered is None
+
+    @pytest.mark.asyncio
+    async def test_default_settings_never_shed(self, monkeypatch):
+        """По умолчанию нет ни порога одновременных запросов, ни измерения задержки loop"""
+        for name in ("PGS_ADMISSION_MAX_IN_FLIGHT", "PGS_ADMISSION_MAX_LOOP_LAG", "PGS_RATE_LIMIT_PER_SECOND"):
+            monkeypatch.delenv(name, raising=False)
+        settings = Settings()
+        controller = AdmissionController(
+            max_in_flight=settings.admission_max_in_flight,
+            max_loop_lag=settings.admission_max_loop_lag,
+            lag_interval=settings.admission_lag_interval
+        )
+        await controller.start()
+        release = asyncio.Event()
+        try:
+            async with _client({"controller": controller}, release) as client:
+                # Больше прежнего порога в 1000 одновременных запросов
+                slow = [asyncio.create_task(client.get(f"/api/pay/pay_{i}")) for i in range(1500)]
+                while controller.in_flight < 1500:
+                    await asyncio.sleep(0)
+                time.sleep(0.1)  # Блокируем loop
+                await asyncio.sleep(0.01)
+                slow.append(asyncio.create_task(client.post("/api/pay")))
+                while controller.in_flight < 1501:
+                    await asyncio.sleep(0)
+                release.set()
+                done = await asyncio.gather(*slow)
+        finally:
+            await controller.aclose()
+
+        assert settings.rate_limit_per_second == 0
+        assert controller.check() is None
+        assert {r.status_code for r in done} == {200}
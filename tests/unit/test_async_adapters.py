@@ -0,0 +1,130 @@
+"""
+Юнит-тесты для асинхронных адаптеров
+
+Проверяем:
+- AsyncInMemoryPaymentAdapter делегирует в синхронное хранилище
+- AsyncConsoleLoggerAdapter пишет JSON-строки в stdout после flush
+"""
+import json
+import pytest
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentProcessingError,
+    PaymentCommand,
+    AsyncPaymentProcessorPort,
+)
+from src.payment_gateway_simulator.adapters.payment import (
+    InMemoryPaymentAdapter,
+    AsyncInMemoryPaymentAdapter,
+)
+from src.payment_gateway_simulator.adapters.logging import AsyncConsoleLoggerAdapter
+
+
+class TestAsyncInMemoryPaymentAdapter:
+    """Тесты для асинхронного in-memory адаптера"""
+
+    @pytest.mark.asyncio
+    async def test_process_and_refund(self):
+        """Платёж создаётся и возвращается через корутины"""
+        adapter = AsyncInMemoryPaymentAdapter()
+
+        payment = await adapter.process_payment(
+            payment_id=PaymentId("pay_async"),
+            amount=Amount(Decimal("15.00"), "USD")
+        )
+        refunded = await adapter.refund_payment(PaymentId("pay_async"), reason="Test")
+
+        assert payment.status == PaymentStatus.SUCCEEDED
+        assert refunded.status == PaymentStatus.REFUNDED
+
+    @pytest.mark.asyncio
+    async def test_authorize_and_capture(self):
+        """Авторизация и списание доступны через корутины"""
+        adapter = AsyncInMemoryPaymentAdapter()
+
+        authorized = await adapter.authorize_payment(
+            PaymentId("pay_async_auth"), Amount(Decimal("15.00"), "USD"), datetime.now() + timedelta(minutes=5)
+        )
+        captured = await adapter.capture_payment(PaymentId("pay_async_auth"))
+
+        assert authorized.status == PaymentStatus.PENDING
+        assert captured.status == PaymentStatus.SUCCEEDED
+        with pytest.raises(PaymentProcessingError, match="cannot be voided"):
+            await adapter.void_payment(PaymentId("pay_async_auth"))
+
+    @pytest.mark.asyncio
+    async def test_shares_state_with_sync_store(self):
+        """Асинхронный адаптер работает поверх переданного синхронного хранилища"""
+        store = InMemoryPaymentAdapter()
+        adapter = AsyncInMemoryPaymentAdapter(store)
+
+        await adapter.process_payment(PaymentId("pay_shared"), Amount(Decimal("1.00"), "EUR"))
+
+        with pytest.raises(PaymentProcessingError, match="already exists"):
+            store.process_payment(PaymentId("pay_shared"), Amount(Decimal("1.00"), "EUR"))
+
+    @pytest.mark.asyncio
+    async def test_process_payments_batch(self):
+        """Пакетная обработка возвращает платёж или ошибку по каждой команде"""
+        adapter = AsyncInMemoryPaymentAdapter()
+
+        outcomes = await adapter.process_payments([
+            PaymentCommand(PaymentId("pay_a"), Amount(Decimal("1.00"), "USD")),
+            PaymentCommand(PaymentId("pay_a"), Amount(Decimal("1.00"), "USD")),
+        ])
+
+        assert outcomes[0].status == PaymentStatus.SUCCEEDED
+        assert isinstance(outcomes[1], PaymentProcessingError)
+
+    @pytest.mark.asyncio
+    async def test_default_batch_passes_decline_reason(self):
+        """Пакет порта по умолчанию передаёт decline_reason и settlement_amount в process_payment"""
+        adapter = AsyncInMemoryPaymentAdapter()
+
+        settlement = Amount(Decimal("1.09"), "USD")
+
+        declined, settled = await AsyncPaymentProcessorPort.process_payments(adapter, [
+            PaymentCommand(PaymentId("pay_default_declined"), Amount(Decimal("1.00"), "USD"), decline_reason="Risk"),
+            PaymentCommand(PaymentId("pay_default_settled"), Amount(Decimal("1.00"), "EUR"), settlement_amount=settlement),
+        ])
+
+        assert (declined.status, declined.error_message) == (PaymentStatus.FAILED, "Risk")
+        assert settled.settlement_amount == settlement
+
+
+class TestAsyncConsoleLoggerAdapter:
+    """Тесты для асинхронного консольного логгера"""
+
+    @staticmethod
+    def _payment(payment_id: str) -> Payment:
+        return Payment(
+            id=PaymentId(payment_id),
+            amount=Amount(Decimal("9.99"), "USD"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime.now()
+        )
+
+    @pytest.mark.asyncio
+    async def test_log_transactions_written_after_flush(self, capsys):
+        """Все строки попадают в stdout после flush, в порядке логирования"""
+        logger = AsyncConsoleLoggerAdapter()
+
+        await logger.log_transaction(self._payment("pay_1"))
+        await logger.log_transactions([self._payment("pay_2"), self._payment("pay_3")])
+        await logger.aclose()
+
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert [json.loads(line)["payment_id"] for line in lines] == ["pay_1", "pay_2", "pay_3"]
+
+    @pytest.mark.asyncio
+    async def test_get_transactions_returns_empty_list(self):
+        """Консоль не хранит историю"""
+        logger = AsyncConsoleLoggerAdapter()
+
+        assert await logger.get_transactions_by_payment_id(PaymentId("any")) == []
@@ -0,0 +1,150 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+from decimal import Decimal
+from datetime import datetime, timedelta
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentProcessingError,
+)
+from src.payment_gateway_simulator.use_cases import (
+    AuthorizePaymentUseCase,
+    AsyncAuthorizePaymentUseCase,
+    AuthorizePaymentInput,
+    CapturePaymentUseCase,
+    CapturePaymentInput,
+    VoidPaymentUseCase,
+    AsyncVoidPaymentUseCase,
+    VoidPaymentInput,
+)
+from src.payment_gateway_simulator.adapters.payment import InMemoryPaymentAdapter, AsyncInMemoryPaymentAdapter
+from src.payment_gateway_simulator.adapters.risk import RiskEngine, RiskRule
+from src.payment_gateway_simulator.adapters.fx import FxRateMatrix, LocalFxRateProvider
+
+
+def _payment(status: PaymentStatus) -> Payment:
+    return Payment(
+        id=PaymentId("pay_auth"),
+        amount=Amount(Decimal("40.00"), "USD"),
+        status=status,
+        created_at=datetime.now()
+    )
+
+
+class TestAuthorizePaymentUseCase:
+    """Тесты для сценария авторизации"""
+
+    def test_authorization_is_processed_and_logged(self):
+        """Процессор получает срок now + hold_seconds, авторизация уходит в лог"""
+        mock_processor = Mock()
+        mock_logger = Mock()
+        mock_processor.authorize_payment.return_value = _payment(PaymentStatus.PENDING)
+        use_case = AuthorizePaymentUseCase(mock_processor, mock_logger)
+
+        before = datetime.now()
+        result = use_case.execute(AuthorizePaymentInput(
+            payment_id="pay_auth", amount=Decimal("40.00"), currency="usd", hold_seconds=3600
+        ))
+
+        kwargs = mock_processor.authorize_payment.call_args.kwargs
+        assert kwargs["amount"] == Amount(Decimal("40.00"), "USD")
+        assert before + timedelta(hours=1) <= kwargs["expires_at"] <= datetime.now() + timedelta(hours=1)
+        mock_logger.log_transaction.assert_called_once_with(result)
+
+    @pytest.mark.parametrize("hold_seconds", [0, -1])
+    def test_non_positive_hold_rejected(self, hold_seconds):
+        """Срок авторизации должен быть положительным"""
+        mock_processor = Mock()
+        use_case = AuthorizePaymentUseCase(mock_processor, Mock())
+
+        with pytest.raises(ValueError, match="hold_seconds"):
+            use_case.execute(AuthorizePaymentInput(
+                payment_id="pay_auth", amount=Decimal("1.00"), currency="USD", hold_seconds=hold_seconds
+            ))
+        mock_processor.authorize_payment.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_authorization(self):
+        """Асинхронный сценарий применяет те же правила валидации"""
+        mock_processor = AsyncMock()
+        mock_processor.authorize_payment.return_value = _payment(PaymentStatus.PENDING)
+        use_case = AsyncAuthorizePaymentUseCase(mock_processor, AsyncMock())
+
+        with pytest.raises(ValueError):
+            await use_case.execute(AuthorizePaymentInput(payment_id="", amount=Decimal("1.00"), currency="USD"))
+
+        result = await use_case.execute(AuthorizePaymentInput(payment_id="pay_auth", amount=Decimal("1.00"), currency="USD"))
+        assert result.status == PaymentStatus.PENDING
+
+    def test_risk_and_settlement_apply_to_authorization(self):
+        """Правило риска отклоняет авторизацию, одобренная получает сумму в валюте расчётов и сохраняет её при списании"""
+        adapter = InMemoryPaymentAdapter()
+        use_case = AuthorizePaymentUseCase(
+            adapter, Mock(),
+            risk_assessor=RiskEngine([RiskRule.from_dict({"name": "large", "min_amount": "1000", "message": "Too large"})]),
+            fx_rates=LocalFxRateProvider(FxRateMatrix("USD", {"EUR": Decimal("0.92")})),
+            settlement_currency="USD"
+        )
+
+        declined = use_case.execute(AuthorizePaymentInput(payment_id="pay_auth_risk", amount=Decimal("5000"), currency="EUR"))
+        held = use_case.execute(AuthorizePaymentInput(payment_id="pay_auth_fx", amount=Decimal("92.00"), currency="EUR"))
+        captured = CapturePaymentUseCase(adapter, Mock()).execute(CapturePaymentInput(payment_id="pay_auth_fx"))
+
+        assert (declined.status, declined.error_message, declined.expires_at) == (PaymentStatus.FAILED, "Too large", None)
+        assert held.status == PaymentStatus.PENDING
+        assert captured.status == PaymentStatus.SUCCEEDED
+        assert captured.settlement_amount == Amount(Decimal("100.00"), "USD")
+
+    @pytest.mark.asyncio
+    async def test_async_risk_decline(self):
+        """Асинхронная авторизация проходит ту же оценку риска"""
+        use_case = AsyncAuthorizePaymentUseCase(
+            AsyncInMemoryPaymentAdapter(InMemoryPaymentAdapter()), AsyncMock(),
+            risk_assessor=RiskEngine([RiskRule.from_dict({"name": "eur", "currency": ["EUR"]})])
+        )
+
+        result = await use_case.execute(AuthorizePaymentInput(payment_id="pay_auth_async_risk", amount=Decimal("1.00"), currency="EUR"))
+
+        assert result.status == PaymentStatus.FAILED
+
+
+class TestCaptureAndVoidUseCases:
+    """Тесты для сценариев списания и отмены авторизации"""
+
+    def test_capture_is_logged(self):
+        """Списанный платёж уходит в лог"""
+        mock_processor = Mock()
+        mock_logger = Mock()
+        mock_processor.capture_payment.return_value = _payment(PaymentStatus.SUCCEEDED)
+
+        result = CapturePaymentUseCase(mock_processor, mock_logger).execute(CapturePaymentInput("pay_auth"))
+
+        mock_processor.capture_payment.assert_called_once_with(PaymentId("pay_auth"))
+        mock_logger.log_transaction.assert_called_once_with(result)
+
+    def test_rejected_transition_not_logged(self):
+        """Отклонённый переход не попадает в лог"""
+        mock_processor = Mock()
+        mock_logger = Mock()
+        mock_processor.void_payment.side_effect = PaymentProcessingError("cannot be voided")
+
+        with pytest.raises(PaymentProcessingError):
+            VoidPaymentUseCase(mock_processor, mock_logger).execute(VoidPaymentInput("pay_auth"))
+        with pytest.raises(ValueError):
+            VoidPaymentUseCase(mock_processor, mock_logger).execute(VoidPaymentInput(""))
+        mock_logger.log_transaction.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_void_passes_reason(self):
+        """Причина отмены передаётся процессору"""
+        mock_processor = AsyncMock()
+        mock_processor.void_payment.return_value = _payment(PaymentStatus.VOIDED)
+        mock_logger = AsyncMock()
+
+        await AsyncVoidPaymentUseCase(mock_processor, mock_logger).execute(VoidPaymentInput("pay_auth", "Expired"))
+
+        mock_processor.void_payment.assert_awaited_once_with(PaymentId("pay_auth"), "Expired")
+        mock_logger.log_transaction.assert_awaited_once()
@@ -0,0 +1,82 @@
+"""
+Юнит-тесты для пакета бенчмарков
+
+Проверяем:
+- Перцентили и сводку по замерам
+- Поиск регрессий относительно базовой линии
+- Сценарии с неуспешными ответами
+- Короткий прогон сценариев внутри процесса
+"""
+import pytest
+
+from src.benchmarks import compare, failures, run_in_process, summarize
+from src.benchmarks.stats import percentile
+
+
+class TestStats:
+    """Тесты для статистики бенчмарков"""
+
+    def test_percentile_nearest_rank(self):
+        """Перцентиль берётся по ближайшему рангу"""
+        samples = [float(i) for i in range(1, 101)]
+
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile(samples, 99.9) == 100.0
+        assert percentile([], 50) == 0.0
+
+    def test_summarize(self):
+        """Сводка переводит задержки в миллисекунды и считает throughput"""
+        result = summarize("create", "in-process", [0.001] * 10, elapsed=0.5)
+
+        assert result.payments == 10
+        assert result.throughput == pytest.approx(20.0)
+        assert result.p50_ms == pytest.approx(1.0)
+        assert result.key == "in-process:create"
+
+    def test_compare_flags_regressions(self):
+        """Ухудшение сверх допуска попадает в отчёт, улучшение — нет"""
+        baseline = summarize("create", "in-process", [0.001] * 10, elapsed=0.5).to_dict()
+        slower = summarize("create", "in-process", [0.002] * 10, elapsed=1.0)
+        faster = summarize("create", "in-process", [0.0005] * 10, elapsed=0.25)
+
+        regressions = compare({"results": [baseline]}, [slower], tolerance=0.2)
+
+        assert any("throughput" in line for line in regressions)
+        assert any("p50_ms" in line for line in regressions)
+        assert compare({"results": [baseline]}, [faster], tolerance=0.2) == []
+
+    def test_compare_ignores_unknown_flows(self):
+        """Сценарии без базовой линии не считаются регрессией"""
+        result = summarize("batch", "http", [0.1], elapsed=0.1)
+
+        assert compare({"results": []}, [result]) == []
+
+    def test_failures_report_errors(self):
+        """Сценарий с ответами не из 2xx считается неуспешным"""
+        ok = summarize("create", "http", [0.001] * 10, elapsed=0.01)
+        ok.extra["errors"] = 0
+        throttled = summarize("lookup", "http", [0.001] * 10, elapsed=0.01)
+        throttled.extra["errors"] = 4
+
+        assert failures([ok, throttled]) == ["http:lookup: 4 of 10 responses failed"]
+
+
+class TestInProcessRun:
+    """Тесты для прогона внутри процесса"""
+
+    def test_runs_all_flows(self):
+        """Короткий прогон возвращает результаты всех сценариев"""
+        results = run_in_process(count=50, batch_size=20, alloc_sample=20)
+
+        assert [r.flow for r in results] == ["create", "lookup", "refund", "batch", "risk", "fx", "capture", "list"]
+        assert all(r.payments == 50 for r in results)
+        assert results[3].operations == 3
+        assert results[0].alloc_bytes_per_op is not None
+
+    def test_lookup_alone_prepares_payments(self):
+        """lookup без create в списке всё равно находит платежи"""
+        results = run_in_process(count=10, flows=["lookup"], alloc_sample=None)
+
+        assert [r.flow for r in results] == ["lookup"]
+        assert results[0].alloc_bytes_per_op is None
@@ -0,0 +1,146 @@
+"""
+Юнит-тесты для BufferedLoggerAdapter
+
+Проверяем:
+- Запись пачками и порядок строк
+- Сброс по интервалу без закрытия
+- Дописывание очереди при остановке
+- Backpressure при заполненной очереди
+- Ошибку записи пачки в лог модуля без остановки писателя
+- Запись пачек в файловый логгер и чтение истории из него
+"""
+import asyncio
+import io
+import json
+import logging
+import pytest
+from decimal import Decimal
+from datetime import datetime
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+)
+from src.payment_gateway_simulator.adapters.logging import BufferedLoggerAdapter, FileTransactionLoggerAdapter
+
+
+class _RecordingStream(io.StringIO):
+    """Поток, запоминающий каждый вызов write"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+
+def _payment(payment_id: str) -> Payment:
+    return Payment(
+        id=PaymentId(payment_id),
+        amount=Amount(Decimal("5.00"), "USD"),
+        status=PaymentStatus.SUCCEEDED,
+        created_at=datetime.now()
+    )
+
+
+def _logged_ids(stream: io.StringIO) -> list:
+    return [json.loads(line)["payment_id"] for line in stream.getvalue().splitlines()]
+
+
+class TestBufferedLoggerAdapter:
+    """Тесты для буферизованного логгера"""
+
+    @pytest.mark.asyncio
+    async def test_batches_are_written_in_order(self):
+        """Платежи пишутся пачками не больше flush_size, порядок сохраняется"""
+        stream = _RecordingStream()
+        logger = BufferedLoggerAdapter(stream=stream, flush_size=4, flush_interval=1.0)
+
+        await logger.log_transactions([_payment(f"pay_{i}") for i in range(10)])
+        await logger.aclose()
+
+        assert _logged_ids(stream) == [f"pay_{i}" for i in range(10)]
+        assert stream.writes == 3  # 4 + 4 + 2
+
+    @pytest.mark.asyncio
+    async def test_flushes_by_interval(self):
+        """Неполная пачка сбрасывается по истечении flush_interval"""
+        stream = io.StringIO()
+        logger = BufferedLoggerAdapter(stream=stream, flush_size=100, flush_interval=0.01)
+
+        await logger.log_transaction(_payment("pay_interval"))
+        for _ in range(50):
+            if stream.getvalue():
+                break
+            await asyncio.sleep(0.01)
+
+        assert _logged_ids(stream) == ["pay_interval"]
+        await logger.aclose()
+
+    @pytest.mark.asyncio
+    async def test_backpressure_when_queue_full(self):
+        """При заполненной очереди логирование ждёт, пока писатель её разберёт"""
+        stream = io.StringIO()
+        logger = BufferedLoggerAdapter(stream=stream, flush_size=2, flush_interval=0.0, max_queue_size=2)
+
+        await asyncio.wait_for(
+            logger.log_transactions([_payment(f"pay_bp_{i}") for i in range(20)]),
+            timeout=5
+        )
+        assert logger.pending <= 2
+
+        await logger.aclose()
+        assert len(_logged_ids(stream)) == 20
+
+    @pytest.mark.asyncio
+    async def test_closed_logger_rejects_writes(self):
+        """После остановки логгер не принимает новые транзакции"""
+        logger = BufferedLoggerAdapter(stream=io.StringIO())
+        await logger.aclose()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            await logger.log_transaction(_payment("pay_late"))
+
+    @pytest.mark.asyncio
+    async def test_write_error_logged_and_writer_continues(self, caplog):
+        """Ошибка записи пачки уходит в лог с трейсбеком, следующие пачки пишутся"""
+        class _FailingOnce(_RecordingStream):
+            def write(self, data):
+                if not self.writes:
+                    self.writes += 1
+                    raise OSError("disk full")
+                return super().write(data)
+
+        stream = _FailingOnce()
+        logger = BufferedLoggerAdapter(stream=stream, flush_size=1, flush_interval=1.0)
+
+        with caplog.at_level(logging.ERROR, logger="payment_gateway_simulator.adapters.logging"):
+            await logger.log_transactions([_payment("pay_lost"), _payment("pay_kept")])
+            await logger.aclose()
+
+        assert _logged_ids(stream) == ["pay_kept"]
+        [record] = caplog.records
+        assert record.exc_info[0] is OSError
+
+    @pytest.mark.asyncio
+    async def test_writes_batches_to_sink(self, tmp_path):
+        """С sink пачки уходят в файловый логгер, история читается из него"""
+        with FileTransactionLoggerAdapter(tmp_path) as sink:
+            logger = BufferedLoggerAdapter(flush_size=4, flush_interval=1.0, sink=sink)
+
+            await logger.log_transactions([_payment(f"pay_{i}") for i in range(10)])
+            await logger.aclose()
+
+            assert len(sink) == 10
+            history = await logger.get_transactions_by_payment_id(PaymentId("pay_7"))
+
+        assert [payment.id.value for payment in history] == ["pay_7"]
+
+    def test_invalid_flush_size(self):
+        """Размер пачки должен быть положительным"""
+        with pytest.raises(ValueError, match="flush_size"):
+            BufferedLoggerAdapter(flush_size=0)
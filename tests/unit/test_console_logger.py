@@ -73,6 +73,27 @@ class TestConsoleLoggerAdapter:
         assert "\n" in log_output
         assert "  " in log_output  # отступы
 
+    def test_log_transactions_batch_outputs_line_per_payment(self, capsys):
+        """Пакет транзакций выводится по одной JSON-строке на платёж"""
+        logger = ConsoleLoggerAdapter(pretty=False)
+
+        payments = [
+            Payment(
+                id=PaymentId(f"pay_batch_{i}"),
+                amount=Amount(Decimal("10.00"), "USD"),
+                status=PaymentStatus.SUCCEEDED,
+                created_at=datetime.now()
+            )
+            for i in range(3)
+        ]
+
+        logger.log_transactions(payments)
+
+        lines = capsys.readouterr().out.strip().splitlines()
+        assert [json.loads(line)["payment_id"] for line in lines] == [
+            "pay_batch_0", "pay_batch_1", "pay_batch_2"
+        ]
+
     def test_get_transactions_returns_empty_list(self):
         """Консольный адаптер не хранит историю — возвращает пустой список"""
         logger = ConsoleLoggerAdapter()
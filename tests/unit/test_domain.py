@@ -8,6 +8,7 @@ from src.payment_gateway_simulator.domain import (
     PaymentId,
     Amount,
     Payment,
+    PaymentProcessingError,
 )
 
 
@@ -24,6 +25,8 @@ class TestPaymentStatus:
         assert PaymentStatus.SUCCEEDED.value == "succeeded"
         assert PaymentStatus.FAILED.value == "failed"
         assert PaymentStatus.REFUNDED.value == "refunded"
+        assert PaymentStatus.PARTIALLY_REFUNDED.value == "partially_refunded"
+        assert PaymentStatus.VOIDED.value == "voided"
 
     def test_status_comparison(self):
         """Проверяем сравнение статусов"""
@@ -70,6 +73,10 @@ class TestPaymentId:
         with pytest.raises(AttributeError):
             payment_id.value = "new_id"  # type: ignore
 
+    def test_trusted_payment_id_equals_validated(self):
+        """Доверенное создание даёт тот же объект-значение без проверок"""
+        assert PaymentId.trusted("pay_123") == PaymentId("pay_123")
+
 
 # ============================================================================
 # Тесты для Amount (Value Object)
@@ -120,6 +127,66 @@ class TestAmount:
         with pytest.raises(AttributeError):
             amount.value = Decimal("200.00")  # type: ignore
 
+    def test_currency_is_interned(self):
+        """Одинаковые коды валют ссылаются на одну строку"""
+        first = Amount(Decimal("1.00"), "usd")
+        second = Amount(Decimal("2.00"), "".join(["U", "S", "D"]))
+        assert first.currency is second.currency
+
+    def test_trusted_amount_equals_validated(self):
+        """Доверенное создание суммы без проверок"""
+        assert Amount.trusted(Decimal("100.50"), "EUR") == Amount(Decimal("100.50"), "EUR")
+        assert Amount.trusted(Decimal("100.50"), "EUR").minor == 10050
+        assert Amount.trusted_minor(10050, "EUR") == Amount(Decimal("100.50"), "EUR")
+
+
+# ============================================================================
+# Тесты для минорных единиц (экспоненты ISO 4217)
+# ============================================================================
+
+class TestAmountMinorUnits:
+    """Тесты для представления суммы в минорных единицах"""
+
+    @pytest.mark.parametrize("value, currency, expected_value, expected_minor", [
+        ("100.50", "USD", "100.50", 10050),
+        ("100", "USD", "100.00", 10000),
+        ("500", "JPY", "500", 500),
+        ("100.5", "JPY", "100", 100),
+        ("1.005", "KWD", "1.005", 1005),
+        ("1.2345", "KWD", "1.234", 1234),
+        ("12345678901234567.89", "USD", "12345678901234567.89", 1234567890123456789),
+    ])
+    def test_value_rounded_to_currency_exponent(self, value, currency, expected_value, expected_minor):
+        """Сумма округляется до минорной единицы своей валюты, а не всегда до 2 знаков"""
+        amount = Amount(Decimal(value), currency)
+        assert str(amount.value) == expected_value
+        assert amount.minor == expected_minor
+
+    def test_from_minor(self):
+        """Сумма из минорных единиц получает экспоненту валюты"""
+        assert Amount.from_minor(1050, "usd") == Amount(Decimal("10.50"), "USD")
+        assert str(Amount.from_minor(500, "JPY").value) == "500"
+        assert str(Amount.from_minor(1005, "KWD").value) == "1.005"
+
+    def test_amount_below_minor_unit_raises_error(self):
+        """Сумма меньше минорной единицы после округления недопустима"""
+        with pytest.raises(ValueError, match="positive"):
+            Amount(Decimal("0.4"), "JPY")
+        with pytest.raises(ValueError, match="positive"):
+            Amount.from_minor(0, "USD")
+
+    def test_amount_above_64_bit_raises_error(self):
+        """Сумма должна помещаться в 64-битное целое минорных единиц"""
+        with pytest.raises(ValueError, match="exceed"):
+            Amount(Decimal("1e30"), "USD")
+        with pytest.raises(ValueError, match="exceed"):
+            Amount.from_minor(2 ** 63, "JPY")
+
+    def test_minor_not_part_of_equality(self):
+        """minor выводится из value и не влияет на сравнение и repr"""
+        assert Amount(Decimal("100"), "USD") == Amount(Decimal("100.00"), "USD")
+        assert "minor" not in repr(Amount(Decimal("1.00"), "USD"))
+
 
 # ============================================================================
 # Тесты для Payment (Entity)
@@ -189,6 +256,18 @@ class TestPayment:
         assert "100.00 USD" in result
         assert "succeeded" in result
 
+    def test_domain_objects_have_no_instance_dict(self):
+        """Доменные объекты используют __slots__ (без __dict__ на экземпляр)"""
+        payment = Payment(
+            id=PaymentId("pay_slots"),
+            amount=Amount(Decimal("1.00"), "USD"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime.now()
+        )
+
+        for obj in (payment, payment.id, payment.amount):
+            assert not hasattr(obj, "__dict__")
+
     def test_optional_fields_can_be_none(self):
         """Опциональные поля могут быть None"""
         payment = Payment(
@@ -201,4 +280,127 @@ class TestPayment:
 
         assert payment.description is None
         assert payment.customer_email is None
-        assert payment.error_message is None
\ No newline at end of file
+        assert payment.error_message is None
+
+
+# ============================================================================
+# Тесты для возвратов (Payment.refund)
+# ============================================================================
+
+class TestPaymentRefund:
+    """Тесты для возвратов платежа"""
+
+    @pytest.fixture
+    def payment(self):
+        return Payment(
+            id=PaymentId("pay_refund"),
+            amount=Amount(Decimal("100.00"), "USD"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime.now()
+        )
+
+    def test_partial_then_full_refund(self, payment):
+        """Сумма возвратов копится, исходная сумма платежа не меняется"""
+        partial, record = payment.refund(Amount(Decimal("30.00"), "USD"), reason="Damaged")
+
+        assert partial.status == PaymentStatus.PARTIALLY_REFUNDED
+        assert partial.amount == payment.amount
+        assert partial.refunded_amount.value == Decimal("30.00")
+        assert record.amount.value == Decimal("30.00")
+        assert record.status == PaymentStatus.REFUNDED
+        assert record.description == "Refund: Damaged"
+
+        full, rest = partial.refund()
+
+        assert full.status == PaymentStatus.REFUNDED
+        assert full.refunded_amount.value == Decimal("100.00")
+        assert rest.amount.value == Decimal("70.00")
+        assert full.refundable_value() == Decimal("0")
+
+    def test_over_refund_rejected(self, payment):
+        """Возврат сверх остатка отклоняется"""
+        partial, _ = payment.refund(Amount(Decimal("60.00"), "USD"))
+
+        with pytest.raises(PaymentProcessingError, match="exceeds refundable amount 40.00"):
+            partial.refund(Amount(Decimal("40.01"), "USD"))
+
+    def test_refunds_exact_in_minor_units(self):
+        """Возвраты считаются целыми минорными единицами: три по 0.1 KWD дают ровно 0.3"""
+        payment = Payment(
+            id=PaymentId("pay_kwd"),
+            amount=Amount(Decimal("0.300"), "KWD"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime.now()
+        )
+        for _ in range(3):
+            payment, _ = payment.refund(Amount(Decimal("0.1"), "KWD"))
+
+        assert payment.status == PaymentStatus.REFUNDED
+        assert payment.refunded_amount.minor == 300
+        assert payment.refundable_value() == Decimal("0")
+
+    def test_currency_mismatch_rejected(self, payment):
+        """Валюта возврата должна совпадать с валютой платежа"""
+        with pytest.raises(PaymentProcessingError, match="does not match"):
+            payment.refund(Amount(Decimal("10.00"), "EUR"))
+
+    @pytest.mark.parametrize("status", [PaymentStatus.FAILED, PaymentStatus.PENDING, PaymentStatus.REFUNDED])
+    def test_refund_requires_captured_payment(self, payment, status):
+        """Возврат возможен только для успешного (или частично возвращённого) платежа"""
+        from dataclasses import replace
+
+        with pytest.raises(PaymentProcessingError, match="cannot be refunded"):
+            replace(payment, status=status).refund()
+
+
+# ============================================================================
+# Тесты для авторизации (Payment.capture / Payment.void)
+# ============================================================================
+
+class TestPaymentAuthorization:
+    """Тесты для переходов авторизованного платежа"""
+
+    @pytest.fixture
+    def authorization(self):
+        return Payment(
+            id=PaymentId("pay_auth"),
+            amount=Amount(Decimal("100.00"), "USD"),
+            status=PaymentStatus.PENDING,
+            created_at=datetime(2026, 2, 4, 12, 0, 0),
+            expires_at=datetime(2026, 2, 11, 12, 0, 0)
+        )
+
+    def test_capture(self, authorization):
+        """Списание переводит авторизацию в SUCCEEDED и снимает срок"""
+        captured = authorization.capture(datetime(2026, 2, 5, 12, 0, 0))
+
+        assert captured.status == PaymentStatus.SUCCEEDED
+        assert captured.expires_at is None
+        assert captured.amount == authorization.amount
+        assert captured.refund()[0].status == PaymentStatus.REFUNDED
+
+    def test_capture_after_expiry_rejected(self, authorization):
+        """Истёкшую авторизацию списать нельзя"""
+        with pytest.raises(PaymentProcessingError, match="expired"):
+            authorization.capture(datetime(2026, 2, 11, 12, 0, 0))
+
+    def test_void(self, authorization):
+        """Отмена переводит авторизацию в VOIDED с причиной"""
+        voided = authorization.void("Customer cancelled")
+
+        assert voided.status == PaymentStatus.VOIDED
+        assert voided.expires_at is None
+        assert voided.error_message == "Customer cancelled"
+        assert not voided.can_transition_to(PaymentStatus.SUCCEEDED)
+
+    @pytest.mark.parametrize("status", [PaymentStatus.SUCCEEDED, PaymentStatus.FAILED, PaymentStatus.VOIDED])
+    def test_illegal_transitions_rejected(self, authorization, status):
+        """Списать или отменить можно только PENDING"""
+        from dataclasses import replace
+
+        payment = replace(authorization, status=status)
+        assert not payment.can_transition_to(PaymentStatus.VOIDED)
+        with pytest.raises(PaymentProcessingError, match="cannot be captured"):
+            payment.capture(datetime(2026, 2, 5, 12, 0, 0))
+        with pytest.raises(PaymentProcessingError, match="cannot be voided"):
+            payment.void()
@@ -0,0 +1,139 @@
+"""
+Юнит-тесты для истечения авторизаций (ExpiryWheel, AuthorizationExpiryScheduler)
+
+Проверяем:
+- Таймер срабатывает в первом разборе после его тика, ровно один раз
+- Снятие и перестановку таймера
+- Просроченные на момент постановки и разбор после долгого простоя
+- Передачу истёкших пачками и восстановление таймеров из хранилища
+- Ошибку пачки в логе модуля и её повтор в следующем тике
+- Постановку и снятие таймеров декоратором логгера
+"""
+import logging
+import pytest
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import Payment, PaymentId, Amount, PaymentStatus
+from src.payment_gateway_simulator.adapters.payment import AsyncInMemoryPaymentAdapter
+from src.payment_gateway_simulator.adapters.expiry import (
+    ExpiryWheel,
+    AuthorizationExpiryScheduler,
+    AsyncExpiryTrackingTransactionLogger,
+)
+
+_START = datetime(2026, 2, 4, 12, 0, 0)
+_T0 = _START.timestamp()
+
+
+def _authorization(number: int, seconds: float) -> Payment:
+    return Payment(
+        id=PaymentId(f"pay_{number:03d}"),
+        amount=Amount(Decimal("10.00"), "USD"),
+        status=PaymentStatus.PENDING,
+        created_at=_START,
+        expires_at=_START + timedelta(seconds=seconds)
+    )
+
+
+class TestExpiryWheel:
+    """Тесты для колеса таймеров"""
+
+    def test_fires_after_its_tick_once(self):
+        """Ключ забирается, когда его тик целиком прошёл, и только один раз"""
+        wheel = ExpiryWheel(tick=1.0)
+        wheel.add("a", _START + timedelta(seconds=10.5))
+        wheel.add("b", _START + timedelta(seconds=20))
+        assert wheel.pop_expired(_T0) == []
+
+        assert wheel.pop_expired(_T0 + 10.9) == []
+        assert wheel.pop_expired(_T0 + 11) == ["a"]
+        assert wheel.pop_expired(_T0 + 15) == []
+        assert wheel.pop_expired(_T0 + 21) == ["b"]
+        assert len(wheel) == 0
+
+    def test_discard_and_reschedule(self):
+        """Снятый таймер не срабатывает, переставленный срабатывает по новому сроку"""
+        wheel = ExpiryWheel()
+        wheel.add("a", _START + timedelta(seconds=1))
+        wheel.add("b", _START + timedelta(seconds=1))
+        wheel.discard("a")
+        wheel.discard("missing")
+        wheel.add("b", _START + timedelta(seconds=5))
+
+        assert "a" not in wheel and "b" in wheel
+        assert wheel.pop_expired(_T0 + 3) == []
+        assert wheel.pop_expired(_T0 + 6) == ["b"]
+
+    def test_past_due_and_long_idle(self):
+        """Просроченный при постановке срабатывает в ближайший разбор; простой не теряет таймеры"""
+        wheel = ExpiryWheel()
+        wheel.add("old", _START - timedelta(days=1))
+        assert wheel.pop_expired(_T0) == ["old"]
+
+        wheel.add("late", _START - timedelta(seconds=30))
+        wheel.add("near", _START + timedelta(seconds=2))
+        wheel.add("far", _START + timedelta(days=30))
+        assert sorted(wheel.pop_expired(_T0 + 1)) == ["late"]
+        assert wheel.pop_expired(_T0 + 365 * 24 * 3600) == ["near", "far"]
+
+
+class TestAuthorizationExpiryScheduler:
+    """Тесты для планировщика отмены авторизаций"""
+
+    @pytest.mark.asyncio
+    async def test_expired_passed_in_batches(self, caplog):
+        """Истёкшие авторизации уходят в expire пачками; ошибка пачки уходит в лог и не останавливает разбор"""
+        expire = AsyncMock(side_effect=[RuntimeError("store down"), None, None])
+        scheduler = AuthorizationExpiryScheduler(expire, batch_size=2)
+        for number in range(5):
+            scheduler.track(_authorization(number, 1))
+        scheduler.track(_authorization(9, 100))
+
+        with caplog.at_level(logging.ERROR, logger="payment_gateway_simulator.adapters.expiry"):
+            assert await scheduler.run_once(_T0 + 2) == 5
+        assert [len(call.args[0]) for call in expire.await_args_list] == [2, 2, 1]
+        assert len(scheduler) == 3  # Упавшая пачка вернулась в колесо
+        [record] = caplog.records
+        assert record.exc_info[0] is RuntimeError
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_retried_next_tick(self):
+        """Пачка, на которой expire упал, повторяется в следующем тике и больше не повторяется после успеха"""
+        expire = AsyncMock(side_effect=[RuntimeError("store down"), None])
+        scheduler = AuthorizationExpiryScheduler(expire)
+        for number in range(3):
+            scheduler.track(_authorization(number, 1))
+
+        assert await scheduler.run_once(_T0 + 2) == 3
+        assert len(scheduler) == 3
+        assert await scheduler.run_once(_T0 + 2.5) == 0  # Тот же тик — ещё не срок
+        assert await scheduler.run_once(_T0 + 3) == 3
+        assert await scheduler.run_once(_T0 + 4) == 0
+
+        first, retry = [call.args[0] for call in expire.await_args_list]
+        assert retry == first == ["pay_000", "pay_001", "pay_002"]
+        assert len(scheduler) == 0
+
+    @pytest.mark.asyncio
+    async def test_load_and_tracking_logger(self):
+        """Таймеры восстанавливаются из хранилища; списание снимает таймер"""
+        adapter = AsyncInMemoryPaymentAdapter()
+        expires_at = datetime.now() + timedelta(hours=1)
+        for number in range(3):
+            await adapter.authorize_payment(PaymentId(f"pay_{number:03d}"), Amount(Decimal("1.00"), "USD"), expires_at)
+        await adapter.process_payment(PaymentId("pay_captured"), Amount(Decimal("1.00"), "USD"))
+
+        scheduler = AuthorizationExpiryScheduler(AsyncMock())
+        assert await scheduler.load(adapter, page_size=2) == 3
+
+        logger = AsyncExpiryTrackingTransactionLogger(AsyncMock(), scheduler)
+        await logger.log_transaction(await adapter.capture_payment(PaymentId("pay_000")))
+        await logger.log_transactions([
+            await adapter.void_payment(PaymentId("pay_001")),
+            await adapter.authorize_payment(PaymentId("pay_new"), Amount(Decimal("1.00"), "USD"), expires_at),
+        ])
+
+        assert len(scheduler) == 2
+        assert await scheduler.run_once(expires_at.timestamp() + 2) == 2
@@ -0,0 +1,111 @@
+"""
+Юнит-тесты для FileTransactionLoggerAdapter
+
+Проверяем:
+- Чтение истории платежа по индексу
+- Сохранение возвратов, срока авторизации и суммы расчётов
+- Сохранение истории между перезапусками
+- Ротацию сегментов
+- Восстановление после аварийной остановки
+"""
+from decimal import Decimal
+from dataclasses import replace
+from datetime import datetime
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+)
+from src.payment_gateway_simulator.adapters.logging import FileTransactionLoggerAdapter
+
+
+def _payment(payment_id: str, status: PaymentStatus = PaymentStatus.SUCCEEDED, value: str = "10.00") -> Payment:
+    return Payment(
+        id=PaymentId(payment_id),
+        amount=Amount(Decimal(value), "EUR"),
+        status=status,
+        created_at=datetime(2026, 2, 4, 12, 0, 0),
+        description="File log test",
+        customer_email="test@example.com"
+    )
+
+
+class TestFileTransactionLoggerAdapter:
+    """Тесты для файлового логгера транзакций"""
+
+    def test_history_by_payment_id(self, tmp_path):
+        """История платежа возвращается целиком и в порядке записи"""
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            logger.log_transaction(_payment("pay_1"))
+            logger.log_transaction(_payment("pay_2"))
+            logger.log_transaction(_payment("pay_1", PaymentStatus.REFUNDED, "4.00"))
+
+            history = logger.get_transactions_by_payment_id(PaymentId("pay_1"))
+
+        assert [p.status for p in history] == [PaymentStatus.SUCCEEDED, PaymentStatus.REFUNDED]
+        assert history[0] == _payment("pay_1")
+        assert history[1].amount.value == Decimal("4.00")
+
+    def test_optional_fields_roundtrip(self, tmp_path):
+        """Сумма возвратов, срок авторизации и сумма в валюте расчётов читаются без потерь"""
+        refunded = replace(
+            _payment("pay_1", PaymentStatus.PARTIALLY_REFUNDED),
+            refunded_amount=Amount(Decimal("3.50"), "EUR"),
+            settlement_amount=Amount(Decimal("1627"), "JPY"),
+        )
+        pending = replace(
+            _payment("pay_2", PaymentStatus.PENDING), expires_at=datetime(2026, 2, 11, 12, 0, 0)
+        )
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            logger.log_transactions([refunded, pending])
+
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            assert logger.get_transactions_by_payment_id(PaymentId("pay_1")) == [refunded]
+            assert logger.get_transactions_by_payment_id(PaymentId("pay_2")) == [pending]
+
+    def test_unknown_payment_returns_empty_list(self, tmp_path):
+        """Для неизвестного платежа история пустая"""
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            assert logger.get_transactions_by_payment_id(PaymentId("missing")) == []
+
+    def test_history_survives_restart(self, tmp_path):
+        """После перезапуска индекс загружается с диска"""
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            logger.log_transactions([_payment(f"pay_{i}") for i in range(5)])
+
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            assert len(logger) == 5
+            assert logger.get_transactions_by_payment_id(PaymentId("pay_3")) == [_payment("pay_3")]
+            logger.log_transaction(_payment("pay_3", PaymentStatus.REFUNDED))
+            assert len(logger.get_transactions_by_payment_id(PaymentId("pay_3"))) == 2
+
+    def test_segment_rotation(self, tmp_path):
+        """При превышении размера начинается новый сегмент, чтение работает по всем"""
+        with FileTransactionLoggerAdapter(tmp_path, max_segment_bytes=200) as logger:
+            for i in range(10):
+                logger.log_transaction(_payment(f"pay_rot_{i}"))
+
+        assert len(list(tmp_path.glob("segment-*.log"))) > 1
+
+        with FileTransactionLoggerAdapter(tmp_path, max_segment_bytes=200) as logger:
+            for i in range(10):
+                assert logger.get_transactions_by_payment_id(PaymentId(f"pay_rot_{i}"))[0].id.value == f"pay_rot_{i}"
+
+    def test_recovers_from_missing_index_and_torn_write(self, tmp_path):
+        """Потерянный индекс восстанавливается из лога, недописанная запись отбрасывается"""
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            logger.log_transactions([_payment("pay_a"), _payment("pay_b")])
+
+        (tmp_path / "segment-00000001.idx").unlink()
+        with open(tmp_path / "segment-00000001.log", "ab") as log:
+            log.write(b'{"i":"pay_torn","n":1')
+
+        with FileTransactionLoggerAdapter(tmp_path) as logger:
+            assert len(logger) == 2
+            assert logger.get_transactions_by_payment_id(PaymentId("pay_b")) == [_payment("pay_b")]
+            logger.log_transaction(_payment("pay_c"))
+            assert logger.get_transactions_by_payment_id(PaymentId("pay_c")) == [_payment("pay_c")]
+
+        assert (tmp_path / "segment-00000001.idx").exists()
@@ -0,0 +1,132 @@
+"""
+Юнит-тесты для курсов валют (FxRateMatrix, LocalFxRateProvider)
+
+Проверяем:
+- Кросс-курсы через базовую валюту с учётом экспонент (JPY, KWD)
+- Банковское округление и валюты без курса
+- Отказ на невалидных курсах
+- Атомарную подмену таблицы и перечитывание изменённого файла
+- Сохранение прежних курсов при ошибке в файле
+"""
+import asyncio
+import json
+import os
+import pytest
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import Amount
+from src.payment_gateway_simulator.adapters.fx import FxRateMatrix, LocalFxRateProvider
+
+_RATES = {"base": "USD", "rates": {"EUR": "0.92", "JPY": "151.30", "KWD": "0.3075"}}
+
+
+def _write(path, data: dict, mtime_ns: int) -> None:
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestFxRateMatrix:
+    """Тесты для таблицы курсов"""
+
+    def test_cross_rates_in_minor_units(self):
+        """Пары без базовой валюты считаются через неё, с экспонентами обеих валют"""
+        matrix = FxRateMatrix.from_dict(_RATES)
+
+        assert len(matrix) == 4
+        assert matrix.convert_minor(10000, "USD", "EUR") == 9200  # 100.00 USD → 92.00 EUR
+        assert matrix.convert_minor(9200, "EUR", "USD") == 10000
+        assert matrix.convert_minor(10000, "EUR", "JPY") == 16446  # 100 / 0.92 * 151.30 = 16445.65
+        assert matrix.convert_minor(10000, "USD", "KWD") == 30750  # 100.00 USD → 30.750 KWD
+        assert matrix.convert_minor(1513, "JPY", "USD") == 1000
+        assert matrix.convert_minor(12345, "EUR", "EUR") == 12345
+
+    def test_bankers_rounding(self):
+        """Ровно половина минорной единицы округляется к чётному"""
+        matrix = FxRateMatrix("USD", {"EUR": Decimal("0.5")})
+
+        assert [matrix.convert_minor(minor, "USD", "EUR") for minor in (1, 3, 5, 7)] == [0, 2, 2, 4]
+        assert matrix.convert_minor(3, "EUR", "USD") == 6
+
+    def test_unknown_currency(self):
+        """Валюта без курса — None, а не исключение"""
+        matrix = FxRateMatrix.from_dict(_RATES)
+
+        assert matrix.convert_minor(100, "USD", "GBP") is None
+        assert matrix.convert_minor(100, "GBP", "USD") is None
+        assert "EUR" in matrix and "GBP" not in matrix
+
+    @pytest.mark.parametrize("data", [
+        {"rates": {"EUR": "0.92"}},
+        {"base": "USD", "rates": {"EUR": "0"}},
+        {"base": "USD", "rates": {"EUR": "-1"}},
+        {"base": "USD", "rates": {"EUR": "abc"}},
+        {"base": "USD", "rates": {"EURO": "0.92"}},
+        {"base": "USD", "rates": {"USD": "2"}},
+    ])
+    def test_invalid_rates_rejected(self, data):
+        """Нет base, неположительный или нечисловой курс, невалидный код — ValueError"""
+        with pytest.raises(ValueError):
+            FxRateMatrix.from_dict(data)
+
+
+class TestLocalFxRateProvider:
+    """Тесты для провайдера курсов из файла"""
+
+    def test_convert_amount(self):
+        """Сумма пересчитывается в Amount целевой валюты; меньше минорной единицы — None"""
+        provider = LocalFxRateProvider(FxRateMatrix.from_dict(_RATES))
+
+        converted = provider.convert(Amount(Decimal("100.00"), "EUR"), "JPY")
+
+        assert (converted.value, converted.currency, converted.minor) == (Decimal("16446"), "JPY", 16446)
+        assert provider.convert(Amount(Decimal("1"), "JPY"), "USD") == Amount(Decimal("0.01"), "USD")
+        assert provider.convert(Amount(Decimal("0.01"), "USD"), "GBP") is None
+        assert LocalFxRateProvider(FxRateMatrix("USD", {"JPY": Decimal("1000")})).convert(
+            Amount(Decimal("1"), "JPY"), "USD"
+        ) is None
+
+    def test_reload_swaps_table(self, tmp_path):
+        """Изменённый файл перечитывается, неизменённый — нет; ссылка на старую таблицу остаётся целой"""
+        path = tmp_path / "rates.json"
+        _write(path, _RATES, 1_000_000_000)
+        provider = LocalFxRateProvider.from_file(path)
+        old = provider.matrix
+
+        assert provider.reload() is False
+
+        _write(path, {"base": "USD", "rates": {"EUR": "0.5"}}, 2_000_000_000)
+        assert provider.reload() is True
+
+        assert provider.convert_minor(10000, "USD", "EUR") == 5000
+        assert provider.convert_minor(10000, "USD", "JPY") is None
+        assert old.convert_minor(10000, "USD", "EUR") == 9200
+
+    def test_invalid_file_keeps_rates(self, tmp_path):
+        """Файл с ошибкой не применяется — остаются прежние курсы"""
+        path = tmp_path / "rates.json"
+        _write(path, _RATES, 1_000_000_000)
+        provider = LocalFxRateProvider.from_file(path)
+
+        _write(path, {"base": "USD", "rates": {"EUR": "-1"}}, 2_000_000_000)
+        with pytest.raises(ValueError):
+            provider.reload()
+
+        assert provider.convert_minor(10000, "USD", "EUR") == 9200
+
+    @pytest.mark.asyncio
+    async def test_background_reload(self, tmp_path):
+        """Фоновая задача подхватывает изменения файла"""
+        path = tmp_path / "rates.json"
+        _write(path, _RATES, 1_000_000_000)
+        provider = LocalFxRateProvider.from_file(path, reload_interval=0.01)
+        await provider.start()
+        try:
+            _write(path, {"base": "USD", "rates": {"EUR": "0.5"}}, 2_000_000_000)
+            for _ in range(100):
+                if provider.convert_minor(100, "USD", "EUR") == 50:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await provider.aclose()
+
+        assert provider.convert_minor(100, "USD", "EUR") == 50
@@ -0,0 +1,152 @@
+"""
+Юнит-тесты для IdempotencyCache
+
+Проверяем:
+- Повтор сохранённого ответа без повторного выполнения
+- Конфликт при другом теле запроса
+- TTL и вытеснение LRU
+- Объединение одновременных запросов с одним ключом
+- Завершение и кэширование ответа после отмены первого запроса
+"""
+import asyncio
+import pytest
+
+from src.payment_gateway_simulator.api.idempotency import (
+    CachedResponse,
+    IdempotencyCache,
+    IdempotencyKeyConflict,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _executor(calls: list, status_code: int = 201, delay: float = 0.0):
+    async def execute():
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        return CachedResponse(status_code, b'{"ok": true}', "fp")
+    return execute
+
+
+class TestIdempotencyCache:
+    """Тесты для кэша идемпотентных ответов"""
+
+    @pytest.mark.asyncio
+    async def test_replays_cached_response(self):
+        """Повторный запрос получает сохранённый ответ, сценарий выполняется один раз"""
+        cache = IdempotencyCache()
+        calls = []
+
+        first, replayed_first = await cache.run("key", "fp", _executor(calls))
+        second, replayed_second = await cache.run("key", "fp", _executor(calls))
+
+        assert first == second
+        assert (replayed_first, replayed_second) == (False, True)
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_conflict_on_different_fingerprint(self):
+        """Тот же ключ с другим телом запроса — конфликт"""
+        cache = IdempotencyCache()
+        await cache.run("key", "fp", _executor([]))
+
+        with pytest.raises(IdempotencyKeyConflict):
+            await cache.run("key", "other", _executor([]))
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_not_cached(self):
+        """Ответы 5xx не кэшируются"""
+        cache = IdempotencyCache()
+        calls = []
+
+        await cache.run("key", "fp", _executor(calls, status_code=503))
+        await cache.run("key", "fp", _executor(calls, status_code=503))
+
+        assert len(calls) == 2
+
+    def test_ttl_expiry(self):
+        """Ответ недоступен после истечения TTL"""
+        clock = _Clock()
+        cache = IdempotencyCache(ttl=10, clock=clock)
+        cache.put("key", CachedResponse(201, b"", "fp"))
+
+        clock.now = 9.9
+        assert cache.get("key") is not None
+        clock.now = 10.0
+        assert cache.get("key") is None
+
+    def test_lru_eviction(self):
+        """При переполнении вытесняется давно не использованный ключ"""
+        cache = IdempotencyCache(max_entries=2)
+        cache.put("a", CachedResponse(201, b"a", "fp"))
+        cache.put("b", CachedResponse(201, b"b", "fp"))
+        cache.get("a")
+        cache.put("c", CachedResponse(201, b"c", "fp"))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_coalesce(self):
+        """Одновременные запросы с одним ключом ждут единственное выполнение"""
+        cache = IdempotencyCache()
+        calls = []
+
+        results = await asyncio.gather(*[
+            cache.run("key", "fp", _executor(calls, delay=0.01)) for _ in range(10)
+        ])
+
+        assert len(calls) == 1
+        assert [replayed for _, replayed in results].count(False) == 1
+
+    @pytest.mark.asyncio
+    async def test_waiters_retry_after_leader_failure(self):
+        """Если первый запрос упал, ожидающий выполняет сценарий сам"""
+        cache = IdempotencyCache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        leader = asyncio.ensure_future(cache.run("key", "fp", failing))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.run("key", "fp", _executor(calls)))
+
+        with pytest.raises(RuntimeError):
+            await leader
+        response, replayed = await follower
+
+        assert response.status_code == 201
+        assert replayed is False
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_leader_cancellation_does_not_abort_execution(self):
+        """Отмена первого запроса не прерывает сценарий: ожидающий получает его ответ из кэша"""
+        cache = IdempotencyCache()
+        calls = []
+
+        leader = asyncio.ensure_future(cache.run("key", "fp", _executor(calls, delay=0.01)))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.run("key", "fp", _executor(calls)))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        response, replayed = await follower
+
+        assert response.status_code == 201
+        assert replayed is True
+        assert len(calls) == 1
+        assert cache.get("key") == response
@@ -7,20 +7,34 @@
 - Отказ при дублировании payment_id
 - Успешный возврат платежа
 - Отказ при возврате несуществующего платежа
+- Журнал возвратов и защиту от возврата сверх суммы
+- Выборку платежей по фильтрам
+- Авторизацию, списание и отмену
+- Отказ до шлюза (decline_reason), в том числе через пакет порта по умолчанию
 """
+import threading
 import pytest
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from src.payment_gateway_simulator.domain import (
     PaymentId,
     Amount,
     PaymentStatus,
     PaymentProcessingError,
+    PaymentCommand,
+    PaymentQuery,
+    PaymentNotFoundError,
+    PaymentProcessorPort,
 )
 from src.payment_gateway_simulator.adapters.payment import InMemoryPaymentAdapter
 
 
+class _DefaultBatchAdapter(InMemoryPaymentAdapter):
+    """Адаптер без своего пакетного пути: пакет обрабатывает реализация порта по умолчанию"""
+    process_payments = PaymentProcessorPort.process_payments
+
+
 class TestInMemoryPaymentAdapter:
     """Тесты для in-memory адаптера обработки платежей"""
 
@@ -121,4 +135,154 @@ class TestInMemoryPaymentAdapter:
 
         # Во втором адаптере платёж не существует
         with pytest.raises(PaymentProcessingError, match="not found"):
-            adapter2.refund_payment(PaymentId("pay_isolated"))
\ No newline at end of file
+            adapter2.refund_payment(PaymentId("pay_isolated"))
+
+    def test_get_payment(self):
+        """Чтение платежа по ID: текущее состояние или None"""
+        adapter = InMemoryPaymentAdapter()
+        created = adapter.process_payment(
+            payment_id=PaymentId("pay_get"),
+            amount=Amount(Decimal("12.00"), "USD")
+        )
+
+        assert adapter.get_payment(PaymentId("pay_get")) == created
+        assert adapter.get_payment(PaymentId("pay_missing")) is None
+
+        adapter.refund_payment(PaymentId("pay_get"))
+        assert adapter.get_payment(PaymentId("pay_get")).status == PaymentStatus.REFUNDED
+
+    def test_process_payments_batch(self):
+        """Пакетная обработка: дубликаты внутри пакета и с хранилищем — ошибки"""
+        adapter = InMemoryPaymentAdapter()
+        adapter.process_payment(
+            payment_id=PaymentId("pay_existing"),
+            amount=Amount(Decimal("5.00"), "USD")
+        )
+
+        outcomes = adapter.process_payments([
+            PaymentCommand(PaymentId("pay_b1"), Amount(Decimal("1.00"), "USD")),
+            PaymentCommand(PaymentId("pay_existing"), Amount(Decimal("2.00"), "USD")),
+            PaymentCommand(PaymentId("pay_b1"), Amount(Decimal("3.00"), "USD")),
+        ])
+
+        assert outcomes[0].status == PaymentStatus.SUCCEEDED
+        assert isinstance(outcomes[1], PaymentProcessingError)
+        assert isinstance(outcomes[2], PaymentProcessingError)
+        assert "already exists" in str(outcomes[2])
+
+    def test_refund_keeps_original_amount_and_ledger(self):
+        """Хранимый платёж сохраняет сумму, возвраты копятся в журнале"""
+        adapter = InMemoryPaymentAdapter()
+        adapter.process_payment(PaymentId("pay_ledger"), Amount(Decimal("100.00"), "USD"))
+
+        adapter.refund_payment(PaymentId("pay_ledger"), Amount(Decimal("30.00"), "USD"), "First")
+        adapter.refund_payment(PaymentId("pay_ledger"), reason="Rest")
+
+        stored = adapter.get_payment(PaymentId("pay_ledger"))
+        assert stored.amount.value == Decimal("100.00")
+        assert stored.status == PaymentStatus.REFUNDED
+        assert [r.amount.value for r in adapter.get_refunds(PaymentId("pay_ledger"))] == [
+            Decimal("30.00"), Decimal("70.00")
+        ]
+        with pytest.raises(PaymentProcessingError, match="cannot be refunded"):
+            adapter.refund_payment(PaymentId("pay_ledger"))
+
+    def test_concurrent_refunds_never_exceed_amount(self):
+        """Шторм одновременных возвратов: проходит ровно столько, сколько помещается в сумму"""
+        adapter = InMemoryPaymentAdapter()
+        adapter.process_payment(PaymentId("pay_storm"), Amount(Decimal("50.00"), "USD"))
+        accepted, rejected = [], []
+        start = threading.Barrier(16)
+
+        def worker():
+            start.wait()
+            for _ in range(10):
+                try:
+                    accepted.append(adapter.refund_payment(PaymentId("pay_storm"), Amount(Decimal("1.00"), "USD")))
+                except PaymentProcessingError:
+                    rejected.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(accepted) == 50
+        assert len(rejected) == 110
+        assert len(adapter.get_refunds(PaymentId("pay_storm"))) == 50
+        assert adapter.get_payment(PaymentId("pay_storm")).refunded_amount.value == Decimal("50.00")
+
+    def test_list_payments_follows_writes(self):
+        """Выборка видит новые платежи (по одному и пакетом) и смену статуса после возврата"""
+        adapter = InMemoryPaymentAdapter()
+        adapter.process_payment(PaymentId("pay_list_1"), Amount(Decimal("1.00"), "USD"), customer_email="a@b.cc")
+        adapter.process_payments([
+            PaymentCommand(PaymentId("pay_list_2"), Amount(Decimal("2.00"), "EUR")),
+            PaymentCommand(PaymentId("pay_list_1"), Amount(Decimal("3.00"), "USD")),
+        ])
+        adapter.refund_payment(PaymentId("pay_list_1"))
+
+        def ids(**filters):
+            return [p.id.value for p in adapter.list_payments(PaymentQuery(**filters)).items]
+
+        assert ids() == ["pay_list_1", "pay_list_2"]
+        assert ids(currency="EUR") == ["pay_list_2"]
+        assert ids(customer_email="a@b.cc", status=PaymentStatus.REFUNDED) == ["pay_list_1"]
+        assert ids(status=PaymentStatus.SUCCEEDED) == ["pay_list_2"]
+
+    def test_authorize_capture_void(self):
+        """Авторизация ждёт списания или отмены; индекс статусов следует за переходами"""
+        adapter = InMemoryPaymentAdapter()
+        expires_at = datetime.now() + timedelta(days=7)
+        for number in (1, 2):
+            authorized = adapter.authorize_payment(
+                PaymentId(f"pay_auth_{number}"), Amount(Decimal("20.00"), "USD"), expires_at
+            )
+            assert authorized.status == PaymentStatus.PENDING
+            assert authorized.expires_at == expires_at
+
+        captured = adapter.capture_payment(PaymentId("pay_auth_1"))
+        voided = adapter.void_payment(PaymentId("pay_auth_2"), reason="Cancelled")
+
+        assert captured.status == PaymentStatus.SUCCEEDED
+        assert voided.status == PaymentStatus.VOIDED
+        assert adapter.get_payment(PaymentId("pay_auth_2")) == voided
+        assert [p.id.value for p in adapter.list_payments(PaymentQuery(status=PaymentStatus.VOIDED)).items] == [
+            "pay_auth_2"
+        ]
+        assert adapter.list_payments(PaymentQuery(status=PaymentStatus.PENDING)).items == []
+        with pytest.raises(PaymentProcessingError, match="cannot be captured"):
+            adapter.capture_payment(PaymentId("pay_auth_2"))
+        with pytest.raises(PaymentNotFoundError):
+            adapter.void_payment(PaymentId("pay_missing"))
+
+    def test_decline_reason_stored_as_failed(self):
+        """Платёж с decline_reason сохраняется отклонённым, без симулятора; дубликат по-прежнему ошибка"""
+        adapter = InMemoryPaymentAdapter()
+
+        declined = adapter.process_payment(
+            PaymentId("pay_declined"), Amount(Decimal("5.00"), "USD"), decline_reason="Risk rule"
+        )
+        outcomes = adapter.process_payments([
+            PaymentCommand(PaymentId("pay_batch_declined"), Amount(Decimal("1.00"), "USD"), decline_reason="Velocity"),
+            PaymentCommand(PaymentId("pay_declined"), Amount(Decimal("1.00"), "USD")),
+        ])
+
+        assert (declined.status, declined.error_message) == (PaymentStatus.FAILED, "Risk rule")
+        assert adapter.get_payment(PaymentId("pay_declined")) == declined
+        assert (outcomes[0].status, outcomes[0].error_message) == (PaymentStatus.FAILED, "Velocity")
+        assert isinstance(outcomes[1], PaymentProcessingError)
+
+    def test_default_batch_passes_decline_reason(self):
+        """Пакет порта по умолчанию передаёт decline_reason и settlement_amount в process_payment"""
+        adapter = _DefaultBatchAdapter()
+        settlement = Amount(Decimal("1.09"), "USD")
+
+        declined, settled = adapter.process_payments([
+            PaymentCommand(PaymentId("pay_default_declined"), Amount(Decimal("1.00"), "USD"), decline_reason="Risk"),
+            PaymentCommand(PaymentId("pay_default_settled"), Amount(Decimal("1.00"), "EUR"), settlement_amount=settlement),
+        ])
+
+        assert (declined.status, declined.error_message) == (PaymentStatus.FAILED, "Risk")
+        assert settled.settlement_amount == settlement
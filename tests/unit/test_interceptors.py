@@ -0,0 +1,229 @@
+"""
+Юнит-тесты для перехватчиков сценариев
+
+Проверяем:
+- Порядок вызова before / after / on_error
+- Встроенные перехватчики: замеры, медленные вызовы, профилирование
+- Перехват пакетных вызовов execute_batch
+- Завершение профиля при отмене асинхронного вызова
+- Настройку цепочки по имени сценария
+"""
+import asyncio
+import logging
+import tracemalloc
+import pytest
+from unittest.mock import Mock
+from decimal import Decimal
+
+from src.payment_gateway_simulator.use_cases import (
+    ProcessPaymentUseCase,
+    AsyncProcessPaymentUseCase,
+    ProcessPaymentInput,
+)
+from src.payment_gateway_simulator.use_cases.core import (
+    UseCaseInterceptor,
+    TimingInterceptor,
+    SlowCallInterceptor,
+    SamplingProfilerInterceptor,
+    build_interceptors,
+    configure_interceptors,
+)
+from src.payment_gateway_simulator.adapters import (
+    InMemoryPaymentAdapter,
+    AsyncInMemoryPaymentAdapter,
+    ConsoleLoggerAdapter,
+    BufferedLoggerAdapter,
+)
+
+
+def _input(payment_id: str, amount: str = "10.00") -> ProcessPaymentInput:
+    return ProcessPaymentInput(payment_id=payment_id, amount=Decimal(amount), currency="USD")
+
+
+class _Recorder(UseCaseInterceptor):
+    def __init__(self, name, events):
+        self.name = name
+        self.events = events
+
+    def before(self, ctx):
+        self.events.append((self.name, "before", ctx.use_case))
+
+    def after(self, ctx, result):
+        self.events.append((self.name, "after", result.id.value))
+
+    def on_error(self, ctx, error):
+        self.events.append((self.name, "error", type(error).__name__))
+
+
+@pytest.fixture
+def use_case():
+    return ProcessPaymentUseCase(InMemoryPaymentAdapter(), ConsoleLoggerAdapter())
+
+
+class TestInterceptorChain:
+    """Тесты для цепочки перехватчиков"""
+
+    def test_hooks_run_in_middleware_order(self, use_case):
+        """before — в прямом порядке, after — в обратном"""
+        events = []
+        use_case.interceptors = [_Recorder("outer", events), _Recorder("inner", events)]
+
+        use_case.execute(_input("pay_chain"))
+
+        assert events == [
+            ("outer", "before", "ProcessPaymentUseCase"),
+            ("inner", "before", "ProcessPaymentUseCase"),
+            ("inner", "after", "pay_chain"),
+            ("outer", "after", "pay_chain"),
+        ]
+
+    def test_on_error_sees_exception(self, use_case):
+        """Исключение проходит через on_error и пробрасывается дальше"""
+        events = []
+        use_case.interceptors = [_Recorder("only", events)]
+
+        with pytest.raises(ValueError):
+            use_case.execute(_input("pay_bad", "-1"))
+
+        assert events[-1] == ("only", "error", "ValueError")
+
+    @pytest.mark.asyncio
+    async def test_async_use_case_is_intercepted(self):
+        """Асинхронные сценарии оборачиваются так же"""
+        events = []
+        logger = BufferedLoggerAdapter()
+        use_case = AsyncProcessPaymentUseCase(AsyncInMemoryPaymentAdapter(), logger)
+        use_case.interceptors = [_Recorder("only", events)]
+
+        await use_case.execute(_input("pay_async_chain"))
+        await logger.aclose()
+
+        assert events == [
+            ("only", "before", "AsyncProcessPaymentUseCase"),
+            ("only", "after", "pay_async_chain"),
+        ]
+
+    def test_configure_by_use_case_name(self, use_case):
+        """Цепочка из конфигурации применяется ко всем экземплярам класса"""
+        events = []
+        configure_interceptors({"ProcessPaymentUseCase": [_Recorder("configured", events)]})
+        try:
+            use_case.execute(_input("pay_configured"))
+        finally:
+            configure_interceptors({"ProcessPaymentUseCase": []})
+
+        assert ("configured", "after", "pay_configured") in events
+        with pytest.raises(ValueError, match="Unknown use case"):
+            configure_interceptors({"NoSuchUseCase": []})
+
+
+class TestBuiltinInterceptors:
+    """Тесты для встроенных перехватчиков"""
+
+    def test_timing_reports_wall_and_cpu(self, use_case):
+        """Замер передаётся в sink для успешных и неуспешных вызовов"""
+        samples = []
+        use_case.interceptors = [TimingInterceptor(lambda name, wall, cpu: samples.append((name, wall, cpu)))]
+
+        use_case.execute(_input("pay_timed"))
+        with pytest.raises(ValueError):
+            use_case.execute(_input("pay_timed_bad", "0"))
+
+        assert len(samples) == 2
+        assert all(name == "ProcessPaymentUseCase" and wall >= 0 and cpu >= 0 for name, wall, cpu in samples)
+
+    @pytest.mark.asyncio
+    async def test_batch_calls_are_timed(self, caplog):
+        """execute_batch проходит через ту же цепочку под своим именем; в контексте — размер пакета"""
+        samples = []
+        logger = BufferedLoggerAdapter()
+        use_case = AsyncProcessPaymentUseCase(AsyncInMemoryPaymentAdapter(), logger)
+        use_case.interceptors = [
+            TimingInterceptor(lambda name, wall, cpu: samples.append(name)),
+            SlowCallInterceptor(threshold=0.0),
+        ]
+
+        with caplog.at_level(logging.WARNING, logger="payment_gateway_simulator.use_cases"):
+            results = await use_case.execute_batch([_input(f"pay_batch_{i}") for i in range(3)])
+        sync_samples = []
+        sync_use_case = ProcessPaymentUseCase(InMemoryPaymentAdapter(), ConsoleLoggerAdapter())
+        sync_use_case.interceptors = [TimingInterceptor(lambda name, wall, cpu: sync_samples.append(name))]
+        sync_use_case.execute_batch([_input("pay_sync_batch")])
+        await logger.aclose()
+
+        assert all(result.succeeded for result in results)
+        assert samples == ["AsyncProcessPaymentUseCase.execute_batch"]
+        assert sync_samples == ["ProcessPaymentUseCase.execute_batch"]
+        assert "input='<batch of 3>'" in caplog.records[0].getMessage()
+
+    def test_slow_calls_are_logged(self, use_case, caplog):
+        """Вызовы дольше порога попадают в лог WARNING"""
+        use_case.interceptors = [SlowCallInterceptor(threshold=0.0)]
+
+        with caplog.at_level(logging.WARNING, logger="payment_gateway_simulator.use_cases"):
+            use_case.execute(_input("pay_slow"))
+
+        assert "Slow call ProcessPaymentUseCase" in caplog.text
+
+    def test_profiler_samples_every_nth_call(self, use_case, tmp_path):
+        """Профиль сохраняется только для каждого N-го вызова"""
+        use_case.interceptors = [SamplingProfilerInterceptor(every=3, output_dir=str(tmp_path))]
+
+        for i in range(7):
+            use_case.execute(_input(f"pay_profiled_{i}"))
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "ProcessPaymentUseCase-3.prof",
+            "ProcessPaymentUseCase-6.prof",
+        ]
+
+    def test_tracemalloc_profile_is_logged(self, use_case, caplog):
+        """В режиме tracemalloc в лог пишутся строки с аллокациями"""
+        use_case.interceptors = [SamplingProfilerInterceptor(every=1, mode="tracemalloc")]
+
+        with caplog.at_level(logging.INFO, logger="payment_gateway_simulator.use_cases"):
+            use_case.execute(_input("pay_traced"))
+
+        assert "Allocations ProcessPaymentUseCase-1" in caplog.text
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["cprofile", "tracemalloc"])
+    async def test_cancelled_call_releases_profiler(self, mode, tmp_path):
+        """Отменённый вызов завершает профиль: следующий выбранный вызов снова профилируется"""
+        started = asyncio.Event()
+
+        async def hang(**kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        processor = Mock()
+        processor.process_payment = hang
+        use_case = AsyncProcessPaymentUseCase(processor, Mock())
+        use_case.interceptors = [SamplingProfilerInterceptor(every=1, mode=mode, output_dir=str(tmp_path))]
+
+        task = asyncio.create_task(use_case.execute(_input("pay_cancelled")))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not tracemalloc.is_tracing()
+        started.clear()
+        task = asyncio.create_task(use_case.execute(_input("pay_after_cancel")))
+        await started.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        suffix = ".prof" if mode == "cprofile" else ".alloc.txt"
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            f"AsyncProcessPaymentUseCase-1{suffix}",
+            f"AsyncProcessPaymentUseCase-2{suffix}",
+        ]
+
+    def test_build_interceptors_by_name(self):
+        """Цепочка собирается из имён, неизвестное имя — ошибка"""
+        chain = build_interceptors(["timing", "slow_calls", "profile"], profile_every=10)
+
+        assert [type(i) for i in chain] == [TimingInterceptor, SlowCallInterceptor, SamplingProfilerInterceptor]
+        with pytest.raises(ValueError, match="Unknown interceptor"):
+            build_interceptors(["flamegraph"])
@@ -0,0 +1,146 @@
+"""
+Юнит-тесты для метрик
+
+Проверяем:
+- Счётчики и гистограммы с агрегацией по потокам
+- Текстовый формат Prometheus
+- Декораторы портов (статусы, валюты, классы исключений)
+"""
+import threading
+import pytest
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import (
+    PaymentId,
+    Amount,
+    PaymentCommand,
+    PaymentProcessingError,
+)
+from src.payment_gateway_simulator.adapters import (
+    InMemoryPaymentAdapter,
+    AsyncInMemoryPaymentAdapter,
+    MetricsRegistry,
+    PaymentMetrics,
+    InstrumentedPaymentProcessor,
+    AsyncInstrumentedPaymentProcessor,
+    AsyncInstrumentedTransactionLogger,
+    BufferedLoggerAdapter,
+)
+
+USD_10 = Amount(Decimal("10.00"), "USD")
+
+
+class TestRegistry:
+    """Тесты для счётчиков и гистограмм"""
+
+    def test_counter_sums_across_threads(self):
+        """Значения из ячеек разных потоков суммируются при сборе"""
+        counter = MetricsRegistry().counter("hits_total", "Hits", ("route",))
+
+        def worker():
+            for _ in range(1000):
+                counter.inc(("pay",))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(("get",), 5)
+
+        assert counter.collect() == {("pay",): 8000, ("get",): 5}
+
+    def test_histogram_render_is_cumulative(self):
+        """Корзины в выводе кумулятивные, значение на границе попадает в le=границе"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", ("op",), buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(("pay",), value)
+
+        text = registry.render()
+
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{op="pay",le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{op="pay",le="1.0"} 3' in text
+        assert 'latency_seconds_bucket{op="pay",le="+Inf"} 4' in text
+        assert 'latency_seconds_count{op="pay"} 4' in text
+        assert 'latency_seconds_sum{op="pay"} 3.65' in text
+
+    def test_label_values_are_escaped(self):
+        """Кавычки и переводы строк в значениях меток экранируются"""
+        registry = MetricsRegistry()
+        registry.counter("errors_total", "Errors", ("message",)).inc(('bad "value"\n',))
+
+        assert 'errors_total{message="bad \\"value\\"\\n"} 1' in registry.render()
+
+    def test_duplicate_metric_name_rejected(self):
+        """Имя метрики регистрируется один раз"""
+        registry = MetricsRegistry()
+        registry.counter("dup_total", "Dup")
+
+        with pytest.raises(ValueError, match="already registered"):
+            registry.counter("dup_total", "Dup")
+
+
+class TestInstrumentedPorts:
+    """Тесты для декораторов портов"""
+
+    @pytest.fixture
+    def metrics(self):
+        return PaymentMetrics(MetricsRegistry())
+
+    def test_processor_counts_by_status_and_currency(self, metrics):
+        """Успешные вызовы считаются по статусу и валюте, ошибки — по классу"""
+        processor = InstrumentedPaymentProcessor(InMemoryPaymentAdapter(), metrics)
+
+        processor.process_payment(PaymentId("pay_1"), USD_10)
+        with pytest.raises(PaymentProcessingError):
+            processor.process_payment(PaymentId("pay_1"), USD_10)
+        processor.refund_payment(PaymentId("pay_1"))
+        processor.get_payment(PaymentId("pay_missing"))
+
+        operations = metrics.operations.collect()
+        assert operations[("process_payment", "succeeded", "USD")] == 1
+        assert operations[("refund_payment", "refunded", "USD")] == 1
+        assert operations[("get_payment", "NOT_FOUND", "")] == 1
+        assert metrics.errors.collect() == {("process_payment", "PaymentAlreadyExistsError"): 1}
+        assert metrics.duration.collect()[("process_payment",)][-2] == 0  # ничего в +Inf
+
+    def test_batch_outcomes_are_counted_per_item(self, metrics):
+        """Пакет учитывается поэлементно: платежи и отказы"""
+        processor = InstrumentedPaymentProcessor(InMemoryPaymentAdapter(), metrics)
+        commands = [PaymentCommand(PaymentId(f"pay_{i % 2}"), USD_10) for i in range(3)]
+
+        processor.process_payments(commands)
+
+        assert metrics.operations.collect() == {("process_payments", "succeeded", "USD"): 2}
+        assert metrics.errors.collect() == {("process_payments", "PaymentAlreadyExistsError"): 1}
+
+    @pytest.mark.asyncio
+    async def test_async_decorators(self, metrics):
+        """Асинхронные декораторы считают те же метрики"""
+        processor = AsyncInstrumentedPaymentProcessor(AsyncInMemoryPaymentAdapter(), metrics)
+        logger = BufferedLoggerAdapter()
+        instrumented_logger = AsyncInstrumentedTransactionLogger(logger, metrics)
+
+        payment = await processor.process_payment(PaymentId("pay_async"), USD_10)
+        await instrumented_logger.log_transaction(payment)
+        await logger.aclose()
+
+        operations = metrics.operations.collect()
+        assert operations[("process_payment", "succeeded", "USD")] == 1
+        assert operations[("log_transaction", "succeeded", "USD")] == 1
+
+    def test_validation_errors(self, metrics):
+        """Ошибки валидации считаются по полю и типу"""
+        metrics.record_validation_errors([
+            {"loc": ("body", "amount"), "type": "greater_than"},
+            {"loc": ("body", "currency"), "type": "string_pattern_mismatch"},
+            {"loc": ("body", "amount"), "type": "greater_than"},
+        ])
+
+        assert metrics.validation_errors.collect() == {
+            ("amount", "greater_than"): 2,
+            ("currency", "string_pattern_mismatch"): 1,
+        }
@@ -0,0 +1,141 @@
+"""
+Юнит-тесты для PaymentIndex
+
+Проверяем:
+- Порядок выдачи и курсорную пагинацию
+- Фильтры по статусу, валюте, email и диапазону created_at
+- Перенос платежа между индексами статусов при возврате
+- Вставку платежей не по порядку времени
+- Блочный набор ключей против отсортированного списка
+- Слияние шардов при пагинации больших выборок
+"""
+import random
+from dataclasses import replace
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentQuery,
+)
+from src.payment_gateway_simulator.adapters.payment.payment_index import PaymentIndex, _SortedKeys
+
+_START = datetime(2026, 2, 4, 12, 0, 0)
+
+
+def _payment(number: int, currency: str = "USD", email: str = None, minutes: int = None) -> Payment:
+    return Payment(
+        id=PaymentId(f"pay_{number:03d}"),
+        amount=Amount(Decimal("10.00"), currency),
+        status=PaymentStatus.SUCCEEDED,
+        created_at=_START + timedelta(minutes=number if minutes is None else minutes),
+        customer_email=email
+    )
+
+
+def _indexed(payments):
+    store = {payment.id.value: payment for payment in payments}
+    index = PaymentIndex()
+    index.add_many(payments)
+    return index, store
+
+
+def _ids(page):
+    return [payment.id.value for payment in page.items]
+
+
+class TestPaymentIndex:
+    """Тесты для вторичных индексов платежей"""
+
+    def test_cursor_pagination_visits_every_payment_once(self):
+        """Страницы по курсору проходят выборку целиком без повторов"""
+        index, store = _indexed([_payment(i) for i in range(10)])
+
+        seen, query = [], PaymentQuery(limit=3)
+        while True:
+            page = index.query(query, store.get)
+            seen.extend(_ids(page))
+            if page.next_cursor is None:
+                break
+            query = replace(query, after=page.next_cursor)
+
+        assert seen == [f"pay_{i:03d}" for i in range(10)]
+
+    def test_filters_combined(self):
+        """Фильтры объединяются через И, диапазон created_at — полуоткрытый"""
+        payments = [_payment(i, "EUR" if i % 2 else "USD", "a@example.com" if i < 5 else None) for i in range(10)]
+        index, store = _indexed(payments)
+
+        page = index.query(PaymentQuery(
+            currency="EUR",
+            customer_email="a@example.com",
+            created_from=_START + timedelta(minutes=1),
+            created_to=_START + timedelta(minutes=3)
+        ), store.get)
+
+        assert _ids(page) == ["pay_001"]
+        assert page.next_cursor is None
+
+    def test_status_change_moves_payment(self):
+        """После возврата платёж находится по новому статусу и не находится по старому"""
+        index, store = _indexed([_payment(1), _payment(2)])
+        refunded, _ = store["pay_001"].refund()
+        store["pay_001"] = refunded
+        index.update_status(_payment(1), refunded)
+
+        assert _ids(index.query(PaymentQuery(status=PaymentStatus.REFUNDED), store.get)) == ["pay_001"]
+        assert _ids(index.query(PaymentQuery(status=PaymentStatus.SUCCEEDED), store.get)) == ["pay_002"]
+
+    def test_out_of_order_insert(self):
+        """Платёж с более ранним временем встаёт на своё место в порядке выдачи"""
+        index, store = _indexed([_payment(2), _payment(3)])
+        late = _payment(1)
+        store[late.id.value] = late
+        index.add(late)
+
+        assert _ids(index.query(PaymentQuery(), store.get)) == ["pay_001", "pay_002", "pay_003"]
+        assert len(index) == 3
+
+    def test_sorted_keys_match_sorted_list(self):
+        """Вставки и удаления в случайном порядке с делением блоков дают тот же порядок, что и список"""
+        rng = random.Random(7)
+        keys = [(_START + timedelta(seconds=rng.randrange(5000)), f"pay_{i:05d}") for i in range(3000)]
+        sorted_keys, expected = _SortedKeys(), []
+        for key in keys:
+            sorted_keys.add(key)
+            expected.append(key)
+        for key in rng.sample(keys, 1500):
+            sorted_keys.discard(key)
+            expected.remove(key)
+        sorted_keys.discard((_START, "missing"))
+        expected.sort()
+
+        low, high = expected[100], (expected[1200][0],)
+        assert len(sorted_keys) == 1500
+        assert sorted_keys.slice(None, True, None, 5000) == expected
+        assert sorted_keys.slice(low, False, high, 5000) == [k for k in expected if low < k < high]
+        assert sorted_keys.slice(low, True, None, 10) == expected[100:110]
+
+    def test_pagination_across_shards(self):
+        """Большая выборка со сменой статусов проходится страницами по всем шардам без пропусков"""
+        payments = [_payment(i, minutes=i // 3) for i in range(2000)]
+        index, store = _indexed(payments)
+        for payment in payments[::2]:
+            refunded, _ = payment.refund()
+            store[payment.id.value] = refunded
+            index.update_status(payment, refunded)
+
+        seen, query = [], PaymentQuery(status=PaymentStatus.REFUNDED, limit=100)
+        while True:
+            page = index.query(query, store.get)
+            seen.extend(_ids(page))
+            if page.next_cursor is None:
+                break
+            query = replace(query, after=page.next_cursor)
+
+        expected = sorted(payments[::2], key=lambda p: (p.created_at, p.id.value))
+        assert seen == [payment.id.value for payment in expected]
+        assert len(index) == 2000
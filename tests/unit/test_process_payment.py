@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, AsyncMock
 from decimal import Decimal
 from datetime import datetime
 
@@ -8,11 +8,17 @@ from src.payment_gateway_simulator.domain import (
     PaymentId,
     Amount,
     PaymentStatus,
+    PaymentProcessingError,
+    PaymentAlreadyExistsError,
 )
 from src.payment_gateway_simulator.use_cases import (
     ProcessPaymentUseCase,
+    AsyncProcessPaymentUseCase,
     ProcessPaymentInput,
 )
+from src.payment_gateway_simulator.adapters.fx import FxRateMatrix, LocalFxRateProvider
+from src.payment_gateway_simulator.adapters.payment import InMemoryPaymentAdapter
+from src.payment_gateway_simulator.adapters.risk import RiskEngine, RiskRule
 
 
 class TestProcessPaymentUseCase:
@@ -107,6 +113,159 @@ class TestProcessPaymentUseCase:
                 currency="US"  # Только 2 символа
             ))
 
+    def test_execute_batch_calls_ports_once(self):
+        """Пакет уходит в процессор и логгер одним вызовом, результаты по порядку"""
+        mock_processor = Mock()
+        mock_logger = Mock()
+
+        ok_payment = Payment(
+            id=PaymentId("pay_ok"),
+            amount=Amount(Decimal("10.00"), "USD"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime.now()
+        )
+        mock_processor.process_payments.return_value = [
+            ok_payment,
+            PaymentProcessingError("Payment with id=pay_dup already exists", payment_id="pay_dup"),
+        ]
+
+        use_case = ProcessPaymentUseCase(mock_processor, mock_logger)
+        results = use_case.execute_batch([
+            ProcessPaymentInput(payment_id="pay_ok", amount=Decimal("10.00"), currency="USD"),
+            ProcessPaymentInput(payment_id="pay_bad", amount=Decimal("-1.00"), currency="USD"),
+            ProcessPaymentInput(payment_id="pay_dup", amount=Decimal("20.00"), currency="USD"),
+        ])
+
+        assert [r.payment_id for r in results] == ["pay_ok", "pay_bad", "pay_dup"]
+        assert results[0].succeeded and results[0].payment == ok_payment
+        assert not results[1].succeeded and "positive" in results[1].error
+        assert not results[2].succeeded and "already exists" in results[2].error
+
+        # Невалидный элемент не доходит до процессора
+        mock_processor.process_payments.assert_called_once()
+        commands = mock_processor.process_payments.call_args.args[0]
+        assert [c.payment_id.value for c in commands] == ["pay_ok", "pay_dup"]
+
+        mock_logger.log_transactions.assert_called_once_with([ok_payment])
+
+    def test_risk_decline_passed_to_processor(self):
+        """Сработавшее правило риска уходит в процессор как decline_reason, по одному и в пакете"""
+        mock_processor = Mock()
+        mock_risk = Mock()
+        mock_risk.assess.side_effect = lambda command: "Risky" if command.payment_id.value == "pay_risky" else None
+        mock_processor.process_payments.return_value = []
+        use_case = ProcessPaymentUseCase(mock_processor, Mock(), risk_assessor=mock_risk)
+
+        use_case.execute(ProcessPaymentInput(payment_id="pay_risky", amount=Decimal("5.00"), currency="USD"))
+        use_case.execute_batch([
+            ProcessPaymentInput(payment_id="pay_risky", amount=Decimal("5.00"), currency="USD"),
+            ProcessPaymentInput(payment_id="pay_fine", amount=Decimal("5.00"), currency="USD"),
+            ProcessPaymentInput(payment_id="pay_bad", amount=Decimal("0"), currency="USD"),
+        ])
+
+        assert mock_processor.process_payment.call_args.kwargs["decline_reason"] == "Risky"
+        commands = mock_processor.process_payments.call_args.args[0]
+        assert [c.decline_reason for c in commands] == ["Risky", None]
+        assert mock_risk.assess.call_count == 3  # Невалидный элемент до оценки риска не доходит
+
+    def test_declined_batch_item_is_not_success(self):
+        """Отклонённый платёж (FAILED) сохранён в результате, но успешным не считается"""
+        mock_processor = Mock()
+        declined = Payment(
+            id=PaymentId("pay_declined"),
+            amount=Amount(Decimal("10.00"), "USD"),
+            status=PaymentStatus.FAILED,
+            created_at=datetime.now(),
+            error_message="Card declined"
+        )
+        mock_processor.process_payments.return_value = [declined]
+        use_case = ProcessPaymentUseCase(mock_processor, Mock())
+
+        results = use_case.execute_batch([
+            ProcessPaymentInput(payment_id="pay_declined", amount=Decimal("10.00"), currency="USD"),
+        ])
+
+        assert results[0].payment == declined
+        assert not results[0].succeeded
+
+    def test_duplicates_do_not_count_towards_velocity(self):
+        """Повтор уже существующего платежа не увеличивает счётчик скорости — по одному и в пакете"""
+        engine = RiskEngine([RiskRule.from_dict({"name": "velocity", "velocity": {"max": 3, "window": 3600}})])
+        use_case = ProcessPaymentUseCase(InMemoryPaymentAdapter(), Mock(), risk_assessor=engine)
+
+        def pay(payment_id: str) -> ProcessPaymentInput:
+            return ProcessPaymentInput(
+                payment_id=payment_id, amount=Decimal("5.00"), currency="USD", customer_email="a@example.com"
+            )
+
+        use_case.execute(pay("pay_1"))
+        for _ in range(3):
+            with pytest.raises(PaymentAlreadyExistsError):
+                use_case.execute(pay("pay_1"))
+        results = use_case.execute_batch([pay("pay_2"), pay("pay_1"), pay("pay_2")])
+
+        assert [r.succeeded for r in results] == [True, False, False]
+        assert "already exists" in results[1].error and "already exists" in results[2].error
+        assert use_case.execute(pay("pay_3")).is_successful()
+        assert use_case.execute(pay("pay_4")).is_failed()  # Четвёртый новый платёж — сверх лимита
+
+    def test_settlement_amount_passed_to_processor(self):
+        """Сумма в валюте расчётов уходит в процессор; валюта без курса — без пересчёта"""
+        mock_processor = Mock()
+        mock_processor.process_payments.return_value = []
+        fx_rates = LocalFxRateProvider(FxRateMatrix("USD", {"EUR": Decimal("0.92"), "JPY": Decimal("151.30")}))
+        use_case = ProcessPaymentUseCase(mock_processor, Mock(), fx_rates=fx_rates, settlement_currency="usd")
+
+        use_case.execute(ProcessPaymentInput(payment_id="pay_eur", amount=Decimal("92.00"), currency="EUR"))
+        use_case.execute_batch([
+            ProcessPaymentInput(payment_id="pay_jpy", amount=Decimal("1513"), currency="JPY"),
+            ProcessPaymentInput(payment_id="pay_gbp", amount=Decimal("5.00"), currency="GBP"),
+        ])
+
+        assert mock_processor.process_payment.call_args.kwargs["settlement_amount"] == Amount(Decimal("100.00"), "USD")
+        commands = mock_processor.process_payments.call_args.args[0]
+        assert [c.settlement_amount for c in commands] == [Amount(Decimal("10.00"), "USD"), None]
+
+    @pytest.mark.asyncio
+    async def test_async_use_case_awaits_ports(self):
+        """Асинхронный сценарий ожидает порты напрямую"""
+        mock_processor = AsyncMock()
+        mock_logger = AsyncMock()
+
+        expected_payment = Payment(
+            id=PaymentId("pay_async"),
+            amount=Amount(Decimal("12.00"), "EUR"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime.now()
+        )
+        mock_processor.process_payment.return_value = expected_payment
+
+        use_case = AsyncProcessPaymentUseCase(mock_processor, mock_logger)
+        result = await use_case.execute(ProcessPaymentInput(
+            payment_id="pay_async",
+            amount=Decimal("12.00"),
+            currency="EUR"
+        ))
+
+        assert result == expected_payment
+        mock_processor.process_payment.assert_awaited_once()
+        mock_logger.log_transaction.assert_awaited_once_with(expected_payment)
+
+    @pytest.mark.asyncio
+    async def test_async_use_case_validates_before_ports(self):
+        """Асинхронный сценарий применяет те же правила валидации"""
+        mock_processor = AsyncMock()
+        use_case = AsyncProcessPaymentUseCase(mock_processor, AsyncMock())
+
+        with pytest.raises(ValueError, match="3-letter"):
+            await use_case.execute(ProcessPaymentInput(
+                payment_id="pay_async_invalid",
+                amount=Decimal("1.00"),
+                currency="EU"
+            ))
+
+        mock_processor.process_payment.assert_not_called()
+
     def test_use_case_does_not_depend_on_concrete_adapters(self):
         """
         Use Case зависит ТОЛЬКО от абстракций (портов), а не от конкретных адаптеров.
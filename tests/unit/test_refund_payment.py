@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+from decimal import Decimal
+from dataclasses import replace
+from datetime import datetime
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentNotFoundError,
+    PaymentProcessingError,
+)
+from src.payment_gateway_simulator.adapters.fx import FxRateMatrix, LocalFxRateProvider
+from src.payment_gateway_simulator.use_cases import (
+    RefundPaymentUseCase,
+    AsyncRefundPaymentUseCase,
+    RefundPaymentInput,
+)
+
+
+def _refund_record(value: str = "25.00") -> Payment:
+    return Payment(
+        id=PaymentId("pay_refund"),
+        amount=Amount(Decimal(value), "USD"),
+        status=PaymentStatus.REFUNDED,
+        created_at=datetime.now(),
+        description="Refund: Test"
+    )
+
+
+class TestRefundPaymentUseCase:
+    """Тесты для сценария возврата"""
+
+    def test_partial_refund_is_processed_and_logged(self):
+        """Частичный возврат передаётся в процессор, запись уходит в лог"""
+        mock_processor = Mock()
+        mock_logger = Mock()
+        record = _refund_record()
+        mock_processor.refund_payment.return_value = record
+        use_case = RefundPaymentUseCase(mock_processor, mock_logger)
+
+        result = use_case.execute(RefundPaymentInput(
+            payment_id="pay_refund", amount=Decimal("25.00"), currency="usd", reason="Test"
+        ))
+
+        assert result == record
+        mock_processor.refund_payment.assert_called_once_with(
+            payment_id=PaymentId("pay_refund"),
+            amount=Amount(Decimal("25.00"), "USD"),
+            reason="Test"
+        )
+        mock_logger.log_transaction.assert_called_once_with(record)
+
+    def test_full_refund_without_amount(self):
+        """Без суммы процессор получает amount=None (возврат остатка)"""
+        mock_processor = Mock()
+        mock_processor.refund_payment.return_value = _refund_record()
+        use_case = RefundPaymentUseCase(mock_processor, Mock())
+
+        use_case.execute(RefundPaymentInput(payment_id="pay_refund"))
+
+        assert mock_processor.refund_payment.call_args.kwargs["amount"] is None
+
+    @pytest.mark.parametrize("input, message", [
+        (RefundPaymentInput(payment_id=" "), "payment_id"),
+        (RefundPaymentInput(payment_id="pay", amount=Decimal("0"), currency="USD"), "positive"),
+        (RefundPaymentInput(payment_id="pay", amount=Decimal("1.00")), "currency"),
+    ])
+    def test_invalid_input_rejected_before_ports(self, input, message):
+        """Невалидный запрос не доходит до процессора"""
+        mock_processor = Mock()
+        use_case = RefundPaymentUseCase(mock_processor, Mock())
+
+        with pytest.raises(ValueError, match=message):
+            use_case.execute(input)
+
+        mock_processor.refund_payment.assert_not_called()
+
+    def test_processor_errors_are_not_logged(self):
+        """Отклонённый возврат не логируется"""
+        mock_processor = Mock()
+        mock_logger = Mock()
+        mock_processor.refund_payment.side_effect = PaymentNotFoundError("not found", "pay_refund")
+        use_case = RefundPaymentUseCase(mock_processor, mock_logger)
+
+        with pytest.raises(PaymentNotFoundError):
+            use_case.execute(RefundPaymentInput(payment_id="pay_refund"))
+
+        mock_logger.log_transaction.assert_not_called()
+
+    def test_refund_in_other_currency_converted(self):
+        """Сумма в другой валюте пересчитывается в валюту платежа; без курса — отказ до возврата"""
+        mock_processor = Mock()
+        mock_processor.get_payment.return_value = replace(_refund_record("100.00"), status=PaymentStatus.SUCCEEDED)
+        mock_processor.refund_payment.return_value = _refund_record()
+        fx_rates = LocalFxRateProvider(FxRateMatrix("USD", {"EUR": Decimal("0.92")}))
+        use_case = RefundPaymentUseCase(mock_processor, Mock(), fx_rates=fx_rates)
+
+        use_case.execute(RefundPaymentInput(payment_id="pay_refund", amount=Decimal("23.00"), currency="EUR"))
+        with pytest.raises(PaymentProcessingError, match="No FX rate"):
+            use_case.execute(RefundPaymentInput(payment_id="pay_refund", amount=Decimal("5.00"), currency="GBP"))
+
+        mock_processor.refund_payment.assert_called_once_with(
+            payment_id=PaymentId("pay_refund"),
+            amount=Amount(Decimal("25.00"), "USD"),
+            reason=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_async_refund(self):
+        """Асинхронный сценарий ожидает порты"""
+        mock_processor = AsyncMock()
+        mock_logger = AsyncMock()
+        record = _refund_record()
+        mock_processor.refund_payment.return_value = record
+        use_case = AsyncRefundPaymentUseCase(mock_processor, mock_logger)
+
+        result = await use_case.execute(RefundPaymentInput(payment_id="pay_refund", reason="Test"))
+
+        assert result == record
+        mock_logger.log_transaction.assert_awaited_once_with(record)
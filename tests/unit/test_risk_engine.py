@@ -0,0 +1,127 @@
+"""
+Юнит-тесты для правил риска (RiskEngine, VelocityCounter)
+
+Проверяем:
+- Условия по сумме, валюте, домену email и полям meta
+- Порядок правил и текст отказа
+- Скорость по email в скользящем окне и отмену учёта дубликатов
+- Ограничение памяти счётчиков и вытеснение по ячейкам времени
+- Разбор правил из JSON и отказ на неизвестных полях
+"""
+import json
+import pytest
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import PaymentCommand, PaymentId, Amount
+from src.payment_gateway_simulator.adapters.risk import RiskEngine, RiskRule, VelocityCounter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _command(value: str = "10.00", currency: str = "USD", email: str = None, meta: dict = None) -> PaymentCommand:
+    return PaymentCommand(PaymentId("pay_risk"), Amount(Decimal(value), currency), customer_email=email, meta=meta)
+
+
+class TestRiskEngine:
+    """Тесты для скомпилированных правил риска"""
+
+    def test_static_conditions(self):
+        """Правило срабатывает, только если выполнены все его условия"""
+        engine = RiskEngine([
+            RiskRule.from_dict({"name": "large_usd", "currency": "usd", "min_amount": "1000", "max_amount": "5000"}),
+            RiskRule.from_dict({"name": "disposable", "email_domain": ["Mailinator.com"], "message": "Bad email"}),
+            RiskRule.from_dict({"name": "country", "meta": {"country": ["KP", "IR"], "channel": "web"}}),
+        ])
+
+        assert engine.assess(_command("1000.00")) == "Declined by risk rule large_usd"
+        assert engine.assess(_command("999.99")) is None
+        assert engine.assess(_command("5000.00")) is None
+        assert engine.assess(_command("1000.00", "EUR")) is None
+        assert engine.assess(_command(email="a@MAILINATOR.com")) == "Bad email"
+        assert engine.assess(_command(email="a@example.com")) is None
+        assert engine.assess(_command(meta={"country": "KP", "channel": "web"})) == "Declined by risk rule country"
+        assert engine.assess(_command(meta={"country": "KP"})) is None
+        assert engine.assess(_command(meta={"country": ["KP"], "channel": "web"})) is None
+
+    def test_first_matching_rule_wins(self):
+        """Правила проверяются по порядку"""
+        engine = RiskEngine([
+            RiskRule.from_dict({"name": "first", "min_amount": "100"}),
+            RiskRule.from_dict({"name": "second", "min_amount": "10"}),
+        ])
+
+        assert engine.assess(_command("150")) == "Declined by risk rule first"
+        assert engine.assess(_command("50")) == "Declined by risk rule second"
+
+    def test_velocity_per_email(self):
+        """Сверх max платежей с одним email за окно — отказ; после окна счёт начинается заново"""
+        clock = _Clock()
+        engine = RiskEngine([
+            RiskRule.from_dict({"name": "velocity", "velocity": {"max": 3, "window": 60}}),
+        ], clock=clock)
+
+        decisions = [engine.assess(_command(email="a@example.com")) for _ in range(4)]
+        assert decisions == [None, None, None, "Declined by risk rule velocity"]
+        assert engine.assess(_command(email="B@example.com")) is None
+        assert engine.assess(_command(email="A@EXAMPLE.COM")) is not None
+        assert engine.assess(_command()) is None
+
+        clock.now = 61.0
+        assert engine.assess(_command(email="a@example.com")) is None
+
+    def test_discard_undoes_velocity_hit(self):
+        """discard убирает учтённую попытку, счёт не уходит ниже нуля"""
+        engine = RiskEngine([
+            RiskRule.from_dict({"name": "velocity", "velocity": {"max": 1, "window": 60}}),
+        ], clock=_Clock())
+
+        assert engine.assess(_command(email="a@example.com")) is None
+        engine.discard(_command(email="A@example.com"))
+        engine.discard(_command(email="a@example.com"))
+        engine.discard(_command())
+        assert engine.assess(_command(email="a@example.com")) is None
+        assert engine.assess(_command(email="a@example.com")) is not None
+
+    def test_rules_from_file(self, tmp_path):
+        """Правила читаются из JSON; опечатка в поле и правило без условий отклоняются"""
+        path = tmp_path / "risk.json"
+        path.write_text(json.dumps({"rules": [{"name": "large", "min_amount": 100}]}), encoding="utf-8")
+
+        assert len(RiskEngine.from_file(path)) == 1
+        with pytest.raises(ValueError, match="min_amout"):
+            RiskRule.from_dict({"name": "typo", "min_amout": "100"})
+        with pytest.raises(ValueError, match="no conditions"):
+            RiskRule.from_dict({"name": "empty"})
+
+
+class TestVelocityCounter:
+    """Тесты для счётчика скорости"""
+
+    def test_sliding_window_by_buckets(self):
+        """Событие учитывается, пока его ячейка в окне, и выпадает вместе с ней"""
+        counter = VelocityCounter(window=10, buckets=5)
+
+        assert counter.hit("a", 0.5) == 1
+        assert counter.hit("a", 4.0) == 2
+        assert counter.hit("a", 9.9) == 3
+        assert counter.hit("a", 10.0) == 3  # Ячейка [0, 2) вышла из окна
+        assert counter.hit("a", 14.0) == 3  # Ячейка [4, 6) — тоже
+
+    def test_memory_bounded(self):
+        """Ключей в ячейке не больше max_keys, старые ячейки удаляются целиком"""
+        counter = VelocityCounter(window=10, buckets=2, max_keys=3)
+
+        for i in range(10):
+            counter.hit(f"key_{i}", 1.0)
+        assert len(counter) == 3
+        assert counter.hit("key_9", 1.0) == 0  # Не поместился — правило пропускает
+
+        counter.hit("key_0", 6.0)
+        counter.hit("key_1", 11.0)
+        assert len(counter) == 2
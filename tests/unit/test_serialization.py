@@ -0,0 +1,62 @@
+"""
+Юнит-тесты для общего JSON-кодировщика
+
+Проверяем:
+- Компактный и многострочный вывод
+- Одинаковое содержимое с orjson и без него
+- Совпадение тела ответа API со схемой PaymentResponse
+"""
+import importlib
+import json
+import sys
+from datetime import datetime
+from decimal import Decimal
+
+from src.payment_gateway_simulator.adapters import serialization
+from src.payment_gateway_simulator.domain import Payment, PaymentId, Amount, PaymentStatus
+
+SAMPLE = {"payment_id": "pay_1", "amount": 100.5, "description": "Оплата ☕", "error_message": None}
+
+
+class TestSerialization:
+    """Тесты для кодировщика"""
+
+    def test_dumps_is_compact_utf8(self):
+        """Компактный вывод в UTF-8 без экранирования не-ASCII"""
+        data = serialization.dumps(SAMPLE)
+
+        assert isinstance(data, bytes)
+        assert b", " not in data
+        assert "Оплата ☕".encode("utf-8") in data
+        assert serialization.loads(data) == SAMPLE
+
+    def test_pretty_output(self):
+        """pretty=True даёт многострочный JSON"""
+        assert b"\n" in serialization.dumps(SAMPLE, pretty=True)
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """Без orjson содержимое то же самое"""
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        fallback = importlib.reload(serialization)
+        try:
+            assert fallback.HAS_ORJSON is False
+            assert json.loads(fallback.dumps(SAMPLE)) == SAMPLE
+            assert b", " not in fallback.dumps(SAMPLE)
+        finally:
+            monkeypatch.undo()
+            importlib.reload(serialization)
+
+    def test_api_body_matches_response_model(self):
+        """Тело быстрого пути проходит валидацию PaymentResponse и совпадает с ней по полям"""
+        from src.payment_gateway_simulator.api.routes.payments import PaymentResponse, _to_response
+
+        payment = Payment(
+            id=PaymentId("pay_schema"),
+            amount=Amount(Decimal("10.50"), "USD"),
+            status=PaymentStatus.SUCCEEDED,
+            created_at=datetime(2024, 1, 2, 3, 4, 5, 6),
+        )
+        body = _to_response(payment)
+
+        assert list(body) == list(PaymentResponse.model_fields)
+        assert json.loads(serialization.dumps(body)) == json.loads(PaymentResponse(**body).model_dump_json())
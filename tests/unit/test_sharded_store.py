@@ -0,0 +1,96 @@
+"""
+Юнит-тесты для ShardedPaymentStore
+
+Проверяем:
+- Атомарную вставку при отсутствии ключа
+- Пакетную вставку с повторами
+- Атомарное обновление
+- Отсутствие гонок при параллельных вставках одного ключа
+"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from decimal import Decimal
+from datetime import datetime
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentProcessingError,
+)
+from src.payment_gateway_simulator.adapters.payment import (
+    ShardedPaymentStore,
+    InMemoryPaymentAdapter,
+)
+
+
+def _payment(payment_id: str) -> Payment:
+    return Payment(
+        id=PaymentId(payment_id),
+        amount=Amount(Decimal("10.00"), "USD"),
+        status=PaymentStatus.SUCCEEDED,
+        created_at=datetime.now()
+    )
+
+
+class TestShardedPaymentStore:
+    """Тесты для шардированного хранилища"""
+
+    def test_shard_count_rounded_to_power_of_two(self):
+        """Количество шардов округляется до степени двойки"""
+        assert ShardedPaymentStore(shards=10).shard_count == 16
+
+    def test_insert_if_absent(self):
+        """Повторная вставка ключа не перезаписывает платёж"""
+        store = ShardedPaymentStore()
+        first = _payment("pay_1")
+
+        assert store.insert_if_absent("pay_1", first) is True
+        assert store.insert_if_absent("pay_1", _payment("pay_1")) is False
+        assert store.get("pay_1") is first
+        assert len(store) == 1
+
+    def test_insert_many_if_absent(self):
+        """В пачке успешен только первый из повторов ключа"""
+        store = ShardedPaymentStore(shards=4)
+        store.insert_if_absent("pay_old", _payment("pay_old"))
+
+        items = [(f"pay_{i}", _payment(f"pay_{i}")) for i in range(20)]
+        items += [("pay_3", _payment("pay_3")), ("pay_old", _payment("pay_old"))]
+
+        assert store.insert_many_if_absent(items) == [True] * 20 + [False, False]
+        assert len(store) == 21
+
+    def test_update(self):
+        """Обновление применяется атомарно; исключение в fn не меняет хранилище"""
+        store = ShardedPaymentStore()
+        store.insert_if_absent("pay_upd", _payment("pay_upd"))
+
+        updated = store.update("pay_upd", lambda p: replace(p, status=PaymentStatus.REFUNDED))
+        assert updated.status == PaymentStatus.REFUNDED
+        assert store.update("pay_missing", lambda p: p) is None
+
+        def fail(_):
+            raise ValueError("rejected")
+
+        with pytest.raises(ValueError):
+            store.update("pay_upd", fail)
+        assert store.get("pay_upd") is updated
+
+    def test_concurrent_duplicates_in_adapter(self):
+        """Из параллельных запросов с одним ID успешен ровно один"""
+        adapter = InMemoryPaymentAdapter()
+
+        def attempt(i):
+            try:
+                adapter.process_payment(PaymentId(f"pay_race_{i % 10}"), Amount(Decimal("1.00"), "USD"))
+                return True
+            except PaymentProcessingError:
+                return False
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(attempt, range(1000)))
+
+        assert results.count(True) == 10
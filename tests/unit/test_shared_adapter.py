@@ -0,0 +1,140 @@
+"""
+Юнит-тесты для SharedPaymentAdapter
+
+Сервер хранилища запускается в отдельном процессе, клиенты
+подключаются к нему как воркеры. Проверяем:
+- Дубликат, пришедший через другого клиента, отклоняется
+- Возврат виден всем клиентам
+- Ошибки передаются между процессами без потери данных
+- Выборка выполняется на сервере по его индексам
+- Авторизация, отменённая одним воркером, не списывается другим
+- Симуляция отказов на сервере хранилища
+"""
+import socket
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import (
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentProcessingError,
+    PaymentCommand,
+    PaymentQuery,
+)
+from src.payment_gateway_simulator.adapters.payment import (
+    SharedPaymentAdapter,
+    AsyncSharedPaymentAdapter,
+    start_store_server,
+    SimulationConfig,
+)
+
+AUTHKEY = b"test-store"
+
+
+def _free_address():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()
+
+
+@pytest.fixture(scope="module")
+def store_address():
+    address = _free_address()
+    process = start_store_server(address, AUTHKEY)
+    yield address
+    process.terminate()
+    process.join()
+
+
+class TestSharedPaymentAdapter:
+    """Тесты для клиента общего хранилища"""
+
+    def test_duplicate_detected_across_clients(self, store_address):
+        """Платёж, созданный одним воркером, виден как дубликат другому"""
+        worker_1 = SharedPaymentAdapter(store_address, AUTHKEY)
+        worker_2 = SharedPaymentAdapter(store_address, AUTHKEY)
+
+        payment = worker_1.process_payment(PaymentId("pay_shared_dup"), Amount(Decimal("10.00"), "USD"))
+
+        assert worker_2.get_payment(PaymentId("pay_shared_dup")) == payment
+        with pytest.raises(PaymentProcessingError) as exc_info:
+            worker_2.process_payment(PaymentId("pay_shared_dup"), Amount(Decimal("10.00"), "USD"))
+        assert exc_info.value.payment_id == "pay_shared_dup"
+        assert str(exc_info.value).count("PaymentProcessingError") == 1
+
+    def test_refund_visible_across_clients(self, store_address):
+        """Возврат через одного воркера виден другому"""
+        worker_1 = SharedPaymentAdapter(store_address, AUTHKEY)
+        worker_2 = SharedPaymentAdapter(store_address, AUTHKEY)
+
+        worker_1.process_payment(PaymentId("pay_shared_ref"), Amount(Decimal("30.00"), "EUR"))
+        worker_2.refund_payment(PaymentId("pay_shared_ref"), reason="Shared")
+
+        assert worker_1.get_payment(PaymentId("pay_shared_ref")).status == PaymentStatus.REFUNDED
+        assert [r.description for r in worker_1.get_refunds(PaymentId("pay_shared_ref"))] == ["Refund: Shared"]
+
+    def test_void_visible_across_clients(self, store_address):
+        """Отменённую одним воркером авторизацию другой списать не может"""
+        worker_1 = SharedPaymentAdapter(store_address, AUTHKEY)
+        worker_2 = SharedPaymentAdapter(store_address, AUTHKEY)
+
+        worker_1.authorize_payment(
+            PaymentId("pay_shared_auth"), Amount(Decimal("12.00"), "USD"), datetime.now() + timedelta(hours=1)
+        )
+        worker_2.void_payment(PaymentId("pay_shared_auth"), reason="Shared")
+
+        assert worker_1.get_payment(PaymentId("pay_shared_auth")).status == PaymentStatus.VOIDED
+        with pytest.raises(PaymentProcessingError, match="cannot be captured"):
+            worker_1.capture_payment(PaymentId("pay_shared_auth"))
+
+    def test_list_payments_across_clients(self, store_address):
+        """Платежи разных воркеров попадают в одну выборку"""
+        worker_1 = SharedPaymentAdapter(store_address, AUTHKEY)
+        worker_2 = SharedPaymentAdapter(store_address, AUTHKEY)
+        worker_1.process_payment(PaymentId("pay_shared_list_1"), Amount(Decimal("1.00"), "CHF"))
+        worker_2.process_payment(PaymentId("pay_shared_list_2"), Amount(Decimal("2.00"), "CHF"))
+
+        page = worker_1.list_payments(PaymentQuery(currency="CHF"))
+
+        assert [p.id.value for p in page.items] == ["pay_shared_list_1", "pay_shared_list_2"]
+
+    def test_batch(self, store_address):
+        """Пакет уходит на сервер одним вызовом, ошибки возвращаются по элементам"""
+        worker = SharedPaymentAdapter(store_address, AUTHKEY)
+
+        outcomes = worker.process_payments([
+            PaymentCommand(PaymentId("pay_shared_b"), Amount(Decimal("1.00"), "USD")),
+            PaymentCommand(PaymentId("pay_shared_b"), Amount(Decimal("1.00"), "USD")),
+        ])
+
+        assert outcomes[0].status == PaymentStatus.SUCCEEDED
+        assert isinstance(outcomes[1], PaymentProcessingError)
+
+    @pytest.mark.asyncio
+    async def test_async_adapter(self, store_address):
+        """Асинхронный клиент ждёт сервер в пуле потоков"""
+        adapter = AsyncSharedPaymentAdapter(SharedPaymentAdapter(store_address, AUTHKEY))
+        try:
+            payment = await adapter.process_payment(PaymentId("pay_shared_async"), Amount(Decimal("2.00"), "USD"))
+            assert await adapter.get_payment(PaymentId("pay_shared_async")) == payment
+        finally:
+            adapter.close()
+
+    def test_simulation_on_store_server(self):
+        """Правила отказов из SimulationConfig применяются сервером ко всем клиентам"""
+        address = _free_address()
+        simulation = SimulationConfig.from_dict({"decline_rules": [{"currency": "EUR", "rate": 1.0}]})
+        process = start_store_server(address, AUTHKEY, simulation=simulation)
+        try:
+            worker = SharedPaymentAdapter(address, AUTHKEY)
+            declined = worker.process_payment(PaymentId("pay_shared_sim_1"), Amount(Decimal("1.00"), "EUR"))
+            accepted = worker.process_payment(PaymentId("pay_shared_sim_2"), Amount(Decimal("1.00"), "USD"))
+        finally:
+            process.terminate()
+            process.join()
+
+        assert declined.status == PaymentStatus.FAILED
+        assert declined.error_message == "Card declined"
+        assert accepted.status == PaymentStatus.SUCCEEDED
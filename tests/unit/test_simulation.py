@@ -0,0 +1,197 @@
+"""
+Юнит-тесты для PaymentSimulator
+
+Проверяем:
+- Воспроизводимость решений при одном seed
+- Долю отказов и правила по валюте/диапазону сумм
+- Распределения задержек
+- Окна недоступности
+- Интеграцию с in-memory адаптерами (FAILED платежи, неблокирующая задержка)
+- Симуляцию поверх SQLite: отказы через decline_reason, задержка, пакеты
+"""
+import asyncio
+import time
+import pytest
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import (
+    PaymentCommand,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+)
+from src.payment_gateway_simulator.adapters.payment import (
+    InMemoryPaymentAdapter,
+    AsyncInMemoryPaymentAdapter,
+    AsyncSimulatedPaymentAdapter,
+    AsyncSqlitePaymentAdapter,
+    SqlitePaymentAdapter,
+    PaymentSimulator,
+    SimulationConfig,
+    DeclineRule,
+    LatencyModel,
+    OutageWindow,
+)
+
+USD_10 = Amount(Decimal("10.00"), "USD")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPaymentSimulator:
+    """Тесты для движка симуляции"""
+
+    def test_decisions_are_reproducible(self):
+        """Один seed — одинаковые решения, другой seed — другие"""
+        config = SimulationConfig(seed=7, decline_rules=(DeclineRule(rate=0.5),))
+        first = PaymentSimulator(config)
+        second = PaymentSimulator(config)
+        other = PaymentSimulator(SimulationConfig(seed=8, decline_rules=(DeclineRule(rate=0.5),)))
+
+        ids = [f"pay_{i}" for i in range(200)]
+        decisions = [first.decide(i, USD_10) for i in ids]
+
+        assert decisions == [second.decide(i, USD_10) for i in reversed(ids)][::-1]
+        assert decisions != [other.decide(i, USD_10) for i in ids]
+
+    def test_decline_rate(self):
+        """Доля отказов близка к заданной"""
+        simulator = PaymentSimulator(SimulationConfig(decline_rules=(DeclineRule(rate=0.2),)))
+
+        declined = sum(simulator.decide(f"pay_{i}", USD_10) is not None for i in range(10_000))
+
+        assert 1700 < declined < 2300
+
+    def test_rules_by_currency_and_amount_band(self):
+        """Правило применяется только к своей валюте и диапазону сумм"""
+        rule = DeclineRule(rate=1.0, currency="EUR", min_amount=Decimal("100"), max_amount=Decimal("1000"),
+                           message="Limit exceeded")
+        simulator = PaymentSimulator(SimulationConfig(decline_rules=(rule,)))
+
+        assert simulator.decide("p1", Amount(Decimal("500"), "EUR")) == "Limit exceeded"
+        assert simulator.decide("p2", Amount(Decimal("500"), "USD")) is None
+        assert simulator.decide("p3", Amount(Decimal("99.99"), "EUR")) is None
+        assert simulator.decide("p4", Amount(Decimal("1000"), "EUR")) is None
+
+    def test_latency_distributions(self):
+        """Задержки соответствуют распределению"""
+        fixed = LatencyModel("fixed", value=0.2)
+        normal = LatencyModel("normal", value=1.0, stddev=0.1)
+        pareto = LatencyModel("pareto", value=0.05, alpha=1.5, max_latency=2.0)
+
+        assert fixed.sample(0.9) == 0.2
+        assert normal.sample(0.5) == pytest.approx(1.0)
+        assert normal.sample(0.0001) >= 0
+        assert pareto.sample(0.0001) == pytest.approx(0.05, rel=1e-3)
+        assert pareto.sample(0.999999) == 2.0
+
+        with pytest.raises(ValueError, match="Unknown latency"):
+            LatencyModel("uniform")
+
+    def test_outage_windows(self):
+        """Во время окна недоступности все платежи отклоняются"""
+        clock = _Clock()
+        outage = OutageWindow(start=10, end=20, period=100, message="Down")
+        simulator = PaymentSimulator(SimulationConfig(outages=(outage,)), clock=clock)
+
+        clock.now = 5
+        assert simulator.decide("p", USD_10) is None
+        clock.now = 15
+        assert simulator.decide("p", USD_10) == "Down"
+        clock.now = 115
+        assert simulator.decide("p", USD_10) == "Down"
+
+    def test_config_from_dict(self):
+        """Настройки собираются из JSON-формата, fail_rate — правило по умолчанию"""
+        config = SimulationConfig.from_dict({
+            "seed": 3,
+            "fail_rate": 0.1,
+            "decline_rules": [{"currency": "JPY", "min_amount": "10000", "rate": 0.5}],
+            "latency": {"distribution": "fixed", "value": 0.01},
+            "outages": [{"start": 0, "end": 5}],
+        })
+
+        assert config.seed == 3
+        assert config.decline_rules[0].currency == "JPY"
+        assert config.decline_rules[-1] == DeclineRule(rate=0.1)
+        assert config.latency.distribution == "fixed"
+        assert config.outages[0].end == 5
+
+
+class TestSimulatedAdapters:
+    """Интеграция симулятора с адаптерами"""
+
+    def test_declined_payment_is_stored_as_failed(self):
+        """Отклонённый платёж сохраняется со статусом FAILED и текстом ошибки"""
+        simulator = PaymentSimulator(SimulationConfig(decline_rules=(DeclineRule(rate=1.0, message="Declined"),)))
+        adapter = InMemoryPaymentAdapter(simulator=simulator)
+
+        payment = adapter.process_payment(PaymentId("pay_declined"), USD_10)
+
+        assert payment.status == PaymentStatus.FAILED
+        assert payment.error_message == "Declined"
+        assert adapter.get_payment(PaymentId("pay_declined")) == payment
+
+    @pytest.mark.asyncio
+    async def test_latency_does_not_block_event_loop(self):
+        """Медленные платежи ждут параллельно через asyncio.sleep"""
+        simulator = PaymentSimulator(SimulationConfig(latency=LatencyModel("fixed", value=0.2)))
+        adapter = AsyncSimulatedPaymentAdapter(AsyncInMemoryPaymentAdapter(), simulator)
+
+        started = time.monotonic()
+        payments = await asyncio.gather(*[
+            adapter.process_payment(PaymentId(f"pay_slow_{i}"), USD_10) for i in range(500)
+        ])
+        elapsed = time.monotonic() - started
+
+        assert all(p.status == PaymentStatus.SUCCEEDED for p in payments)
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_simulation_over_sqlite(self, tmp_path):
+        """Поверх SQLite отказы сохраняются как FAILED, задержка выдерживается, отказ риска не ждёт шлюза"""
+        simulator = PaymentSimulator(SimulationConfig(
+            decline_rules=(DeclineRule(currency="EUR", rate=1.0, message="Declined"),),
+            latency=LatencyModel("fixed", value=0.1)
+        ))
+        store = AsyncSqlitePaymentAdapter(SqlitePaymentAdapter(tmp_path / "payments.db"))
+        adapter = AsyncSimulatedPaymentAdapter(store, simulator)
+        try:
+            started = time.monotonic()
+            declined = await adapter.process_payment(PaymentId("pay_eur"), Amount(Decimal("5.00"), "EUR"))
+            slow = time.monotonic() - started
+
+            started = time.monotonic()
+            risky = await adapter.process_payment(PaymentId("pay_risky"), USD_10, decline_reason="Risky")
+            fast = time.monotonic() - started
+
+            outcomes = await adapter.process_payments([
+                PaymentCommand(PaymentId("pay_batch_usd"), USD_10),
+                PaymentCommand(PaymentId("pay_batch_eur"), Amount(Decimal("5.00"), "EUR")),
+            ])
+            stored = await adapter.get_payment(PaymentId("pay_eur"))
+        finally:
+            adapter.close()
+
+        assert (declined.status, declined.error_message) == (PaymentStatus.FAILED, "Declined")
+        assert stored == declined
+        assert slow >= 0.1 and fast < 0.1
+        assert risky.error_message == "Risky"
+        assert [p.status for p in outcomes] == [PaymentStatus.SUCCEEDED, PaymentStatus.FAILED]
+
+    @pytest.mark.asyncio
+    async def test_latency_only_when_store_decides(self):
+        """decide=False: отказы решает хранилище со своим симулятором, обёртка только ждёт"""
+        simulator = PaymentSimulator(SimulationConfig(decline_rules=(DeclineRule(rate=1.0, message="Declined"),)))
+        store = AsyncInMemoryPaymentAdapter(InMemoryPaymentAdapter())
+        adapter = AsyncSimulatedPaymentAdapter(store, simulator, decide=False)
+
+        payment = await adapter.process_payment(PaymentId("pay_store"), USD_10)
+
+        assert payment.status == PaymentStatus.SUCCEEDED
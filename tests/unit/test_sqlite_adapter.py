@@ -0,0 +1,294 @@
+"""
+Юнит-тесты для SqlitePaymentAdapter
+
+Проверяем:
+- Успешную обработку и чтение платежа
+- Отказ при дублировании payment_id
+- Возврат платежа и отказ для несуществующего
+- Сохранение данных между перезапусками
+- Выборку платежей по фильтрам с курсором
+- Групповую запись из нескольких потоков
+- Авторизацию со сроком
+- Отказ до шлюза (decline_reason)
+- Сохранение суммы в валюте расчётов
+- Сбой потока-писателя: ожидающие и новые операции получают ошибку, а не зависают
+- Откат изменений операции, упавшей на середине (возврат, пакет)
+"""
+import pytest
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import (
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    PaymentProcessingError,
+    PaymentCommand,
+    PaymentQuery,
+)
+from src.payment_gateway_simulator.adapters.payment import (
+    SqlitePaymentAdapter,
+    AsyncSqlitePaymentAdapter,
+)
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    adapter = SqlitePaymentAdapter(tmp_path / "payments.db")
+    yield adapter
+    adapter.close()
+
+
+class TestSqlitePaymentAdapter:
+    """Тесты для SQLite-адаптера обработки платежей"""
+
+    def test_process_and_get_payment(self, adapter):
+        """Созданный платёж читается из базы без изменений"""
+        payment = adapter.process_payment(
+            payment_id=PaymentId("pay_sql"),
+            amount=Amount(Decimal("100.50"), "USD"),
+            description="SQLite test",
+            customer_email="test@example.com"
+        )
+
+        assert payment.status == PaymentStatus.SUCCEEDED
+        assert adapter.get_payment(PaymentId("pay_sql")) == payment
+        assert adapter.get_payment(PaymentId("pay_missing")) is None
+
+    def test_duplicate_id_raises_error(self, adapter):
+        """Повторный ID отклоняется"""
+        adapter.process_payment(PaymentId("pay_dup"), Amount(Decimal("1.00"), "EUR"))
+
+        with pytest.raises(PaymentProcessingError, match="already exists"):
+            adapter.process_payment(PaymentId("pay_dup"), Amount(Decimal("2.00"), "EUR"))
+
+    def test_refund(self, adapter):
+        """Возврат обновляет статус, несуществующий платёж — ошибка"""
+        adapter.process_payment(PaymentId("pay_ref"), Amount(Decimal("50.00"), "GBP"))
+
+        refunded = adapter.refund_payment(
+            PaymentId("pay_ref"), amount=Amount(Decimal("20.00"), "GBP"), reason="Partial"
+        )
+
+        assert refunded.status == PaymentStatus.REFUNDED
+        assert refunded.amount.value == Decimal("20.00")
+        stored = adapter.get_payment(PaymentId("pay_ref"))
+        assert stored.status == PaymentStatus.PARTIALLY_REFUNDED
+        assert stored.amount.value == Decimal("50.00")
+        assert stored.refunded_amount.value == Decimal("20.00")
+
+        with pytest.raises(PaymentProcessingError, match="not found"):
+            adapter.refund_payment(PaymentId("pay_unknown"))
+
+    def test_refund_ledger_and_over_refund(self, adapter):
+        """Остаток возвращается без суммы, превышение отклоняется, журнал хранится"""
+        adapter.process_payment(PaymentId("pay_ledger"), Amount(Decimal("50.00"), "GBP"))
+        adapter.refund_payment(PaymentId("pay_ledger"), amount=Amount(Decimal("20.00"), "GBP"))
+
+        with pytest.raises(PaymentProcessingError, match="exceeds"):
+            adapter.refund_payment(PaymentId("pay_ledger"), amount=Amount(Decimal("30.01"), "GBP"))
+
+        rest = adapter.refund_payment(PaymentId("pay_ledger"), reason="Rest")
+
+        assert rest.amount.value == Decimal("30.00")
+        assert adapter.get_payment(PaymentId("pay_ledger")).status == PaymentStatus.REFUNDED
+        assert [r.amount.value for r in adapter.get_refunds(PaymentId("pay_ledger"))] == [
+            Decimal("20.00"), Decimal("30.00")
+        ]
+        assert adapter.get_refunds(PaymentId("pay_unknown")) == []
+
+    def test_list_payments(self, adapter):
+        """Фильтры и курсор: страницы по возрастанию (created_at, id) без повторов"""
+        adapter.process_payments([
+            PaymentCommand(PaymentId(f"pay_list_{i}"), Amount(Decimal("1.00"), "EUR" if i % 2 else "USD"))
+            for i in range(5)
+        ])
+        adapter.refund_payment(PaymentId("pay_list_0"))
+
+        first = adapter.list_payments(PaymentQuery(currency="USD", limit=1))
+        second = adapter.list_payments(PaymentQuery(currency="USD", limit=1, after=first.next_cursor))
+        rest = adapter.list_payments(PaymentQuery(currency="USD", after=second.next_cursor))
+
+        assert [p.id.value for page in (first, second, rest) for p in page.items] == [
+            "pay_list_0", "pay_list_2", "pay_list_4"
+        ]
+        assert rest.next_cursor is None
+        assert [p.id.value for p in adapter.list_payments(PaymentQuery(status=PaymentStatus.REFUNDED)).items] == [
+            "pay_list_0"
+        ]
+
+    def test_process_payments_batch(self, adapter):
+        """Пакет пишется одной транзакцией, дубликаты — ошибки по элементам"""
+        outcomes = adapter.process_payments([
+            PaymentCommand(PaymentId("pay_b1"), Amount(Decimal("1.00"), "USD")),
+            PaymentCommand(PaymentId("pay_b1"), Amount(Decimal("1.00"), "USD")),
+            PaymentCommand(PaymentId("pay_b2"), Amount(Decimal("2.00"), "USD")),
+        ])
+
+        assert outcomes[0].status == PaymentStatus.SUCCEEDED
+        assert isinstance(outcomes[1], PaymentProcessingError)
+        assert outcomes[2].status == PaymentStatus.SUCCEEDED
+
+    def test_data_survives_restart(self, tmp_path):
+        """После перезапуска платежи и проверка дубликатов сохраняются"""
+        path = tmp_path / "restart.db"
+        first = SqlitePaymentAdapter(path)
+        first.process_payment(PaymentId("pay_persist"), Amount(Decimal("9.99"), "USD"))
+        first.close()
+
+        second = SqlitePaymentAdapter(path)
+        try:
+            assert second.get_payment(PaymentId("pay_persist")).amount.value == Decimal("9.99")
+            with pytest.raises(PaymentProcessingError, match="already exists"):
+                second.process_payment(PaymentId("pay_persist"), Amount(Decimal("1.00"), "USD"))
+        finally:
+            second.close()
+
+    def test_concurrent_duplicates_detected(self, adapter):
+        """Из параллельных запросов с одним ID успешен ровно один"""
+        def attempt(_):
+            try:
+                adapter.process_payment(PaymentId("pay_race"), Amount(Decimal("1.00"), "USD"))
+                return True
+            except PaymentProcessingError:
+                return False
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(attempt, range(32)))
+
+        assert results.count(True) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_adapter(self, adapter):
+        """Асинхронная обёртка ждёт поток-писатель без блокировки loop"""
+        async_adapter = AsyncSqlitePaymentAdapter(adapter)
+
+        payment = await async_adapter.process_payment(PaymentId("pay_async_sql"), Amount(Decimal("3.00"), "USD"))
+
+        assert await async_adapter.get_payment(PaymentId("pay_async_sql")) == payment
+
+    def test_submit_returns_future(self, adapter):
+        """submit_* ставят операции в очередь писателя и возвращают Future"""
+        expires_at = datetime.now() + timedelta(hours=1)
+        futures = [
+            adapter.submit_process(PaymentId("pay_future"), Amount(Decimal("5.00"), "USD")),
+            adapter.submit_authorize(PaymentId("pay_future_auth"), Amount(Decimal("5.00"), "USD"), expires_at),
+            adapter.submit_capture(PaymentId("pay_future_auth")),
+            adapter.submit_refund(PaymentId("pay_future"), Amount(Decimal("2.00"), "USD")),
+        ]
+
+        payment, authorized, captured, refund = [future.result(timeout=5) for future in futures]
+
+        assert (payment.status, authorized.status) == (PaymentStatus.SUCCEEDED, PaymentStatus.PENDING)
+        assert captured.status == PaymentStatus.SUCCEEDED
+        assert refund.amount.value == Decimal("2.00")
+        assert adapter.get_payment(PaymentId("pay_future")).status == PaymentStatus.PARTIALLY_REFUNDED
+
+    def test_authorization_persisted(self, tmp_path):
+        """Срок авторизации переживает перезапуск, списание снимает его"""
+        path = tmp_path / "auth.db"
+        expires_at = datetime.now().replace(microsecond=0) + timedelta(days=1)
+        first = SqlitePaymentAdapter(path)
+        try:
+            first.authorize_payment(PaymentId("pay_auth_sql"), Amount(Decimal("5.00"), "USD"), expires_at)
+            first.authorize_payment(PaymentId("pay_void_sql"), Amount(Decimal("6.00"), "USD"), expires_at)
+            first.void_payment(PaymentId("pay_void_sql"), reason="Expired")
+        finally:
+            first.close()
+
+        second = SqlitePaymentAdapter(path)
+        try:
+            pending = second.get_payment(PaymentId("pay_auth_sql"))
+            assert (pending.status, pending.expires_at) == (PaymentStatus.PENDING, expires_at)
+            voided = second.get_payment(PaymentId("pay_void_sql"))
+            assert (voided.status, voided.expires_at, voided.error_message) == (PaymentStatus.VOIDED, None, "Expired")
+
+            captured = second.capture_payment(PaymentId("pay_auth_sql"))
+            assert captured.expires_at is None
+            assert second.get_payment(PaymentId("pay_auth_sql")) == captured
+            with pytest.raises(PaymentProcessingError, match="cannot be voided"):
+                second.void_payment(PaymentId("pay_auth_sql"))
+        finally:
+            second.close()
+
+    def test_decline_reason_stored_as_failed(self, adapter):
+        """Платёж с decline_reason сохраняется со статусом FAILED и текстом отказа"""
+        declined = adapter.process_payment(
+            PaymentId("pay_sql_declined"), Amount(Decimal("5.00"), "USD"), decline_reason="Risk rule"
+        )
+        [batch_declined] = adapter.process_payments([
+            PaymentCommand(PaymentId("pay_sql_batch_declined"), Amount(Decimal("1.00"), "USD"), decline_reason="Velocity")
+        ])
+
+        assert adapter.get_payment(PaymentId("pay_sql_declined")) == declined
+        assert (declined.status, declined.error_message) == (PaymentStatus.FAILED, "Risk rule")
+        assert adapter.get_payment(PaymentId("pay_sql_batch_declined")).error_message == "Velocity"
+        assert batch_declined.status == PaymentStatus.FAILED
+
+        held = adapter.authorize_payment(
+            PaymentId("pay_sql_auth_declined"), Amount(Decimal("5.00"), "USD"),
+            datetime.now() + timedelta(hours=1), decline_reason="Risk rule"
+        )
+        assert adapter.get_payment(PaymentId("pay_sql_auth_declined")) == held
+        assert (held.status, held.expires_at) == (PaymentStatus.FAILED, None)
+
+    def test_settlement_amount_persisted(self, adapter):
+        """Сумма в валюте расчётов сохраняется с платежом, по одному и в пакете"""
+        settled = adapter.process_payment(
+            PaymentId("pay_sql_eur"), Amount(Decimal("92.00"), "EUR"),
+            settlement_amount=Amount(Decimal("100.00"), "USD")
+        )
+        adapter.process_payments([
+            PaymentCommand(PaymentId("pay_sql_jpy"), Amount(Decimal("1513"), "JPY"),
+                           settlement_amount=Amount(Decimal("10.00"), "USD"))
+        ])
+
+        assert adapter.get_payment(PaymentId("pay_sql_eur")) == settled
+        assert settled.settlement_amount == Amount(Decimal("100.00"), "USD")
+        assert adapter.get_payment(PaymentId("pay_sql_jpy")).settlement_amount.minor == 1000
+
+    def test_writer_failure_fails_pending_and_new_operations(self, adapter, monkeypatch):
+        """Сбой самого писателя (BEGIN/ROLLBACK) завершает ожидающие операции ошибкой и ломает адаптер"""
+        def broken_group(connection, group):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(SqlitePaymentAdapter, "_execute_group", staticmethod(broken_group))
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(adapter.process_payment, PaymentId("pay_lost"), Amount(Decimal("1.00"), "USD"))
+            with pytest.raises(RuntimeError, match="writer failed") as exc_info:
+                pending.result(timeout=5)
+
+        assert isinstance(exc_info.value.__cause__, sqlite3.OperationalError)
+        with pytest.raises(RuntimeError, match="writer failed"):
+            adapter.process_payment(PaymentId("pay_next"), Amount(Decimal("1.00"), "USD"))
+
+    def test_failed_operation_rolls_back_its_own_writes(self, tmp_path):
+        """Операция, упавшая на середине, не оставляет своих записей; соседние операции пачки сохраняются"""
+        path = tmp_path / "payments.db"
+        adapter = SqlitePaymentAdapter(path)
+        try:
+            adapter.process_payment(PaymentId("pay_ref"), Amount(Decimal("10.00"), "USD"))
+            with sqlite3.connect(path) as connection:
+                connection.executescript("""
+                    CREATE TRIGGER fail_refund BEFORE INSERT ON refunds
+                    BEGIN SELECT RAISE(ABORT, 'refund log unavailable'); END;
+                    CREATE TRIGGER fail_row BEFORE INSERT ON payments WHEN NEW.id = 'pay_bad'
+                    BEGIN SELECT RAISE(ABORT, 'row rejected'); END;
+                """)
+
+            with pytest.raises(sqlite3.IntegrityError, match="refund log unavailable"):
+                adapter.refund_payment(PaymentId("pay_ref"), Amount(Decimal("4.00"), "USD"))
+            with pytest.raises(sqlite3.IntegrityError, match="row rejected"):
+                adapter.process_payments([
+                    PaymentCommand(PaymentId(payment_id), Amount(Decimal("1.00"), "USD"))
+                    for payment_id in ("pay_a", "pay_bad", "pay_c")
+                ])
+
+            refunded = adapter.get_payment(PaymentId("pay_ref"))
+            assert (refunded.status, refunded.refunded_amount) == (PaymentStatus.SUCCEEDED, None)
+            assert adapter.get_payment(PaymentId("pay_a")) is None
+            assert adapter.process_payment(PaymentId("pay_c"), Amount(Decimal("1.00"), "USD"))
+        finally:
+            adapter.close()
@@ -0,0 +1,63 @@
+"""
+Юнит-тесты для разбора NDJSON-потока (ndjson_batches)
+
+Проверяем:
+- Склейку строк, разрезанных между фрагментами
+- Ограничение размера пачки
+- Отдачу неполной пачки, когда поток замолкает
+- Отбрасывание слишком длинных строк
+"""
+import asyncio
+import pytest
+
+from src.payment_gateway_simulator.api.streaming import ndjson_batches
+
+
+async def _chunks(*parts: bytes, delay: float = 0.0):
+    for part in parts:
+        if delay:
+            await asyncio.sleep(delay)
+        yield part
+
+
+async def _collect(chunks, **kwargs):
+    return [batch async for batch in ndjson_batches(chunks, **kwargs)]
+
+
+class TestNdjsonBatches:
+    """Тесты для разбора NDJSON-потока пачками"""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """Строки собираются из фрагментов, пустые строки пропускаются, номера — физические"""
+        batches = await _collect(_chunks(b'{"a"', b':1}\n\n{"b":2}\r\n{"c"', b":3}"))
+
+        assert batches == [[(1, b'{"a":1}'), (3, b'{"b":2}'), (4, b'{"c":3}')]]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_bound(self):
+        """Пачка не больше batch_size строк"""
+        body = b"".join(b'{"n":%d}\n' % i for i in range(7))
+
+        batches = await _collect(_chunks(body), batch_size=3)
+
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert [line_no for batch in batches for line_no, _ in batch] == list(range(1, 8))
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_when_stream_stalls(self):
+        """Неполная пачка отдаётся по таймеру, не дожидаясь следующих данных"""
+        batches = await _collect(
+            _chunks(b'{"n":1}\n', b'{"n":2}\n', delay=0.05), batch_size=100, flush_interval=0.01
+        )
+
+        assert batches == [[(1, b'{"n":1}')], [(2, b'{"n":2}')]]
+
+    @pytest.mark.asyncio
+    async def test_long_line_rejected_and_skipped(self):
+        """Слишком длинная строка приходит как None, остаток отбрасывается до перевода строки"""
+        batches = await _collect(
+            _chunks(b'{"n":1}\n' + b"x" * 20, b"x" * 20, b'x\n{"n":3}\n'), max_line_bytes=16
+        )
+
+        assert batches == [[(1, b'{"n":1}'), (2, None), (3, b'{"n":3}')]]
@@ -0,0 +1,171 @@
+"""
+Юнит-тесты для отчёта по объёму транзакций
+
+Проверяем:
+- Раскладку транзакций по окнам, валютам и статусам
+- Вытеснение старых окон и отбрасывание опоздавших транзакций
+- Выборку окон по диапазону [start, end)
+- Декоратор логгера, пополняющий агрегаты
+- Проверку входных данных и фильтры сценария отчёта
+- Пересчёт сумм окон в валюту расчётов
+"""
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import Mock, AsyncMock
+
+from src.payment_gateway_simulator.domain import (
+    Payment,
+    PaymentId,
+    Amount,
+    PaymentStatus,
+    ReportGranularity,
+    VolumeBucket,
+)
+from src.payment_gateway_simulator.adapters.reporting import (
+    VolumeAggregator,
+    AggregatingTransactionLogger,
+    AsyncAggregatingTransactionLogger,
+)
+from src.payment_gateway_simulator.adapters.fx import FxRateMatrix, LocalFxRateProvider
+from src.payment_gateway_simulator.use_cases import VolumeReportUseCase, VolumeReportInput
+
+_START = datetime(2026, 2, 4, 12, 0, 0)
+
+
+def _payment(seconds: int, value: str = "10.00", currency: str = "USD",
+             status: PaymentStatus = PaymentStatus.SUCCEEDED) -> Payment:
+    return Payment(
+        id=PaymentId(f"pay_{seconds}"),
+        amount=Amount(Decimal(value), currency),
+        status=status,
+        created_at=_START + timedelta(seconds=seconds)
+    )
+
+
+def _rows(buckets):
+    return [(b.start, b.currency, b.status.value, b.count, b.amount_minor) for b in buckets]
+
+
+class TestVolumeAggregator:
+    """Тесты для инкрементальных агрегатов по окнам"""
+
+    def test_buckets_by_currency_and_status(self):
+        """Транзакции складываются в окна каждой ширины, суммы — в минорных единицах"""
+        aggregator = VolumeAggregator()
+        aggregator.record(_payment(0, "10.50"))
+        aggregator.record(_payment(30, "0.25"))
+        aggregator.record(_payment(61, "1000", "JPY"))
+        aggregator.record(_payment(62, "5.00", status=PaymentStatus.FAILED))
+
+        minute = _START + timedelta(minutes=1)
+        assert _rows(aggregator.volume(ReportGranularity.MINUTE)) == [
+            (_START, "USD", "succeeded", 2, 1075),
+            (minute, "JPY", "succeeded", 1, 1000),
+            (minute, "USD", "failed", 1, 500),
+        ]
+        assert _rows(aggregator.volume(ReportGranularity.HOUR)) == [
+            (_START, "JPY", "succeeded", 1, 1000),
+            (_START, "USD", "failed", 1, 500),
+            (_START, "USD", "succeeded", 2, 1075),
+        ]
+
+    def test_old_buckets_evicted(self):
+        """Хранится не больше заданного числа последних окон, опоздавшие в вытесненные — отбрасываются"""
+        aggregator = VolumeAggregator(minute_buckets=2)
+        for minute in range(4):
+            aggregator.record(_payment(minute * 60))
+        aggregator.record(_payment(0))
+
+        assert [b.start for b in aggregator.volume(ReportGranularity.MINUTE)] == [
+            _START + timedelta(minutes=2), _START + timedelta(minutes=3)
+        ]
+        assert aggregator.volume(ReportGranularity.HOUR)[0].count == 5
+
+    def test_range_selects_overlapping_buckets(self):
+        """Берутся окна, пересекающие [start, end)"""
+        aggregator = VolumeAggregator()
+        aggregator.record_many([_payment(minute * 60) for minute in range(5)])
+
+        buckets = aggregator.volume(
+            ReportGranularity.MINUTE,
+            start=_START + timedelta(minutes=1, seconds=30),
+            end=_START + timedelta(minutes=3)
+        )
+
+        assert [b.start for b in buckets] == [_START + timedelta(minutes=1), _START + timedelta(minutes=2)]
+
+    def test_logger_decorator_records_after_inner(self):
+        """Декоратор пишет во внутренний логгер и пополняет агрегаты"""
+        aggregator = VolumeAggregator()
+        inner = Mock()
+        logger = AggregatingTransactionLogger(inner, aggregator)
+
+        logger.log_transaction(_payment(0))
+        logger.log_transactions([_payment(1), _payment(2)])
+
+        inner.log_transaction.assert_called_once()
+        inner.log_transactions.assert_called_once()
+        assert aggregator.volume(ReportGranularity.DAY)[0].count == 3
+
+    @pytest.mark.asyncio
+    async def test_async_logger_decorator_skips_failed_write(self):
+        """Если внутренний логгер упал, транзакция в агрегаты не попадает"""
+        aggregator = VolumeAggregator()
+        inner = AsyncMock()
+        inner.log_transaction.side_effect = RuntimeError("queue full")
+        logger = AsyncAggregatingTransactionLogger(inner, aggregator)
+
+        with pytest.raises(RuntimeError):
+            await logger.log_transaction(_payment(0))
+
+        assert aggregator.volume(ReportGranularity.DAY) == []
+
+
+class TestVolumeReportUseCase:
+    """Тесты для сценария отчёта"""
+
+    def test_filters_by_currency_and_status(self):
+        """Фильтры валюты и статуса применяются к окнам порта"""
+        report = Mock()
+        report.volume.return_value = [
+            VolumeBucket(_START, "EUR", PaymentStatus.SUCCEEDED, 1, 100),
+            VolumeBucket(_START, "USD", PaymentStatus.FAILED, 2, 200),
+            VolumeBucket(_START, "USD", PaymentStatus.SUCCEEDED, 3, 300),
+        ]
+
+        buckets = VolumeReportUseCase(report).execute(
+            VolumeReportInput(granularity="hour", currency="usd", status="succeeded")
+        )
+
+        report.volume.assert_called_once_with(ReportGranularity.HOUR, None, None)
+        assert [b.count for b in buckets] == [3]
+
+    @pytest.mark.parametrize("input", [
+        VolumeReportInput(granularity="week"),
+        VolumeReportInput(status="unknown"),
+        VolumeReportInput(start=_START, end=_START),
+    ])
+    def test_invalid_input_rejected(self, input):
+        """Неизвестная ширина окна, статус или пустой диапазон — ValueError"""
+        report = Mock()
+
+        with pytest.raises(ValueError):
+            VolumeReportUseCase(report).execute(input)
+
+        report.volume.assert_not_called()
+
+    def test_settlement_currency(self):
+        """Суммы окон пересчитываются в валюту расчётов; без курсов — ValueError"""
+        report = Mock()
+        report.volume.return_value = [
+            VolumeBucket(_START, "EUR", PaymentStatus.SUCCEEDED, 1, 9200),
+            VolumeBucket(_START, "GBP", PaymentStatus.SUCCEEDED, 2, 500),
+        ]
+        fx_rates = LocalFxRateProvider(FxRateMatrix("USD", {"EUR": Decimal("0.92")}))
+
+        buckets = VolumeReportUseCase(report, fx_rates).execute(VolumeReportInput(settlement_currency="usd"))
+
+        assert [(b.settlement_currency, b.settlement_minor) for b in buckets] == [("USD", 10000), ("USD", None)]
+        with pytest.raises(ValueError, match="FX rates"):
+            VolumeReportUseCase(report).execute(VolumeReportInput(settlement_currency="USD"))
@@ -0,0 +1,213 @@
+"""
+Юнит-тесты для доставки вебхуков (WebhookDispatcher)
+
+Проверяем:
+- Подпись тела и её проверку получателем
+- Повторы после ошибок и отказ после max_attempts
+- Непредвиденную ошибку доставки в логе модуля
+- Ограничение одновременных запросов к эндпоинту
+- Фильтр типов событий и удаление эндпоинта
+- Отбрасывание событий сверх max_pending
+"""
+import asyncio
+import json
+import logging
+import pytest
+import httpx
+from datetime import datetime
+from decimal import Decimal
+
+from src.payment_gateway_simulator.domain import Payment, PaymentId, Amount, PaymentStatus
+from src.payment_gateway_simulator.adapters.webhooks import (
+    WebhookDispatcher,
+    SIGNATURE_HEADER,
+    sign,
+    verify,
+)
+
+
+def _payment(number: int = 1, status: PaymentStatus = PaymentStatus.SUCCEEDED) -> Payment:
+    return Payment(
+        id=PaymentId(f"pay_{number:03d}"),
+        amount=Amount(Decimal("10.50"), "USD"),
+        status=status,
+        created_at=datetime(2026, 2, 4, 12, 0, 0)
+    )
+
+
+async def _settle(dispatcher: WebhookDispatcher, timeout: float = 2.0) -> None:
+    """Дождаться, пока не останется недоставленных событий"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while dispatcher.stats()["pending"] and loop.time() < deadline:
+        await asyncio.sleep(0.005)
+
+
+def _dispatcher(handler, **kwargs) -> WebhookDispatcher:
+    kwargs.setdefault("backoff_base", 0.001)
+    return WebhookDispatcher(transport=httpx.MockTransport(handler), **kwargs)
+
+
+class TestSigning:
+    """Тесты для подписи вебхуков"""
+
+    def test_verify_accepts_signature_and_rejects_tampering(self):
+        """Подпись проверяется секретом; изменённое тело, чужой секрет и старая метка отвергаются"""
+        header = sign("secret", 1_700_000_000, b'{"a":1}')
+
+        assert verify("secret", header, b'{"a":1}', now=1_700_000_010)
+        assert not verify("secret", header, b'{"a":2}', now=1_700_000_010)
+        assert not verify("other", header, b'{"a":1}', now=1_700_000_010)
+        assert not verify("secret", header, b'{"a":1}', now=1_700_001_000)
+        assert not verify("secret", "garbage", b'{"a":1}')
+
+
+class TestWebhookDispatcher:
+    """Тесты для очередей и повторов доставки"""
+
+    @pytest.mark.asyncio
+    async def test_delivers_signed_event(self):
+        """Событие доставляется POST-запросом с подписью и полями платежа"""
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(request)
+            return httpx.Response(204)
+
+        dispatcher = _dispatcher(handler)
+        endpoint = dispatcher.register("http://receiver/hook")
+        dispatcher.publish([_payment(), _payment(2, PaymentStatus.REFUNDED)])
+        await _settle(dispatcher)
+        await dispatcher.aclose()
+
+        assert [json.loads(r.content)["type"] for r in received] == ["payment.succeeded", "refund.created"]
+        event = json.loads(received[0].content)
+        assert event["data"]["amount"] == "10.50"
+        assert event["data"]["amount_minor"] == 1050
+        assert received[0].headers["Webhook-Id"] == event["id"]
+        assert verify(endpoint.secret, received[0].headers[SIGNATURE_HEADER], received[0].content)
+        assert dispatcher.stats()["delivered"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """Ошибки сети и ответы не 2xx повторяются из кучи таймеров"""
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request.headers["Webhook-Attempt"])
+            if len(attempts) == 1:
+                raise httpx.ConnectError("refused")
+            if len(attempts) == 2:
+                return httpx.Response(503)
+            return httpx.Response(200)
+
+        dispatcher = _dispatcher(handler)
+        dispatcher.register("http://receiver/hook")
+        dispatcher.publish([_payment()])
+        await _settle(dispatcher)
+        stats = dispatcher.stats()
+        await dispatcher.aclose()
+
+        assert attempts == ["1", "2", "3"]
+        assert stats["retried"] == 2
+        assert stats["delivered"] == 1
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_logged_and_retried(self, caplog):
+        """Непредвиденная ошибка доставки уходит в лог с трейсбеком и повторяется как обычная"""
+        attempts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            attempts.append(request.headers["Webhook-Attempt"])
+            if len(attempts) == 1:
+                raise RuntimeError("handler bug")
+            return httpx.Response(200)
+
+        dispatcher = _dispatcher(handler)
+        dispatcher.register("http://receiver/hook")
+        with caplog.at_level(logging.ERROR, logger="payment_gateway_simulator.adapters.webhooks"):
+            dispatcher.publish([_payment()])
+            await _settle(dispatcher)
+        await dispatcher.aclose()
+
+        assert attempts == ["1", "2"]
+        [record] = caplog.records
+        assert "http://receiver/hook" in record.getMessage()
+        assert record.exc_info[0] is RuntimeError
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """После max_attempts неудачных попыток доставка отбрасывается"""
+        dispatcher = _dispatcher(lambda request: httpx.Response(500), max_attempts=3)
+        dispatcher.register("http://receiver/hook")
+        dispatcher.publish([_payment()])
+        await _settle(dispatcher)
+        stats = dispatcher.stats()
+        await dispatcher.aclose()
+
+        assert stats["failed"] == 1
+        assert stats["retried"] == 2
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_endpoint_concurrency_limit(self):
+        """Одновременных запросов к эндпоинту не больше max_concurrency"""
+        active, peak = 0, 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+            return httpx.Response(200)
+
+        dispatcher = _dispatcher(handler)
+        dispatcher.register("http://receiver/hook", max_concurrency=3)
+        dispatcher.publish([_payment(i) for i in range(50)])
+        assert dispatcher.stats()["in_flight"] == 3
+        await _settle(dispatcher)
+        stats = dispatcher.stats()
+        await dispatcher.aclose()
+
+        assert peak == 3
+        assert stats["delivered"] == 50
+
+    @pytest.mark.asyncio
+    async def test_event_filter_and_remove(self):
+        """Эндпоинт получает только подписанные типы; удалённый — ничего"""
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(request.url.path)
+            return httpx.Response(200)
+
+        dispatcher = _dispatcher(handler)
+        dispatcher.register("http://receiver/failed", events=["payment.failed"])
+        removed = dispatcher.register("http://receiver/removed")
+        assert dispatcher.remove(removed.id)
+        assert not dispatcher.remove(removed.id)
+
+        dispatcher.publish([_payment(1), _payment(2, PaymentStatus.FAILED)])
+        await _settle(dispatcher)
+        await dispatcher.aclose()
+
+        assert received == ["/failed"]
+        with pytest.raises(ValueError):
+            dispatcher.register("http://receiver/hook", events=["payment.unknown"])
+
+    @pytest.mark.asyncio
+    async def test_drops_beyond_max_pending(self):
+        """Сверх max_pending новые доставки отбрасываются, а не копятся"""
+        dispatcher = _dispatcher(lambda request: httpx.Response(200), max_pending=5)
+        dispatcher.register("http://receiver/hook", max_concurrency=1)
+        dispatcher.publish([_payment(i) for i in range(8)])
+        stats = dispatcher.stats()
+        await _settle(dispatcher)
+        delivered = dispatcher.stats()["delivered"]
+        await dispatcher.aclose()
+
+        assert stats["pending"] == 5
+        assert stats["dropped"] == 3
+        assert delivered == 5